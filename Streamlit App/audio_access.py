@@ -0,0 +1,212 @@
+# Call Recording Access for the Dashboard and the Transcription Notebook
+# Lists recordings from the CALL_CENTER_AUDIO_FILES directory table without
+# signing anything, and signs one URL per recording only when it is played.
+# Only some calls have a recording, so the set of recorded paths is listed once
+# and cached for LISTING_TTL_SECONDS: pages ask has_recording() before offering
+# a player, and url() never signs a path that is not on the stage.
+# Signed URLs are cached until shortly before they expire (REFRESH_MARGIN_SECONDS),
+# so replaying a call or reopening its page costs no query. Bytes are read in
+# CHUNK_BYTES pieces - a player only needs the URL (the browser streams it with
+# range requests), and anything that processes the audio never holds a whole file.
+#
+# LocalAudioLibrary serves the audio/ folder the same way for the local harness.
+
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+AUDIO_STAGE = "@CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_CENTER_AUDIO_FILES"
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+
+URL_EXPIRY_SECONDS = 3600
+REFRESH_MARGIN_SECONDS = 300    # re-sign a URL with less than this left, so a player never starts on a dying link
+MAX_CACHED_URLS = 4096
+LISTING_TTL_SECONDS = 300       # new uploads show up in the dashboard within this
+CHUNK_BYTES = 1 << 20
+
+Recording = namedtuple("Recording", ["path", "size", "last_modified"])
+
+
+def recording_path(call_id, extension=".mp3"):
+    """Stage path of a call's recording (files are named <CALL_ID>.mp3)"""
+    return f"{call_id}{extension}"
+
+
+# ============================================
+# PRESIGNED URL CACHE
+# ============================================
+
+class PresignedUrlCache:
+    """
+    Thread-safe LRU of signed URLs. An entry is served until `margin` seconds
+    before it expires, then re-signed. When full, expired entries are dropped
+    first and the least recently used after that.
+    """
+
+    def __init__(self, sign, expiry_seconds=URL_EXPIRY_SECONDS, margin=REFRESH_MARGIN_SECONDS,
+                 max_entries=MAX_CACHED_URLS, clock=time.time):
+        self._sign = sign           # (path, expiry_seconds) -> url
+        self.expiry_seconds = expiry_seconds
+        self.margin = margin
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()   # path -> (url, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.signed = 0
+
+    def get(self, path):
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] - self.margin > now:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[0]
+
+        # Sign outside the lock so one slow query does not block other sessions
+        url = self._sign(path, self.expiry_seconds)
+        with self._lock:
+            self.signed += 1
+            self._entries[path] = (url, now + self.expiry_seconds)
+            self._entries.move_to_end(path)
+            self._evict(now)
+        return url
+
+    def _evict(self, now):
+        if len(self._entries) <= self.max_entries:
+            return
+        for path in [p for p, (_, expires_at) in self._entries.items() if expires_at - self.margin <= now]:
+            del self._entries[path]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "signed": self.signed}
+
+
+# ============================================
+# RECORDING INDEX
+# ============================================
+
+class RecordingIndex:
+    """
+    Thread-safe set of the recorded paths, re-listed once `ttl` seconds have
+    passed. One listing answers has_recording() for every call and session.
+    """
+
+    def __init__(self, list_paths, ttl=LISTING_TTL_SECONDS, clock=time.time):
+        self._list_paths = list_paths   # () -> iterable of paths
+        self.ttl = ttl
+        self._clock = clock
+        self._paths = None
+        self._listed_at = None
+        self._lock = threading.Lock()
+        self.listings = 0
+
+    def paths(self):
+        now = self._clock()
+        with self._lock:
+            if self._paths is not None and now - self._listed_at < self.ttl:
+                return self._paths
+        paths = frozenset(self._list_paths())
+        with self._lock:
+            self._paths, self._listed_at = paths, now
+            self.listings += 1
+        return paths
+
+    def __contains__(self, path):
+        return path in self.paths()
+
+
+# ============================================
+# SNOWFLAKE STAGE
+# ============================================
+
+class StageAudioLibrary:
+    """Recordings on the CALL_CENTER_AUDIO_FILES stage (needs SNOWFLAKE_SSE encryption for presigned URLs)"""
+
+    def __init__(self, session, stage=AUDIO_STAGE, cache=None, index=None):
+        self.session = session
+        self.stage = stage
+        self.cache = cache or PresignedUrlCache(self._sign)
+        self.index = index or RecordingIndex(lambda: (r.path for r in self.list_recordings()))
+
+    def list_recordings(self, limit=None, offset=0):
+        """Paths and sizes from the directory table - no URLs are signed here"""
+        filters = " OR ".join(f"RELATIVE_PATH ILIKE '%{ext}'" for ext in AUDIO_EXTENSIONS)
+        page = f"\nLIMIT {int(limit)} OFFSET {int(offset)}" if limit is not None else ""
+        rows = self.session.sql(f"""
+            SELECT RELATIVE_PATH, SIZE, LAST_MODIFIED
+            FROM DIRECTORY('{self.stage}')
+            WHERE {filters}
+            ORDER BY RELATIVE_PATH{page}
+        """).collect()
+        return [Recording(row["RELATIVE_PATH"], row["SIZE"], row["LAST_MODIFIED"]) for row in rows]
+
+    def _sign(self, path, expiry_seconds):
+        rows = self.session.sql(
+            f"SELECT GET_PRESIGNED_URL('{self.stage}', ?, ?) AS URL", params=[path, expiry_seconds]
+        ).collect()
+        return rows[0]["URL"]
+
+    def has_recording(self, path):
+        """Whether path is on the stage (cached directory listing, no query per call)"""
+        return path in self.index
+
+    def url(self, path):
+        """Presigned URL for one recording, signed on first use and cached until near expiry; None if not on the stage"""
+        return self.cache.get(path) if self.has_recording(path) else None
+
+    def iter_chunks(self, path, chunk_bytes=CHUNK_BYTES):
+        """The recording's bytes, chunk_bytes at a time"""
+        with self.session.file.get_stream(f"{self.stage}/{path}") as f:
+            yield from iter(lambda: f.read(chunk_bytes), b"")
+
+
+# ============================================
+# LOCAL STAND-IN
+# ============================================
+
+class LocalAudioLibrary:
+    """Recordings in a local folder (the repo's audio/); URLs are file paths, None for a missing file"""
+
+    def __init__(self, directory, cache=None, index=None):
+        self.directory = directory
+        self.cache = cache or PresignedUrlCache(self._sign)
+        self.index = index or RecordingIndex(lambda: (r.path for r in self.list_recordings()))
+
+    def list_recordings(self, limit=None, offset=0):
+        recordings = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                    stat = entry.stat()
+                    recordings.append(Recording(entry.name, stat.st_size, stat.st_mtime))
+        recordings.sort()
+        return recordings[offset:] if limit is None else recordings[offset:offset + limit]
+
+    def _sign(self, path, expiry_seconds):
+        full_path = os.path.join(self.directory, path)
+        return full_path if os.path.isfile(full_path) else None
+
+    def has_recording(self, path):
+        return path in self.index
+
+    def url(self, path):
+        return self.cache.get(path) if self.has_recording(path) else None
+
+    def iter_chunks(self, path, chunk_bytes=CHUNK_BYTES):
+        with open(os.path.join(self.directory, path), "rb") as f:
+            yield from iter(lambda: f.read(chunk_bytes), b"")
+
+
+def audio_library_for(session):
+    """LocalAudioLibrary for a session that exposes an audio_directory (the harness), else the stage"""
+    directory = getattr(session, "audio_directory", None)
+    if directory:
+        return LocalAudioLibrary(directory)
+    return StageAudioLibrary(session)
@@ -0,0 +1,154 @@
+# Bulk Export of Filtered Calls for the Call Center Analytics Dashboard
+# Turns the current page's filters into a server-side unload: COPY INTO the
+# CALL_EXPORTS stage (sql/01) as compressed CSV or Parquet split into files of
+# at most MAX_FILE_BYTES, then presigned download links for the files. Rows go
+# from the warehouse straight to the stage - the app only sees the COPY summary
+# and the file list, so exports of millions of rows never pass through app memory.
+#
+# LocalExporter is the stand-in for the local harness: DuckDB's COPY ... TO a
+# directory with the same formats and file splitting, and file:// links.
+
+import os
+import time
+import uuid
+from collections import namedtuple
+
+
+CALL_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED"
+PROFILE_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE"
+EXPORT_STAGE = "@CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_EXPORTS"
+
+MAX_FILE_BYTES = 128 * 1024 * 1024
+URL_EXPIRY_SECONDS = 3600
+
+# Label -> Snowflake FILE_FORMAT options, DuckDB COPY options, file extension
+EXPORT_FORMATS = {
+    "CSV (gzip)": (
+        "TYPE = CSV COMPRESSION = GZIP FIELD_OPTIONALLY_ENCLOSED_BY = '\"' NULL_IF = ()",
+        "FORMAT csv, HEADER true, COMPRESSION gzip",
+        "csv.gz",
+    ),
+    "Parquet (snappy)": (
+        "TYPE = PARQUET COMPRESSION = SNAPPY",
+        "FORMAT parquet, COMPRESSION snappy, ROW_GROUP_SIZE 16384",  # files split on row-group boundaries
+        "parquet",
+    ),
+}
+
+# Filter columns that live on the customer profile, not on the call rows
+PROFILE_COLUMNS = {"REGION", "CUSTOMER_SEGMENT"}
+
+ExportFile = namedtuple("ExportFile", ["name", "rows", "bytes", "url"])
+ExportResult = namedtuple("ExportResult", ["prefix", "format", "rows", "files", "seconds"])
+
+
+# ============================================
+# FILTERS -> SQL
+# ============================================
+# Filters are tuples, so they can key caches and session state:
+#   ("in", column, values)       column is one of values
+#   ("contains", column, term)   column contains term, case-insensitive
+
+def sql_literal(value):
+    """value as a quoted SQL string literal (quotes and backslashes escaped)"""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _condition(kind, column, value):
+    if kind == "in":
+        values = ", ".join(sql_literal(v) for v in value)
+        if column in PROFILE_COLUMNS:
+            return f"CUSTOMER_NAME IN (SELECT CUSTOMER_NAME FROM {PROFILE_TABLE} WHERE {column} IN ({values}))"
+        return f"{column} IN ({values})"
+    if kind == "contains":
+        return f"CONTAINS(LOWER({column}), {sql_literal(value.lower())})"
+    raise ValueError(f"Unknown export filter: {kind}")
+
+
+def export_query(filters):
+    """SELECT of the call rows matching filters (all columns, newest first)"""
+    conditions = [_condition(*f) for f in filters if f[0] != "in" or f[2]]
+    where = f"\nWHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT *\nFROM {CALL_TABLE}{where}\nORDER BY ANALYSIS_TIMESTAMP DESC"
+
+
+def _export_prefix():
+    """Unique folder per export: exports/<UTC timestamp>_<id>"""
+    return f"exports/{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}_{uuid.uuid4().hex[:8]}"
+
+
+# ============================================
+# SNOWFLAKE STAGE
+# ============================================
+
+class StageExporter:
+    """COPY INTO @CALL_EXPORTS + GET_PRESIGNED_URL (needs an SSE-encrypted internal stage)"""
+
+    def __init__(self, run_query, stage=EXPORT_STAGE):
+        self.run_query = run_query  # (name, sql) -> pyarrow Table, e.g. the app's telemetry-recording run_query
+        self.stage = stage
+
+    def export(self, filters, export_format):
+        start = time.perf_counter()
+        snowflake_format, _, extension = EXPORT_FORMATS[export_format]
+        prefix = _export_prefix()
+        unloaded = self.run_query("export", f"""
+        COPY INTO {self.stage}/{prefix}/calls_
+        FROM ({export_query(filters)})
+        FILE_FORMAT = ({snowflake_format})
+        HEADER = TRUE
+        MAX_FILE_SIZE = {MAX_FILE_BYTES}
+        DETAILED_OUTPUT = TRUE
+        """).to_pylist()
+        # DETAILED_OUTPUT: one row per file (FILE_NAME, FILE_SIZE, ROW_COUNT)
+        files = [(f"{prefix}/{os.path.basename(row['FILE_NAME'])}", row['ROW_COUNT'], row['FILE_SIZE'])
+                 for row in unloaded if row.get('FILE_NAME')]
+        urls = {}
+        if files:
+            presign = " UNION ALL ".join(
+                f"SELECT {sql_literal(path)} AS PATH, GET_PRESIGNED_URL({self.stage}, {sql_literal(path)}, "
+                f"{URL_EXPIRY_SECONDS}) AS URL" for path, _, _ in files
+            )
+            urls = {row['PATH']: row['URL'] for row in self.run_query("export_urls", presign).to_pylist()}
+        export_files = [ExportFile(path, rows, size, urls.get(path)) for path, rows, size in files]
+        return ExportResult(prefix, export_format, sum(f.rows for f in export_files), export_files,
+                            time.perf_counter() - start)
+
+
+# ============================================
+# LOCAL STAND-IN
+# ============================================
+
+class LocalExporter:
+    """DuckDB COPY ... TO a local directory (file:// links) - same query, formats and file split"""
+
+    def __init__(self, run_query, directory):
+        self.run_query = run_query
+        self.directory = directory
+
+    def export(self, filters, export_format):
+        start = time.perf_counter()
+        _, duckdb_format, extension = EXPORT_FORMATS[export_format]
+        prefix = _export_prefix()
+        target = os.path.join(self.directory, prefix)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        self.run_query("export", f"""
+        COPY ({export_query(filters)})
+        TO '{target}'
+        ({duckdb_format}, FILE_SIZE_BYTES {MAX_FILE_BYTES}, FILENAME_PATTERN 'calls_{{i}}', FILE_EXTENSION '{extension}')
+        """)
+        export_files = []
+        for name in sorted(os.listdir(target)):
+            path = os.path.join(target, name)
+            rows = self.run_query("export_count", f"SELECT COUNT(*) AS N FROM '{path}'").column(0)[0].as_py()
+            export_files.append(ExportFile(f"{prefix}/{name}", rows, os.path.getsize(path), f"file://{path}"))
+        return ExportResult(prefix, export_format, sum(f.rows for f in export_files), export_files,
+                            time.perf_counter() - start)
+
+
+def exporter_for(session, run_query):
+    """LocalExporter for a session that exposes an export_directory (the harness), else the stage"""
+    directory = getattr(session, "export_directory", None)
+    if directory:
+        return LocalExporter(run_query, directory)
+    return StageExporter(run_query)
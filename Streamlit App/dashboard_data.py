@@ -0,0 +1,223 @@
+# Data Access and Shared Caches for the Call Center Analytics Dashboard
+# Snowflake loaders, headline metrics, the priority feed and the process-wide
+# caches (view models, frame store, name resolver) used by the main script and
+# the page modules in dashboard_pages/. Kept apart from the pages so loading
+# data never imports plotting code.
+
+import time
+
+import streamlit as st
+from snowflake.snowpark.context import get_active_session
+
+import telemetry
+from audio_access import audio_library_for
+from call_export import exporter_for, sql_literal
+from frame_adapter import FrameStore, fetch_arrow
+from name_resolver import NameResolver
+from priority_feed import FEED_SIZE, LiveFeed, PriorityFeed
+from rollup_cube import RollupCube
+from view_cache import ViewModelCache, view_key
+
+# Initialize Snowflake session
+session = get_active_session()
+
+
+# ============================================
+# DATA LOADING FUNCTIONS
+# ============================================
+
+# Base datasets are fetched as Arrow tables and held once per app process with
+# st.cache_resource: Arrow tables are immutable, so every session shares the same
+# buffers instead of unpickling its own pandas copy.
+
+def run_query(name, query):
+    """Fetch a query as Arrow, tagged with this run's page, and record it in the run's telemetry"""
+    stats = {}
+    run = telemetry.current_run()
+    tag = telemetry.query_tag(run.page) if run is not None else None
+    table = fetch_arrow(session, query, stats, query_tag=tag)
+    if run is not None:
+        run.record_query(name, stats)
+    return table
+
+
+@st.cache_resource(show_spinner=False)
+def load_call_data():
+    """Load call center data from the main table (pyarrow Table)"""
+    query = """
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED
+    ORDER BY ANALYSIS_TIMESTAMP DESC
+    """
+    return run_query('calls', query)
+
+
+@st.cache_resource(show_spinner=False)
+def load_customer_profiles():
+    """Load customer profile data (pyarrow Table)"""
+    query = """
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE
+    """
+    return run_query('customers', query)
+
+
+@st.cache_resource(show_spinner=False)
+def load_rollup_cube():
+    """Daily rollup cube from the CALL_ROLLUP_DAILY dynamic table (buckets, not calls)"""
+    query = """
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_ROLLUP_DAILY
+    """
+    return RollupCube(run_query('rollup', query))
+
+
+# Calls per page of the priority feed; the first FEED_SIZE ranks are held in memory
+PRIORITY_PAGE_SIZE = 5
+
+
+@st.cache_resource(show_spinner=False)
+def load_priority_feed():
+    """Top FEED_SIZE calls of the CALL_PRIORITY_SCORES dynamic table, watermarked with the newest call"""
+    rows = run_query('priority', f"""
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_PRIORITY_SCORES
+    ORDER BY PRIORITY_KEY DESC, CALL_ID
+    LIMIT {FEED_SIZE}
+    """)
+    watermark = run_query('priority_watermark', """
+    SELECT MAX(ANALYSIS_TIMESTAMP) AS WATERMARK
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_PRIORITY_SCORES
+    """).column(0)[0].as_py()
+    return PriorityFeed(rows, FEED_SIZE, watermark)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def load_new_priority_rows(watermark):
+    """Scored calls that landed after the watermark (pyarrow Table)"""
+    query = f"""
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_PRIORITY_SCORES
+    WHERE ANALYSIS_TIMESTAMP > {sql_literal(watermark)}
+    """
+    return run_query('priority_delta', query)
+
+
+@st.cache_resource(show_spinner=False)
+def get_live_priority_feed():
+    """Process-wide feed that advances its watermark as new calls are merged in"""
+    return LiveFeed(load_priority_feed())
+
+
+def get_priority_feed():
+    """The cached top-K feed topped up with calls scored since the last refresh - O(delta), no rescan"""
+    return get_live_priority_feed().refresh(load_new_priority_rows)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def fetch_priority_page(offset, size, filters=()):
+    """Ranked calls beyond the in-memory feed, paged on the server"""
+    conditions = " AND ".join(
+        f"{column} IN ({', '.join(sql_literal(value) for value in values)})" for column, values in filters
+    )
+    query = f"""
+    SELECT *
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_PRIORITY_SCORES
+    {'WHERE ' + conditions if conditions else ''}
+    ORDER BY PRIORITY_KEY DESC, CALL_ID
+    LIMIT {int(size)} OFFSET {int(offset)}
+    """
+    return run_query('priority_page', query)
+
+
+# Headline periods, counted back from the newest call day
+HEADLINE_PERIODS = {'All time': None, 'Last 7 days': 7, 'Last 30 days': 30, 'Last 90 days': 90}
+
+
+@st.cache_data(show_spinner=False)
+def get_summary_stats(days=None):
+    """
+    Headline metrics and percentiles for the last `days` call days (None = all),
+    merged from the per-day states of CALL_SKETCHES_DAILY - O(days), no call scan.
+    Distinct counts are HyperLogLog estimates (about 1.6% standard error) and
+    percentiles come from a digest (rank error around 1%); counts and averages are exact.
+    """
+    period_filter = "" if days is None else f"""
+    WHERE CALL_DATE > (SELECT MAX(CALL_DATE) FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_SKETCHES_DAILY) - {int(days)}"""
+    query = f"""
+    SELECT 
+        SUM(CALLS) as total_calls,
+        HLL_ESTIMATE(HLL_COMBINE(CUSTOMER_HLL)) as unique_customers,
+        HLL_ESTIMATE(HLL_COMBINE(AGENT_HLL)) as unique_agents,
+        ROUND(SUM(SENTIMENT_SUM) / NULLIF(SUM(SENTIMENT_COUNT), 0), 3) as avg_sentiment_score,
+        ROUND(SUM(PERFORMANCE_SUM) / NULLIF(SUM(PERFORMANCE_COUNT), 0), 1) as avg_agent_score,
+        SUM(RESOLVED_CALLS) as resolved_calls,
+        SUM(ESCALATED_CALLS) as escalated_calls,
+        SUM(SATISFIED_CALLS) as satisfied_customers,
+        SUM(NEGATIVE_CALLS) as negative_calls,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(SENTIMENT_DIGEST), 0.1) as p10_sentiment,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(SENTIMENT_DIGEST), 0.5) as p50_sentiment,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(SENTIMENT_DIGEST), 0.9) as p90_sentiment,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(PERFORMANCE_DIGEST), 0.1) as p10_agent_score,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(PERFORMANCE_DIGEST), 0.5) as p50_agent_score,
+        APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(PERFORMANCE_DIGEST), 0.9) as p90_agent_score
+    FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_SKETCHES_DAILY{period_filter}
+    """
+    return run_query('summary_stats', query).to_pylist()[0]
+
+
+# ============================================
+# BULK EXPORT
+# ============================================
+
+def export_calls(filters, export_format):
+    """
+    Unload the calls matching filters to the CALL_EXPORTS stage (split, compressed
+    files + presigned links). Not cached: every click is a fresh export.
+    """
+    return exporter_for(session, run_query).export(filters, export_format)
+
+
+# ============================================
+# VIEW MODEL CACHE
+# ============================================
+
+@st.cache_resource(show_spinner=False)
+def get_view_cache():
+    """Process-wide view model cache shared by all sessions"""
+    return ViewModelCache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_frame_store():
+    """Read-only datasets and filter masks shared by all sessions (sessions hold views, not copies)"""
+    return FrameStore()
+
+
+@st.cache_resource(show_spinner=False)
+def get_audio_library():
+    """Call recordings with a process-wide presigned URL cache (URLs are signed on first play)"""
+    return audio_library_for(session)
+
+
+@st.cache_resource(show_spinner=False)
+def get_customer_resolver():
+    """Fuzzy customer-name resolver over the profile table, built once per app process"""
+    return NameResolver(load_customer_profiles().column('CUSTOMER_NAME').to_pylist())
+
+
+def cached_view(page, builder, *frames, **state):
+    """Return the page's view model, building it only for a new data version / filter combination"""
+    timing = {}
+
+    def timed_builder():
+        start = time.perf_counter()
+        view_model = builder()
+        timing['seconds'] = time.perf_counter() - start
+        return view_model
+
+    view_model = get_view_cache().get_or_build(view_key(page, *frames, **state), timed_builder)
+    run = telemetry.current_run()
+    if run is not None:
+        run.record_view(page, hit='seconds' not in timing, compute_seconds=timing.get('seconds', 0.0))
+    return view_model
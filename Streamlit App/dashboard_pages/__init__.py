@@ -0,0 +1,3 @@
+# Page modules of the Call Center Analytics Dashboard
+# Each module holds one page's view model builders and render function; the
+# main script imports a module the first time its page is shown.
@@ -0,0 +1,63 @@
+# Agent Performance page
+# Agent summary table and performance chart
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import cached_view
+from frame_adapter import as_frame
+
+
+def build_agent_view(call_data):
+    """Agent summary table and performance chart"""
+    agent_stats = call_data.group_summary('AGENT_NAME', [
+        ('Total Calls', 'CALL_ID', 'count'),
+        ('Avg Sentiment', 'SENTIMENT_SCORE', 'mean'),
+        ('Performance Score', 'AGENT_PERFORMANCE_SCORE', 'mean'),
+        ('Resolved', 'ISSUE_RESOLVED', 'count_equal', 'yes'),
+        ('Satisfied', 'CUSTOMER_SATISFACTION', 'count_equal', 'satisfied')
+    ])
+    
+    agent_stats.columns = ['Agent', 'Total Calls', 'Avg Sentiment', 'Performance Score', 'Resolved', 'Satisfied']
+    agent_stats['Resolution Rate'] = (agent_stats['Resolved'] / agent_stats['Total Calls'] * 100).round(1)
+    agent_stats['Satisfaction Rate'] = (agent_stats['Satisfied'] / agent_stats['Total Calls'] * 100).round(1)
+    agent_stats = agent_stats.sort_values('Performance Score', ascending=False)
+    
+    # Performance distribution chart
+    fig_perf = px.bar(
+        agent_stats.head(10),
+        x='Agent',
+        y='Performance Score',
+        title="Agent Performance Scores",
+        color='Performance Score',
+        color_continuous_scale='RdYlGn'
+    )
+    fig_perf.update_layout(height=400)
+    
+    return {
+        'agent_stats': agent_stats,
+        'top_agents': agent_stats.head(5)[['Agent', 'Performance Score', 'Resolution Rate', 'Satisfaction Rate']],
+        'performance_figure': fig_perf.to_dict()
+    }
+
+
+def show_agent_performance(call_data):
+    """Agent performance analysis"""
+    call_data = as_frame(call_data)
+    st.markdown("## 👨‍💼 Agent Performance Analysis")
+    
+    view = cached_view('agents', lambda: build_agent_view(call_data), call_data)
+    
+    # Top Performers
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 🏆 Top Performing Agents")
+        st.dataframe(view['top_agents'], use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.plotly_chart(view['performance_figure'], use_container_width=True)
+    
+    # Detailed agent table
+    st.markdown("### 📋 Full Agent Summary")
+    st.dataframe(view['agent_stats'], use_container_width=True, hide_index=True)
@@ -0,0 +1,122 @@
+# Customer Insights page
+# Fuzzy customer lookup, profile, sentiment gauge and call history (with recordings)
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from audio_access import recording_path
+from dashboard_data import cached_view, get_audio_library, get_customer_resolver
+from frame_adapter import as_frame
+
+
+def create_sentiment_gauge(sentiment_score):
+    """Create a sentiment gauge chart"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=sentiment_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Avg Sentiment"},
+        gauge={
+            'axis': {'range': [-1, 1]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [-1, -0.3], 'color': "lightcoral"},
+                {'range': [-0.3, 0.3], 'color': "lightyellow"},
+                {'range': [0.3, 1], 'color': "lightgreen"}
+            ]
+        }
+    ))
+    fig.update_layout(height=250)
+    return fig
+
+
+def build_customer_list(call_data):
+    """Sorted customer names for the selector"""
+    return sorted(call_data.unique('CUSTOMER_NAME'))
+
+
+def build_customer_view(call_data, customer_data, selected_customer):
+    """Profile, metrics, gauge and recent calls for one customer"""
+    customer_calls = call_data.where_equals('CUSTOMER_NAME', selected_customer)
+    
+    # Customer profile if available
+    customer_profile = customer_data.where_equals('CUSTOMER_NAME', selected_customer).head(1).rows()
+    
+    return {
+        'total_calls': len(customer_calls),
+        'profile': customer_profile[0] if customer_profile else None,
+        'gauge_figure': create_sentiment_gauge(customer_calls.mean('SENTIMENT_SCORE')).to_dict(),
+        'resolved': customer_calls.count_equal('ISSUE_RESOLVED', 'yes'),
+        'satisfied': customer_calls.count_equal('CUSTOMER_SATISFACTION', 'satisfied'),
+        'recent_calls': customer_calls.head(5).rows()
+    }
+
+
+def show_customer_insights(call_data, customer_data):
+    """Customer insights and profiles; returns the selected customer as export filters"""
+    call_data = as_frame(call_data)
+    customer_data = as_frame(customer_data)
+    st.markdown("## 👤 Customer Insights")
+    
+    # Customer selector
+    customers = cached_view('customer_list', lambda: build_customer_list(call_data), call_data)
+    
+    # Fuzzy lookup (typos, partial or reordered names) narrows the selector to ranked matches
+    name_query = st.text_input("Find customer:", placeholder="e.g. Thompsn, Alex Carter...")
+    if name_query:
+        with_calls = set(customers)
+        matches = [c.name for c in get_customer_resolver().resolve(name_query, limit=10) if c.name in with_calls]
+        if matches:
+            customers = matches
+        else:
+            st.info(f"No customer name close to '{name_query}'")
+    selected_customer = st.selectbox("Select Customer", customers)
+    
+    if selected_customer:
+        view = cached_view(
+            'customer',
+            lambda: build_customer_view(call_data, customer_data, selected_customer),
+            call_data, customer_data,
+            customer=selected_customer
+        )
+        
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            st.markdown(f"""
+            <div class="customer-card">
+                <h2>👤 {selected_customer}</h2>
+                <p><strong>Total Calls:</strong> {view['total_calls']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            profile = view['profile']
+            if profile is not None:
+                st.write(f"**Segment:** {profile.get('CUSTOMER_SEGMENT', 'N/A')}")
+                st.write(f"**Region:** {profile.get('REGION', 'N/A')}")
+                st.write(f"**Lifetime Value:** ${profile.get('LIFETIME_VALUE', 0):,.2f}")
+        
+        with col2:
+            st.plotly_chart(view['gauge_figure'], use_container_width=True)
+        
+        with col3:
+            st.metric("Issues Resolved", f"{view['resolved']}/{view['total_calls']}")
+            st.metric("Satisfied Calls", view['satisfied'])
+        
+        # Customer call history
+        st.markdown("### 📞 Call History")
+        for call in view['recent_calls']:
+            with st.expander(f"{call['PRIMARY_INTENT']} - {call['ANALYSIS_TIMESTAMP']}"):
+                st.write(f"**Agent:** {call['AGENT_NAME']}")
+                st.write(f"**Sentiment:** {call['SENTIMENT_CATEGORY']} ({call['SENTIMENT_SCORE']:.2f})")
+                # Only recorded calls get a player; the URL is signed only when it is played,
+                # then reused until near expiry
+                path = recording_path(call['CALL_ID'])
+                if not get_audio_library().has_recording(path):
+                    st.caption("No recording on the stage for this call")
+                elif st.checkbox("🎧 Play recording", key=f"play_{call['CALL_ID']}"):
+                    st.audio(get_audio_library().url(path), format="audio/mpeg")
+                st.write(f"**Resolved:** {call['ISSUE_RESOLVED']}")
+                st.write(f"**Summary:** {call['CALL_SUMMARY']}")
+    
+    return (('in', 'CUSTOMER_NAME', (selected_customer,)),) if selected_customer else ()
@@ -0,0 +1,136 @@
+# Executive Dashboard page
+# Headline tiles, sentiment and intent charts and the priority call feed.
+# The landing page, so it builds its charts with plotly.graph_objects only:
+# plotly.express costs ~100 ms to import and is left to the other pages.
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard_data import PRIORITY_PAGE_SIZE, cached_view, fetch_priority_page
+from frame_adapter import as_frame
+from priority_feed import scored_rows
+
+SENTIMENT_COLORS = {
+    'POSITIVE': '#10B981',
+    'NEUTRAL': '#29B5E8',
+    'NEGATIVE': '#EF4444'
+}
+
+
+def format_metric(value, spec, suffix=""):
+    """Tile text for a stat that is NULL when no call has a value (e.g. an empty digest)"""
+    return "N/A" if value is None else f"{value:{spec}}{suffix}"
+
+
+def build_executive_view(call_data):
+    """Sentiment and intent charts for the executive dashboard"""
+    # Sentiment Distribution
+    sentiment_counts = call_data.value_counts('SENTIMENT_CATEGORY')
+    fig_sentiment = go.Figure(go.Pie(
+        values=sentiment_counts.values,
+        labels=sentiment_counts.index,
+        marker=dict(colors=[SENTIMENT_COLORS.get(label, '#29B5E8') for label in sentiment_counts.index])
+    ))
+    fig_sentiment.update_layout(title="📊 Call Sentiment Distribution", height=400)
+    
+    # Call Intent Categories
+    intent_counts = call_data.value_counts('PRIMARY_INTENT').head(6)
+    fig_intent = go.Figure(go.Bar(
+        x=intent_counts.values,
+        y=intent_counts.index,
+        orientation='h',
+        marker={'color': intent_counts.values, 'colorscale': 'Viridis', 'showscale': True}
+    ))
+    fig_intent.update_layout(title="🏷️ Call Intent Categories", height=400, showlegend=False)
+    
+    return {
+        'sentiment_figure': fig_sentiment.to_dict(),
+        'intent_figure': fig_intent.to_dict()
+    }
+
+
+def show_executive_dashboard(call_data, stats, feed):
+    """Executive Dashboard with key metrics, insights and the priority call feed"""
+    call_data = as_frame(call_data)
+    st.markdown("## 📊 Executive Dashboard")
+    
+    # Key Metrics Row
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric("📞 Total Calls", f"{stats['TOTAL_CALLS']:,}")
+    
+    with col2:
+        st.metric("👥 Customers", f"{stats['UNIQUE_CUSTOMERS']:,}",
+                  help="HyperLogLog estimate, about 1.6% standard error")
+    
+    with col3:
+        resolution_rate = (stats['RESOLVED_CALLS'] / stats['TOTAL_CALLS'] * 100) if stats['TOTAL_CALLS'] > 0 else 0
+        st.metric("✅ Resolution Rate", f"{resolution_rate:.1f}%")
+    
+    with col4:
+        satisfaction_rate = (stats['SATISFIED_CUSTOMERS'] / stats['TOTAL_CALLS'] * 100) if stats['TOTAL_CALLS'] > 0 else 0
+        st.metric("😊 Satisfaction Rate", f"{satisfaction_rate:.1f}%")
+    
+    with col5:
+        st.metric("⭐ Avg Agent Score", format_metric(stats['AVG_AGENT_SCORE'], '.1f', '/10'))
+    
+    # Percentile row (digest estimates, merged from the daily sketches)
+    col1, col2, col3, col4, col5 = st.columns(5)
+    percentile_help = "Approximate: merged from daily sketches, rank error around 1%"
+    
+    with col1:
+        st.metric("😟 Sentiment p10", format_metric(stats['P10_SENTIMENT'], '.2f'), help=percentile_help)
+    
+    with col2:
+        st.metric("😐 Sentiment Median", format_metric(stats['P50_SENTIMENT'], '.2f'), help=percentile_help)
+    
+    with col3:
+        st.metric("😀 Sentiment p90", format_metric(stats['P90_SENTIMENT'], '.2f'), help=percentile_help)
+    
+    with col4:
+        st.metric("🐢 Agent Score p10", format_metric(stats['P10_AGENT_SCORE'], '.1f', '/10'), help=percentile_help)
+    
+    with col5:
+        st.metric("🚀 Agent Score p90", format_metric(stats['P90_AGENT_SCORE'], '.1f', '/10'), help=percentile_help)
+    
+    view = cached_view('executive', lambda: build_executive_view(call_data), call_data)
+    
+    # Charts Row
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(view['sentiment_figure'], use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(view['intent_figure'], use_container_width=True)
+    
+    # Priority Issues Section - ranked by escalation, sentiment, urgency, customer value and age
+    st.markdown("## 🚨 Calls Requiring Attention")
+    
+    page_number = int(st.number_input("Priority page", min_value=1, value=1, step=1)) - 1
+    priority_calls = feed.page(page_number, PRIORITY_PAGE_SIZE)
+    if priority_calls is None:
+        # Past the in-memory top K: rank on the server
+        rows = fetch_priority_page(page_number * PRIORITY_PAGE_SIZE, PRIORITY_PAGE_SIZE, feed.filters)
+        priority_calls = scored_rows(rows, feed.reference_days())
+    
+    if priority_calls:
+        for call in priority_calls:
+            if call['ESCALATION_REQUIRED'] == 'yes':
+                priority_class = "priority-high"
+            elif call['SENTIMENT_CATEGORY'] == 'NEGATIVE':
+                priority_class = "priority-medium"
+            else:
+                priority_class = "priority-low"
+            st.markdown(f"""
+            <div class="{priority_class}">
+                <strong>🚨 {call['CUSTOMER_NAME']} - {call['PRIMARY_INTENT']}</strong><br>
+                <em>Priority: {call['PRIORITY_SCORE']} | Agent: {call['AGENT_NAME']} | Sentiment: {call['SENTIMENT_CATEGORY']} | Urgency: {call['URGENCY_LEVEL']}</em><br>
+                {str(call['CALL_SUMMARY'])[:200]}...
+            </div>
+            """, unsafe_allow_html=True)
+    elif page_number == 0:
+        st.success("✅ No high-priority issues at this time!")
+    else:
+        st.info("No more calls to show.")
@@ -0,0 +1,79 @@
+# Regional Analysis page
+# Call metrics and lifetime value by region (calls joined to customer profiles)
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import cached_view
+from frame_adapter import as_frame
+
+
+def build_regional_view(call_data, customer_data):
+    """Regional metrics table and charts (None if no region data)"""
+    # Merge call data with customer profiles for region info
+    merged_data = call_data.left_join(
+        customer_data,
+        on='CUSTOMER_NAME',
+        columns=['CUSTOMER_NAME', 'REGION', 'CUSTOMER_SEGMENT', 'LIFETIME_VALUE']
+    )
+    
+    if not merged_data.has_values('REGION'):
+        return None
+    
+    # Regional metrics
+    regional_stats = merged_data.group_summary('REGION', [
+        ('Calls', 'CALL_ID', 'count'),
+        ('Avg Sentiment', 'SENTIMENT_SCORE', 'mean'),
+        ('Resolved', 'ISSUE_RESOLVED', 'count_equal', 'yes'),
+        ('Satisfied', 'CUSTOMER_SATISFACTION', 'count_equal', 'satisfied'),
+        ('Total LTV', 'LIFETIME_VALUE', 'sum')
+    ])
+    
+    regional_stats.columns = ['Region', 'Calls', 'Avg Sentiment', 'Resolved', 'Satisfied', 'Total LTV']
+    regional_stats['Resolution Rate'] = (regional_stats['Resolved'] / regional_stats['Calls'] * 100).round(1)
+    regional_stats['Satisfaction Rate'] = (regional_stats['Satisfied'] / regional_stats['Calls'] * 100).round(1)
+    
+    fig_region = px.bar(
+        regional_stats,
+        x='Region',
+        y='Satisfaction Rate',
+        title="Customer Satisfaction by Region",
+        color='Satisfaction Rate',
+        color_continuous_scale='RdYlGn'
+    )
+    fig_ltv = px.bar(
+        regional_stats,
+        x='Region',
+        y='Total LTV',
+        title="Total Customer Value by Region",
+        color='Total LTV',
+        color_continuous_scale='Blues'
+    )
+    
+    return {
+        'regional_stats': regional_stats,
+        'region_figure': fig_region.to_dict(),
+        'ltv_figure': fig_ltv.to_dict()
+    }
+
+
+def show_regional_analysis(call_data, customer_data):
+    """Regional analysis with customer data"""
+    call_data = as_frame(call_data)
+    customer_data = as_frame(customer_data)
+    st.markdown("## 🗺️ Regional Analysis")
+    
+    view = cached_view('regional', lambda: build_regional_view(call_data, customer_data), call_data, customer_data)
+    
+    if view is not None:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(view['region_figure'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(view['ltv_figure'], use_container_width=True)
+        
+        st.dataframe(view['regional_stats'], use_container_width=True, hide_index=True)
+    else:
+        st.info("Regional data not available. Ensure customer profiles are loaded.")
@@ -0,0 +1,54 @@
+# Transcript Search page
+# Case-insensitive keyword search over call transcripts
+
+import streamlit as st
+
+from dashboard_data import cached_view
+from frame_adapter import as_frame
+
+
+def build_search_view(call_data, search_term):
+    """Match count and top matching calls for a transcript search"""
+    matches = call_data.where_contains('TRANSCRIPT_TEXT', search_term)
+    return {
+        'match_count': len(matches),
+        'matches': matches.head(10).rows()
+    }
+
+
+def show_transcript_search(call_data):
+    """Search through call transcripts; returns the search as export filters"""
+    call_data = as_frame(call_data)
+    st.markdown("## 🔍 Transcript Search")
+    
+    search_term = st.text_input("Search transcripts:", placeholder="Enter keywords...")
+    # Matching is case-insensitive: one normalized term keys the cache and runs the search
+    search_term = search_term.strip().lower()
+    
+    if search_term:
+        # Filter transcripts containing the search term
+        view = cached_view(
+            'search',
+            lambda: build_search_view(call_data, search_term),
+            call_data,
+            search=search_term
+        )
+        
+        st.write(f"Found **{view['match_count']}** matching calls")
+        
+        for call in view['matches']:
+            sentiment_color = "sentiment-positive" if call['SENTIMENT_CATEGORY'] == 'POSITIVE' else \
+                             "sentiment-negative" if call['SENTIMENT_CATEGORY'] == 'NEGATIVE' else "sentiment-neutral"
+            
+            with st.expander(f"📞 {call['CUSTOMER_NAME']} - {call['PRIMARY_INTENT']}"):
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(f"**Summary:** {call['CALL_SUMMARY']}")
+                    st.write(f"**Transcript excerpt:** ...{str(call['TRANSCRIPT_TEXT'])[:500]}...")
+                with col2:
+                    st.markdown(f"**Sentiment:** <span class='{sentiment_color}'>{call['SENTIMENT_CATEGORY']}</span>", 
+                               unsafe_allow_html=True)
+                    st.write(f"**Agent:** {call['AGENT_NAME']}")
+                    st.write(f"**Resolved:** {call['ISSUE_RESOLVED']}")
+    
+    return (('contains', 'TRANSCRIPT_TEXT', search_term),) if search_term else ()
@@ -0,0 +1,161 @@
+# Agent Trends and Sentiment Trends pages
+# Both read only the daily rollup cube (CALL_ROLLUP_DAILY) - no call scan
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard_data import cached_view
+
+
+TREND_GRAINS = {'Day': 'day', 'Week': 'week', 'Month': 'month'}
+
+
+def build_agent_trend_view(cube, agents, grain):
+    """Performance and volume per agent over time, from the rollup cube"""
+    if agents:
+        cube = cube.where_in('AGENT_NAME', agents)
+    trend = cube.slice(['CALL_DATE', 'AGENT_NAME'], grain=grain)
+    
+    fig_perf = px.line(
+        trend,
+        x='CALL_DATE',
+        y='AVG_PERFORMANCE',
+        color='AGENT_NAME',
+        markers=True,
+        title="⭐ Average Performance Score Over Time",
+        labels={'CALL_DATE': 'Date', 'AVG_PERFORMANCE': 'Performance Score', 'AGENT_NAME': 'Agent'}
+    )
+    fig_perf.update_layout(height=400)
+    
+    fig_volume = px.bar(
+        trend,
+        x='CALL_DATE',
+        y='CALLS',
+        color='AGENT_NAME',
+        title="📞 Calls Handled Over Time",
+        labels={'CALL_DATE': 'Date', 'CALLS': 'Calls', 'AGENT_NAME': 'Agent'}
+    )
+    fig_volume.update_layout(height=400)
+    
+    summary = cube.slice(['AGENT_NAME'])
+    summary = summary[['AGENT_NAME', 'CALLS', 'AVG_PERFORMANCE', 'PERFORMANCE_STDDEV', 'AVG_SENTIMENT',
+                       'RESOLUTION_RATE', 'SATISFACTION_RATE']].round(2)
+    summary.columns = ['Agent', 'Calls', 'Avg Performance', 'Performance Std Dev', 'Avg Sentiment',
+                       'Resolution Rate', 'Satisfaction Rate']
+    
+    return {
+        'performance_figure': fig_perf.to_dict(),
+        'volume_figure': fig_volume.to_dict(),
+        'summary': summary.sort_values('Avg Performance', ascending=False)
+    }
+
+
+def build_sentiment_trend_view(cube, intents, regions, grain):
+    """Sentiment mean ± one standard deviation and category mix over time, from the rollup cube"""
+    if intents:
+        cube = cube.where_in('PRIMARY_INTENT', intents)
+    if regions:
+        cube = cube.where_in('REGION', regions)
+    trend = cube.slice(['CALL_DATE'], grain=grain)
+    
+    band = trend['SENTIMENT_STDDEV'].fillna(0)
+    fig_sentiment = go.Figure([
+        go.Scatter(x=trend['CALL_DATE'], y=trend['AVG_SENTIMENT'] + band, mode='lines',
+                   line=dict(width=0), showlegend=False, hoverinfo='skip'),
+        go.Scatter(x=trend['CALL_DATE'], y=trend['AVG_SENTIMENT'] - band, mode='lines',
+                   line=dict(width=0), fill='tonexty', fillcolor='rgba(41, 181, 232, 0.2)',
+                   name='± 1 std dev', hoverinfo='skip'),
+        go.Scatter(x=trend['CALL_DATE'], y=trend['AVG_SENTIMENT'], mode='lines+markers',
+                   line=dict(color='#29B5E8'), name='Avg sentiment'),
+    ])
+    fig_sentiment.update_layout(title="📈 Average Sentiment Over Time", height=400,
+                                yaxis_title="Sentiment Score", xaxis_title="Date")
+    
+    mix = cube.slice(['CALL_DATE', 'SENTIMENT_CATEGORY'], grain=grain)
+    fig_mix = px.area(
+        mix,
+        x='CALL_DATE',
+        y='CALLS',
+        color='SENTIMENT_CATEGORY',
+        title="📊 Sentiment Mix Over Time",
+        labels={'CALL_DATE': 'Date', 'CALLS': 'Calls', 'SENTIMENT_CATEGORY': 'Sentiment'},
+        color_discrete_map={
+            'POSITIVE': '#10B981',
+            'NEUTRAL': '#29B5E8',
+            'NEGATIVE': '#EF4444'
+        }
+    )
+    fig_mix.update_layout(height=400)
+    
+    rate_columns = ['AVG_SENTIMENT', 'SENTIMENT_STDDEV', 'RESOLUTION_RATE', 'ESCALATION_RATE', 'SATISFACTION_RATE']
+    rates = trend[['CALL_DATE', 'CALLS'] + rate_columns].round(dict.fromkeys(rate_columns, 2))
+    rates.columns = ['Period', 'Calls', 'Avg Sentiment', 'Sentiment Std Dev', 'Resolution Rate',
+                     'Escalation Rate', 'Satisfaction Rate']
+    
+    return {
+        'sentiment_figure': fig_sentiment.to_dict(),
+        'mix_figure': fig_mix.to_dict(),
+        'rates': rates.sort_values('Period', ascending=False)
+    }
+
+
+def show_agent_trends(cube):
+    """Agent performance over time (rollup cube only - no call scan); returns the agents as export filters"""
+    st.markdown("## 📈 Agent Performance Trends")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        busiest = cached_view('agent_ranking', lambda: cube.slice(['AGENT_NAME']).sort_values(
+            'CALLS', ascending=False)['AGENT_NAME'].tolist(), cube)
+        agents = st.multiselect("Agents", options=sorted(busiest), default=busiest[:5])
+    with col2:
+        grain = TREND_GRAINS[st.selectbox("Time bucket", list(TREND_GRAINS), index=1)]
+    
+    view = cached_view(
+        'agent_trends',
+        lambda: build_agent_trend_view(cube, agents, grain),
+        cube,
+        agents=tuple(sorted(agents)), grain=grain
+    )
+    
+    st.plotly_chart(view['performance_figure'], use_container_width=True)
+    st.plotly_chart(view['volume_figure'], use_container_width=True)
+    
+    st.markdown("### 📋 Agent Summary (selected period)")
+    st.dataframe(view['summary'], use_container_width=True, hide_index=True)
+    
+    return (('in', 'AGENT_NAME', tuple(sorted(agents))),)
+
+
+def show_sentiment_trends(cube):
+    """Sentiment over time (rollup cube only - no call scan); returns intents/regions as export filters"""
+    st.markdown("## 📉 Sentiment Trends")
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        intents = st.multiselect("Intent", options=cube.values('PRIMARY_INTENT'))
+    with col2:
+        regions = st.multiselect("Region", options=cube.values('REGION'))
+    with col3:
+        grain = TREND_GRAINS[st.selectbox("Time bucket", list(TREND_GRAINS), index=1)]
+    
+    view = cached_view(
+        'sentiment_trends',
+        lambda: build_sentiment_trend_view(cube, intents, regions, grain),
+        cube,
+        intents=tuple(sorted(intents)), regions=tuple(sorted(regions)), grain=grain
+    )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(view['sentiment_figure'], use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(view['mix_figure'], use_container_width=True)
+    
+    st.markdown("### 📋 Rates by Period")
+    st.dataframe(view['rates'], use_container_width=True, hide_index=True)
+    
+    return (('in', 'PRIMARY_INTENT', tuple(sorted(intents))), ('in', 'REGION', tuple(sorted(regions))))
@@ -0,0 +1,484 @@
+# Frame Adapter for the Call Center Analytics Dashboard
+# Arrow-first data access with an optional Polars compute backend
+# Page functions work on FrameAdapter; pandas is only produced for charts and tables
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional - fall back to Arrow compute kernels
+    pl = None
+
+
+# Preferred compute backend: "polars" when installed, otherwise "arrow"
+DEFAULT_BACKEND = "polars" if pl is not None else "arrow"
+
+# Per-thread (= per Streamlit session script run) time spent converting between
+# pandas, Arrow and Polars - read by the telemetry panel
+_conversion = threading.local()
+
+
+@contextmanager
+def _timed_conversion():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _conversion.seconds = getattr(_conversion, "seconds", 0.0) + time.perf_counter() - start
+
+
+def pop_conversion_seconds():
+    """Return and reset the conversion time accumulated on the current thread"""
+    seconds = getattr(_conversion, "seconds", 0.0)
+    _conversion.seconds = 0.0
+    return seconds
+
+
+# ============================================
+# ARROW FETCH
+# ============================================
+
+def fetch_arrow(session, query, stats=None, query_tag=None):
+    """
+    Run a query and return the result as a pyarrow Table built from Arrow record batches.
+    If a stats dict is passed it is filled with query_id, rows, bytes,
+    execute_seconds (Snowflake) and fetch_seconds (result download).
+    query_tag is set for this statement only (the session's own tag is shared).
+    """
+    cursor = session.connection.cursor()
+    try:
+        start = time.perf_counter()
+        cursor.execute(query, _statement_params={"QUERY_TAG": query_tag} if query_tag else None)
+        executed = time.perf_counter()
+        # fetch_arrow_all() concatenates the result batches and unifies their schemas
+        table = cursor.fetch_arrow_all()
+        fetched = time.perf_counter()
+        query_id = cursor.sfqid or ""
+    finally:
+        cursor.close()
+
+    if table is not None:
+        # Stamp the query ID so the dataset version travels with the table
+        table = table.replace_schema_metadata({"query_id": query_id})
+    else:
+        # Empty result sets carry no Arrow batches, so take the schema from Snowpark
+        table = pa.Table.from_pandas(session.sql(query).limit(0).to_pandas(), preserve_index=False)
+
+    if stats is not None:
+        stats.update({
+            "query_id": query_id,
+            "rows": table.num_rows,
+            "bytes": table.nbytes,
+            "execute_seconds": executed - start,
+            "fetch_seconds": fetched - executed,
+        })
+    return table
+
+
+def data_version(table):
+    """
+    Version tag for a loaded table: its query ID, or a fingerprint of its schema
+    and content for locally built data (rollup cells, feed rows - small tables),
+    so equal data gets the same version and different data never shares one.
+    """
+    metadata = getattr(getattr(table, "schema", None), "metadata", None) or {}
+    query_id = metadata.get(b"query_id")
+    if query_id:
+        return query_id.decode()
+    return f"local-{_fingerprint(table)}"
+
+
+def _fingerprint(table):
+    """128-bit hash of a table's Arrow IPC stream (schema + every column buffer)"""
+    if isinstance(table, pd.DataFrame):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+    elif pl is not None and isinstance(table, pl.DataFrame):
+        table = table.to_arrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.blake2b(sink.getvalue(), digest_size=16).hexdigest()
+
+
+# ============================================
+# FRAME ADAPTER
+# ============================================
+
+class FrameAdapter:
+    """
+    Thin adapter over a Polars DataFrame or pyarrow Table used by the page functions.
+
+    Filters, joins and head() are lazy: they return a new adapter that is only
+    evaluated when its data is first needed. Each adapter carries a `key` - the
+    dataset version plus the chain of operations applied to it - which the view
+    model cache uses to recognise a repeated filter combination without computing it.
+
+    Frames handed out by a FrameStore filter by mask: a filtered frame is the
+    shared base plus a boolean row mask (itself shared through the store), and
+    its rows are only copied out if a page actually reads them.
+    """
+
+    def __init__(self, data, backend=None, key=None, store=None, base=None, mask=None):
+        self.backend = resolve_backend(backend)
+        self.key = key
+        self.store = store
+        self._base = base    # selection frames: the store's base frame ...
+        self._mask = mask    # ... and a callable returning the row mask over it
+        self._source = data
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            data = self._source
+            if callable(data):
+                data = data()
+            if isinstance(data, FrameAdapter):
+                data = data.data
+            with _timed_conversion():
+                if isinstance(data, pd.DataFrame):
+                    data = pa.Table.from_pandas(data, preserve_index=False)
+                elif pl is not None and isinstance(data, pl.DataFrame) and self.backend == "arrow":
+                    data = data.to_arrow()
+                if self.backend == "polars" and isinstance(data, pa.Table):
+                    data = pl.from_arrow(data)
+            self._data, self._source = data, None
+        return self._data
+
+    def _derive(self, step, compute):
+        """New lazy adapter computing compute(self.data), keyed by self.key + step"""
+        key = None if self.key is None else self.key + (step,)
+        return FrameAdapter(lambda: compute(self.data), backend=self.backend, key=key)
+
+    def _project(self, columns):
+        """Data restricted to columns - a selection copies only these columns out of the shared base"""
+        columns = list(dict.fromkeys(columns))
+        if self._data is None and self._mask is not None:
+            return self._base.data.select(columns).filter(self._mask())
+        return self.data.select(columns)
+
+    @property
+    def columns(self):
+        data = self._base.data if self._data is None and self._mask is not None else self.data
+        return list(data.columns) if self.backend == "polars" else data.column_names
+
+    def __len__(self):
+        if self._data is None and self._mask is not None:
+            # Selection: count the mask instead of copying the rows out
+            mask = self._mask()
+            return int(mask.sum() or 0) if self.backend == "polars" else pc.sum(mask).as_py() or 0
+        return self.data.height if self.backend == "polars" else self.data.num_rows
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    # ---------- filters ----------
+
+    def _where(self, step, condition):
+        """
+        Rows where condition(data) holds (a Polars expression or Arrow boolean array).
+        Store frames and their selections only combine row masks; other frames filter.
+        """
+        if self.store is None:
+            return self._derive(step, lambda data: data.filter(condition(data)))
+
+        base = self._base if self._base is not None else self
+        parent_mask = self._mask
+        key = self.key + (step,)
+
+        def compute_mask():
+            data = base.data
+            mask = condition(data)
+            if self.backend == "polars":
+                mask = data.select(mask).to_series()
+                return mask if parent_mask is None else mask & parent_mask()
+            return mask if parent_mask is None else pc.and_kleene(parent_mask(), mask)
+
+        def mask():
+            return self.store.mask(key, self.backend, compute_mask)
+
+        return FrameAdapter(lambda: base.data.filter(mask()), backend=self.backend, key=key,
+                            store=self.store, base=base, mask=mask)
+
+    def where_equals(self, column, value):
+        """Rows where column == value"""
+        def condition(data):
+            if self.backend == "polars":
+                return pl.col(column) == value
+            return pc.equal(data[column], value)
+        return self._where(("equals", column, value), condition)
+
+    def where_any_equals(self, conditions):
+        """Rows matching any of the (column, value) conditions"""
+        conditions = tuple(conditions)
+
+        def condition(data):
+            if self.backend == "polars":
+                return pl.any_horizontal([pl.col(column) == value for column, value in conditions])
+            mask = None
+            for column, value in conditions:
+                matches = pc.equal(data[column], value)
+                mask = matches if mask is None else pc.or_kleene(mask, matches)
+            return mask
+        return self._where(("any_equals", conditions), condition)
+
+    def where_in(self, column, values):
+        """Rows where column is one of values"""
+        values = tuple(sorted(values))
+
+        def condition(data):
+            if self.backend == "polars":
+                return pl.col(column).is_in(list(values))
+            value_set = pa.array(values, type=data.schema.field(column).type)
+            return pc.is_in(data[column], value_set=value_set)
+        return self._where(("in", column, values), condition)
+
+    def where_contains(self, column, term):
+        """Rows where column contains term (literal, case-insensitive)"""
+        def condition(data):
+            if self.backend == "polars":
+                return pl.col(column).str.contains("(?i)" + re.escape(term))
+            return pc.match_substring(data[column], term, ignore_case=True)
+        return self._where(("contains", column, term.lower()), condition)
+
+    def head(self, n):
+        if self._mask is not None:
+            # Selection: gather the first n matching rows, never the whole filtered frame
+            base, mask = self._base, self._mask
+
+            def take_first():
+                if self.backend == "polars":
+                    return base.data[mask().arg_true().head(n)]
+                # One chunk: indices_nonzero crashes on a chunked mask with no chunks (empty base)
+                flags = pc.fill_null(mask(), False)
+                if isinstance(flags, pa.ChunkedArray):
+                    flags = flags.combine_chunks()
+                return base.data.take(pc.indices_nonzero(flags).slice(0, n))
+            return FrameAdapter(take_first, backend=self.backend, key=self.key + (("head", n),))
+
+        def compute(data):
+            return data.head(n) if self.backend == "polars" else data.slice(0, n)
+        return self._derive(("head", n), compute)
+
+    # ---------- scalar aggregates ----------
+
+    def mean(self, column):
+        data = self._project([column])
+        if self.backend == "polars":
+            return data.get_column(column).mean()
+        return pc.mean(data[column]).as_py()
+
+    def count_equal(self, column, value):
+        """Number of rows where column == value"""
+        data = self._project([column])
+        if self.backend == "polars":
+            return int((data.get_column(column) == value).sum() or 0)
+        matches = pc.cast(pc.equal(data[column], value), pa.int64())
+        return pc.sum(matches).as_py() or 0
+
+    def has_values(self, column):
+        """True if column exists and holds at least one non-null value"""
+        if column not in self.columns:
+            return False
+        data = self._project([column])
+        if self.backend == "polars":
+            return data.get_column(column).null_count() < data.height
+        return data[column].null_count < data.num_rows
+
+    def unique(self, column):
+        """Distinct non-null values of column as a Python list"""
+        data = self._project([column])
+        if self.backend == "polars":
+            return data.get_column(column).drop_nulls().unique().to_list()
+        return pc.unique(pc.drop_null(data[column])).to_pylist()
+
+    # ---------- chart boundary (returns pandas) ----------
+
+    def value_counts(self, column):
+        """pandas Series of value counts for column, largest first"""
+        data = self._project([column])
+        if self.backend == "polars":
+            counts = data.get_column(column).drop_nulls().value_counts(sort=True)
+            values, totals = counts.columns
+            return pd.Series(counts.get_column(totals).to_list(),
+                             index=counts.get_column(values).to_list(), name=column)
+        counts = pc.value_counts(pc.drop_null(data[column]))
+        series = pd.Series(counts.field("counts").to_pylist(),
+                           index=counts.field("values").to_pylist(), name=column)
+        return series.sort_values(ascending=False)
+
+    def group_summary(self, by, aggregations):
+        """
+        Group by a key column (null keys dropped, keys sorted) and aggregate.
+        aggregations: list of (output_name, column, how[, value]) where how is
+        'count', 'mean', 'sum' or 'count_equal' (rows where column == value).
+        Returns a small pandas DataFrame ready for charts/tables.
+        """
+        data = self._project([by] + [aggregation[1] for aggregation in aggregations])
+        if self.backend == "polars":
+            exprs = []
+            for output_name, column, how, *value in aggregations:
+                col = pl.col(column)
+                if how == "count_equal":
+                    expr = (col == value[0]).sum()
+                else:
+                    expr = getattr(col, how)()
+                exprs.append(expr.alias(output_name))
+            result = data.filter(pl.col(by).is_not_null()).group_by(by).agg(exprs).sort(by)
+            with _timed_conversion():
+                return result.to_pandas()
+
+        table = data.filter(pc.is_valid(data[by]))
+        columns = {by: table[by]}
+        aggs, names = [], {}
+        for i, (output_name, column, how, *value) in enumerate(aggregations):
+            key = f"agg_{i}"
+            if how == "count_equal":
+                columns[key] = pc.fill_null(pc.cast(pc.equal(table[column], value[0]), pa.int64()), 0)
+                how = "sum"
+            else:
+                columns[key] = table[column]
+            aggs.append((key, how))
+            names[f"{key}_{how}"] = output_name
+        result = pa.table(columns).group_by(by).aggregate(aggs).sort_by(by)
+        result = result.rename_columns([names.get(name, name) for name in result.column_names])
+        result = result.select([by] + [agg[0] for agg in aggregations])
+        with _timed_conversion():
+            return result.to_pandas()
+
+    def to_pandas(self):
+        data = self.data
+        with _timed_conversion():
+            return data.to_pandas()
+
+    def rows(self):
+        """Rows as a list of dicts - only call on small (head-limited) frames"""
+        if self.backend == "polars":
+            return list(self.data.iter_rows(named=True))
+        return self.data.to_pylist()
+
+    # ---------- joins ----------
+
+    def left_join(self, other, on, columns=None):
+        """Left join other (optionally restricted to columns) on a key column"""
+        other = as_frame(other, backend=self.backend)
+        columns = None if columns is None else tuple(columns)
+
+        def compute(data):
+            right = other.data
+            if columns is not None:
+                right = right.select(list(columns))
+            if self.backend == "polars":
+                return data.join(right, on=on, how="left")
+            return data.join(right, keys=on, join_type="left outer")
+        step = ("left_join", other.key, on, columns) if other.key is not None else None
+        if step is None:
+            return FrameAdapter(lambda: compute(self.data), backend=self.backend)
+        return self._derive(step, compute)
+
+
+def resolve_backend(backend=None):
+    """The compute backend to use: backend or DEFAULT_BACKEND, arrow when Polars is missing"""
+    backend = backend or DEFAULT_BACKEND
+    return "arrow" if backend == "polars" and pl is None else backend
+
+
+# ============================================
+# SHARED FRAME STORE
+# ============================================
+
+class FrameStore:
+    """
+    Read-only base datasets and the row masks of their filters, shared by every
+    session of the app process (keep one in st.cache_resource). Each dataset is
+    converted to the compute backend once per data version; a session's filtered
+    frame is a view - the shared base plus a shared mask of one bit per row -
+    so per-session memory stays at the size of the masks, not of the data.
+    """
+
+    def __init__(self, max_masks=256):
+        self.max_masks = max_masks
+        self._bases = {}            # (name, backend) -> (version, data)
+        self._masks = OrderedDict()  # (backend, frame key) -> mask
+        self._lock = threading.Lock()
+        self._convert_lock = threading.Lock()
+        self.conversions = 0
+        self.mask_hits = 0
+        self.mask_misses = 0
+
+    def frame(self, name, data, backend=None):
+        """
+        Store frame for dataset name. data is the loader result (pyarrow Table);
+        a new data version replaces the previous base, releasing it.
+        """
+        backend = resolve_backend(backend)
+        version = data_version(data)
+        # Convert under the lock: sessions arriving together wait for one conversion
+        with self._convert_lock:
+            entry = self._bases.get((name, backend))
+            if entry is None or entry[0] != version:
+                converted = FrameAdapter(data, backend=backend).data
+                with self._lock:
+                    if entry is not None:
+                        stale = (name, entry[0])
+                        for mask_key in [k for k in self._masks if k[1][:2] == stale]:
+                            del self._masks[mask_key]
+                    self._bases[(name, backend)] = entry = (version, converted)
+                    self.conversions += 1
+        return FrameAdapter(entry[1], backend=backend, key=(name, version), store=self)
+
+    def mask(self, key, backend, compute):
+        """The shared row mask for a filtered frame key, computed on first use"""
+        with self._lock:
+            mask = self._masks.get((backend, key))
+            if mask is not None:
+                self._masks.move_to_end((backend, key))
+                self.mask_hits += 1
+                return mask
+            self.mask_misses += 1
+        mask = compute()
+        with self._lock:
+            self._masks[(backend, key)] = mask
+            while len(self._masks) > self.max_masks:
+                self._masks.popitem(last=False)
+        return mask
+
+    def stats(self):
+        with self._lock:
+            return {
+                "datasets": len(self._bases),
+                "dataset_bytes": sum(_nbytes(data) for _, data in self._bases.values()),
+                "masks": len(self._masks),
+                "mask_bytes": sum(_nbytes(mask) for mask in self._masks.values()),
+                "conversions": self.conversions,
+                "mask_hits": self.mask_hits,
+                "mask_misses": self.mask_misses,
+            }
+
+
+def _nbytes(data):
+    """Memory held by a Polars frame/series or Arrow table/array"""
+    return int(data.estimated_size()) if hasattr(data, "estimated_size") else int(data.nbytes)
+
+
+def as_frame(data, backend=None, name=None):
+    """
+    Wrap a pyarrow Table, Polars DataFrame, pandas DataFrame or FrameAdapter.
+    Passing a dataset name keys the frame by (name, data version) for view caching.
+    """
+    if isinstance(data, FrameAdapter) and (backend is None or data.backend == backend):
+        return data
+    if isinstance(data, FrameAdapter):
+        return FrameAdapter(data, backend=backend, key=data.key)
+    key = (name, data_version(data)) if name is not None else None
+    return FrameAdapter(data, backend=backend, key=key)
@@ -0,0 +1,187 @@
+# In-Process Name Resolver for the Call Center Analytics Dashboard
+# Fuzzy matching of customer / agent names without a warehouse round trip:
+# a trigram index finds names sharing fragments of the query (partial names,
+# reordered tokens) and first/last names within a few edits (typos) - the
+# trigram count filter shortlists tokens, a Levenshtein check confirms them -
+# and candidates are ranked by a blend of both similarities.
+# Pure Python, so the same resolver serves the app and the scripts/ tools.
+
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict, namedtuple
+
+
+Candidate = namedtuple("Candidate", ["name", "score", "distance"])
+
+
+def normalize(name):
+    """Lower-case, accents stripped, punctuation removed, whitespace collapsed"""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join(ch if ch.isalnum() else " " for ch in text.lower())
+    return " ".join(text.split())
+
+
+def trigrams(text):
+    """Trigrams of each token, padded so word starts/ends count ('  a', ' ab', ... 'yz ')"""
+    grams = set()
+    for token in text.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def levenshtein(a, b):
+    """
+    Edit distance with the bit-parallel algorithm of Myers/Hyyro: one pass over
+    b with a handful of integer operations per character (names are short)
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    match_masks = {}
+    for i, char in enumerate(b):
+        match_masks[char] = match_masks.get(char, 0) | (1 << i)
+    mask = (1 << len(b)) - 1
+    high = 1 << (len(b) - 1)
+    positive, negative, score = mask, 0, len(b)
+    for char in a:
+        eq = match_masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_pos = negative | (~(xh | positive) & mask)
+        horizontal_neg = positive & xh
+        if horizontal_pos & high:
+            score += 1
+        elif horizontal_neg & high:
+            score -= 1
+        horizontal_pos = ((horizontal_pos << 1) | 1) & mask
+        horizontal_neg = (horizontal_neg << 1) & mask
+        positive = horizontal_neg | (~(xv | horizontal_pos) & mask)
+        negative = horizontal_pos & xv
+    return score
+
+
+class NameResolver:
+    """
+    Ranked fuzzy lookup over a fixed set of names. Immutable once built (safe to
+    share across sessions); recent results are kept in a small LRU.
+    """
+
+    def __init__(self, names, cache_size=1024):
+        self._display = {}  # normalized -> original spelling
+        for name in names:
+            if name is not None and str(name).strip():
+                self._display.setdefault(normalize(name), str(name))
+        self._grams = {key: trigrams(key) for key in self._display}
+        self._tokens = {key: key.split() for key in self._display}
+        self._gram_index = defaultdict(set)   # trigram -> names
+        self._token_index = defaultdict(set)  # token -> names
+        for key in self._display:
+            for gram in self._grams[key]:
+                self._gram_index[gram].add(key)
+            for token in self._tokens[key]:
+                self._token_index[token].add(key)
+        self._token_gram_index = defaultdict(set)  # trigram -> tokens
+        for token in self._token_index:
+            for gram in trigrams(token):
+                self._token_gram_index[gram].add(token)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._display)
+
+    def _token_matches(self, token):
+        """{name token: similarity} for tokens within a few edits of token, or that it prefixes"""
+        max_edits = 1 if len(token) <= 7 else 2
+        grams = trigrams(token)
+        # q-gram lemma: one edit changes at most 3 trigrams, so a token within
+        # max_edits keeps at least len(grams) - 3 * max_edits of the query trigrams
+        needed = len(grams) - 3 * max_edits
+        if needed > 0:
+            counts = defaultdict(int)
+            for gram in grams:
+                for candidate in self._token_gram_index.get(gram, ()):
+                    counts[candidate] += 1
+            shortlist = [candidate for candidate, count in counts.items() if count >= needed]
+        else:  # very short token: the count filter cannot prune, fall back to length
+            shortlist = [candidate for candidate in self._token_index
+                         if abs(len(candidate) - len(token)) <= max_edits]
+        matches = {}
+        for candidate in shortlist:
+            distance = levenshtein(token, candidate)
+            if distance <= max_edits:
+                matches[candidate] = 1 - distance / max(len(token), len(candidate))
+        if len(token) >= 2:
+            for candidate in self._token_index:
+                if candidate.startswith(token) and candidate != token:
+                    matches[candidate] = max(matches.get(candidate, 0.0), 0.9)  # "alex" -> "alexander"
+        return matches
+
+    def resolve(self, query, limit=5, min_score=0.35):
+        """
+        Best matching names for query as Candidate(name, score, distance),
+        highest score first. An exact (normalized) match scores 1.0; otherwise
+        the score blends token similarity (typos, prefixes, any order), how
+        much of the query's trigrams the name contains, and trigram Dice.
+        """
+        key = normalize(query)
+        if not key:
+            return []
+        cache_key = (key, limit, min_score)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        result = self._resolve(key, limit, min_score)
+        with self._lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _resolve(self, key, limit, min_score):
+        exact = [Candidate(self._display[key], 1.0, 0)] if key in self._display else []
+        if exact and limit == 1:
+            return exact
+
+        query_grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._gram_index.get(gram, ()):
+                shared[candidate] += 1
+        token_matches = [self._token_matches(token) for token in key.split()]
+
+        # Shortlist: names holding a matching token, plus the best trigram overlaps
+        shortlist = set(sorted(shared, key=shared.get, reverse=True)[:limit * 4])
+        for matches in token_matches:
+            for token in matches:
+                shortlist.update(self._token_index[token])
+        shortlist.discard(key)
+
+        ranked = []
+        for candidate in shortlist:
+            tokens = self._tokens[candidate]
+            token_score = sum(
+                max((matches.get(token, 0.0) for token in tokens), default=0.0) for matches in token_matches
+            ) / len(token_matches)
+            overlap = shared.get(candidate, 0)
+            containment = overlap / len(query_grams)
+            dice = 2 * overlap / (len(query_grams) + len(self._grams[candidate]))
+            score = round(0.5 * token_score + 0.3 * containment + 0.2 * dice, 4)
+            if score >= min_score:
+                ranked.append((min(score, 0.9999), candidate))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return exact + [
+            Candidate(self._display[candidate], score, levenshtein(key, candidate))
+            for score, candidate in ranked[:limit - len(exact)]
+        ]
+
+    def best(self, query, min_score=0.6):
+        """Single best name, or None when nothing is close enough"""
+        candidates = self.resolve(query, limit=1, min_score=min_score)
+        return candidates[0].name if candidates else None
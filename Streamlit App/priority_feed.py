@@ -0,0 +1,182 @@
+# Priority Feed for the Call Center Analytics Dashboard
+# Scores every call for supervisor attention and keeps only the top K, the
+# local counterpart of the CALL_PRIORITY_SCORES dynamic table (sql/02). The
+# score adds escalation, negative sentiment, urgency and customer lifetime value
+# and subtracts AGE_POINTS_PER_DAY per day of age. Because the age penalty is
+# linear, it is stored as a bonus for newer calls (PRIORITY_KEY grows with the
+# call time), so the ranking never has to be recomputed as time passes: new
+# calls are pushed through a bounded heap of K and older keys stay valid.
+#
+# Keep the weights in sync with the CALL_PRIORITY_SCORES query.
+
+import heapq
+import threading
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from frame_adapter import data_version
+
+
+ESCALATION_POINTS = 40
+SENTIMENT_POINTS = 15           # per unit below +1: -1.0 sentiment -> 30 points
+URGENCY_POINTS = {'high': 20, 'medium': 10, 'low': 0}
+VALUE_POINTS = 10               # at or above VALUE_CAP lifetime value
+VALUE_CAP = 10000.0
+AGE_POINTS_PER_DAY = 1.0
+
+FEED_SIZE = 50                  # K: calls kept in memory, pages beyond come from the server
+
+FEED_COLUMNS = [
+    'CALL_ID', 'CUSTOMER_NAME', 'AGENT_NAME', 'PRIMARY_INTENT', 'SENTIMENT_CATEGORY',
+    'SENTIMENT_SCORE', 'URGENCY_LEVEL', 'ESCALATION_REQUIRED', 'LIFETIME_VALUE',
+    'CALL_SUMMARY', 'ANALYSIS_TIMESTAMP', 'PRIORITY_KEY',
+]
+
+_DAY_MS = 86400 * 1000
+
+
+def _epoch_days(column):
+    """ANALYSIS_TIMESTAMP (timestamp or ISO string) -> fractional days since 1970-01-01"""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.cast(column, pa.timestamp('ms', tz='UTC'))
+    column = pc.cast(column, pa.timestamp('ms', tz=column.type.tz))
+    return pc.divide(pc.cast(column, pa.int64()), float(_DAY_MS))
+
+
+def score_calls(calls, profiles=None):
+    """
+    FEED_COLUMNS for call rows (pyarrow Table) - the local equivalent of the
+    CALL_PRIORITY_SCORES query. LIFETIME_VALUE comes from the profiles (0 without one).
+    """
+    if profiles is not None and 'LIFETIME_VALUE' in profiles.column_names:
+        values = profiles.select(['CUSTOMER_NAME', 'LIFETIME_VALUE'])
+        calls = calls.join(values, keys='CUSTOMER_NAME', join_type='left outer')
+    else:
+        calls = calls.append_column('LIFETIME_VALUE', pa.nulls(len(calls), pa.float64()))
+
+    sentiment = pc.fill_null(pc.cast(calls['SENTIMENT_SCORE'], pa.float64()), 0.0)
+    lifetime_value = pc.cast(calls['LIFETIME_VALUE'], pa.float64())
+    levels = pc.index_in(calls['URGENCY_LEVEL'], value_set=pa.array(list(URGENCY_POINTS)))
+    points = pa.array(list(URGENCY_POINTS.values()) + [0], pa.float64())
+    urgency_points = pc.take(points, pc.fill_null(levels, len(URGENCY_POINTS)))
+
+    key = pc.multiply(pc.fill_null(pc.cast(pc.equal(calls['ESCALATION_REQUIRED'], 'yes'), pa.float64()), 0.0),
+                      float(ESCALATION_POINTS))
+    key = pc.add(key, pc.multiply(pc.subtract(1.0, sentiment), float(SENTIMENT_POINTS)))
+    key = pc.add(key, urgency_points)
+    key = pc.add(key, pc.multiply(pc.min_element_wise(pc.divide(pc.fill_null(lifetime_value, 0.0), VALUE_CAP), 1.0),
+                                  float(VALUE_POINTS)))
+    key = pc.add(key, pc.multiply(_epoch_days(calls['ANALYSIS_TIMESTAMP']), AGE_POINTS_PER_DAY))
+
+    columns = {name: calls[name] for name in FEED_COLUMNS if name not in ('LIFETIME_VALUE', 'CALL_SUMMARY', 'PRIORITY_KEY')}
+    columns['LIFETIME_VALUE'] = lifetime_value
+    columns['CALL_SUMMARY'] = pc.utf8_slice_codeunits(pc.cast(calls['CALL_SUMMARY'], pa.string()), 0, 200)
+    columns['PRIORITY_KEY'] = key
+    return pa.table({name: columns[name] for name in FEED_COLUMNS})
+
+
+def top_k(scored, k):
+    """The k highest PRIORITY_KEY rows of scored, highest first"""
+    if scored.num_rows > k:
+        scored = scored.take(pc.select_k_unstable(scored, k, [('PRIORITY_KEY', 'descending')]))
+    return scored.sort_by([('PRIORITY_KEY', 'descending'), ('CALL_ID', 'ascending')])
+
+
+class PriorityFeed:
+    """
+    Immutable top-K priority calls (pyarrow Table with FEED_COLUMNS, highest
+    key first) plus the watermark: the newest ANALYSIS_TIMESTAMP already
+    considered. Carries a `key` like RollupCube for view caching.
+    """
+
+    def __init__(self, rows, k=FEED_SIZE, watermark=None, key=None, filters=()):
+        self.rows = rows
+        self.k = k
+        self.watermark = watermark
+        self.filters = filters
+        self.key = key if key is not None else ('priority', data_version(rows), watermark)
+
+    def __len__(self):
+        return self.rows.num_rows
+
+    def extend(self, scored):
+        """
+        New feed with freshly scored calls pushed through a bounded heap of k -
+        O(delta log k), never a rescan. A re-scored call replaces its old row.
+        """
+        if scored.num_rows == 0:
+            return self
+        # Drop the query ID stamped on the loaded rows: the extended feed is a new data version
+        schema = self.rows.schema.remove_metadata()
+        scored = scored.select(FEED_COLUMNS).cast(schema)
+        kept = self.rows.filter(pc.invert(pc.is_in(self.rows['CALL_ID'], value_set=scored['CALL_ID']))).cast(schema)
+        combined = pa.concat_tables([kept, top_k(scored, self.k)])
+
+        keys = combined['PRIORITY_KEY'].to_pylist()
+        heap = []
+        for index, value in enumerate(keys):
+            if value is None:
+                continue
+            if len(heap) < self.k:
+                heapq.heappush(heap, (value, index))
+            elif value > heap[0][0]:
+                heapq.heapreplace(heap, (value, index))
+        rows = combined.take([index for _, index in heap])
+        rows = rows.sort_by([('PRIORITY_KEY', 'descending'), ('CALL_ID', 'ascending')])
+
+        newest = pc.max(scored['ANALYSIS_TIMESTAMP']).as_py()
+        watermark = newest if self.watermark is None or (newest is not None and newest > self.watermark) else self.watermark
+        return PriorityFeed(rows, self.k, watermark, filters=self.filters)
+
+    def where_in(self, column, values):
+        """Feed restricted to rows whose column value is in values (also applied to server pages)"""
+        mask = pc.is_in(self.rows[column], value_set=pa.array(list(values), self.rows[column].type))
+        filters = self.filters + ((column, tuple(sorted(values))),)
+        return PriorityFeed(self.rows.filter(mask), self.k, self.watermark,
+                            key=self.key + (('where_in',) + filters[-1],), filters=filters)
+
+    def reference_days(self):
+        """Age origin: the watermark in epoch days (the newest call has age 0)"""
+        if self.watermark is None or len(self) == 0:
+            return 0.0
+        return _epoch_days(pa.array([self.watermark]))[0].as_py()
+
+    def page(self, number, size=10):
+        """
+        Rows of page `number` (0-based) as dicts with PRIORITY_SCORE, or None when
+        the page reaches past the rows held (the caller fetches it from the server).
+        The rows held are an exact prefix of the (filtered) ranking: any call not
+        in the top k ranks below all of them.
+        """
+        start = number * size
+        if start + size > len(self):
+            return None
+        return scored_rows(self.rows.slice(start, size), self.reference_days())
+
+
+class LiveFeed:
+    """
+    Process-wide holder of the current feed. refresh() extends it with the calls
+    scored after its watermark and keeps the result, so the watermark advances
+    and each delta query only covers calls landed since the previous refresh.
+    """
+
+    def __init__(self, feed):
+        self.feed = feed
+        self._lock = threading.Lock()
+
+    def refresh(self, load_new_rows):
+        """Current feed after adding load_new_rows(watermark) (a scored pyarrow Table)"""
+        with self._lock:
+            if self.feed.watermark is not None:
+                self.feed = self.feed.extend(load_new_rows(self.feed.watermark))
+            return self.feed
+
+
+def scored_rows(rows, reference_days):
+    """Row dicts with PRIORITY_SCORE = key minus the age penalty up to reference_days"""
+    result = rows.to_pylist()
+    for row in result:
+        row['PRIORITY_SCORE'] = round(row['PRIORITY_KEY'] - reference_days * AGE_POINTS_PER_DAY, 1)
+    return result
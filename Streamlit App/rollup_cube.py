@@ -0,0 +1,143 @@
+# Rollup Cube for the Call Center Analytics Dashboard
+# Daily buckets of counts, sums and sums of squares per agent / intent /
+# sentiment category / region - the same cells as the CALL_ROLLUP_DAILY dynamic
+# table (sql/02). Trend pages slice the cube instead of scanning calls, so their
+# cost follows the number of buckets, not the number of calls. Means and
+# standard deviations are derived from the additive measures, which is also what
+# makes the cube mergeable: a delta of new calls is rolled up on its own and
+# added cell by cell.
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from frame_adapter import data_version
+
+
+DIMENSIONS = ['CALL_DATE', 'AGENT_NAME', 'PRIMARY_INTENT', 'SENTIMENT_CATEGORY', 'REGION']
+
+# Additive measures only (sum of sums is the sum of the merged buckets)
+MEASURES = [
+    'CALLS',
+    'SENTIMENT_COUNT', 'SENTIMENT_SUM', 'SENTIMENT_SUM_SQ',
+    'PERFORMANCE_COUNT', 'PERFORMANCE_SUM', 'PERFORMANCE_SUM_SQ',
+    'RESOLVED_CALLS', 'ESCALATED_CALLS', 'SATISFIED_CALLS',
+]
+
+
+def _call_dates(column):
+    """ANALYSIS_TIMESTAMP (timestamp or ISO string) -> date32"""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.utf8_slice_codeunits(column, 0, 10)
+    return pc.cast(column, pa.date32())
+
+
+def _flag(column, value):
+    return pc.fill_null(pc.cast(pc.equal(column, value), pa.int64()), 0)
+
+
+def build_cells(calls, profiles=None):
+    """
+    Roll call rows (pyarrow Table) up to cube cells - the local equivalent of the
+    CALL_ROLLUP_DAILY query. REGION comes from the profiles, null without one.
+    """
+    if profiles is not None and 'REGION' in profiles.column_names:
+        regions = profiles.select(['CUSTOMER_NAME', 'REGION'])
+        calls = calls.join(regions, keys='CUSTOMER_NAME', join_type='left outer')
+    else:
+        calls = calls.append_column('REGION', pa.nulls(len(calls), pa.string()))
+
+    sentiment = pc.cast(calls['SENTIMENT_SCORE'], pa.float64())
+    performance = pc.cast(calls['AGENT_PERFORMANCE_SCORE'], pa.float64())
+    table = pa.table({
+        'CALL_DATE': _call_dates(calls['ANALYSIS_TIMESTAMP']),
+        'AGENT_NAME': calls['AGENT_NAME'],
+        'PRIMARY_INTENT': calls['PRIMARY_INTENT'],
+        'SENTIMENT_CATEGORY': calls['SENTIMENT_CATEGORY'],
+        'REGION': pc.cast(calls['REGION'], pa.string()),
+        'CALL_ID': calls['CALL_ID'],
+        'SENTIMENT': sentiment,
+        'SENTIMENT_SQ': pc.multiply(sentiment, sentiment),
+        'PERFORMANCE': performance,
+        'PERFORMANCE_SQ': pc.multiply(performance, performance),
+        'RESOLVED': _flag(calls['ISSUE_RESOLVED'], 'yes'),
+        'ESCALATED': _flag(calls['ESCALATION_REQUIRED'], 'yes'),
+        'SATISFIED': _flag(calls['CUSTOMER_SATISFACTION'], 'satisfied'),
+    })
+    cells = table.group_by(DIMENSIONS).aggregate([
+        ('CALL_ID', 'count', pc.CountOptions(mode='all')),
+        ('SENTIMENT', 'count'), ('SENTIMENT', 'sum'), ('SENTIMENT_SQ', 'sum'),
+        ('PERFORMANCE', 'count'), ('PERFORMANCE', 'sum'), ('PERFORMANCE_SQ', 'sum'),
+        ('RESOLVED', 'sum'), ('ESCALATED', 'sum'), ('SATISFIED', 'sum'),
+    ])
+    return cells.select(DIMENSIONS + [
+        'CALL_ID_count', 'SENTIMENT_count', 'SENTIMENT_sum', 'SENTIMENT_SQ_sum',
+        'PERFORMANCE_count', 'PERFORMANCE_sum', 'PERFORMANCE_SQ_sum',
+        'RESOLVED_sum', 'ESCALATED_sum', 'SATISFIED_sum',
+    ]).rename_columns(DIMENSIONS + MEASURES)
+
+
+def _std(count, total, total_sq):
+    """Sample standard deviation from n, sum(x) and sum(x^2) (NaN below 2 values)"""
+    variance = (total_sq - total * total / count) / (count - 1)
+    return variance.where(count > 1).clip(lower=0) ** 0.5
+
+
+class RollupCube:
+    """
+    Immutable set of cube cells (pyarrow Table with DIMENSIONS + MEASURES).
+    Carries a `key` like FrameAdapter, so trend view models are cached per
+    cube version and filter.
+    """
+
+    def __init__(self, cells, key=None):
+        self.cells = cells
+        self.key = key if key is not None else ('rollup', data_version(cells))
+
+    def __len__(self):
+        return self.cells.num_rows
+
+    def merge(self, delta_cells):
+        """New cube with delta cells added bucket by bucket - O(buckets + delta), never a rescan of calls"""
+        combined = pa.concat_tables([self.cells, delta_cells.select(DIMENSIONS + MEASURES).cast(self.cells.schema)])
+        merged = combined.group_by(DIMENSIONS).aggregate([(m, 'sum') for m in MEASURES])
+        merged = merged.select(DIMENSIONS + [f'{m}_sum' for m in MEASURES]).rename_columns(DIMENSIONS + MEASURES)
+        # Drop the query ID stamped on the loaded cells: the merged cube is a new data version
+        return RollupCube(merged.cast(self.cells.schema.remove_metadata()))
+
+    def where_in(self, column, values):
+        """Cube restricted to cells whose dimension value is in values"""
+        mask = pc.is_in(self.cells[column], value_set=pa.array(list(values), self.cells[column].type))
+        key = self.key + (('where_in', column, tuple(sorted(values))),)
+        return RollupCube(self.cells.filter(mask), key=key)
+
+    def values(self, column):
+        """Distinct non-null values of a dimension, sorted"""
+        return sorted(v for v in pc.unique(self.cells[column]).to_pylist() if v is not None)
+
+    def slice(self, by, grain='day'):
+        """
+        Aggregate the cells to the `by` dimensions (CALL_DATE truncated to
+        grain: day / week / month) and derive means, standard deviations and rates.
+        """
+        frame = self.cells.select(list(by) + MEASURES).to_pandas()
+        if 'CALL_DATE' in by:
+            dates = pd.to_datetime(frame['CALL_DATE'])
+            if grain == 'week':
+                dates = dates - pd.to_timedelta(dates.dt.weekday, unit='D')
+            elif grain == 'month':
+                dates = dates.dt.to_period('M').dt.to_timestamp()
+            frame['CALL_DATE'] = dates
+        frame[MEASURES] = frame[MEASURES].astype('float64')
+        totals = frame.groupby(list(by), dropna=False, sort=True)[MEASURES].sum().reset_index()
+
+        calls = totals['CALLS'].where(totals['CALLS'] > 0)
+        totals['AVG_SENTIMENT'] = totals['SENTIMENT_SUM'] / totals['SENTIMENT_COUNT'].where(totals['SENTIMENT_COUNT'] > 0)
+        totals['SENTIMENT_STDDEV'] = _std(totals['SENTIMENT_COUNT'], totals['SENTIMENT_SUM'], totals['SENTIMENT_SUM_SQ'])
+        totals['AVG_PERFORMANCE'] = totals['PERFORMANCE_SUM'] / totals['PERFORMANCE_COUNT'].where(totals['PERFORMANCE_COUNT'] > 0)
+        totals['PERFORMANCE_STDDEV'] = _std(totals['PERFORMANCE_COUNT'], totals['PERFORMANCE_SUM'], totals['PERFORMANCE_SUM_SQ'])
+        totals['RESOLUTION_RATE'] = totals['RESOLVED_CALLS'] / calls * 100
+        totals['ESCALATION_RATE'] = totals['ESCALATED_CALLS'] / calls * 100
+        totals['SATISFACTION_RATE'] = totals['SATISFIED_CALLS'] / calls * 100
+        totals['CALLS'] = totals['CALLS'].astype('int64')
+        return totals
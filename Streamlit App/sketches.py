@@ -0,0 +1,308 @@
+# Mergeable Sketches for the Call Center Analytics Dashboard
+# Pure-Python/NumPy counterparts of the Snowflake sketch functions behind the
+# CALL_SKETCHES_DAILY table (sql/02): HyperLogLog for distinct counts
+# (HLL_ACCUMULATE / HLL_COMBINE / HLL_ESTIMATE) and a KLL quantile sketch for
+# percentiles (APPROX_PERCENTILE_ACCUMULATE / _COMBINE / _ESTIMATE, a t-digest
+# in Snowflake). One state per day; any date range is answered by merging the
+# states of its days, so headline tiles cost O(buckets). merge_sketch_tables
+# adds a delta of new calls the way the CALL_SKETCHES_DAILY_MERGE task does,
+# rebuilding only the rows of the days it falls into. Used by the local harness.
+#
+# Error bounds:
+#   HyperLogLog, precision 12 (4096 registers): standard error 1.04 / sqrt(4096)
+#   = 1.6% of the true count (small counts are near exact via linear counting).
+#   Snowflake HLL uses the same register count.
+#   KLL, k = 200: rank error within ~1.7% of n with 99% confidence (a p90 read
+#   lies between the true p88.3 and p91.7). Snowflake t-digest is tighter in the
+#   tails.
+
+import hashlib
+import random
+import struct
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+HLL_PRECISION = 12
+KLL_K = 200
+
+HLL_RELATIVE_ERROR = 1.04 / (1 << HLL_PRECISION) ** 0.5
+KLL_RANK_ERROR = 0.017
+
+# Compaction coin flips; one stream for every sketch so merges of freshly
+# deserialized states do not all flip the same way (fixed seed: reproducible)
+_RNG = random.Random(20250728)
+
+
+def hash64(values):
+    """Stable 64-bit hashes of strings (NumPy uint64 array)"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(str(v).encode(), digest_size=8).digest(), 'little') for v in values),
+        dtype=np.uint64,
+        count=len(values)
+    )
+
+
+def _bit_length(values):
+    """Bit length of each uint64 (exact: frexp on 32-bit halves)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+# ============================================
+# HYPERLOGLOG (distinct counts)
+# ============================================
+
+class HyperLogLog:
+    """Distinct-count sketch: 2^precision one-byte registers, merged by element-wise max"""
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, np.uint8) if registers is None else registers
+
+    def add_hashes(self, hashes):
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Guard bit keeps the rank within 64 - precision + 1
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = (65 - _bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def add(self, values):
+        """Add values (hashed); pass distinct values where possible, duplicates only cost time"""
+        return self.add_hashes(hash64(values))
+
+    def merge(self, other):
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)  # linear counting for small cardinalities
+        return float(raw)
+
+    def to_bytes(self):
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data[0], np.frombuffer(data, np.uint8, offset=1).copy())
+
+
+# ============================================
+# KLL (quantiles)
+# ============================================
+
+class KLLSketch:
+    """
+    Quantile sketch of Karnin, Lang and Liberty: level h holds items of weight
+    2^h; a full level is sorted and every other item (random offset) promoted.
+    Level capacities shrink geometrically (factor 2/3) below the top level.
+    """
+
+    def __init__(self, k=KLL_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = _RNG if seed is None else random.Random(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self, level):
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        keep = items[-1:] if len(items) % 2 else items[:0]
+        items = items[:len(items) - len(keep)]
+        self.levels[level] = keep
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[self._rng.randrange(2)::2]])
+
+    def _compress(self):
+        """Compact the lowest full level until the sketch fits its total capacity"""
+        while sum(len(level) for level in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) >= self._capacity(level):
+                    self._compact(level)
+                    break
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        merged = KLLSketch(min(self.k, other.k))
+        merged.n = self.n + other.n
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [
+            np.concatenate([sketch.levels[h] for sketch in (self, other) if h < len(sketch.levels)])
+            for h in range(depth)
+        ]
+        merged._compress()
+        return merged
+
+    def quantile(self, q):
+        """Value at quantile q (0-1); None when empty"""
+        if self.n == 0:
+            return None
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = int(np.searchsorted(cumulative, q * cumulative[-1], side='left'))
+        return float(items[order][min(position, len(items) - 1)])
+
+    def to_bytes(self):
+        header = struct.pack('<IQI', self.k, self.n, len(self.levels))
+        lengths = struct.pack(f'<{len(self.levels)}I', *(len(level) for level in self.levels))
+        return header + lengths + np.concatenate(self.levels).astype('<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        k, n, depth = struct.unpack_from('<IQI', data)
+        offset = struct.calcsize('<IQI')
+        lengths = struct.unpack_from(f'<{depth}I', data, offset)
+        items = np.frombuffer(data, '<f8', offset=offset + 4 * depth)
+        sketch = cls(k)
+        sketch.n = n
+        sketch.levels = list(np.split(items.astype(np.float64), np.cumsum(lengths)[:-1]))
+        return sketch
+
+
+# ============================================
+# COMBINE (stand-ins for the Snowflake aggregate functions)
+# ============================================
+
+def hll_estimate_list(states):
+    """HLL_ESTIMATE(HLL_COMBINE(states)) over serialized HyperLogLog states"""
+    states = [s for s in states or [] if s is not None]
+    if not states:
+        return 0
+    merged = HyperLogLog.from_bytes(states[0])
+    for state in states[1:]:
+        merged = merged.merge(HyperLogLog.from_bytes(state))
+    return int(round(merged.estimate()))
+
+
+def kll_estimate_list(states, q):
+    """APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(states), q) over serialized KLL states"""
+    states = [s for s in states or [] if s is not None]
+    if not states:
+        return None
+    merged = KLLSketch.from_bytes(states[0])
+    for state in states[1:]:
+        merged = merged.merge(KLLSketch.from_bytes(state))
+    return merged.quantile(q)
+
+
+# ============================================
+# DAILY SKETCH TABLE (local CALL_SKETCHES_DAILY)
+# ============================================
+
+COUNT_COLUMNS = ['CALLS', 'SENTIMENT_COUNT', 'SENTIMENT_SUM', 'PERFORMANCE_COUNT', 'PERFORMANCE_SUM',
+                 'RESOLVED_CALLS', 'ESCALATED_CALLS', 'SATISFIED_CALLS', 'NEGATIVE_CALLS']
+SKETCH_COLUMNS = ['CUSTOMER_HLL', 'AGENT_HLL', 'SENTIMENT_DIGEST', 'PERFORMANCE_DIGEST']
+
+
+def _flag(column, value):
+    return pc.fill_null(pc.cast(pc.equal(column, value), pa.int64()), 0)
+
+
+def build_sketch_table(calls):
+    """Roll call rows (pyarrow Table) up to one row of counts and serialized sketches per CALL_DATE"""
+    from rollup_cube import _call_dates
+
+    dates = _call_dates(calls['ANALYSIS_TIMESTAMP'])
+    order = pc.sort_indices(dates)
+    calls = calls.take(order)
+    dates = pc.cast(dates.take(order), pa.int32()).to_numpy(zero_copy_only=False)
+    days, starts = np.unique(dates, return_index=True)
+    bounds = list(starts[1:]) + [len(dates)]
+
+    sentiment = pc.cast(calls['SENTIMENT_SCORE'], pa.float64()).to_numpy(zero_copy_only=False)
+    performance = pc.cast(calls['AGENT_PERFORMANCE_SCORE'], pa.float64()).to_numpy(zero_copy_only=False)
+    flags = {
+        'RESOLVED_CALLS': _flag(calls['ISSUE_RESOLVED'], 'yes').to_numpy(),
+        'ESCALATED_CALLS': _flag(calls['ESCALATION_REQUIRED'], 'yes').to_numpy(),
+        'SATISFIED_CALLS': _flag(calls['CUSTOMER_SATISFACTION'], 'satisfied').to_numpy(),
+        'NEGATIVE_CALLS': _flag(calls['SENTIMENT_CATEGORY'], 'NEGATIVE').to_numpy(),
+    }
+    customers = calls['CUSTOMER_NAME'].to_numpy(zero_copy_only=False)
+    agents = calls['AGENT_NAME'].to_numpy(zero_copy_only=False)
+    name_hashes = {}
+
+    def hashed(names):
+        distinct = [n for n in set(names) if n is not None]
+        missing = [n for n in distinct if n not in name_hashes]
+        if missing:
+            name_hashes.update(zip(missing, hash64(missing).tolist()))
+        return np.array([name_hashes[n] for n in distinct], dtype=np.uint64)
+
+    rows = {column: [] for column in ['CALL_DATE'] + COUNT_COLUMNS + SKETCH_COLUMNS}
+    for day, start, end in zip(days, starts, bounds):
+        day_sentiment = sentiment[start:end]
+        day_performance = performance[start:end]
+        rows['CALL_DATE'].append(day)
+        rows['CALLS'].append(int(end - start))
+        rows['SENTIMENT_COUNT'].append(int(np.count_nonzero(~np.isnan(day_sentiment))))
+        rows['SENTIMENT_SUM'].append(float(np.nansum(day_sentiment)))
+        rows['PERFORMANCE_COUNT'].append(int(np.count_nonzero(~np.isnan(day_performance))))
+        rows['PERFORMANCE_SUM'].append(float(np.nansum(day_performance)))
+        for column, values in flags.items():
+            rows[column].append(int(values[start:end].sum()))
+        rows['CUSTOMER_HLL'].append(HyperLogLog().add_hashes(hashed(customers[start:end])).to_bytes())
+        rows['AGENT_HLL'].append(HyperLogLog().add_hashes(hashed(agents[start:end])).to_bytes())
+        rows['SENTIMENT_DIGEST'].append(KLLSketch().update(day_sentiment).to_bytes())
+        rows['PERFORMANCE_DIGEST'].append(KLLSketch().update(day_performance).to_bytes())
+
+    rows['CALL_DATE'] = pa.array(rows['CALL_DATE'], pa.int32()).cast(pa.date32())
+    return pa.table({
+        column: values if isinstance(values, pa.Array) else pa.array(
+            values, pa.binary() if column in SKETCH_COLUMNS else None)
+        for column, values in rows.items()
+    })
+
+
+def merge_sketch_tables(existing, delta):
+    """
+    Add a delta (build_sketch_table of new calls) to a sketch table: counts are
+    summed and sketches merged for days present in both; other days pass through
+    as Arrow slices. Only rows of days in the delta are decoded, so the Python
+    work is O(days in the delta) - the filter and re-sort of the table stay
+    vectorized, O(days) in Arrow.
+    """
+    if delta.num_rows == 0:
+        return existing
+    touched = pc.is_in(existing['CALL_DATE'], value_set=delta['CALL_DATE'].combine_chunks())
+    by_day = {row['CALL_DATE']: row for row in existing.filter(touched).to_pylist()}
+    for row in delta.to_pylist():
+        current = by_day.get(row['CALL_DATE'])
+        if current is None:
+            by_day[row['CALL_DATE']] = row
+            continue
+        for column in COUNT_COLUMNS:
+            current[column] += row[column]
+        for column in ('CUSTOMER_HLL', 'AGENT_HLL'):
+            current[column] = HyperLogLog.from_bytes(current[column]).merge(
+                HyperLogLog.from_bytes(row[column])).to_bytes()
+        for column in ('SENTIMENT_DIGEST', 'PERFORMANCE_DIGEST'):
+            current[column] = KLLSketch.from_bytes(current[column]).merge(
+                KLLSketch.from_bytes(row[column])).to_bytes()
+    schema = existing.schema.remove_metadata()
+    merged = pa.concat_tables([
+        existing.filter(pc.invert(touched)).cast(schema),
+        pa.Table.from_pylist(list(by_day.values()), schema=schema),
+    ])
+    return merged.sort_by('CALL_DATE')
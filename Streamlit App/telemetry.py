@@ -0,0 +1,181 @@
+# Query and Render Telemetry for the Call Center Analytics Dashboard
+# Records, per script run: Snowflake queries (ID, rows, bytes, execute/fetch time),
+# loader cache hits/misses, view-model compute time, pandas/Arrow conversion time
+# and render time. Shown in a sidebar panel and appended to a local JSONL log.
+
+import json
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from frame_adapter import pop_conversion_seconds
+
+
+APP_NAME = "CALL_CENTER_ANALYTICS_APP"
+
+# Local JSONL log - override with CALL_CENTER_TELEMETRY_LOG
+TELEMETRY_LOG = os.environ.get(
+    "CALL_CENTER_TELEMETRY_LOG",
+    os.path.join(tempfile.gettempdir(), "call_center_app_telemetry.jsonl")
+)
+
+
+class RunTelemetry:
+    """Events for one script run (one page render) of one session"""
+
+    def __init__(self, session_id, page):
+        self.session_id = session_id
+        self.page = page
+        self.started = time.perf_counter()
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.queries = []
+        self.loaders = []
+        self.views = []
+        self.page_seconds = None
+        self.conversion_seconds = 0.0
+        self._fetched = set()
+
+    # ---------- loaders / queries ----------
+
+    def record_query(self, name, stats):
+        """Called from inside a cached loader body, i.e. only on a cache miss"""
+        self._fetched.add(name)
+        self.queries.append({'name': name, **stats})
+
+    @contextmanager
+    def loader(self, name):
+        """Wrap a cached loader call; records a hit unless the body issued a query"""
+        start = time.perf_counter()
+        yield
+        self.loaders.append({
+            'name': name,
+            'cache': 'miss' if name in self._fetched else 'hit',
+            'seconds': time.perf_counter() - start,
+        })
+
+    # ---------- page compute / render ----------
+
+    def record_view(self, view, hit, compute_seconds):
+        self.views.append({'view': view, 'cache': 'hit' if hit else 'miss', 'compute_seconds': compute_seconds})
+
+    @contextmanager
+    def page_render(self):
+        """Time the page function; render time = page time - view-model compute time"""
+        pop_conversion_seconds()
+        start = time.perf_counter()
+        yield
+        self.page_seconds = time.perf_counter() - start
+        self.conversion_seconds = pop_conversion_seconds()
+
+    @property
+    def compute_seconds(self):
+        return sum(view['compute_seconds'] for view in self.views)
+
+    @property
+    def render_seconds(self):
+        if self.page_seconds is None:
+            return None
+        return max(self.page_seconds - self.compute_seconds, 0.0)
+
+    def to_record(self):
+        return {
+            'timestamp': self.timestamp,
+            'app': APP_NAME,
+            'session_id': self.session_id,
+            'page': self.page,
+            'total_seconds': time.perf_counter() - self.started,
+            'page_seconds': self.page_seconds,
+            'compute_seconds': self.compute_seconds,
+            'conversion_seconds': self.conversion_seconds,
+            'render_seconds': self.render_seconds,
+            'queries': self.queries,
+            'loaders': self.loaders,
+            'views': self.views,
+        }
+
+
+def start_run(page):
+    """Begin telemetry for this script run and store it in session state"""
+    if 'telemetry_session_id' not in st.session_state:
+        st.session_state['telemetry_session_id'] = uuid.uuid4().hex[:12]
+    run = RunTelemetry(st.session_state['telemetry_session_id'], page)
+    st.session_state['telemetry_run'] = run
+    return run
+
+
+def current_run():
+    """The RunTelemetry for this script run, or None outside a run"""
+    try:
+        return st.session_state.get('telemetry_run')
+    except Exception:  # no script run context (e.g. headless use of the page functions)
+        return None
+
+
+def query_tag(page):
+    """QUERY_TAG value for a page's queries, so cost shows up per page in QUERY_HISTORY"""
+    return json.dumps({'app': APP_NAME, 'page': page}, ensure_ascii=False)
+
+
+def set_query_tag(session, page):
+    """
+    Tag the session's queries with the app and page. Set on every run: the
+    Snowpark session is shared by all users of the app process, so another
+    user's run may have retagged it since. Queries run through
+    dashboard_data.run_query also carry the tag per statement, which holds
+    even while runs overlap.
+    """
+    session.query_tag = query_tag(page)
+
+
+def write_log(run, path=TELEMETRY_LOG):
+    """Append the run record to the JSONL log; telemetry must never break the app"""
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run.to_record(), default=str) + "\n")
+    except OSError:
+        pass
+
+
+def show_panel(run, cache_stats=None, store_stats=None):
+    """Sidebar panel with this run's query, cache and timing breakdown"""
+    record = run.to_record()
+    st.markdown("### 📡 Performance Telemetry")
+
+    col1, col2 = st.columns(2)
+    col1.metric("Compute", f"{record['compute_seconds'] * 1000:.0f} ms")
+    col2.metric("Render", f"{(record['render_seconds'] or 0) * 1000:.0f} ms")
+    col1.metric("Conversion", f"{record['conversion_seconds'] * 1000:.0f} ms")
+    col2.metric("Total", f"{record['total_seconds'] * 1000:.0f} ms")
+
+    if record['queries']:
+        st.markdown("**Snowflake queries**")
+        queries = pd.DataFrame(record['queries'])
+        queries['MB'] = (queries['bytes'] / 1e6).round(2)
+        st.dataframe(
+            queries[['name', 'query_id', 'rows', 'MB', 'execute_seconds', 'fetch_seconds']],
+            use_container_width=True, hide_index=True
+        )
+
+    st.markdown("**Cache**")
+    cache_rows = [{'item': f"loader:{l['name']}", 'cache': l['cache']} for l in record['loaders']]
+    cache_rows += [{'item': f"view:{v['view']}", 'cache': v['cache']} for v in record['views']]
+    if cache_rows:
+        st.dataframe(pd.DataFrame(cache_rows), use_container_width=True, hide_index=True)
+    if cache_stats:
+        st.caption(
+            f"View cache: {cache_stats['entries']} entries, {cache_stats['bytes'] / 1e6:.1f} MB, "
+            f"{cache_stats['hits']} hits / {cache_stats['misses']} misses, {cache_stats['evictions']} evictions"
+        )
+    if store_stats:
+        st.caption(
+            f"Shared datasets: {store_stats['datasets']} ({store_stats['dataset_bytes'] / 1e6:.1f} MB, "
+            f"{store_stats['conversions']} conversions), {store_stats['masks']} filter masks "
+            f"({store_stats['mask_bytes'] / 1e3:.1f} KB)"
+        )
+    st.caption(f"Log: {TELEMETRY_LOG}")
@@ -0,0 +1,104 @@
+# View Model Cache for the Call Center Analytics Dashboard
+# Caches each page's computed view model (aggregated frames and figure specs)
+# keyed by dataset version + normalized filter state, shared across sessions
+
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Defaults - one cache instance serves every session in the app process
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB of view models
+DEFAULT_MAX_ENTRIES = 512
+
+
+def estimate_size(value):
+    """Approximate in-memory size of a view model (frames, figure dicts, lists, scalars)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, "nbytes"):  # numpy arrays inside plotly figure specs
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class ViewModelCache:
+    """Thread-safe LRU cache of page view models bounded by entry count and byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (view_model, size)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, builder):
+        """
+        Return the cached view model for key, or build, store and return it.
+        A key of None (unversioned data) bypasses the cache.
+        """
+        if key is None:
+            return builder()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Build outside the lock so one slow page does not block other sessions
+        view_model = builder()
+        size = estimate_size(view_model)
+        if size > self.max_bytes:
+            return view_model
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (view_model, size)
+            self.total_bytes += size
+            while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return view_model
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Snapshot of cache counters for display"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def view_key(page, *frames, **state):
+    """
+    Cache key for a page view: page name, the lineage keys of its input frames
+    (dataset version + filters) and any widget state, normalized to a hashable tuple.
+    Returns None if any frame is unversioned.
+    """
+    frame_keys = tuple(getattr(frame, 'key', None) for frame in frames)
+    if any(key is None for key in frame_keys):
+        return None
+    return (page, frame_keys, tuple(sorted(state.items())))
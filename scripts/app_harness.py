@@ -0,0 +1,414 @@
+"""
+Headless harness for the Streamlit dashboard
+Loads Streamlit App/CALL_CENTER_ANALYTICS_APP.py without a Streamlit server or a
+Snowflake connection: `st` is replaced by a recording stub and the Snowpark
+session by LocalSession, a DuckDB-backed stand-in that answers the app's SQL.
+Used by the benchmark and load-testing scripts.
+
+Requires: pandas, pyarrow, duckdb, plotly (polars optional)
+"""
+
+import functools
+import importlib.util
+import os
+import random
+import re
+import sys
+import threading
+import types
+import uuid
+
+import duckdb
+import pyarrow as pa
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+APP_DIR = os.path.join(PROJECT_ROOT, "Streamlit App")
+APP_FILE = os.path.join(APP_DIR, "CALL_CENTER_ANALYTICS_APP.py")
+DATA_DIR = os.path.join(PROJECT_ROOT, "data", "final")
+EXPORT_DIR = os.path.join(PROJECT_ROOT, "exports")
+AUDIO_DIR = os.path.join(PROJECT_ROOT, "audio")
+
+# Distinct records generated by synthetic_tables; larger sizes repeat them
+SYNTHETIC_POOL_SIZE = 20000
+
+# Fully-qualified names used in the app's SQL, mapped to local table names
+QUALIFIED_PREFIX = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING."
+CALL_TABLE = "AI_TRANSCRIBED_CALLS_AI_GENERATED"
+PROFILE_TABLE = "AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE"
+ROLLUP_TABLE = "CALL_ROLLUP_DAILY"
+SKETCH_TABLE = "CALL_SKETCHES_DAILY"
+PRIORITY_TABLE = "CALL_PRIORITY_SCORES"
+
+# Snowflake sketch aggregates -> list aggregate + Python UDF over the local
+# (Streamlit App/sketches.py) states
+SKETCH_REWRITES = [
+    (re.compile(r"HLL_ESTIMATE\(\s*HLL_COMBINE\(\s*(\w+)\s*\)\s*\)", re.I), r"HLL_ESTIMATE_LIST(LIST(\1))"),
+    (re.compile(r"APPROX_PERCENTILE_ESTIMATE\(\s*APPROX_PERCENTILE_COMBINE\(\s*(\w+)\s*\)\s*,\s*([0-9.]+)\s*\)", re.I),
+     r"KLL_ESTIMATE_LIST(LIST(\1), \2)"),
+]
+
+
+# ============================================
+# STREAMLIT STUB
+# ============================================
+
+class _Element:
+    """No-op stand-in for containers, columns and widgets"""
+
+    def __init__(self, stub):
+        self._stub = stub
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._stub, name)
+
+
+class StreamlitStub(types.ModuleType):
+    """
+    Minimal `streamlit` module replacement.
+    - cache_data / cache_resource memoize by arguments (with .clear())
+    - widgets return `inputs[label]` if scripted, otherwise their default;
+      set_session_inputs() scripts one thread's session on top of that
+    - plotly_chart / dataframe do the serialization Streamlit would do
+      (figure -> JSON, DataFrame -> Arrow) so render cost stays measurable
+    Any other st.* call is a no-op.
+    """
+
+    def __init__(self, inputs=None):
+        super().__init__("streamlit")
+        self.inputs = dict(inputs or {})
+        self._local = threading.local()
+        self.sidebar = _Element(self)
+        self.calls = 0
+
+    # ---------- session state (per thread, like one Streamlit session per script thread) ----------
+
+    @property
+    def session_state(self):
+        if not hasattr(self._local, "state"):
+            self._local.state = {}
+        return self._local.state
+
+    def reset_session(self):
+        self._local.state = {}
+
+    # ---------- caching ----------
+
+    def _memoize(self, func=None, **_options):
+        def decorator(f):
+            cache = {}
+            lock = threading.Lock()
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                key = (args, tuple(sorted(kwargs.items())))
+                with lock:
+                    if key in cache:
+                        return cache[key]
+                value = f(*args, **kwargs)
+                with lock:
+                    cache[key] = value
+                return value
+
+            wrapper.clear = cache.clear
+            return wrapper
+        return decorator(func) if callable(func) else decorator
+
+    cache_data = _memoize
+    cache_resource = _memoize
+
+    # ---------- layout ----------
+
+    def columns(self, spec, **_kwargs):
+        count = spec if isinstance(spec, int) else len(spec)
+        return [_Element(self) for _ in range(count)]
+
+    def expander(self, *_args, **_kwargs):
+        return _Element(self)
+
+    def container(self, *_args, **_kwargs):
+        return _Element(self)
+
+    # ---------- widgets ----------
+
+    def _input(self, label, default):
+        session_inputs = getattr(self._local, "inputs", None)
+        if session_inputs is not None and label in session_inputs:
+            return session_inputs[label]
+        return self.inputs.get(label, default)
+
+    def set_session_inputs(self, inputs):
+        """Widget values for the calling thread's session (take precedence over `inputs`)"""
+        self._local.inputs = dict(inputs)
+
+    def selectbox(self, label, options, index=0, **_kwargs):
+        options = list(options)
+        return self._input(label, options[index] if options else None)
+
+    def multiselect(self, label, options, default=None, **_kwargs):
+        return self._input(label, list(default or []))
+
+    def text_input(self, label, value="", **_kwargs):
+        return self._input(label, value)
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **_kwargs):
+        return self._input(label, value if value is not None else min_value)
+
+    def checkbox(self, label, value=False, **_kwargs):
+        return self._input(label, value)
+
+    toggle = checkbox
+
+    def button(self, label, **_kwargs):
+        return self._input(label, False)
+
+    # ---------- output ----------
+
+    def plotly_chart(self, figure, **_kwargs):
+        import plotly.io as pio
+        self.calls += 1
+        pio.to_json(figure, validate=False)
+
+    def dataframe(self, data, **_kwargs):
+        self.calls += 1
+        pa.Table.from_pandas(data, preserve_index=False)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def noop(*_args, **_kwargs):
+            self.calls += 1
+            return _Element(self)
+        return noop
+
+
+# ============================================
+# LOCAL SESSION (DuckDB stand-in for Snowpark)
+# ============================================
+
+class _LocalCursor:
+    def __init__(self, session):
+        self._session = session
+        self._result = None
+        self.sfqid = None
+
+    def execute(self, query, _statement_params=None):
+        self.sfqid = f"local-{uuid.uuid4().hex[:16]}"
+        self.statement_params = _statement_params
+        self._result = self._session._execute(query)
+        return self
+
+    def fetch_arrow_all(self):
+        # arrow() is a Table on older DuckDB and a RecordBatchReader on newer; pa.table takes either
+        table = pa.table(self._result.arrow())
+        # Snowflake returns unquoted identifiers upper-cased
+        return table.rename_columns([name.upper() for name in table.column_names])
+
+    def fetch_arrow_batches(self):
+        yield self.fetch_arrow_all()
+
+    def close(self):
+        self._result = None
+
+
+class _LocalConnection:
+    def __init__(self, session):
+        self._session = session
+
+    def cursor(self):
+        return _LocalCursor(self._session)
+
+
+class _LocalDataFrame:
+    """The small part of the Snowpark DataFrame API the app uses"""
+
+    def __init__(self, session, query):
+        self._session = session
+        self._query = query
+
+    def limit(self, n):
+        return _LocalDataFrame(self._session, f"SELECT * FROM ({self._query}) LIMIT {int(n)}")
+
+    def to_pandas(self):
+        cursor = self._session.connection.cursor().execute(self._query)
+        return cursor.fetch_arrow_all().to_pandas()
+
+    def collect(self):
+        cursor = self._session.connection.cursor().execute(self._query)
+        return cursor.fetch_arrow_all().to_pylist()
+
+
+class LocalSession:
+    """
+    Snowpark-like session over in-process DuckDB.
+    Register Arrow tables / pandas frames under their Snowflake table names; the
+    CALL_CENTER_ANALYTICS.AUDIO_PROCESSING. prefix is stripped from queries and
+    the HLL / APPROX_PERCENTILE sketch aggregates run on the local sketches.
+    Each thread gets its own DuckDB cursor so concurrent sessions can query.
+    Bulk exports are written under export_directory and recordings are served
+    from audio_directory instead of stages.
+    """
+
+    def __init__(self, tables=None):
+        if APP_DIR not in sys.path:
+            sys.path.insert(0, APP_DIR)
+        import sketches
+        self._db = duckdb.connect()
+        self._db.create_function("HLL_ESTIMATE_LIST", sketches.hll_estimate_list, ["BLOB[]"], "BIGINT")
+        self._db.create_function("KLL_ESTIMATE_LIST", sketches.kll_estimate_list, ["BLOB[]", "DOUBLE"], "DOUBLE")
+        self._local = threading.local()
+        self._tables = {}
+        self.query_tag = None
+        self.export_directory = EXPORT_DIR
+        self.audio_directory = AUDIO_DIR
+        self.connection = _LocalConnection(self)
+        for name, table in (tables or {}).items():
+            self.register(name, table)
+
+    def register(self, name, table):
+        """Expose an Arrow table or pandas frame as a queryable table (call before querying)"""
+        self._tables[name.upper()] = table
+
+    def _execute(self, query):
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            # Registered Arrow/pandas tables are per-connection in DuckDB
+            cursor = self._local.cursor = self._db.cursor()
+            for name, table in self._tables.items():
+                cursor.register(name, table)
+        query = query.replace(QUALIFIED_PREFIX, "")
+        for pattern, replacement in SKETCH_REWRITES:
+            query = pattern.sub(replacement, query)
+        return cursor.execute(query)
+
+    def sql(self, query):
+        return _LocalDataFrame(self, query)
+
+
+# ============================================
+# APP LOADING
+# ============================================
+
+def load_app(session, inputs=None, module_name="call_center_app"):
+    """
+    Import the dashboard with a stubbed `st` and `get_active_session()` returning session.
+    Returns (app_module, streamlit_stub).
+    """
+    stub = StreamlitStub(inputs)
+    sys.modules["streamlit"] = stub
+
+    try:
+        import snowflake.snowpark.context as snowpark_context
+        snowpark_context.get_active_session = lambda: session
+    except ImportError:
+        snowflake_pkg = sys.modules.setdefault("snowflake", types.ModuleType("snowflake"))
+        snowflake_pkg.__path__ = getattr(snowflake_pkg, "__path__", [])
+        snowpark_pkg = types.ModuleType("snowflake.snowpark")
+        snowpark_pkg.__path__ = []
+        context = types.ModuleType("snowflake.snowpark.context")
+        context.get_active_session = lambda: session
+        snowpark_pkg.context = context
+        snowflake_pkg.snowpark = snowpark_pkg
+        sys.modules["snowflake.snowpark"] = snowpark_pkg
+        sys.modules["snowflake.snowpark.context"] = context
+
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    # Reload the app's modules that use st / the session so they bind to this stub
+    for name in list(sys.modules):
+        if name in ("telemetry", "dashboard_data") or name.split(".")[0] == "dashboard_pages":
+            sys.modules.pop(name)
+
+    spec = importlib.util.spec_from_file_location(module_name, APP_FILE)
+    app = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = app
+    spec.loader.exec_module(app)
+    return app, stub
+
+
+# ============================================
+# DATASETS
+# ============================================
+
+def load_final_tables():
+    """The shipped data/final CSVs as Arrow tables (calls, profiles)"""
+    import pyarrow.csv as pacsv
+    calls = pacsv.read_csv(os.path.join(DATA_DIR, "FINAL_TABLE_COMPLETE.csv"))
+    profiles = pacsv.read_csv(os.path.join(DATA_DIR, "CUSTOMER_PROFILE_COMPLETE.csv"))
+    return calls, profiles
+
+
+def synthetic_tables(num_rows, pool_size=SYNTHETIC_POOL_SIZE, seed=42):
+    """
+    Synthetic calls/profiles built with generate_call_data / generate_customer_profiles.
+    Only min(num_rows, pool_size) distinct records are generated. Larger sizes
+    repeat that pool (sharing its Arrow buffers) with fresh CALL_IDs, so 10M rows
+    stay affordable - but every column except CALL_ID holds the pool's values:
+    distinct counts, sketches, dictionary sizes and search matches stop growing
+    past pool_size, and scale runs measure volume, not cardinality (see
+    distinct_records). Both tables are stamped with a version tag built from
+    these parameters, as Snowflake results carry their query ID.
+    """
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    import generate_call_data
+    import generate_customer_profiles
+
+    random.seed(seed)
+    pool = [generate_call_data.generate_call_record(i) for i in range(1, distinct_records(num_rows, pool_size) + 1)]
+    for record in pool:
+        record.pop("", None)  # index column is not part of the table
+    pool_table = pa.Table.from_pylist(pool)
+
+    repeats = -(-num_rows // pool_table.num_rows)
+    calls = pa.concat_tables([pool_table] * repeats).slice(0, num_rows)
+    call_ids = pa.array([f"CALL_SYN_{i:010d}" for i in range(num_rows)])
+    calls = calls.set_column(calls.schema.get_field_index("CALL_ID"), "CALL_ID", call_ids)
+
+    names = sorted({record["CUSTOMER_NAME"] for record in pool})
+    profiles = pa.Table.from_pylist([
+        generate_customer_profiles.generate_customer_profile(idx, name)
+        for idx, name in enumerate(names, start=1)
+    ])
+    version = f"synthetic-{num_rows}-{pool_size}-{seed}"
+    return (calls.replace_schema_metadata({"query_id": f"{version}-calls"}),
+            profiles.replace_schema_metadata({"query_id": f"{version}-profiles"}))
+
+
+def distinct_records(num_rows, pool_size=SYNTHETIC_POOL_SIZE):
+    """Distinct call records behind synthetic_tables(num_rows) - the rest are repeats"""
+    return min(num_rows, pool_size)
+
+
+def make_session(calls, profiles):
+    """
+    LocalSession serving the given call and profile tables, plus what the derived
+    tables would hold: the rollup cube (CALL_ROLLUP_DAILY), the daily
+    sketches (CALL_SKETCHES_DAILY) and the priority scores (CALL_PRIORITY_SCORES)
+    """
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    from rollup_cube import build_cells
+    from priority_feed import score_calls
+    from sketches import build_sketch_table
+    return LocalSession({
+        CALL_TABLE: calls,
+        PROFILE_TABLE: profiles,
+        ROLLUP_TABLE: build_cells(calls, profiles),
+        SKETCH_TABLE: build_sketch_table(calls),
+        PRIORITY_TABLE: score_calls(calls, profiles),
+    })
+
+
+def parse_size(text):
+    """'1k' -> 1000, '1M' -> 1000000, '250' -> 250"""
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
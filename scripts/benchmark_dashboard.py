@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Dashboard Scale Benchmark
+Runs the dashboard page functions headless (stubbed `st`, DuckDB-backed
+local session) against synthetic data from generate_call_data.py at increasing
+row counts, and records time and peak memory per page. Above 20k rows the
+synthetic calls repeat a pool of 20k distinct records with new CALL_IDs (see
+app_harness.synthetic_tables), so large sizes measure data volume; distinct
+counts, sketch states and search matches stay at the pool's cardinality.
+
+Each page is measured cold (view-model cache cleared - full aggregation,
+figure building and rendering) and warm (repeat rerun served from the cache).
+Results are appended to a history file and compared with a baseline; pages
+that got slower or hungrier than --threshold are flagged and the script exits 1.
+
+Usage:
+    python scripts/benchmark_dashboard.py                         # 1k,100k,1M,10M
+    python scripts/benchmark_dashboard.py --sizes 1k,100k --repeat 5
+    python scripts/benchmark_dashboard.py --sizes 1k,100k --save-baseline
+
+Prerequisites:
+    pip install pandas pyarrow duckdb plotly  (polars optional)
+    10M rows needs roughly 8-16 GB of RAM depending on the backend.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import app_harness
+
+DEFAULT_SIZES = "1k,100k,1M,10M"
+RESULTS_DIR = os.path.join(app_harness.PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_BASELINE = os.path.join(app_harness.PROJECT_ROOT, "benchmarks", "dashboard_baseline.json")
+
+# Widget values used while benchmarking (label -> value)
+BENCHMARK_INPUTS = {
+    "Search transcripts:": "billing",
+}
+
+
+# ============================================
+# MEMORY SAMPLING
+# ============================================
+
+def current_rss_bytes():
+    """Resident set size of this process (Linux /proc, falls back to ru_maxrss)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class PeakMemory:
+    """Samples RSS on a background thread; .peak_delta is the high-water mark above the start"""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        gc.collect()
+        self.start = self.peak = current_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+        return False
+
+    @property
+    def peak_delta(self):
+        return self.peak - self.start
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def page_calls(app, calls, profiles, stats):
+    """(page name, zero-arg callable) for each dashboard page, as main() would call them"""
+    call_data = app.get_frame_store().frame("calls", calls).where_in("SENTIMENT_CATEGORY", ["POSITIVE", "NEUTRAL", "NEGATIVE"])
+    customer_data = app.get_frame_store().frame("customers", profiles)
+    page = app.page_function
+    return [
+        ("show_executive_dashboard", lambda: page("📊 Executive Dashboard")(call_data, stats, app.get_priority_feed())),
+        ("show_agent_performance", lambda: page("👨‍💼 Agent Performance")(call_data)),
+        ("show_customer_insights", lambda: page("👤 Customer Insights")(call_data, customer_data)),
+        ("show_regional_analysis", lambda: page("🗺️ Regional Analysis")(call_data, customer_data)),
+        ("show_transcript_search", lambda: page("🔍 Transcript Search")(call_data)),
+        ("show_agent_trends", lambda: page("📈 Agent Trends")(app.load_rollup_cube())),
+        ("show_sentiment_trends", lambda: page("📉 Sentiment Trends")(app.load_rollup_cube())),
+    ]
+
+
+def benchmark_size(num_rows, repeat, backend):
+    """Time and peak memory of every page at one dataset size"""
+    print(f"\n📦 Building synthetic dataset: {num_rows:,} rows...")
+    start = time.perf_counter()
+    calls, profiles = app_harness.synthetic_tables(num_rows)
+    print(f"   Built in {time.perf_counter() - start:.1f}s ({calls.nbytes / 1e6:,.0f} MB Arrow)")
+    distinct = app_harness.distinct_records(num_rows)
+    if distinct < num_rows:
+        print(f"   ⚠️  Only {distinct:,} distinct records, repeated with new CALL_IDs: distinct counts, "
+              f"sketches and search matches reflect {distinct:,} calls, not {num_rows:,}")
+
+    session = app_harness.make_session(calls, profiles)
+    app, _ = app_harness.load_app(session, inputs=BENCHMARK_INPUTS)
+    if backend:
+        import frame_adapter
+        frame_adapter.DEFAULT_BACKEND = backend
+    stats = app.get_summary_stats()
+    view_cache = app.get_view_cache()
+
+    results = []
+    for page, render in page_calls(app, calls, profiles, stats):
+        cold_times = []
+        for _ in range(repeat):
+            view_cache.clear()
+            gc.collect()
+            t0 = time.perf_counter()
+            render()
+            cold_times.append(time.perf_counter() - t0)
+
+        view_cache.clear()
+        with PeakMemory() as memory:
+            render()
+
+        t0 = time.perf_counter()
+        render()  # served from the view-model cache
+        warm = time.perf_counter() - t0
+
+        result = {
+            "rows": num_rows,
+            "distinct_records": distinct,
+            "page": page,
+            "cold_seconds": min(cold_times),
+            "warm_seconds": warm,
+            "peak_memory_mb": memory.peak_delta / 1e6,
+        }
+        results.append(result)
+        print(f"   {page:<28} cold {result['cold_seconds'] * 1000:>9.1f} ms | "
+              f"warm {warm * 1000:>7.1f} ms | peak +{result['peak_memory_mb']:>8.1f} MB")
+
+    del app, session, calls, profiles
+    gc.collect()
+    return results
+
+
+# ============================================
+# RESULTS & REGRESSIONS
+# ============================================
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=app_harness.PROJECT_ROOT).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def find_regressions(results, baseline, threshold):
+    """Rows whose cold time or peak memory exceed baseline * threshold"""
+    previous = {(r["rows"], r["page"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = previous.get((result["rows"], result["page"]))
+        if base is None:
+            continue
+        for metric in ("cold_seconds", "peak_memory_mb"):
+            # Ignore noise on tiny absolute values (<10 ms, <5 MB)
+            floor = 0.010 if metric == "cold_seconds" else 5.0
+            if result[metric] > max(base[metric], floor) * threshold:
+                regressions.append((result, metric, base[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard page functions at scale")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated row counts, k/M suffixes allowed (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs per page (best is kept)")
+    parser.add_argument("--backend", choices=["polars", "arrow"], default=None,
+                        help="Force the FrameAdapter backend (default: polars if installed)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Flag a regression when a metric exceeds baseline x threshold")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [app_harness.parse_size(size) for size in args.sizes.split(",")]
+
+    print("=" * 70)
+    print("DASHBOARD SCALE BENCHMARK")
+    print("=" * 70)
+    print(f"Sizes: {', '.join(f'{s:,}' for s in sizes)} | repeat: {args.repeat} | backend: {args.backend or 'default'}")
+
+    results = []
+    for num_rows in sizes:
+        results.extend(benchmark_size(num_rows, args.repeat, args.backend))
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": args.backend or "default",
+        "results": results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, "dashboard_latest.json"), "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    with open(os.path.join(RESULTS_DIR, "dashboard_history.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    print(f"\n✓ Results written to {RESULTS_DIR}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"✓ Baseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline found - run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold)
+
+    print("\n" + "=" * 70)
+    if regressions:
+        print(f"❌ {len(regressions)} REGRESSION(S) vs baseline ({baseline.get('git_revision')}):")
+        for result, metric, base in regressions:
+            print(f"   - {result['page']} @ {result['rows']:,} rows: {metric} "
+                  f"{result[metric]:.3f} vs {base:.3f} (x{result[metric] / max(base, 1e-9):.2f})")
+        return 1
+    print(f"✅ No regressions vs baseline (threshold x{args.threshold})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
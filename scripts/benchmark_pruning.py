@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Date-Range Pruning Benchmark
+Shows how many files a time-window query can skip with the flat (generation
+order) and the date-partitioned (call_date=YYYY-MM-DD/, time-sorted) layouts
+written by generate_call_data.py.
+
+Each file stands in for a micro-partition: its min/max ANALYSIS_TIMESTAMP is
+the zone map a query engine uses to skip it. Flat files each span the whole
+90 days, so nothing can be skipped; partitioned files hold one day each.
+For every window the script reports files/rows read versus rows matched and
+the wall time of actually reading the files that survive pruning.
+
+Usage:
+    python scripts/benchmark_pruning.py
+    python scripts/benchmark_pruning.py --records 100000 --keep /tmp/pruning
+
+Prerequisites:
+    None (standard library only)
+"""
+
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import generate_call_data
+
+csv.field_size_limit(sys.maxsize)
+
+# (label, days back from the newest call, days covered)
+WINDOWS = [
+    ("Last 1 day", 0, 1),
+    ("Last 7 days", 0, 7),
+    ("Last 30 days", 0, 30),
+    ("Single day, 45 days ago", 45, 1),
+    ("Full history", 0, 91),
+]
+
+
+# ============================================
+# LAYOUTS
+# ============================================
+
+def write_flat_files(records, output_dir, rows_per_file):
+    """Generation order, rows_per_file per file (how an unsorted load lands)"""
+    os.makedirs(output_dir, exist_ok=True)
+    for part, start in enumerate(range(0, len(records), rows_per_file)):
+        chunk = [{k: v for k, v in r.items() if k != ""} for r in records[start:start + rows_per_file]]
+        with open(os.path.join(output_dir, f"part-{part:05d}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=chunk[0].keys())
+            writer.writeheader()
+            writer.writerows(chunk)
+
+
+def zone_maps(output_dir):
+    """[(path, rows, min_timestamp, max_timestamp)] for every CSV under output_dir"""
+    maps = []
+    for root, _, names in os.walk(output_dir):
+        for name in sorted(names):
+            if not name.endswith(".csv"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, newline="", encoding="utf-8") as f:
+                stamps = [row["ANALYSIS_TIMESTAMP"] for row in csv.DictReader(f)]
+            maps.append((path, len(stamps), min(stamps), max(stamps)))
+    return maps
+
+
+# ============================================
+# QUERY
+# ============================================
+
+def run_window(maps, low, high):
+    """Prune by zone map, then read the surviving files and filter rows"""
+    start = time.perf_counter()
+    scanned = [m for m in maps if m[3] >= low and m[2] < high]
+    rows_read = matched = 0
+    for path, _, _, _ in scanned:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                rows_read += 1
+                if low <= row["ANALYSIS_TIMESTAMP"] < high:
+                    matched += 1
+    return {
+        "files": len(scanned),
+        "rows_read": rows_read,
+        "matched": matched,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count files a date-range query can skip per layout")
+    parser.add_argument("--records", type=int, default=20000, help="Calls to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--keep", default=None, help="Write the layouts here and keep them (default: temp dir)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("DATE-RANGE PRUNING BENCHMARK")
+    print("=" * 70)
+
+    random.seed(args.seed)
+    records = [generate_call_data.generate_call_record(generate_call_data.START_CALL_ID + i)
+               for i in range(args.records)]
+    work_dir = args.keep or tempfile.mkdtemp(prefix="pruning_")
+    partitioned_dir = os.path.join(work_dir, "partitioned")
+    flat_dir = os.path.join(work_dir, "flat")
+    for directory in (partitioned_dir, flat_dir):
+        shutil.rmtree(directory, ignore_errors=True)
+
+    partitions = generate_call_data.write_partitioned(records, partitioned_dir)
+    # Same number of files for the flat layout, so only the ordering differs
+    write_flat_files(records, flat_dir, -(-len(records) // len(partitions)))
+    layouts = {"flat": zone_maps(flat_dir), "partitioned": zone_maps(partitioned_dir)}
+    print(f"📂 {len(records):,} calls -> {len(layouts['flat'])} files per layout in {work_dir}")
+
+    newest = max(r["ANALYSIS_TIMESTAMP"] for r in records)
+    end_day = datetime.strptime(newest[:10], "%Y-%m-%d") + timedelta(days=1)
+
+    print(f"\n{'Window':<26} {'Layout':<12} {'Files read':>12} {'Rows read':>11} {'Matched':>9} {'Seconds':>8}")
+    for label, back, days in WINDOWS:
+        high_day = end_day - timedelta(days=back)
+        low = (high_day - timedelta(days=days)).strftime("%Y-%m-%d")
+        high = high_day.strftime("%Y-%m-%d")
+        for layout, maps in layouts.items():
+            result = run_window(maps, low, high)
+            skipped = 1 - result["files"] / len(maps)
+            print(f"{label:<26} {layout:<12} {result['files']:>5}/{len(maps):<5} {result['rows_read']:>11,} "
+                  f"{result['matched']:>9,} {result['seconds']:>8.2f}   ({skipped:.0%} skipped)")
+
+    if not args.keep:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    print("✅ Partitioned files cover one day each, so a window reads only its days")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
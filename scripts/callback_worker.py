@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Callback Queue Drain Worker
+Drains CALLBACK_QUEUE with the lease-based claim/complete procedures from
+sql/05_create_custom_tool.sql (section 9) on a pool of worker threads.
+
+Each worker thread repeatedly claims a batch of the highest-priority due
+callbacks under a lease, dials them and completes the batch with one call.
+A callback is only completed by the holder of its lease token; if a worker
+dies its lease expires and the rows are claimed again (up to --max-attempts).
+
+Usage:
+    python scripts/callback_worker.py --local --seed 2000                  # SQLite stand-in
+    python scripts/callback_worker.py --local --seed 2000 --abandon-rate 0.05 --lease-seconds 2
+    python scripts/callback_worker.py --connection my_conn --threads 8 --batch-size 25
+
+Prerequisites:
+    --local: none (SQLite from the standard library)
+    Snowflake: pip install snowflake-connector-python, a connection in
+    ~/.snowflake/connections.toml and sql/05_create_custom_tool.sql deployed
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES_CSV = os.path.join(os.path.dirname(SCRIPT_DIR), "data", "final", "CUSTOMER_PROFILE_COMPLETE.csv")
+QUALIFIED_PREFIX = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING."
+
+CLAIMED_COLUMNS = [
+    "CALLBACK_ID", "LEASE_TOKEN", "CUSTOMER_NAME", "CALLBACK_REASON", "PRIORITY",
+    "SCHEDULED_DATE", "SCHEDULED_TIME", "ASSIGNED_AGENT", "ATTEMPTS",
+]
+
+
+class DialError(Exception):
+    """A callback attempt that did not reach the customer"""
+
+
+# ============================================
+# SNOWFLAKE QUEUE
+# ============================================
+
+class SnowflakeCallbackQueue:
+    """CALLBACK_QUEUE in Snowflake via claim_callbacks / complete_callbacks (one connection per thread)"""
+
+    def __init__(self, connection_name):
+        import snowflake.connector
+        self._connector = snowflake.connector
+        self._connection_name = connection_name
+        self._local = threading.local()
+
+    def _cursor(self):
+        if not hasattr(self._local, "connection"):
+            self._local.connection = self._connector.connect(connection_name=self._connection_name)
+        return self._local.connection.cursor(self._connector.DictCursor)
+
+    def claim(self, worker_id, batch_size, lease_seconds, max_attempts):
+        cursor = self._cursor()
+        cursor.execute(f"CALL {QUALIFIED_PREFIX}claim_callbacks(%s, %s, %s, %s)",
+                       (worker_id, batch_size, lease_seconds, max_attempts))
+        return cursor.fetchall()
+
+    def complete(self, lease_token, outcomes, max_attempts):
+        cursor = self._cursor()
+        cursor.execute(f"CALL {QUALIFIED_PREFIX}complete_callbacks(%s, PARSE_JSON(%s)::ARRAY, %s)",
+                       (lease_token, json.dumps(outcomes), max_attempts))
+        return int(list(cursor.fetchone().values())[0] or 0)
+
+    def outstanding(self):
+        """Due PENDING rows plus leased rows (which may yet expire and come back)"""
+        cursor = self._cursor()
+        cursor.execute(f"""
+            SELECT COUNT(*) AS N FROM {QUALIFIED_PREFIX}CALLBACK_QUEUE
+            WHERE STATUS = 'IN_PROGRESS'
+               OR (STATUS = 'PENDING'
+                   AND TIMESTAMP_NTZ_FROM_PARTS(SCHEDULED_DATE, COALESCE(SCHEDULED_TIME, '00:00:00'::TIME)) <= CURRENT_TIMESTAMP())
+        """)
+        return cursor.fetchone()["N"]
+
+    def status_counts(self):
+        cursor = self._cursor()
+        cursor.execute(f"SELECT STATUS, COUNT(*) AS N FROM {QUALIFIED_PREFIX}CALLBACK_QUEUE GROUP BY STATUS")
+        return {row["STATUS"]: row["N"] for row in cursor.fetchall()}
+
+
+# ============================================
+# LOCAL QUEUE (SQLite stand-in)
+# ============================================
+
+class LocalCallbackQueue:
+    """
+    CALLBACK_QUEUE in a local SQLite file with the same claim/complete semantics
+    as the Snowflake procedures. BEGIN IMMEDIATE plays the part of
+    CALLBACK_CLAIM_LOCK: claims and completions are serialized.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS CALLBACK_QUEUE (
+            CALLBACK_ID INTEGER PRIMARY KEY,
+            CUSTOMER_NAME TEXT NOT NULL,
+            CALLBACK_REASON TEXT,
+            PRIORITY TEXT DEFAULT 'MEDIUM',
+            SCHEDULED_DATE TEXT,
+            SCHEDULED_TIME TEXT,
+            ASSIGNED_AGENT TEXT,
+            STATUS TEXT DEFAULT 'PENDING',
+            LEASE_OWNER TEXT,
+            LEASE_TOKEN TEXT,
+            LEASE_EXPIRES_AT TEXT,
+            ATTEMPTS INTEGER DEFAULT 0,
+            COMPLETED_AT TEXT,
+            LAST_ERROR TEXT
+        )
+    """
+
+    # Same ordering and due-ness as claim_callbacks
+    DUE = "SCHEDULED_DATE || ' ' || COALESCE(SCHEDULED_TIME, '00:00:00') <= :now"
+    PRIORITY_ORDER = "CASE PRIORITY WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3 END"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._db().executescript(self.SCHEMA)
+
+    def _db(self):
+        if not hasattr(self._local, "db"):
+            db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return self._local.db
+
+    @staticmethod
+    def _now(offset_seconds=0):
+        return (datetime.now() + timedelta(seconds=offset_seconds)).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    def reset(self):
+        self._db().execute("DELETE FROM CALLBACK_QUEUE")
+
+    def seed(self, count, seed=42):
+        """Insert count due callbacks for customers from data/final"""
+        with open(PROFILES_CSV, encoding="utf-8") as f:
+            names = [row["CUSTOMER_NAME"] for row in csv.DictReader(f)]
+        rng = random.Random(seed)
+        today = datetime.now().strftime("%Y-%m-%d")
+        rows = [
+            (rng.choice(names), "Outage follow-up",
+             rng.choices(["HIGH", "MEDIUM", "LOW"], weights=[2, 5, 3])[0], today, "00:00:00")
+            for _ in range(count)
+        ]
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        db.executemany("""
+            INSERT INTO CALLBACK_QUEUE (CUSTOMER_NAME, CALLBACK_REASON, PRIORITY, SCHEDULED_DATE, SCHEDULED_TIME)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        db.execute("COMMIT")
+
+    def claim(self, worker_id, batch_size, lease_seconds, max_attempts):
+        db = self._db()
+        token = uuid.uuid4().hex
+        now = self._now()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("""
+                UPDATE CALLBACK_QUEUE
+                SET STATUS = 'FAILED',
+                    LAST_ERROR = 'Lease expired (' || LEASE_OWNER || ') after ' || ATTEMPTS || ' attempts',
+                    LEASE_OWNER = NULL, LEASE_TOKEN = NULL, LEASE_EXPIRES_AT = NULL
+                WHERE STATUS = 'IN_PROGRESS' AND LEASE_EXPIRES_AT < :now AND ATTEMPTS >= :max_attempts
+            """, {"now": now, "max_attempts": max_attempts})
+            db.execute(f"""
+                UPDATE CALLBACK_QUEUE
+                SET STATUS = 'IN_PROGRESS', LEASE_OWNER = :worker, LEASE_TOKEN = :token,
+                    LEASE_EXPIRES_AT = :expires, ATTEMPTS = COALESCE(ATTEMPTS, 0) + 1
+                WHERE CALLBACK_ID IN (
+                    SELECT CALLBACK_ID FROM CALLBACK_QUEUE
+                    WHERE (STATUS = 'PENDING' OR (STATUS = 'IN_PROGRESS' AND LEASE_EXPIRES_AT < :now))
+                      AND {self.DUE}
+                    ORDER BY {self.PRIORITY_ORDER}, SCHEDULED_DATE, SCHEDULED_TIME, CALLBACK_ID
+                    LIMIT :batch_size
+                )
+            """, {"worker": worker_id, "token": token, "expires": self._now(lease_seconds),
+                  "now": now, "batch_size": batch_size})
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        rows = db.execute(f"SELECT {', '.join(CLAIMED_COLUMNS)} FROM CALLBACK_QUEUE "
+                          "WHERE LEASE_TOKEN = ? ORDER BY CALLBACK_ID", (token,))
+        return [dict(row) for row in rows]
+
+    def complete(self, lease_token, outcomes, max_attempts):
+        db = self._db()
+        now = self._now()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            completed = 0
+            for outcome in outcomes:
+                succeeded = bool(outcome.get("succeeded"))
+                completed += db.execute("""
+                    UPDATE CALLBACK_QUEUE
+                    SET STATUS = CASE WHEN :succeeded THEN 'COMPLETED'
+                                      WHEN ATTEMPTS >= :max_attempts THEN 'FAILED'
+                                      ELSE 'PENDING' END,
+                        COMPLETED_AT = CASE WHEN :succeeded THEN :now END,
+                        LAST_ERROR = :error,
+                        LEASE_OWNER = NULL, LEASE_TOKEN = NULL, LEASE_EXPIRES_AT = NULL
+                    WHERE CALLBACK_ID = :callback_id AND LEASE_TOKEN = :token AND STATUS = 'IN_PROGRESS'
+                """, {"succeeded": succeeded, "max_attempts": max_attempts, "now": now,
+                      "error": outcome.get("error"), "callback_id": outcome["callback_id"],
+                      "token": lease_token}).rowcount
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return completed
+
+    def outstanding(self):
+        return self._db().execute(f"""
+            SELECT COUNT(*) FROM CALLBACK_QUEUE
+            WHERE STATUS = 'IN_PROGRESS' OR (STATUS = 'PENDING' AND {self.DUE})
+        """, {"now": self._now()}).fetchone()[0]
+
+    def status_counts(self):
+        rows = self._db().execute("SELECT STATUS, COUNT(*) FROM CALLBACK_QUEUE GROUP BY STATUS")
+        return {status: count for status, count in rows}
+
+
+# ============================================
+# DRAIN WORKER
+# ============================================
+
+class DrainStats:
+    """Thread-safe counters for a drain run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.claimed = 0
+        self.dials = 0
+        self.failed_dials = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.stale_completions = 0
+        self.connected = Counter()  # callback_id -> successful dials
+
+    def record_batch(self, batch, outcomes, completed):
+        with self._lock:
+            self.batches += 1
+            self.claimed += len(batch)
+            self.dials += len(outcomes)
+            self.failed_dials += sum(1 for o in outcomes if not o["succeeded"])
+            self.completed += completed
+            self.stale_completions += len(outcomes) - completed
+            self.connected.update(o["callback_id"] for o in outcomes if o["succeeded"])
+
+    def record_abandoned(self, batch):
+        with self._lock:
+            self.batches += 1
+            self.claimed += len(batch)
+            self.abandoned += len(batch)
+
+    @property
+    def duplicate_dials(self):
+        """Callbacks that reached the customer more than once"""
+        return sum(count - 1 for count in self.connected.values() if count > 1)
+
+
+def simulated_dial(callback, dial_seconds=0.01, failure_rate=0.05, rng=random):
+    """Stand-in dialler: takes dial_seconds and fails failure_rate of the time"""
+    time.sleep(dial_seconds)
+    if rng.random() < failure_rate:
+        raise DialError(f"No answer from {callback['CUSTOMER_NAME']}")
+
+
+def run_worker(queue, worker_id, handler, stats, stop, batch_size=25, lease_seconds=300,
+               max_attempts=3, poll_seconds=1.0, follow=False, abandon_rate=0.0):
+    """Claim -> dial -> complete until the queue is drained (or stop is set)"""
+    while not stop.is_set():
+        batch = queue.claim(worker_id, batch_size, lease_seconds, max_attempts)
+        if not batch:
+            if not follow and queue.outstanding() == 0:
+                return
+            stop.wait(poll_seconds)
+            continue
+
+        if abandon_rate and random.random() < abandon_rate:
+            # Simulate a crashed worker: never complete, let the lease expire
+            stats.record_abandoned(batch)
+            continue
+
+        outcomes = []
+        for callback in batch:
+            try:
+                handler(callback)
+                outcomes.append({"callback_id": callback["CALLBACK_ID"], "succeeded": True})
+            except Exception as exc:
+                outcomes.append({"callback_id": callback["CALLBACK_ID"], "succeeded": False,
+                                 "error": str(exc)[:1000]})
+        completed = queue.complete(batch[0]["LEASE_TOKEN"], outcomes, max_attempts)
+        stats.record_batch(batch, outcomes, completed)
+
+
+def drain(queue, handler, threads=4, **options):
+    """Run `threads` workers against the queue; returns (DrainStats, elapsed seconds)"""
+    stats = DrainStats()
+    stop = threading.Event()
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    errors = []
+
+    def target(index):
+        try:
+            run_worker(queue, f"{prefix}-{index}", handler, stats, stop, **options)
+        except Exception as exc:
+            errors.append(exc)
+            stop.set()
+
+    workers = [threading.Thread(target=target, args=(i,), daemon=True) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.5)
+    except KeyboardInterrupt:
+        print("\n⏹  Stopping - in-flight batches finish, unclaimed rows stay queued")
+        stop.set()
+        for worker in workers:
+            worker.join()
+    if errors:
+        raise errors[0]
+    return stats, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain CALLBACK_QUEUE with leased batch claims")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local", action="store_true", help="Use the local SQLite stand-in")
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "callback_queue.sqlite"),
+                        help="SQLite file for --local")
+    parser.add_argument("--seed", type=int, default=0, help="--local: reset the queue and insert N due callbacks")
+    parser.add_argument("--threads", type=int, default=4, help="Worker threads")
+    parser.add_argument("--batch-size", type=int, default=25, help="Callbacks claimed per lease")
+    parser.add_argument("--lease-seconds", type=int, default=300,
+                        help="Lease length - must exceed the time to dial a whole batch")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a callback is FAILED")
+    parser.add_argument("--poll-seconds", type=float, default=1.0, help="Wait when nothing is due")
+    parser.add_argument("--follow", action="store_true", help="Keep polling after the queue is empty")
+    parser.add_argument("--dial-seconds", type=float, default=0.01, help="Simulated dial duration")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="Simulated unanswered-call rate")
+    parser.add_argument("--abandon-rate", type=float, default=0.0,
+                        help="Simulate crashed workers: fraction of batches claimed and never completed")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("CALLBACK QUEUE DRAIN WORKER")
+    print("=" * 70)
+
+    if args.local:
+        queue = LocalCallbackQueue(args.db)
+        if args.seed:
+            queue.reset()
+            queue.seed(args.seed)
+            print(f"🌱 Seeded {args.seed:,} due callbacks into {args.db}")
+        print(f"📂 Queue: SQLite {args.db}")
+    else:
+        queue = SnowflakeCallbackQueue(args.connection)
+        print(f"❄️  Queue: Snowflake connection '{args.connection}'")
+
+    print(f"⚙️  threads={args.threads} batch={args.batch_size} lease={args.lease_seconds}s "
+          f"max_attempts={args.max_attempts}")
+    print(f"   Before: {queue.status_counts()}")
+
+    rng = random.Random()
+    stats, elapsed = drain(
+        queue,
+        lambda callback: simulated_dial(callback, args.dial_seconds, args.failure_rate, rng),
+        threads=args.threads,
+        batch_size=args.batch_size,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        poll_seconds=args.poll_seconds,
+        follow=args.follow,
+        abandon_rate=args.abandon_rate,
+    )
+
+    print(f"\n📊 Drained in {elapsed:.1f}s")
+    print(f"   Batches claimed:     {stats.batches:,} ({stats.claimed:,} callbacks)")
+    print(f"   Dials:               {stats.dials:,} ({stats.failed_dials:,} unanswered, retried)")
+    print(f"   Outcomes recorded:   {stats.completed:,} ({stats.dials / max(elapsed, 1e-9):,.0f} dials/s)")
+    print(f"   Abandoned (expired): {stats.abandoned:,}")
+    print(f"   Stale completions:   {stats.stale_completions:,} (lease lost before completing)")
+    print(f"   After: {queue.status_counts()}")
+
+    print("\n" + "=" * 70)
+    if stats.duplicate_dials:
+        print(f"❌ {stats.duplicate_dials} DUPLICATE DIAL(S) - increase --lease-seconds")
+        return 1
+    print("✅ No duplicate dials")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Compact Call Record Schema
+Converts call records between the full AI_TRANSCRIBED_CALLS_AI_GENERATED
+layout and the compact AI_TRANSCRIBED_CALLS_COMPACT layout of
+sql/02b_compact_schema.sql:
+
+- Enumerations (sentiment, intent, urgency, ...) become small integer codes;
+  CODES below is the lookup (CALL_CODE_LOOKUP in SQL - keep both in sync)
+- Agent/customer names are stored once, as columns. CALL_ANALYSIS and
+  EXTRACTED_FIELDS are rebuilt from the columns by the
+  AI_TRANSCRIBED_CALLS_AI_GENERATED view; the original JSON is kept (as
+  VARIANT) only for rows where it says something the columns do not
+- The pandas index column "" is dropped
+
+Run directly to convert a full CSV and compare sizes (CSV load volume and,
+with pyarrow, Parquet bytes as a proxy for scanned bytes):
+
+Usage:
+    python scripts/compact_schema.py                                  # data/final/FINAL_TABLE_COMPLETE.csv
+    python scripts/compact_schema.py --input calls.csv --output calls_compact.csv
+
+Prerequisites:
+    None (pyarrow optional, for the Parquet comparison)
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+FULL_CSV = os.path.join(PROJECT_ROOT, "data", "final", "FINAL_TABLE_COMPLETE.csv")
+
+csv.field_size_limit(sys.maxsize)
+
+# Column -> labels; code = position + 1 (0 is never used, NULL means missing)
+CODES = {
+    "SENTIMENT_CATEGORY": ["POSITIVE", "NEUTRAL", "NEGATIVE"],
+    "CALL_CLASSIFICATION": ["Billing Issue", "Technical Support", "Inquiry", "Compliment", "Complaint"],
+    "CALL_TYPE": ["inbound", "outbound"],
+    "PRIMARY_INTENT": ["billing", "technical_support", "cancellation", "complaint", "compliment", "information"],
+    "URGENCY_LEVEL": ["low", "medium", "high"],
+    "ISSUE_RESOLVED": ["yes", "no", "partial"],
+    "ESCALATION_REQUIRED": ["no", "yes"],
+    "CUSTOMER_SATISFACTION": ["satisfied", "neutral", "dissatisfied"],
+}
+_CODE_OF = {column: {label: code for code, label in enumerate(labels, 1)} for column, labels in CODES.items()}
+
+FULL_COLUMNS = [
+    "CALL_ID", "TRANSCRIPT_TEXT", "WORD_COUNT", "SENTIMENT_SCORE", "SENTIMENT_CATEGORY", "CALL_SUMMARY",
+    "CALL_CLASSIFICATION", "EXTRACTED_FIELDS", "CALL_ANALYSIS", "AGENT_PERFORMANCE_SCORE",
+    "IMPROVEMENT_OPPORTUNITIES", "ANALYSIS_TIMESTAMP", "CALL_TYPE", "CUSTOMER_NAME", "AGENT_NAME",
+    "PRIMARY_INTENT", "URGENCY_LEVEL", "ISSUE_RESOLVED", "ESCALATION_REQUIRED", "CUSTOMER_SATISFACTION",
+]
+
+COMPACT_COLUMNS = [
+    "CALL_ID", "ANALYSIS_TIMESTAMP", "CUSTOMER_NAME", "AGENT_NAME",
+    "SENTIMENT_CATEGORY_CODE", "CALL_CLASSIFICATION_CODE", "CALL_TYPE_CODE", "PRIMARY_INTENT_CODE",
+    "URGENCY_LEVEL_CODE", "ISSUE_RESOLVED_CODE", "ESCALATION_REQUIRED_CODE", "CUSTOMER_SATISFACTION_CODE",
+    "SENTIMENT_SCORE", "AGENT_PERFORMANCE_SCORE", "WORD_COUNT",
+    "CALL_SUMMARY", "IMPROVEMENT_OPPORTUNITIES", "TRANSCRIPT_TEXT",
+    "CALL_ANALYSIS_RAW", "EXTRACTED_FIELDS_RAW",
+]
+
+# CALL_ANALYSIS keys that mirror columns
+ANALYSIS_KEYS = ["agent_name", "call_type", "customer_name", "customer_satisfaction",
+                 "escalation_required", "issue_resolved", "primary_intent", "urgency_level"]
+
+
+# ============================================
+# CODES
+# ============================================
+
+def encode(column, label):
+    """Code for a label (None for empty / unknown labels)"""
+    if label in (None, ""):
+        return None
+    return _CODE_OF[column].get(label)
+
+
+def decode(column, code):
+    if code in (None, ""):
+        return None
+    return CODES[column][int(code) - 1]
+
+
+# ============================================
+# JSON REBUILT FROM COLUMNS
+# ============================================
+
+def analysis_from_columns(row):
+    """CALL_ANALYSIS as the view rebuilds it"""
+    return {key: row[key.upper()] for key in ANALYSIS_KEYS}
+
+
+def extracted_from_columns(row):
+    """EXTRACTED_FIELDS as the view rebuilds it"""
+    return {"response": {"agent_name": row["AGENT_NAME"], "customer_name": row["CUSTOMER_NAME"]}}
+
+
+def _as_json(value):
+    if isinstance(value, (dict, list)):
+        return value
+    try:
+        return json.loads(value) if value else None
+    except (TypeError, ValueError):
+        return value
+
+
+def _normalized(row):
+    """Column values as strings, the way they compare with the JSON copies"""
+    return {column: "" if row.get(column) is None else str(row.get(column)) for column in FULL_COLUMNS}
+
+
+# ============================================
+# CONVERSION
+# ============================================
+
+def to_compact(row):
+    """Full record (CSV row or generator record) -> compact record"""
+    values = _normalized(row)
+    compact = {
+        "CALL_ID": values["CALL_ID"],
+        "ANALYSIS_TIMESTAMP": values["ANALYSIS_TIMESTAMP"],
+        "CUSTOMER_NAME": values["CUSTOMER_NAME"],
+        "AGENT_NAME": values["AGENT_NAME"],
+        "SENTIMENT_SCORE": row.get("SENTIMENT_SCORE"),
+        "AGENT_PERFORMANCE_SCORE": row.get("AGENT_PERFORMANCE_SCORE"),
+        "WORD_COUNT": row.get("WORD_COUNT"),
+        "CALL_SUMMARY": row.get("CALL_SUMMARY"),
+        "IMPROVEMENT_OPPORTUNITIES": row.get("IMPROVEMENT_OPPORTUNITIES"),
+        "TRANSCRIPT_TEXT": row.get("TRANSCRIPT_TEXT"),
+    }
+    for column in CODES:
+        compact[f"{column}_CODE"] = encode(column, values[column])
+
+    # Keep the JSON only where it is not a copy of the columns
+    analysis = _as_json(row.get("CALL_ANALYSIS"))
+    compact["CALL_ANALYSIS_RAW"] = (
+        None if analysis == analysis_from_columns(values) else json.dumps(analysis, separators=(",", ":"))
+    )
+    extracted = _as_json(row.get("EXTRACTED_FIELDS"))
+    compact["EXTRACTED_FIELDS_RAW"] = (
+        None if extracted == extracted_from_columns(values) else json.dumps(extracted, separators=(",", ":"))
+    )
+    return {column: compact[column] for column in COMPACT_COLUMNS}
+
+
+def from_compact(row):
+    """Compact record -> full record (what the view returns); JSON as dicts"""
+    full = {column: row.get(column) for column in FULL_COLUMNS if column in row}
+    for column in CODES:
+        full[column] = decode(column, row.get(f"{column}_CODE"))
+    values = _normalized(full)
+    full["CALL_ANALYSIS"] = _as_json(row.get("CALL_ANALYSIS_RAW")) or analysis_from_columns(values)
+    full["EXTRACTED_FIELDS"] = _as_json(row.get("EXTRACTED_FIELDS_RAW")) or extracted_from_columns(values)
+    return {column: full.get(column) for column in FULL_COLUMNS}
+
+
+def write_csv(records, path_or_file, columns):
+    """Write records with a header; accepts a path or an open text file"""
+    if isinstance(path_or_file, str):
+        with open(path_or_file, "w", newline="", encoding="utf-8") as f:
+            return write_csv(records, f, columns)
+    writer = csv.DictWriter(path_or_file, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(records)
+
+
+# ============================================
+# SIZE COMPARISON
+# ============================================
+
+def parquet_sizes(records, columns):
+    """(total bytes, {column: compressed bytes}) of records written as Parquet, or None without pyarrow"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    table = pa.Table.from_pylist([{c: r.get(c) for c in columns} for r in records])
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer, compression="zstd")
+    data = buffer.getvalue()
+    metadata = pq.ParquetFile(pa.BufferReader(data)).metadata
+    per_column = {}
+    for group in range(metadata.num_row_groups):
+        for index in range(metadata.num_columns):
+            chunk = metadata.row_group(group).column(index)
+            per_column[chunk.path_in_schema] = per_column.get(chunk.path_in_schema, 0) + chunk.total_compressed_size
+    return data.size, per_column
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert full call records to the compact schema and compare sizes")
+    parser.add_argument("--input", default=FULL_CSV, help="Full-schema CSV")
+    parser.add_argument("--output", default=None, help="Write the compact CSV here (for COPY INTO the compact table)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("COMPACT CALL SCHEMA")
+    print("=" * 70)
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    compact = [to_compact(row) for row in rows]
+
+    # Round trip: the view must return what the full table held
+    mismatched = 0
+    for row, packed in zip(rows, compact):
+        rebuilt = from_compact(packed)
+        original = _normalized(row)
+        for column in FULL_COLUMNS:
+            if column in ("CALL_ANALYSIS", "EXTRACTED_FIELDS"):
+                same = rebuilt[column] == _as_json(row[column])
+            else:
+                same = _normalized(rebuilt)[column] == original[column]
+            if not same:
+                mismatched += 1
+                break
+    kept_json = sum(1 for r in compact if r["CALL_ANALYSIS_RAW"] or r["EXTRACTED_FIELDS_RAW"])
+    print(f"📂 {len(rows)} rows from {os.path.relpath(args.input, PROJECT_ROOT)}")
+    print(f"   JSON kept as VARIANT for {kept_json} rows (differs from the columns); rebuilt for the rest")
+    if mismatched:
+        print(f"❌ {mismatched} rows do not round-trip")
+        return 1
+    print("✓ Every row round-trips through the compact schema")
+
+    full_csv, compact_csv = io.StringIO(), io.StringIO()
+    write_csv(rows, full_csv, list(rows[0].keys()))
+    write_csv(compact, compact_csv, COMPACT_COLUMNS)
+    full_bytes, compact_bytes = len(full_csv.getvalue().encode()), len(compact_csv.getvalue().encode())
+    print(f"\n📦 CSV (load volume):     full {full_bytes / 1e3:,.0f} KB -> compact {compact_bytes / 1e3:,.0f} KB "
+          f"({1 - compact_bytes / full_bytes:.0%} smaller)")
+
+    full_parquet = parquet_sizes(rows, list(rows[0].keys()))
+    compact_parquet = parquet_sizes(compact, COMPACT_COLUMNS)
+    if full_parquet and compact_parquet:
+        print(f"📦 Parquet (storage):     full {full_parquet[0] / 1e3:,.0f} KB -> compact {compact_parquet[0] / 1e3:,.0f} KB "
+              f"({1 - compact_parquet[0] / full_parquet[0]:.0%} smaller)")
+        # Dashboard-style scan: everything except transcript/summary/improvement text
+        text = {"TRANSCRIPT_TEXT", "CALL_SUMMARY", "IMPROVEMENT_OPPORTUNITIES"}
+        full_scan = sum(size for column, size in full_parquet[1].items() if column not in text)
+        compact_scan = sum(size for column, size in compact_parquet[1].items() if column not in text)
+        print(f"📦 Scan without free text: full {full_scan / 1e3:,.1f} KB -> compact {compact_scan / 1e3:,.1f} KB "
+              f"({1 - compact_scan / full_scan:.0%} smaller)")
+    else:
+        print("ℹ️  Install pyarrow for the Parquet storage / scan comparison")
+
+    if args.output:
+        write_csv(compact, args.output, COMPACT_COLUMNS)
+        print(f"\n✓ Compact CSV: {args.output}")
+
+    print("\n" + "=" * 70)
+    print("✅ Load the compact CSV with sql/02b_compact_schema.sql (Option B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
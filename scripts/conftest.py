@@ -0,0 +1,9 @@
+# pytest setup for the scripts/ test modules: the dashboard modules under test
+# live in "Streamlit App/", which is not a package, so put it on sys.path
+
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Streamlit App")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
@@ -2,17 +2,47 @@
 Generate realistic call center data for Snowflake Intelligence demo
 Creates 448 additional call records with diverse scenarios, realistic transcripts,
 and varied sentiment/resolution patterns.
+
+Usage:
+    python generate_call_data.py                                   # ADDITIONAL_CALL_DATA.csv
+    python generate_call_data.py --layout partitioned --output calls/
+        -> calls/call_date=YYYY-MM-DD/part-00000.csv, each file sorted by
+           ANALYSIS_TIMESTAMP, plus calls/_partitions.json (per-file row
+           counts and min/max timestamps)
+    python generate_call_data.py --schema compact
+        -> AI_TRANSCRIBED_CALLS_COMPACT columns (enumeration codes, no
+           duplicated JSON, no index column); see sql/02b_compact_schema.sql
+    python generate_call_data.py --append --records 1000
+        -> deltas/calls_batch_00001.csv (CALL_IDs continue after the last
+           one) and deltas/profiles_batch_00001.csv (newly seen customers
+           only). State lives in generation_index.json, bootstrapped from
+           data/final on the first run; later runs never reread old data.
+    python generate_call_data.py --records 1000000 --metrics-json run.json --profile cprofile
+        -> progress with rows/sec, ETA and RSS every --progress-seconds, then a
+           summary of time per phase (sampling, templating, json, io), bytes
+           written and peak RSS (see generator_metrics.py)
 """
 
+import argparse
 import csv
+import os
 import random
 import json
 from datetime import datetime, timedelta
 
+import compact_schema
+import generate_customer_profiles
+import generator_metrics
+from generation_index import INDEX_FILE, GenerationIndex
+from generator_metrics import NULL_METRICS, GeneratorMetrics
+
 # Configuration
 NUM_RECORDS = 448
 START_CALL_ID = 52  # Continue from existing data
 OUTPUT_FILE = "ADDITIONAL_CALL_DATA.csv"
+PARTITIONED_OUTPUT_DIR = "calls_partitioned"
+MAX_ROWS_PER_FILE = 100000
+DELTA_DIR = "deltas"
 
 # Agent names (mix of existing and new)
 AGENTS = [
@@ -219,86 +249,91 @@ def generate_improvement_opportunities(performance_score):
             "Customer left very dissatisfied. Agent must improve empathy, listening, and solution offerings."
         ])
 
-def generate_call_record(call_id):
-    """Generate a single realistic call record"""
-    # Select scenario
-    scenario = random.choice(BILLING_SCENARIOS)
-    
-    # Select agent and customer
-    agent_name = random.choice(AGENTS)
-    customer_name = f"{random.choice(CUSTOMER_FIRST)} {random.choice(CUSTOMER_LAST)}"
-    
-    # Generate call details
-    call_type = random.choice(["inbound", "outbound"])
-    issue_resolved = random.choice(scenario["resolution"])
-    
-    # Generate sentiment
-    sentiment_score = round(random.uniform(*scenario["sentiment_range"]), 4)
-    if sentiment_score > 0.5:
-        sentiment_category = "POSITIVE"
-        customer_satisfaction = random.choice(["satisfied", "neutral"])
-    elif sentiment_score < -0.3:
-        sentiment_category = "NEGATIVE"
-        customer_satisfaction = random.choice(["dissatisfied", "neutral"])
-    else:
-        sentiment_category = "NEUTRAL"
-        customer_satisfaction = "neutral"
-    
-    # Generate performance score
-    performance_score = random.randint(*scenario["performance_range"])
-    
-    # Urgency and escalation
-    if sentiment_category == "NEGATIVE" and issue_resolved == "no":
-        urgency_level = random.choice(["medium", "high"])
-        escalation_required = random.choice(["yes", "no"])
-    else:
-        urgency_level = random.choice(["low", "medium"])
-        escalation_required = "no"
-    
-    # Generate transcript
-    transcript = generate_transcript(scenario, agent_name)
-    word_count = len(transcript.split())
-    
-    # Generate summary
-    call_summary = generate_call_summary(transcript, scenario)
+def generate_call_record(call_id, metrics=NULL_METRICS):
+    """Generate a single realistic call record (phases are timed when metrics are passed)"""
+    with metrics.phase("sampling"):
+        # Select scenario
+        scenario = random.choice(BILLING_SCENARIOS)
+        
+        # Select agent and customer
+        agent_name = random.choice(AGENTS)
+        customer_name = f"{random.choice(CUSTOMER_FIRST)} {random.choice(CUSTOMER_LAST)}"
+        
+        # Generate call details
+        call_type = random.choice(["inbound", "outbound"])
+        issue_resolved = random.choice(scenario["resolution"])
+        
+        # Generate sentiment
+        sentiment_score = round(random.uniform(*scenario["sentiment_range"]), 4)
+        if sentiment_score > 0.5:
+            sentiment_category = "POSITIVE"
+            customer_satisfaction = random.choice(["satisfied", "neutral"])
+        elif sentiment_score < -0.3:
+            sentiment_category = "NEGATIVE"
+            customer_satisfaction = random.choice(["dissatisfied", "neutral"])
+        else:
+            sentiment_category = "NEUTRAL"
+            customer_satisfaction = "neutral"
+        
+        # Generate performance score
+        performance_score = random.randint(*scenario["performance_range"])
+        
+        # Urgency and escalation
+        if sentiment_category == "NEGATIVE" and issue_resolved == "no":
+            urgency_level = random.choice(["medium", "high"])
+            escalation_required = random.choice(["yes", "no"])
+        else:
+            urgency_level = random.choice(["low", "medium"])
+            escalation_required = "no"
     
-    # Call classification
-    classifications = {
-        "billing": "Billing Issue",
-        "technical_support": "Technical Support",
-        "cancellation": "Billing Issue",
-        "compliment": "Compliment",
-        "information": "Inquiry",
-        "complaint": "Complaint"
-    }
-    call_classification = classifications[scenario["intent"]]
+    with metrics.phase("templating"):
+        # Generate transcript
+        transcript = generate_transcript(scenario, agent_name)
+        word_count = len(transcript.split())
+        
+        # Generate summary
+        call_summary = generate_call_summary(transcript, scenario)
+        
+        # Call classification
+        classifications = {
+            "billing": "Billing Issue",
+            "technical_support": "Technical Support",
+            "cancellation": "Billing Issue",
+            "compliment": "Compliment",
+            "information": "Inquiry",
+            "complaint": "Complaint"
+        }
+        call_classification = classifications[scenario["intent"]]
     
-    # Generate timestamp (random within last 90 days)
-    days_ago = random.randint(0, 90)
-    timestamp = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    with metrics.phase("sampling"):
+        # Generate timestamp (random within last 90 days)
+        days_ago = random.randint(0, 90)
+        timestamp = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
     
-    # Extracted fields (JSON)
-    extracted_fields = json.dumps({
-        "response": {
+    with metrics.phase("json"):
+        # Extracted fields (JSON)
+        extracted_fields = json.dumps({
+            "response": {
+                "agent_name": agent_name,
+                "customer_name": customer_name
+            }
+        })
+        
+        # Call analysis (JSON)
+        call_analysis = json.dumps({
             "agent_name": agent_name,
-            "customer_name": customer_name
-        }
-    })
+            "call_type": call_type,
+            "customer_name": customer_name,
+            "customer_satisfaction": customer_satisfaction,
+            "escalation_required": escalation_required,
+            "issue_resolved": issue_resolved,
+            "primary_intent": scenario["intent"],
+            "urgency_level": urgency_level
+        })
     
-    # Call analysis (JSON)
-    call_analysis = json.dumps({
-        "agent_name": agent_name,
-        "call_type": call_type,
-        "customer_name": customer_name,
-        "customer_satisfaction": customer_satisfaction,
-        "escalation_required": escalation_required,
-        "issue_resolved": issue_resolved,
-        "primary_intent": scenario["intent"],
-        "urgency_level": urgency_level
-    })
-    
-    # Improvement opportunities
-    improvement_opportunities = generate_improvement_opportunities(performance_score)
+    with metrics.phase("templating"):
+        # Improvement opportunities
+        improvement_opportunities = generate_improvement_opportunities(performance_score)
     
     # Build record
     record = {
@@ -327,29 +362,134 @@ def generate_call_record(call_id):
     
     return record
 
+def write_flat(records, output_file):
+    """All records in generation order in one CSV"""
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        if records:
+            writer = csv.DictWriter(f, fieldnames=records[0].keys())
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def write_partitioned(records, output_dir, max_rows_per_file=MAX_ROWS_PER_FILE):
+    """
+    Hive-style layout: output_dir/call_date=YYYY-MM-DD/part-NNNNN.csv with each
+    file sorted by ANALYSIS_TIMESTAMP, so every file (and every micro-partition
+    loaded from it) covers one day. The pandas index column is dropped so the
+    files load straight into AI_TRANSCRIBED_CALLS_AI_GENERATED.
+    Also writes output_dir/_partitions.json with each file's row count and
+    min/max timestamp. Returns that list.
+    """
+    by_date = {}
+    for record in records:
+        by_date.setdefault(record["ANALYSIS_TIMESTAMP"][:10], []).append(record)
+    
+    partitions = []
+    for call_date, day_records in sorted(by_date.items()):
+        day_records.sort(key=lambda r: (r["ANALYSIS_TIMESTAMP"], r["CALL_ID"]))
+        day_dir = os.path.join(output_dir, f"call_date={call_date}")
+        os.makedirs(day_dir, exist_ok=True)
+        for part, start in enumerate(range(0, len(day_records), max_rows_per_file)):
+            chunk = [{k: v for k, v in r.items() if k != ""} for r in day_records[start:start + max_rows_per_file]]
+            path = os.path.join(day_dir, f"part-{part:05d}.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=chunk[0].keys())
+                writer.writeheader()
+                writer.writerows(chunk)
+            partitions.append({
+                "path": os.path.relpath(path, output_dir).replace(os.sep, "/"),
+                "call_date": call_date,
+                "rows": len(chunk),
+                "min_timestamp": chunk[0]["ANALYSIS_TIMESTAMP"],
+                "max_timestamp": chunk[-1]["ANALYSIS_TIMESTAMP"],
+            })
+    
+    with open(os.path.join(output_dir, "_partitions.json"), 'w', encoding='utf-8') as f:
+        json.dump(partitions, f, indent=1)
+    return partitions
+
+
 def main():
-    """Generate all call records and write to CSV"""
-    print(f"Generating {NUM_RECORDS} call center records...")
+    """Generate all call records and write them flat or date-partitioned"""
+    parser = argparse.ArgumentParser(description="Generate synthetic call center records")
+    parser.add_argument("--records", type=int, default=NUM_RECORDS, help="Number of calls to generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible output")
+    parser.add_argument("--layout", choices=["flat", "partitioned"], default="flat",
+                        help="flat: one CSV in generation order; partitioned: call_date=YYYY-MM-DD/ folders, time-sorted")
+    parser.add_argument("--output", default=None,
+                        help=f"Output file (flat, default {OUTPUT_FILE}) or folder (partitioned, default {PARTITIONED_OUTPUT_DIR})")
+    parser.add_argument("--max-rows-per-file", type=int, default=MAX_ROWS_PER_FILE,
+                        help="Partitioned layout: split larger days into several files")
+    parser.add_argument("--schema", choices=["full", "compact"], default="full",
+                        help="full: AI_TRANSCRIBED_CALLS_AI_GENERATED columns; compact: AI_TRANSCRIBED_CALLS_COMPACT columns")
+    parser.add_argument("--append", action="store_true",
+                        help="Continue from the generation index: write only a delta batch of calls and new profiles")
+    parser.add_argument("--index", default=INDEX_FILE, help="Generation index file (--append)")
+    parser.add_argument("--delta-dir", default=DELTA_DIR, help="Folder for delta batches (--append)")
+    generator_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    
+    index = None
+    first_call_id = START_CALL_ID
+    if args.append:
+        index = GenerationIndex.load(args.index)
+        if index is None:
+            print(f"No {args.index} yet - bootstrapping from existing data (one-time scan)...")
+            index = GenerationIndex.bootstrap(args.index)
+        index.restore_rng(args.seed)
+        first_call_id = index.last_call_id + 1
+        batch_name = f"batch_{len(index.batches) + 1:05d}"
+        os.makedirs(args.delta_dir, exist_ok=True)
+        print(f"Appending after call_id {index.last_call_id} ({len(index.customers)} known customers)")
+    elif args.seed is not None:
+        random.seed(args.seed)
+    num_records = args.records
+    print(f"Generating {num_records} call center records...")
+    metrics = GeneratorMetrics.from_args(args, "generate_call_data", total=num_records, unit="records")
     
     records = []
-    for i in range(NUM_RECORDS):
-        call_id = START_CALL_ID + i
-        record = generate_call_record(call_id)
+    for i in range(num_records):
+        call_id = first_call_id + i
+        record = generate_call_record(call_id, metrics)
         records.append(record)
-        
-        if (i + 1) % 50 == 0:
-            print(f"  Generated {i + 1}/{NUM_RECORDS} records...")
+        metrics.tick()
     
-    # Write to CSV
-    print(f"Writing to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-        if records:
-            writer = csv.DictWriter(f, fieldnames=records[0].keys())
-            writer.writeheader()
-            writer.writerows(records)
+    # Statistics below read the full records; only the written rows are compact
+    rows = [compact_schema.to_compact(r) for r in records] if args.schema == "compact" else records
     
-    print(f"✓ Successfully generated {NUM_RECORDS} records!")
-    print(f"✓ Output: {OUTPUT_FILE}")
+    if args.layout == "partitioned":
+        output = args.output or (os.path.join(args.delta_dir, f"calls_{batch_name}") if index else PARTITIONED_OUTPUT_DIR)
+        print(f"Writing date partitions to {output}/...")
+        with metrics.phase("io"):
+            partitions = write_partitioned(rows, output, args.max_rows_per_file)
+        metrics.add_output(output)
+        print(f"✓ Successfully generated {num_records} records!")
+        print(f"✓ Output: {len(partitions)} files in {len({p['call_date'] for p in partitions})} call_date= folders")
+    else:
+        output = args.output or (os.path.join(args.delta_dir, f"calls_{batch_name}.csv") if index else OUTPUT_FILE)
+        print(f"Writing to {output}...")
+        with metrics.phase("io"):
+            write_flat(rows, output)
+        metrics.add_output(output)
+        print(f"✓ Successfully generated {num_records} records!")
+        print(f"✓ Output: {output}")
+    
+    if index is not None:
+        # Profiles only for customers the index has not seen; IDs continue
+        new_customers = index.add_customers(r["CUSTOMER_NAME"] for r in records)
+        profiles_output = None
+        if new_customers:
+            profiles_output = os.path.join(args.delta_dir, f"profiles_{batch_name}.csv")
+            with metrics.phase("sampling"):
+                new_profiles = generate_customer_profiles.generate_new_profiles(new_customers)
+            with metrics.phase("io"):
+                generate_customer_profiles.write_profiles(new_profiles, profiles_output)
+            metrics.add_output(profiles_output)
+        index.capture_rng()
+        index.record_batch(first_call_id, first_call_id + num_records - 1, output, profiles_output, len(new_customers))
+        index.save()
+        print(f"✓ New customers: {len(new_customers)}" + (f" -> {profiles_output}" if profiles_output else ""))
+        print(f"✓ Index: {args.index} (next call_id {index.last_call_id + 1})")
     
     # Print statistics
     intents = {}
@@ -367,6 +507,8 @@ def main():
     print("\nSentiment Distribution:")
     for sentiment, count in sorted(sentiments.items()):
         print(f"  {sentiment}: {count} ({count/len(records)*100:.1f}%)")
+    
+    metrics.finish()
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,25 @@
 """
 Generate comprehensive customer profiles for ALL customers in the call data
 Ensures every call can be joined to customer demographic information
+
+Top-ups do not rescan the call CSVs: generate_call_data.py --append writes
+profiles for newly seen customers only (generate_new_profiles), using the
+customer list kept in generation_index.json.
+
+Progress, rates, phase timings and memory come from generator_metrics.py:
+    python generate_customer_profiles.py --metrics-json profiles_run.json --profile tracemalloc
 """
 
+import argparse
 import csv
 import random
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+import generator_metrics
+from generation_index import is_real_customer
+from generator_metrics import GeneratorMetrics
+
 # Read all unique customers from both datasets
 def get_all_customers():
     """Extract unique customer names from both call datasets"""
@@ -18,7 +30,7 @@ def get_all_customers():
         reader = csv.DictReader(f)
         for row in reader:
             name = row.get('CUSTOMER_NAME', '').strip()
-            if name and name != 'None' and name.lower() != 'unknown':
+            if is_real_customer(name):
                 customers.add(name)
     
     # From ADDITIONAL_CALL_DATA
@@ -26,7 +38,7 @@ def get_all_customers():
         reader = csv.DictReader(f)
         for row in reader:
             name = row.get('CUSTOMER_NAME', '').strip()
-            if name and name != 'None' and name.lower() != 'unknown':
+            if is_real_customer(name):
                 customers.add(name)
     
     return sorted(list(customers))
@@ -244,32 +256,47 @@ def generate_customer_profile(customer_id, customer_name):
     
     return profile
 
+def generate_new_profiles(new_customers):
+    """Profiles for [(customer_id, customer_name)] - the delta of an append run"""
+    return [generate_customer_profile(customer_id, name) for customer_id, name in new_customers]
+
+def write_profiles(profiles, output_file):
+    """Write profiles to CSV (header + one row per customer)"""
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        if profiles:
+            writer = csv.DictWriter(f, fieldnames=profiles[0].keys())
+            writer.writeheader()
+            writer.writerows(profiles)
+
 def main():
     """Generate customer profiles for ALL unique customers"""
+    parser = argparse.ArgumentParser(description="Generate customer profiles for every customer in the call data")
+    generator_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    
     print("Extracting unique customers from call data...")
+    metrics = GeneratorMetrics.from_args(args, "generate_customer_profiles", unit="profiles")
     
-    customers = get_all_customers()
+    with metrics.phase("io"):
+        customers = get_all_customers()
+    metrics.total = len(customers)
     
     print(f"Found {len(customers)} unique customers")
     print(f"Generating comprehensive customer profiles...")
     
     profiles = []
     for idx, customer_name in enumerate(customers, start=1):
-        profile = generate_customer_profile(idx, customer_name)
+        with metrics.phase("sampling"):
+            profile = generate_customer_profile(idx, customer_name)
         profiles.append(profile)
-        
-        if idx % 20 == 0:
-            print(f"  Generated {idx}/{len(customers)} profiles...")
+        metrics.tick()
     
     # Write to CSV
     output_file = 'CUSTOMER_PROFILE_COMPLETE.csv'
     print(f"\nWriting to {output_file}...")
-    
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        if profiles:
-            writer = csv.DictWriter(f, fieldnames=profiles[0].keys())
-            writer.writeheader()
-            writer.writerows(profiles)
+    with metrics.phase("io"):
+        write_profiles(profiles, output_file)
+    metrics.add_output(output_file)
     
     print(f"✓ Successfully generated {len(profiles)} customer profiles!")
     print(f"✓ Output: {output_file}")
@@ -314,6 +341,8 @@ def main():
     
     print("\n✅ Customer profiles are now aligned with call data!")
     print("   All calls will have matching customer demographic information.")
+    
+    metrics.finish()
 
 if __name__ == "__main__":
     main()
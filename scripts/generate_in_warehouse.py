@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+In-Warehouse Data Generation
+Runs the call and profile generators (scenarios, transcript templates, sampling
+rules from generate_call_data.py / generate_customer_profiles.py) as Snowpark
+Python UDTFs, so large datasets are generated on the warehouse and inserted
+straight into the tables - nothing is generated, written or uploaded locally.
+
+- GENERATE_CALLS(SEQ, SEED) returns one call row. It is fed by
+  TABLE(GENERATOR(ROWCOUNT => N)), so the warehouse spreads the rows over all
+  of its Python workers; --batch-records caps the rows per INSERT
+- GENERATE_CUSTOMER_PROFILES(CUSTOMER_ID, CUSTOMER_NAME, SEED) returns one
+  profile row, for each customer in the calls that has no profile yet (IDs
+  continue after the highest CUSTOMER_ID)
+- Every row reseeds the generator from (seed, call number) - or (seed, name)
+  for a profile - so the output does not depend on how the warehouse splits
+  the work, and any row can be regenerated on its own (only the time of day
+  in ANALYSIS_TIMESTAMP comes from the clock, as in generate_call_data.py)
+- CALL_IDs continue after the highest one in the table. Each batch numbers
+  its rows with ROW_NUMBER() (SEQ8() alone may skip values, which would run
+  into the next batch's range), so batches are contiguous and never overlap
+
+--local runs the same UDTFs in Snowpark local testing mode and checks the rows
+against the plain Python generator. The local emulator cannot pass columns
+from a joined table into a UDTF, so there each row is one UDTF call with
+literal arguments; the warehouse path uses the GENERATOR join.
+
+Usage:
+    python scripts/generate_in_warehouse.py --local --records 200 --seed 42
+    python scripts/generate_in_warehouse.py --connection my_conn --records 1000000000 --seed 42
+    python scripts/generate_in_warehouse.py --connection my_conn --records 5000000 --dry-run
+
+Prerequisites:
+    pip install snowflake-snowpark-python
+    Snowflake: a connection in ~/.snowflake/connections.toml and the full-schema
+    tables from sql/02_create_tables_and_load.sql (not the compact view of 02b)
+"""
+
+import argparse
+import os
+import random
+import sys
+from functools import reduce
+
+import generate_call_data
+import generate_customer_profiles
+import generator_metrics
+from generator_metrics import GeneratorMetrics
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CALL_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED"
+PROFILE_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE"
+CALL_UDTF = "GENERATE_CALLS"
+PROFILE_UDTF = "GENERATE_CUSTOMER_PROFILES"
+
+CALL_ID_OFFSET = 10050          # CALL_20250728_<10050 + call number>, as in generate_call_record
+BATCH_RECORDS = 100_000_000
+DEFAULT_SEED = 0
+LOCAL_RECORDS = 200
+
+# Modules the UDTF handlers import on the warehouse
+MODULE_FILES = [os.path.join(SCRIPT_DIR, name) for name in (
+    "generate_in_warehouse.py", "generate_call_data.py", "generate_customer_profiles.py",
+    "generation_index.py", "generator_metrics.py", "compact_schema.py",
+)]
+
+# Output columns with their Snowpark type and the SQL that converts the UDTF value
+CALL_COLUMNS = [
+    ("CALL_ID", "string", None),
+    ("TRANSCRIPT_TEXT", "string", None),
+    ("WORD_COUNT", "integer", None),
+    ("SENTIMENT_SCORE", "float", None),
+    ("SENTIMENT_CATEGORY", "string", None),
+    ("CALL_SUMMARY", "string", None),
+    ("CALL_CLASSIFICATION", "string", None),
+    ("EXTRACTED_FIELDS", "string", "PARSE_JSON({})"),
+    ("CALL_ANALYSIS", "string", "PARSE_JSON({})"),
+    ("AGENT_PERFORMANCE_SCORE", "integer", None),
+    ("IMPROVEMENT_OPPORTUNITIES", "string", None),
+    ("ANALYSIS_TIMESTAMP", "string", "TO_TIMESTAMP_NTZ({}, 'YYYY-MM-DD\"T\"HH24:MI:SS.FF3\"Z\"')"),
+    ("CALL_TYPE", "string", None),
+    ("CUSTOMER_NAME", "string", None),
+    ("AGENT_NAME", "string", None),
+    ("PRIMARY_INTENT", "string", None),
+    ("URGENCY_LEVEL", "string", None),
+    ("ISSUE_RESOLVED", "string", None),
+    ("ESCALATION_REQUIRED", "string", None),
+    ("CUSTOMER_SATISFACTION", "string", None),
+]
+
+TIMESTAMP_INDEX = [name for name, _, _ in CALL_COLUMNS].index("ANALYSIS_TIMESTAMP")
+
+PROFILE_COLUMNS = [
+    ("CUSTOMER_ID", "integer", None),
+    ("CUSTOMER_NAME", "string", None),
+    ("EMAIL", "string", None),
+    ("PHONE", "string", None),
+    ("STATE", "string", None),
+    ("REGION", "string", None),
+    ("COUNTRY", "string", None),
+    ("CITY", "string", None),
+    ("POSTAL_CODE", "string", None),
+    ("ACCOUNT_TYPE", "string", None),
+    ("CUSTOMER_SEGMENT", "string", None),
+    ("CUSTOMER_SINCE", "string", "TO_DATE({})"),
+    ("ACCOUNT_STATUS", "string", None),
+    ("MONTHLY_PLAN_VALUE", "float", None),
+    ("LIFETIME_VALUE", "float", None),
+    ("PAYMENT_METHOD", "string", None),
+    ("PREFERRED_CONTACT", "string", None),
+    ("LANGUAGE_PREFERENCE", "string", None),
+    ("AGE_GROUP", "string", None),
+    ("INDUSTRY", "string", None),
+]
+
+
+# ============================================
+# ROW GENERATION (runs inside the UDTFs)
+# ============================================
+
+def call_row(seq, seed):
+    """One call row, determined by (seed, seq) alone"""
+    random.seed(f"call:{seed}:{seq}")
+    record = generate_call_data.generate_call_record(seq)
+    return tuple(record[name] for name, _, _ in CALL_COLUMNS)
+
+
+def profile_row(customer_id, customer_name, seed):
+    """One profile row, determined by (seed, customer_name) alone"""
+    random.seed(f"profile:{seed}:{customer_name}")
+    profile = generate_customer_profiles.generate_customer_profile(customer_id, customer_name)
+    return tuple(profile[name] for name, _, _ in PROFILE_COLUMNS)
+
+
+class CallGenerator:
+    """UDTF handler: (SEQ, SEED) -> one call row"""
+
+    def process(self, seq, seed):
+        yield call_row(seq, seed)
+
+
+class ProfileGenerator:
+    """UDTF handler: (CUSTOMER_ID, CUSTOMER_NAME, SEED) -> one profile row"""
+
+    def process(self, customer_id, customer_name, seed):
+        yield profile_row(customer_id, customer_name, seed)
+
+
+# ============================================
+# REGISTRATION
+# ============================================
+
+def _schema(columns):
+    from snowflake.snowpark.types import FloatType, IntegerType, StringType, StructField, StructType
+    types = {"string": StringType, "integer": IntegerType, "float": FloatType}
+    return StructType([StructField(name, types[kind]()) for name, kind, _ in columns])
+
+
+def register_generators(session):
+    """Register GENERATE_CALLS and GENERATE_CUSTOMER_PROFILES for this session; returns both UDTFs"""
+    from snowflake.snowpark.types import IntegerType, StringType
+    calls = session.udtf.register(
+        CallGenerator, name=CALL_UDTF, output_schema=_schema(CALL_COLUMNS),
+        input_types=[IntegerType(), IntegerType()], imports=MODULE_FILES, replace=True,
+    )
+    profiles = session.udtf.register(
+        ProfileGenerator, name=PROFILE_UDTF, output_schema=_schema(PROFILE_COLUMNS),
+        input_types=[IntegerType(), StringType(), IntegerType()], imports=MODULE_FILES, replace=True,
+    )
+    return calls, profiles
+
+
+# ============================================
+# WAREHOUSE SQL
+# ============================================
+
+def _select_list(columns, alias):
+    return ",\n            ".join((convert or "{}").format(f"{alias}.{name}") for name, _, convert in columns)
+
+
+def calls_insert_sql(first_call_id, records, seed):
+    """INSERT of `records` generated calls numbered first_call_id .. first_call_id + records - 1, no gaps"""
+    names = ", ".join(name for name, _, _ in CALL_COLUMNS)
+    return f"""
+        INSERT INTO {CALL_TABLE} ({names})
+        SELECT
+            {_select_list(CALL_COLUMNS, "c")}
+        FROM (
+            SELECT ROW_NUMBER() OVER (ORDER BY SEQ8()) - 1 + {int(first_call_id)} AS SEQ
+            FROM TABLE(GENERATOR(ROWCOUNT => {int(records)}))
+        ) s,
+             TABLE({CALL_UDTF}(s.SEQ, {int(seed)})) c
+    """
+
+
+def profiles_insert_sql(seed):
+    """INSERT of a profile for every customer in the calls without one (IDs continue after the highest)"""
+    names = ", ".join(name for name, _, _ in PROFILE_COLUMNS)
+    return f"""
+        INSERT INTO {PROFILE_TABLE} ({names})
+        SELECT
+            {_select_list(PROFILE_COLUMNS, "p")}
+        FROM (
+            SELECT m.MAX_ID + ROW_NUMBER() OVER (ORDER BY n.CUSTOMER_NAME) AS CUSTOMER_ID, n.CUSTOMER_NAME
+            FROM (
+                SELECT DISTINCT c.CUSTOMER_NAME
+                FROM {CALL_TABLE} c
+                WHERE NOT EXISTS (SELECT 1 FROM {PROFILE_TABLE} e WHERE e.CUSTOMER_NAME = c.CUSTOMER_NAME)
+            ) n,
+            (SELECT COALESCE(MAX(CUSTOMER_ID), 0) AS MAX_ID FROM {PROFILE_TABLE}) m
+        ) n,
+        TABLE({PROFILE_UDTF}(n.CUSTOMER_ID, n.CUSTOMER_NAME, {int(seed)})) p
+    """
+
+
+def next_call_id(session):
+    """Call number after the highest CALL_ID in the table"""
+    row = session.sql(f"""
+        SELECT COALESCE(MAX(TRY_TO_NUMBER(SPLIT_PART(CALL_ID, '_', 3))), {CALL_ID_OFFSET}) AS LAST_ID
+        FROM {CALL_TABLE}
+    """).collect()[0]
+    return int(row["LAST_ID"]) - CALL_ID_OFFSET + 1
+
+
+def generate_in_warehouse(session, first_call_id, records, seed, batch_records, metrics):
+    """Insert the calls batch by batch, then the new customer profiles; returns profiles inserted"""
+    register_generators(session)
+    for offset in range(0, records, batch_records):
+        batch = min(batch_records, records - offset)
+        session.sql(calls_insert_sql(first_call_id + offset, batch, seed)).collect()
+        metrics.tick(batch)
+    result = session.sql(profiles_insert_sql(seed)).collect()
+    return result[0][0] if result else 0
+
+
+# ============================================
+# LOCAL TESTING MODE
+# ============================================
+
+def _union(frames):
+    return reduce(lambda left, right: left.union_all(right), frames)
+
+
+def generate_locally(session, first_call_id, records, seed, metrics):
+    """
+    Same UDTFs in Snowpark local testing mode, one literal-argument call per row,
+    saved to the emulated tables. Returns (call rows, profile rows).
+    """
+    from snowflake.snowpark.functions import lit
+    calls_udtf, profiles_udtf = register_generators(session)
+
+    frames = []
+    for seq in range(first_call_id, first_call_id + records):
+        frames.append(session.table_function(calls_udtf(lit(seq), lit(seed))))
+        metrics.tick()
+    _union(frames).write.save_as_table(CALL_TABLE, mode="append")
+    calls = session.table(CALL_TABLE).collect()
+
+    names = sorted({row["CUSTOMER_NAME"] for row in calls})
+    frames = [session.table_function(profiles_udtf(lit(customer_id), lit(name), lit(seed)))
+              for customer_id, name in enumerate(names, start=1)]
+    _union(frames).write.save_as_table(PROFILE_TABLE, mode="append")
+    return calls, session.table(PROFILE_TABLE).collect()
+
+
+def _seeded_values(row):
+    """A call row without the clock-dependent time of day (ANALYSIS_TIMESTAMP keeps its date)"""
+    return row[:TIMESTAMP_INDEX] + (row[TIMESTAMP_INDEX][:10],) + row[TIMESTAMP_INDEX + 1:]
+
+
+def check_local_output(calls, profiles, first_call_id, records, seed):
+    """Compare the UDTF rows with call_row/profile_row; returns a list of problems"""
+    problems = []
+    expected = {row[0]: _seeded_values(row)
+                for row in (call_row(seq, seed) for seq in range(first_call_id, first_call_id + records))}
+    actual = {row["CALL_ID"]: _seeded_values(tuple(row)) for row in calls}
+    if len(calls) != records or len(actual) != records:
+        problems.append(f"{len(calls)} call rows / {len(actual)} distinct CALL_IDs, expected {records}")
+    mismatched = [call_id for call_id, row in expected.items() if actual.get(call_id) != row]
+    if mismatched:
+        problems.append(f"{len(mismatched)} call rows differ from the Python generator (first: {mismatched[0]})")
+
+    profiled = {row["CUSTOMER_NAME"]: tuple(row) for row in profiles}
+    missing = {row["CUSTOMER_NAME"] for row in calls} - set(profiled)
+    if missing:
+        problems.append(f"{len(missing)} customers without a profile")
+    differing = [name for name, row in profiled.items() if row != profile_row(row[0], name, seed)]
+    if differing:
+        problems.append(f"{len(differing)} profiles differ from the Python generator (first: {differing[0]})")
+    return problems
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate calls and customer profiles with Snowpark UDTFs")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local", action="store_true", help="Snowpark local testing mode, checked against the Python generator")
+    parser.add_argument("--records", type=int, default=None,
+                        help=f"Calls to generate (default {LOCAL_RECORDS} with --local, {generate_call_data.NUM_RECORDS} otherwise)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed; the same seed and call numbers give the same rows")
+    parser.add_argument("--start-call-id", type=int, default=None,
+                        help="First call number (default: after the highest CALL_ID in the table)")
+    parser.add_argument("--batch-records", type=int, default=BATCH_RECORDS, help="Calls per INSERT statement")
+    parser.add_argument("--dry-run", action="store_true", help="Print the SQL instead of running it")
+    generator_metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    records = args.records or (LOCAL_RECORDS if args.local else generate_call_data.NUM_RECORDS)
+
+    print("=" * 70)
+    print("IN-WAREHOUSE DATA GENERATION")
+    print("=" * 70)
+
+    from snowflake.snowpark import Session
+    if args.local:
+        session = Session.builder.config("local_testing", True).create()
+        first_call_id = args.start_call_id or generate_call_data.START_CALL_ID
+    else:
+        session = Session.builder.config("connection_name", args.connection).create()
+        first_call_id = args.start_call_id or next_call_id(session)
+
+    print(f"Target:  {'Snowpark local testing' if args.local else args.connection}")
+    print(f"Calls:   {records:,} from CALL_20250728_{CALL_ID_OFFSET + first_call_id} (seed {args.seed})\n")
+
+    if args.dry_run:
+        print(calls_insert_sql(first_call_id, min(records, args.batch_records), args.seed))
+        print(profiles_insert_sql(args.seed))
+        return 0
+
+    metrics = GeneratorMetrics.from_args(args, "generate_in_warehouse", total=records, unit="records")
+    if args.local:
+        calls, profiles = generate_locally(session, first_call_id, records, args.seed, metrics)
+        problems = check_local_output(calls, profiles, first_call_id, records, args.seed)
+        print(f"✓ {len(calls):,} calls and {len(profiles):,} profiles generated by {CALL_UDTF} / {PROFILE_UDTF}")
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✓ Rows match the Python generator for the same seed")
+        metrics.finish()
+        return 1 if problems else 0
+
+    new_profiles = generate_in_warehouse(session, first_call_id, records, args.seed, args.batch_records, metrics)
+    print(f"✓ {records:,} calls inserted into {CALL_TABLE}")
+    print(f"✓ {new_profiles:,} new customer profiles inserted into {PROFILE_TABLE}")
+    print(f"✓ Next call number: {first_call_id + records}")
+    metrics.finish()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Generation Index
+Small on-disk state that lets generate_call_data.py --append top up a dataset
+without rereading it: the last CALL_ID number, every known customer with its
+CUSTOMER_ID, the random generator state and a log of the delta batches.
+
+The first --append run bootstraps the index from the existing calls/profiles
+CSVs (one scan); every later run only loads this file, so a top-up costs
+O(delta) instead of O(history).
+
+Usage:
+    python scripts/generation_index.py                          # show generation_index.json
+    python scripts/generation_index.py --index path/to/index.json
+
+Prerequisites:
+    None (standard library only)
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+INDEX_FILE = "generation_index.json"
+BOOTSTRAP_CALLS = os.path.join(PROJECT_ROOT, "data", "final", "FINAL_TABLE_COMPLETE.csv")
+BOOTSTRAP_PROFILES = os.path.join(PROJECT_ROOT, "data", "final", "CUSTOMER_PROFILE_COMPLETE.csv")
+
+# generate_call_data.py: CALL_ID = f"CALL_20250728_{CALL_ID_OFFSET + call_id}"
+CALL_ID_OFFSET = 10050
+INDEX_VERSION = 1
+
+csv.field_size_limit(sys.maxsize)
+
+
+def is_real_customer(name):
+    """Names that get a profile (calls can carry 'None' / 'unknown' placeholders)"""
+    name = (name or "").strip()
+    return bool(name) and name != "None" and name.lower() != "unknown"
+
+
+def call_number(call_id):
+    """'CALL_20250728_10549' -> 499 (the call_id passed to generate_call_record)"""
+    return int(call_id.rsplit("_", 1)[1]) - CALL_ID_OFFSET
+
+
+class GenerationIndex:
+    """Last call number, known customers, RNG state and batch log of one dataset"""
+
+    def __init__(self, path, last_call_id, customers, rng_state=None, batches=None):
+        self.path = path
+        self.last_call_id = last_call_id
+        self.customers = customers  # CUSTOMER_NAME -> CUSTOMER_ID
+        self.rng_state = rng_state
+        self.batches = batches or []
+
+    # ============================================
+    # LOAD / SAVE
+    # ============================================
+
+    @classmethod
+    def load(cls, path):
+        """The index at path, or None if there is none yet"""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path}: unsupported index version {data.get('version')}")
+        return cls(path, data["last_call_id"], data["customers"], data.get("rng_state"), data.get("batches"))
+
+    @classmethod
+    def bootstrap(cls, path, calls_csv=BOOTSTRAP_CALLS, profiles_csv=BOOTSTRAP_PROFILES):
+        """Build the index from existing CSVs - the only full scan"""
+        last_call_id = 0
+        call_customers = set()
+        if os.path.exists(calls_csv):
+            with open(calls_csv, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    last_call_id = max(last_call_id, call_number(row["CALL_ID"]))
+                    if is_real_customer(row.get("CUSTOMER_NAME")):
+                        call_customers.add(row["CUSTOMER_NAME"].strip())
+
+        customers = {}
+        if os.path.exists(profiles_csv):
+            with open(profiles_csv, newline="", encoding="utf-8") as f:
+                customers = {row["CUSTOMER_NAME"]: int(row["CUSTOMER_ID"]) for row in csv.DictReader(f)}
+        # Customers with calls but no profile yet get IDs after the profiled ones
+        next_id = max(customers.values(), default=0) + 1
+        for name in sorted(call_customers - customers.keys()):
+            customers[name] = next_id
+            next_id += 1
+        return cls(path, last_call_id, customers)
+
+    def save(self):
+        """Write atomically, so an interrupted run leaves the previous index intact"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "last_call_id": self.last_call_id,
+                "customers": self.customers,
+                "rng_state": self.rng_state,
+                "batches": self.batches,
+            }, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    # ============================================
+    # STATE
+    # ============================================
+
+    def restore_rng(self, seed=None):
+        """Continue the random sequence of the previous batch (seed only applies to the first)"""
+        if self.rng_state:
+            version, internal, gauss_next = self.rng_state
+            random.setstate((version, tuple(internal), gauss_next))
+        elif seed is not None:
+            random.seed(seed)
+
+    def capture_rng(self):
+        version, internal, gauss_next = random.getstate()
+        self.rng_state = [version, list(internal), gauss_next]
+
+    @property
+    def next_customer_id(self):
+        return max(self.customers.values(), default=0) + 1
+
+    def add_customers(self, names):
+        """Register names not seen before; returns [(CUSTOMER_ID, name)] for the new ones"""
+        added = []
+        next_id = self.next_customer_id
+        for name in names:
+            name = name.strip()
+            if is_real_customer(name) and name not in self.customers:
+                self.customers[name] = next_id
+                added.append((next_id, name))
+                next_id += 1
+        return added
+
+    def record_batch(self, first_call_id, last_call_id, calls_path, profiles_path, new_customers):
+        self.last_call_id = last_call_id
+        self.batches.append({
+            "batch": len(self.batches) + 1,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "first_call_id": first_call_id,
+            "last_call_id": last_call_id,
+            "calls": calls_path,
+            "profiles": profiles_path,
+            "new_customers": new_customers,
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the generation index used by generate_call_data.py --append")
+    parser.add_argument("--index", default=INDEX_FILE, help="Index file")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("GENERATION INDEX")
+    print("=" * 70)
+
+    index = GenerationIndex.load(args.index)
+    if index is None:
+        print(f"❌ No index at {args.index} - run generate_call_data.py --append to create one")
+        return 1
+    print(f"📂 {args.index}")
+    print(f"   Last call: CALL_20250728_{CALL_ID_OFFSET + index.last_call_id} (call_id {index.last_call_id})")
+    print(f"   Known customers: {len(index.customers)} (next CUSTOMER_ID {index.next_customer_id})")
+    print(f"   RNG state saved: {'yes' if index.rng_state else 'no'}")
+    print(f"\n{'Batch':>5} {'Created':<20} {'Call IDs':<14} {'New cust.':>9}  Files")
+    for batch in index.batches:
+        files = ", ".join(p for p in (batch["calls"], batch["profiles"]) if p)
+        print(f"{batch['batch']:>5} {batch['created']:<20} {batch['first_call_id']:>6}-{batch['last_call_id']:<7} "
+              f"{batch['new_customers']:>9}  {files}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Generator Metrics
+Shared progress and performance instrumentation for the dataset generators
+(generate_call_data.py, generate_customer_profiles.py). It prints a progress
+line every few seconds with rows/sec, ETA and RSS. It also times the generation
+phases (sampling, templating, JSON encoding, I/O) and counts the bytes written.
+At the end it prints a run summary, optionally written as JSON, so long builds
+can be tuned and compared run to run. --profile adds a cProfile (top functions
+by cumulative time, plus a .prof file) or tracemalloc (peak traced memory and
+top allocation sites) capture to the summary.
+
+Usage (from a generator):
+    metrics = GeneratorMetrics.from_args(args, "calls", total=num_records, unit="records")
+    with metrics.phase("sampling"):
+        ...
+    metrics.tick()
+    metrics.add_output(path)
+    metrics.finish()
+
+    python scripts/generator_metrics.py summary.json     # print a saved summary
+
+Prerequisites:
+    None (standard library only)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+PHASES = ("sampling", "templating", "json", "io")
+PROFILE_TOP = 15
+
+
+def current_rss_bytes():
+    """Resident set size of this process (Linux /proc, falls back to peak RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    """High-water RSS of this process (0 where the resource module is unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def path_bytes(path):
+    """Size of a file, or of every file under a folder"""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def add_arguments(parser):
+    """The shared --metrics-json / --profile / --progress-seconds options"""
+    parser.add_argument("--metrics-json", default=None, help="Write the run summary (rates, phases, memory) to this file")
+    parser.add_argument("--profile", choices=["cprofile", "tracemalloc"], default=None,
+                        help="Add a cProfile or tracemalloc capture to the summary (slows the run)")
+    parser.add_argument("--progress-seconds", type=float, default=5.0, help="Seconds between progress lines")
+
+
+class _PhaseTimer:
+    """Reusable timing block for one phase (cheaper per record than a generator context manager)"""
+
+    __slots__ = ("phases", "name", "start")
+
+    def __init__(self, phases, name):
+        self.phases = phases
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.phases[self.name] += time.perf_counter() - self.start
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullMetrics:
+    """Stand-in when a generator function is called without instrumentation"""
+
+    _timer = _NoTimer()
+
+    def phase(self, name):
+        return self._timer
+
+    def tick(self, rows=1):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class GeneratorMetrics:
+    """Progress, phase timings, bytes written, RSS and optional profiling for one generator run"""
+
+    def __init__(self, name, total=None, unit="rows", progress_seconds=5.0, profile=None, summary_path=None):
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.progress_seconds = progress_seconds
+        self.profile = profile
+        self.summary_path = summary_path
+        self.rows = 0
+        self.bytes_written = 0
+        self.outputs = []
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._timers = {}
+        self.peak_rss = current_rss_bytes()
+        self._profiler = None
+        self._start = self._last_report = time.perf_counter()
+        self._start_profile()
+
+    @classmethod
+    def from_args(cls, args, name, total=None, unit="rows"):
+        return cls(name, total, unit, args.progress_seconds, args.profile, args.metrics_json)
+
+    # ---------- hooks ----------
+
+    def phase(self, name):
+        """`with metrics.phase(name):` adds the block's time to that phase (blocks of one phase must not nest)"""
+        timer = self._timers.get(name)
+        if timer is None:
+            self.phases.setdefault(name, 0.0)
+            timer = self._timers[name] = _PhaseTimer(self.phases, name)
+        return timer
+
+    def tick(self, rows=1):
+        """Count generated rows; prints a progress line at most every progress_seconds"""
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self._last_report >= self.progress_seconds:
+            self._last_report = now
+            self._report(now)
+
+    def add_output(self, path):
+        """Count the bytes of a written file (or folder of files)"""
+        size = path_bytes(path)
+        self.bytes_written += size
+        self.outputs.append({"path": path, "bytes": size})
+
+    # ---------- reporting ----------
+
+    def _report(self, now):
+        elapsed = now - self._start
+        rate = self.rows / elapsed if elapsed else 0.0
+        rss = current_rss_bytes()
+        self.peak_rss = max(self.peak_rss, rss)
+        progress = f"{self.rows:,}/{self.total:,}" if self.total else f"{self.rows:,}"
+        eta = ""
+        if self.total and rate:
+            eta = f" | ETA {(self.total - self.rows) / rate:,.0f}s"
+        print(f"  Generated {progress} {self.unit} | {rate:,.0f} {self.unit}/s{eta} | RSS {rss / 1e6:,.0f} MB",
+              flush=True)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self._start
+        self.peak_rss = max(self.peak_rss, current_rss_bytes(), peak_rss_bytes())
+        timed = sum(self.phases.values())
+        phases = {name: {"seconds": round(seconds, 3), "share": round(seconds / elapsed, 3) if elapsed else 0.0}
+                  for name, seconds in self.phases.items()}
+        phases["other"] = {"seconds": round(max(elapsed - timed, 0.0), 3),
+                           "share": round(max(elapsed - timed, 0.0) / elapsed, 3) if elapsed else 0.0}
+        return {
+            "generator": self.name,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "argv": sys.argv[1:],
+            "rows": self.rows,
+            "unit": self.unit,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "bytes_written": self.bytes_written,
+            "bytes_per_second": round(self.bytes_written / elapsed, 1) if elapsed else 0.0,
+            "peak_rss_mb": round(self.peak_rss / 1e6, 1),
+            "phases": phases,
+            "outputs": self.outputs,
+        }
+
+    def finish(self):
+        """Stop profiling, print the run summary and write it as JSON if requested; returns it"""
+        summary = self.summary()
+        profile = self._stop_profile()
+        if profile:
+            summary["profile"] = profile
+
+        print(f"\n⏱️  {self.name}: {summary['rows']:,} {self.unit} in {summary['seconds']:,.1f}s "
+              f"({summary['rows_per_second']:,.0f}/s) | {summary['bytes_written'] / 1e6:,.1f} MB written | "
+              f"peak RSS {summary['peak_rss_mb']:,.0f} MB")
+        print("   " + " | ".join(f"{name} {p['seconds']:.2f}s ({p['share'] * 100:.0f}%)"
+                                 for name, p in summary["phases"].items() if p["seconds"]))
+        if profile:
+            print_profile(profile)
+
+        if self.summary_path:
+            with open(self.summary_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            print(f"✓ Metrics: {self.summary_path}")
+        return summary
+
+    # ---------- profiling ----------
+
+    def _start_profile(self):
+        if self.profile == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+            tracemalloc.start()
+
+    def _stop_profile(self):
+        if self.profile == "cprofile":
+            import pstats
+            self._profiler.disable()
+            stats = pstats.Stats(self._profiler)
+            prof_path = os.path.splitext(self.summary_path or f"{self.name}_metrics")[0] + ".prof"
+            stats.dump_stats(prof_path)
+            rows = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP]
+            return {
+                "mode": "cprofile",
+                "prof_file": prof_path,
+                "top_cumulative": [
+                    {"function": f"{os.path.basename(file)}:{line}({func})", "calls": calls,
+                     "total_seconds": round(total, 3), "cumulative_seconds": round(cumulative, 3)}
+                    for (file, line, func), (_, calls, total, cumulative, _) in rows
+                ],
+            }
+        if self.profile == "tracemalloc":
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return {
+                "mode": "tracemalloc",
+                "peak_traced_mb": round(peak / 1e6, 1),
+                "top_allocations": [
+                    {"site": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                     "mb": round(stat.size / 1e6, 2), "blocks": stat.count}
+                    for stat in snapshot.statistics("lineno")[:PROFILE_TOP]
+                ],
+            }
+        return None
+
+
+def print_profile(profile):
+    if profile["mode"] == "cprofile":
+        print(f"   cProfile (top by cumulative time, full stats: {profile['prof_file']}):")
+        for row in profile["top_cumulative"]:
+            print(f"     {row['cumulative_seconds']:>8.3f}s cum {row['total_seconds']:>8.3f}s self "
+                  f"{row['calls']:>9,}  {row['function']}")
+    else:
+        print(f"   tracemalloc: peak traced {profile['peak_traced_mb']:,.1f} MB; top allocation sites:")
+        for row in profile["top_allocations"]:
+            print(f"     {row['mb']:>8.2f} MB {row['blocks']:>9,} blocks  {row['site']}")
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a saved generator run summary")
+    parser.add_argument("summary", help="JSON written with --metrics-json")
+    args = parser.parse_args()
+
+    with open(args.summary, encoding="utf-8") as f:
+        summary = json.load(f)
+    print("=" * 70)
+    print(f"GENERATOR RUN: {summary['generator']} ({summary['timestamp']})")
+    print("=" * 70)
+    print(f"Rows:        {summary['rows']:,} {summary['unit']} in {summary['seconds']:,.1f}s "
+          f"({summary['rows_per_second']:,.0f}/s)")
+    print(f"Written:     {summary['bytes_written'] / 1e6:,.1f} MB ({summary['bytes_per_second'] / 1e6:,.1f} MB/s)")
+    print(f"Peak RSS:    {summary['peak_rss_mb']:,.0f} MB")
+    print("Phases:")
+    for name, phase in summary["phases"].items():
+        print(f"  {name:<12} {phase['seconds']:>9.2f}s {phase['share'] * 100:>5.1f}%")
+    if "profile" in summary:
+        print_profile(summary["profile"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
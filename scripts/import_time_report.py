@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Dashboard Import-Time Report
+Breaks a cold start of the dashboard down the way `python -X importtime` does,
+phase by phase: importing the app script, loading the data, then the first
+render of every page (which imports that page's module and its plotting
+libraries). Each run uses a fresh interpreter, so nothing is already in
+sys.modules; the harness itself (pandas, pyarrow, DuckDB) is imported before
+the first phase, as Streamlit imports pandas/pyarrow before running the script.
+
+Usage:
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py --top 8 --runs 3
+    python scripts/import_time_report.py --json benchmarks/results/import_times.json
+
+Prerequisites:
+    pip install pandas pyarrow duckdb plotly  (polars optional)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MARKER = "@@phase"
+
+# Runs in the child interpreter under -X importtime; phase markers go to stderr
+# so they interleave with the import lines in order
+CHILD = f"""
+import sys, time
+import app_harness
+
+def phase(name, action):
+    print("{MARKER} start " + name, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    result = action()
+    print("{MARKER} end " + name + " " + str(time.perf_counter() - start), file=sys.stderr, flush=True)
+    return result
+
+calls, profiles = app_harness.load_final_tables()
+session = app_harness.make_session(calls, profiles)
+app, stub = phase("app import", lambda: app_harness.load_app(session))
+
+def load_data():
+    app.load_call_data(), app.load_customer_profiles(), app.get_summary_stats(None)
+    app.get_priority_feed(), app.load_rollup_cube()
+phase("data", load_data)
+
+for label in app.PAGES:
+    stub.inputs["Select View"] = label
+    phase("page: " + label.split(" ", 1)[1], app.main)
+"""
+
+
+# ============================================
+# PARSING
+# ============================================
+
+def parse_importtime(stderr):
+    """
+    Split -X importtime output into phases.
+    Returns [{"phase", "seconds", "imports": [(name, self_us, cumulative_us, depth)]}]
+    """
+    phases, current = [], None
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            parts = line.split(" ", 2)
+            if parts[1] == "start":
+                current = {"phase": parts[2], "seconds": None, "imports": []}
+            elif current is not None:
+                name, seconds = parts[2].rsplit(" ", 1)
+                current["seconds"] = float(seconds)
+                phases.append(current)
+                current = None
+            continue
+        if current is None or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |   cumulative | <2 spaces per nesting level>name"
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        depth = (len(module) - len(module.lstrip(" ")) - 1) // 2
+        current["imports"].append((module.strip(), int(self_us), int(cumulative_us), depth))
+    return phases
+
+
+def summarize(phases, top):
+    """Per phase: wall time, module count, total import time and the heaviest top-level imports"""
+    summary = []
+    for phase in phases:
+        imports = phase["imports"]
+        outermost = min((depth for *_, depth in imports), default=0)
+        heaviest = sorted((i for i in imports if i[3] == outermost), key=lambda i: -i[2])[:top]
+        summary.append({
+            "phase": phase["phase"],
+            "wall_ms": phase["seconds"] * 1000,
+            "modules": len(imports),
+            "import_ms": sum(i[1] for i in imports) / 1000,
+            "heaviest": [(name, cumulative / 1000) for name, _, cumulative, _ in heaviest],
+        })
+    return summary
+
+
+def run_once():
+    """One fresh interpreter; returns the parsed phases"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=SCRIPT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return parse_importtime(result.stderr)
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for the dashboard cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to run (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports listed per phase")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("DASHBOARD IMPORT-TIME REPORT")
+    print("=" * 70)
+    print(f"Runs: {args.runs} fresh interpreters (median wall / import times)\n")
+
+    runs = [summarize(run_once(), args.top) for _ in range(args.runs)]
+    report = []
+    for position, phase in enumerate(runs[0]):
+        samples = [run[position] for run in runs]
+        report.append(dict(phase, wall_ms=median(s["wall_ms"] for s in samples),
+                           import_ms=median(s["import_ms"] for s in samples)))
+
+    print(f"{'Phase':<28} {'Wall ms':>9} {'Modules':>8} {'Import ms':>10}")
+    print("-" * 58)
+    for phase in report:
+        print(f"{phase['phase']:<28} {phase['wall_ms']:>9.1f} {phase['modules']:>8} {phase['import_ms']:>10.1f}")
+        for name, cumulative_ms in phase["heaviest"]:
+            print(f"{'':<6}{name:<40} {cumulative_ms:>8.1f} ms")
+
+    cold_start = report[0]["wall_ms"] + report[1]["wall_ms"] + report[2]["wall_ms"]
+    print(f"\n⏱️  Cold start to first page ({report[2]['phase']}): {cold_start:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Dashboard Concurrent-User Load Test
+Simulates N supervisors using the dashboard at once. Each session runs in its
+own thread, as Streamlit runs one script thread per browser session in a single
+process. Each one follows a scripted persona: page switches, sentiment filter
+changes, priority paging, customer lookups and transcript searches. Every step
+is a full rerun of the app's main() against the local DuckDB stand-in session
+(app_harness), so the shared caches, frame store and data-access functions are
+exercised exactly as in the deployed app.
+
+Reports p50/p95/p99 latency per action and overall, throughput (reruns/s) and
+peak memory per session. Pass several session counts to get a capacity curve;
+each count then runs in a fresh interpreter, so memory freed by one level does
+not hide the next level's growth.
+
+Usage:
+    python scripts/load_test_dashboard.py                                  # data/final, 20 sessions
+    python scripts/load_test_dashboard.py --sessions 1,10,50 --steps 40
+    python scripts/load_test_dashboard.py --rows 300k --sessions 20 --think-ms 0
+    python scripts/load_test_dashboard.py --json benchmarks/results/load_test.json
+
+Prerequisites:
+    pip install pandas pyarrow duckdb plotly  (polars optional)
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import app_harness
+from benchmark_dashboard import PeakMemory, current_rss_bytes
+
+SENTIMENTS = ['POSITIVE', 'NEUTRAL', 'NEGATIVE']
+SEARCH_TERMS = ['billing', 'refund', 'cancel', 'internet', 'upgrade', 'password', 'outage', 'charge']
+SEARCH_TYPOS = {'Thompson': 'Thompsn', 'Carter': 'Cartr', 'Johnson': 'Jonson'}
+
+PAGE_EXECUTIVE = "📊 Executive Dashboard"
+PAGE_AGENTS = "👨‍💼 Agent Performance"
+PAGE_CUSTOMERS = "👤 Customer Insights"
+PAGE_REGIONAL = "🗺️ Regional Analysis"
+PAGE_SEARCH = "🔍 Transcript Search"
+PAGE_AGENT_TRENDS = "📈 Agent Trends"
+PAGE_SENTIMENT_TRENDS = "📉 Sentiment Trends"
+
+
+# ============================================
+# PERSONAS
+# ============================================
+# A persona yields (action, widget changes) steps; changes persist like widget
+# state in a real session, so a filter set on one page still applies on the next.
+# None resets a widget to its default (e.g. the first fuzzy match in the selector).
+
+def supervisor(rng, data):
+    """Watches the landing page: sentiment filters, headline periods, priority paging"""
+    yield "open executive", {"Select View": PAGE_EXECUTIVE}
+    while True:
+        roll = rng.random()
+        if roll < 0.35:
+            yield "change sentiment filter", {"Sentiment": rng.choice([['NEGATIVE'], ['NEGATIVE', 'NEUTRAL'], SENTIMENTS])}
+        elif roll < 0.6:
+            yield "page priority feed", {"Priority page": rng.randint(1, 15)}
+        elif roll < 0.8:
+            yield "change headline period", {"Headline period": rng.choice(['All time', 'Last 7 days', 'Last 30 days'])}
+        else:
+            yield "open customer", {"Select View": PAGE_CUSTOMERS, "Find customer:": "",
+                                    "Select Customer": rng.choice(data['customers'])}
+            yield "open executive", {"Select View": PAGE_EXECUTIVE}
+
+
+def analyst(rng, data):
+    """Investigates calls: transcript searches and customer lookups (exact and fuzzy)"""
+    while True:
+        roll = rng.random()
+        if roll < 0.45:
+            yield "search transcripts", {"Select View": PAGE_SEARCH, "Search transcripts:": rng.choice(SEARCH_TERMS)}
+        elif roll < 0.75:
+            yield "select customer", {"Select View": PAGE_CUSTOMERS, "Find customer:": "",
+                                      "Select Customer": rng.choice(data['customers'])}
+        elif roll < 0.9:
+            name = rng.choice(data['customers'])
+            for word, typo in SEARCH_TYPOS.items():
+                name = name.replace(word, typo)
+            yield "find customer", {"Select View": PAGE_CUSTOMERS, "Find customer:": name, "Select Customer": None}
+        else:
+            yield "change sentiment filter", {"Sentiment": rng.choice([['NEGATIVE'], SENTIMENTS])}
+
+
+def manager(rng, data):
+    """Reviews teams: agent performance, regional analysis and the trend pages"""
+    while True:
+        roll = rng.random()
+        if roll < 0.2:
+            yield "open agents", {"Select View": PAGE_AGENTS}
+        elif roll < 0.35:
+            yield "open regional", {"Select View": PAGE_REGIONAL}
+        elif roll < 0.65:
+            yield "agent trends", {"Select View": PAGE_AGENT_TRENDS,
+                                   "Agents": rng.sample(data['agents'], min(len(data['agents']), rng.randint(2, 6))),
+                                   "Time bucket": rng.choice(['Day', 'Week', 'Month'])}
+        elif roll < 0.9:
+            yield "sentiment trends", {"Select View": PAGE_SENTIMENT_TRENDS,
+                                       "Intent": rng.sample(data['intents'], rng.randint(0, 2)),
+                                       "Region": rng.sample(data['regions'], rng.randint(0, 2))}
+        else:
+            yield "change sentiment filter", {"Sentiment": rng.choice([['NEGATIVE'], ['POSITIVE'], SENTIMENTS])}
+
+
+PERSONAS = {"supervisor": supervisor, "analyst": analyst, "manager": manager}
+DEFAULT_MIX = "supervisor:2,analyst:2,manager:1"
+
+
+def parse_mix(text):
+    """'supervisor:2,analyst:1' -> ['supervisor', 'supervisor', 'analyst']"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.partition(":")
+        if name not in PERSONAS:
+            raise ValueError(f"Unknown persona: {name} (choose from {', '.join(PERSONAS)})")
+        mix.extend([name] * int(weight or 1))
+    return mix
+
+
+# ============================================
+# LOAD TEST
+# ============================================
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (0 for none)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def dataset_values(calls, profiles):
+    """Values the personas pick from"""
+    import pyarrow.compute as pc
+
+    def distinct(table, column):
+        return sorted(v for v in pc.unique(table[column]).to_pylist() if v)
+
+    return {
+        'customers': distinct(calls, 'CUSTOMER_NAME')[:2000],
+        'agents': distinct(calls, 'AGENT_NAME'),
+        'intents': distinct(calls, 'PRIMARY_INTENT'),
+        'regions': distinct(profiles, 'REGION'),
+    }
+
+
+def run_session(app, stub, persona, rng, data, steps, think_ms, samples, errors):
+    """One simulated user: `steps` reruns of main() with the persona's widget changes"""
+    stub.reset_session()
+    inputs = {}
+    script = PERSONAS[persona](rng, data)
+    for _ in range(steps):
+        action, changes = next(script)
+        inputs.update(changes)
+        inputs = {label: value for label, value in inputs.items() if value is not None}
+        stub.set_session_inputs(inputs)
+        start = time.perf_counter()
+        try:
+            app.main()
+        except Exception as e:  # keep the session going; failures are reported at the end
+            errors.append(f"{persona}/{action}: {type(e).__name__}: {e}")
+        else:
+            samples.append((persona, action, time.perf_counter() - start))
+        if think_ms:
+            time.sleep(rng.expovariate(1.0 / think_ms) / 1000)
+
+
+def load_test(app, stub, data, sessions, steps, think_ms, ramp_up, mix, seed):
+    """N concurrent sessions; returns the summary for this session count"""
+    samples, errors = [], []
+    threads = []
+    rss_before = current_rss_bytes()
+    with PeakMemory(interval=0.01) as memory:
+        start = time.perf_counter()
+        for index in range(sessions):
+            persona = mix[index % len(mix)]
+            thread = threading.Thread(
+                target=run_session, daemon=True,
+                args=(app, stub, persona, random.Random(seed + index), data, steps, think_ms, samples, errors)
+            )
+            threads.append(thread)
+            thread.start()
+            if ramp_up and sessions > 1:
+                time.sleep(ramp_up / (sessions - 1))
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+    by_action = defaultdict(list)
+    for persona, action, seconds in samples:
+        by_action[action].append(seconds)
+    latencies = [seconds for _, _, seconds in samples]
+    return {
+        "sessions": sessions,
+        "reruns": len(samples),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "wall_seconds": wall,
+        "throughput_per_second": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "rss_before_mb": rss_before / 1e6,
+        "peak_memory_mb": memory.peak_delta / 1e6,
+        "memory_per_session_mb": memory.peak_delta / 1e6 / sessions,
+        "actions": {
+            action: {
+                "count": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+            for action, values in sorted(by_action.items())
+        },
+    }
+
+
+def warm_up(app, stub):
+    """Render every page once so the process-wide caches hold the base datasets (steady state)"""
+    stub.reset_session()
+    for label in app.PAGES:
+        stub.set_session_inputs({"Select View": label})
+        app.main()
+
+
+def print_summary(result):
+    print(f"\n👥 {result['sessions']} sessions: {result['reruns']} reruns in {result['wall_seconds']:.1f}s "
+          f"({result['throughput_per_second']:.1f}/s), {result['errors']} errors")
+    print(f"   {'Action':<26} {'Count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("   " + "-" * 62)
+    for action, stats in result["actions"].items():
+        print(f"   {action:<26} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+    print(f"   {'ALL':<26} {result['reruns']:>6} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+    print(f"   Peak memory +{result['peak_memory_mb']:.0f} MB above {result['rss_before_mb']:.0f} MB "
+          f"({result['memory_per_session_mb']:.1f} MB per session)")
+    for error in result["error_samples"]:
+        print(f"   ⚠️  {error}")
+
+
+def run_level_in_child(args, sessions):
+    """One session count in a fresh interpreter (clean heap and caches); returns its result"""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    command = [
+        sys.executable, os.path.abspath(__file__), "--sessions", str(sessions), "--steps", str(args.steps),
+        "--think-ms", str(args.think_ms), "--ramp-up", str(args.ramp_up), "--mix", args.mix,
+        "--seed", str(args.seed), "--child-result", path,
+    ] + (["--rows", args.rows] if args.rows else []) + (["--cold"] if args.cold else [])
+    sys.stdout.flush()
+    try:
+        subprocess.run(command, check=True)
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for the dashboard")
+    parser.add_argument("--sessions", default="20", help="Concurrent sessions; comma-separated for a capacity curve")
+    parser.add_argument("--steps", type=int, default=30, help="Reruns per session")
+    parser.add_argument("--think-ms", type=float, default=250.0,
+                        help="Mean pause between a session's steps (exponential; 0 = back-to-back)")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds over which sessions are started")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Persona weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--rows", help="Use a synthetic dataset of this size (k/M suffixes) instead of data/final")
+    parser.add_argument("--cold", action="store_true", help="Skip the warm-up, so the first sessions pay for loading")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--child-result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    session_counts = [int(n) for n in args.sessions.split(",")]
+    mix = parse_mix(args.mix)
+
+    if not args.child_result:
+        print("=" * 70)
+        print("DASHBOARD CONCURRENT-USER LOAD TEST")
+        print("=" * 70)
+    if len(session_counts) > 1:
+        results = [run_level_in_child(args, sessions) for sessions in session_counts]
+        rows = results[0]["rows"]
+    else:
+        if args.rows:
+            num_rows = app_harness.parse_size(args.rows)
+            print(f"📦 Building synthetic dataset: {num_rows:,} rows...")
+            calls, profiles = app_harness.synthetic_tables(num_rows)
+            if app_harness.distinct_records(num_rows) < num_rows:
+                print(f"   ⚠️  {app_harness.distinct_records(num_rows):,} distinct records, repeated with new CALL_IDs")
+        else:
+            print("📦 Loading data/final...")
+            calls, profiles = app_harness.load_final_tables()
+        print(f"   {calls.num_rows:,} calls, {profiles.num_rows:,} profiles | mix: {args.mix} | "
+              f"{args.steps} steps/session, think {args.think_ms:.0f} ms")
+
+        app, stub = app_harness.load_app(app_harness.make_session(calls, profiles))
+        if not args.cold:
+            warm_up(app, stub)
+        result = load_test(app, stub, dataset_values(calls, profiles), session_counts[0],
+                           args.steps, args.think_ms, args.ramp_up, mix, args.seed)
+        result["rows"] = rows = calls.num_rows
+        results = [result]
+        print_summary(result)
+        if args.child_result:
+            with open(args.child_result, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+
+    if len(results) > 1:
+        print(f"\n{'Sessions':>8} {'Reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB/session':>11}")
+        print("-" * 60)
+        for r in results:
+            print(f"{r['sessions']:>8} {r['throughput_per_second']:>9.1f} {r['p50_ms']:>9.1f} "
+                  f"{r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['memory_per_session_mb']:>11.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "mix": args.mix, "steps": args.steps,
+                       "think_ms": args.think_ms, "results": results}, f, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Customer / Agent Name Resolver
+Resolves free-text names to the exact CUSTOMER_NAME / AGENT_NAME spellings with
+the dashboard's in-process resolver (Streamlit App/name_resolver.py) - e.g.
+before calling schedule_customer_callback, whose CUSTOMER_NAME_INPUT must match
+exactly. The name lists are loaded once (CSV or one query); lookups need no
+warehouse and no Cortex Search service.
+
+Usage:
+    python scripts/resolve_names.py --local "david thomson" "Alex Carter"
+    python scripts/resolve_names.py --local --kind agent "jon smth"
+    python scripts/resolve_names.py --local --benchmark                     # latency + accuracy on typo'd names
+    python scripts/resolve_names.py --connection my_conn "Ashley Brwn"
+
+Prerequisites:
+    --local: none
+    Snowflake: pip install snowflake-connector-python and a connection in
+    ~/.snowflake/connections.toml
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Streamlit App"))
+
+from name_resolver import NameResolver  # noqa: E402
+
+DATA_DIR = os.path.join(PROJECT_ROOT, "data", "final")
+
+# kind -> (CSV, column, Snowflake query)
+SOURCES = {
+    "customer": ("CUSTOMER_PROFILE_COMPLETE.csv", "CUSTOMER_NAME",
+                 "SELECT DISTINCT CUSTOMER_NAME FROM "
+                 "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE"),
+    "agent": ("FINAL_TABLE_COMPLETE.csv", "AGENT_NAME",
+              "SELECT DISTINCT AGENT_NAME FROM CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS_AI_GENERATED"),
+}
+
+
+def load_names(kind, connection_name=None):
+    """Distinct names for kind from data/final or from Snowflake (one query)"""
+    file_name, column, query = SOURCES[kind]
+    if connection_name:
+        import snowflake.connector
+        with snowflake.connector.connect(connection_name=connection_name) as connection:
+            return [row[0] for row in connection.cursor().execute(query).fetchall() if row[0]]
+    with open(os.path.join(DATA_DIR, file_name), encoding="utf-8") as f:
+        return sorted({row[column] for row in csv.DictReader(f) if row[column]})
+
+
+def make_typo(name, rng):
+    """Drop, swap or replace one character"""
+    chars = list(name)
+    i = rng.randrange(len(chars) - 1)
+    action = rng.choice(("drop", "swap", "replace"))
+    if action == "drop":
+        del chars[i]
+    elif action == "swap":
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def benchmark(resolver, names, samples=500, seed=7):
+    """Cold/warm lookup latency and top-1 accuracy on one-typo names"""
+    rng = random.Random(seed)
+    truth = [rng.choice(names) for _ in range(samples)]
+    queries = [make_typo(name, rng) for name in truth]
+
+    cold = []
+    for query in queries:
+        start = time.perf_counter()
+        resolver.resolve(query)
+        cold.append((time.perf_counter() - start) * 1e6)
+    warm = []
+    for query in queries:
+        start = time.perf_counter()
+        resolver.resolve(query)
+        warm.append((time.perf_counter() - start) * 1e6)
+    top1 = sum(resolver.best(query, min_score=0) == name for query, name in zip(queries, truth))
+    top5 = sum(name in [c.name for c in resolver.resolve(query, min_score=0)] for query, name in zip(queries, truth))
+    return {
+        "cold_p50_us": statistics.median(cold), "cold_p95_us": sorted(cold)[int(0.95 * len(cold))],
+        "warm_p50_us": statistics.median(warm), "top1": top1 / samples, "top5": top5 / samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve fuzzy customer/agent names to exact spellings")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    source.add_argument("--local", action="store_true", help="Use the data/final CSVs")
+    parser.add_argument("--kind", choices=sorted(SOURCES), default="customer", help="Name list to search")
+    parser.add_argument("--limit", type=int, default=5, help="Candidates per query")
+    parser.add_argument("--benchmark", action="store_true", help="Measure latency and accuracy on typo'd names")
+    parser.add_argument("queries", nargs="*", help="Names to resolve (default: read lines from stdin)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("NAME RESOLVER")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    names = load_names(args.kind, args.connection)
+    resolver = NameResolver(names)
+    print(f"📂 {len(resolver)} {args.kind} names indexed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.benchmark:
+        result = benchmark(resolver, names)
+        print(f"⏱️  Cold lookup p50 {result['cold_p50_us']:.0f} µs | p95 {result['cold_p95_us']:.0f} µs | "
+              f"repeat (cached) p50 {result['warm_p50_us']:.1f} µs")
+        print(f"🎯 One-typo queries: top-1 {result['top1']:.1%} | top-5 {result['top5']:.1%}")
+        return 0
+
+    for query in args.queries or (line.strip() for line in sys.stdin if line.strip()):
+        candidates = resolver.resolve(query, limit=args.limit)
+        print(f"\n🔎 {query}")
+        if not candidates:
+            print("   ❌ No close match")
+        for candidate in candidates:
+            print(f"   {candidate.score:.3f}  {candidate.name}  (edit distance {candidate.distance})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
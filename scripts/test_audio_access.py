@@ -0,0 +1,59 @@
+"""
+Tests for recording access (Streamlit App/audio_access.py): only recorded
+calls are signed, the listing is cached for its TTL, and signed URLs are
+reused until near expiry.
+
+Usage:
+    python -m pytest scripts/test_audio_access.py
+"""
+
+from audio_access import LocalAudioLibrary, PresignedUrlCache, RecordingIndex, recording_path
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_index_lists_once_per_ttl():
+    clock = Clock()
+    listed = [["CALL_1.mp3"], ["CALL_1.mp3", "CALL_2.mp3"]]
+    index = RecordingIndex(lambda: listed[min(index.listings, 1)], ttl=300, clock=clock)
+
+    assert "CALL_1.mp3" in index and "CALL_2.mp3" not in index
+    assert index.listings == 1
+    clock.now += 301
+    assert "CALL_2.mp3" in index
+    assert index.listings == 2
+
+
+def test_url_is_none_for_unrecorded_calls_without_signing(tmp_path):
+    (tmp_path / "CALL_1.mp3").write_bytes(b"id3")
+    (tmp_path / "notes.txt").write_text("not audio")
+    library = LocalAudioLibrary(str(tmp_path))
+
+    assert library.has_recording(recording_path("CALL_1"))
+    assert not library.has_recording(recording_path("CALL_2"))
+    assert not library.has_recording("notes.txt")
+    assert library.url(recording_path("CALL_2")) is None
+    assert library.cache.stats()["signed"] == 0
+    assert library.url(recording_path("CALL_1")) == str(tmp_path / "CALL_1.mp3")
+    assert library.index.listings == 1
+
+
+def test_signed_urls_are_reused_until_near_expiry():
+    clock = Clock()
+    signed = []
+
+    def sign(path, expiry_seconds):
+        signed.append(path)
+        return f"https://stage/{path}?v={len(signed)}"
+
+    cache = PresignedUrlCache(sign, expiry_seconds=3600, margin=300, clock=clock)
+    assert cache.get("a.mp3") == cache.get("a.mp3")
+    clock.now += 3301
+    assert cache.get("a.mp3").endswith("v=2")
+    assert cache.stats() == {"entries": 1, "hits": 1, "signed": 2}
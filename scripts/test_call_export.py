@@ -0,0 +1,98 @@
+"""
+Tests for the bulk export (Streamlit App/call_export.py): page filters are
+pushed into the export query (an empty "in" list means no filter, profile
+columns go through the customer profile) and LocalExporter writes exactly the
+matching rows, newest first, in both formats.
+
+Usage:
+    python -m pytest scripts/test_call_export.py
+"""
+
+import os
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+
+from app_harness import CALL_TABLE, PROFILE_TABLE, LocalSession
+from call_export import EXPORT_FORMATS, LocalExporter, export_query
+
+CALLS = pa.table({
+    "CALL_ID": ["C1", "C2", "C3", "C4", "C5"],
+    "CUSTOMER_NAME": ["Ann", "Bob", "Ann", "Cid", "O'Neil"],
+    "SENTIMENT_CATEGORY": ["NEGATIVE", "POSITIVE", "NEGATIVE", "NEGATIVE", "NEUTRAL"],
+    "TRANSCRIPT_TEXT": ["Refund please", "Thanks", "Where is my REFUND", "refund now", "Billing"],
+    "ANALYSIS_TIMESTAMP": ["2025-03-01 09:00:00", "2025-03-02 09:00:00", "2025-03-03 09:00:00",
+                           "2025-03-04 09:00:00", "2025-03-05 09:00:00"],
+})
+PROFILES = pa.table({
+    "CUSTOMER_NAME": ["Ann", "Bob", "Cid", "O'Neil"],
+    "REGION": ["West", "East", "East", "West"],
+})
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    session = LocalSession({CALL_TABLE: CALLS, PROFILE_TABLE: PROFILES})
+    return LocalExporter(lambda name, query: session.connection.cursor().execute(query).fetch_arrow_all(),
+                         str(tmp_path))
+
+
+def exported_ids(result, export_format):
+    tables = []
+    for export_file in result.files:
+        path = export_file.url[len("file://"):]
+        tables.append(pq.read_table(path) if export_format.startswith("Parquet") else pa_csv.read_csv(path))
+    return pa.concat_tables(tables)["CALL_ID"].to_pylist() if tables else []
+
+
+def test_filters_become_where_conditions():
+    query = export_query((
+        ("in", "SENTIMENT_CATEGORY", ("NEGATIVE",)),
+        ("in", "REGION", ("West",)),
+        ("contains", "TRANSCRIPT_TEXT", "O'Refund"),
+    ))
+    assert "SENTIMENT_CATEGORY IN ('NEGATIVE')" in query
+    assert "CUSTOMER_NAME IN (SELECT CUSTOMER_NAME FROM" in query and "WHERE REGION IN ('West')" in query
+    assert "CONTAINS(LOWER(TRANSCRIPT_TEXT), 'o''refund')" in query
+    assert query.endswith("ORDER BY ANALYSIS_TIMESTAMP DESC")
+
+
+def test_empty_in_list_is_no_filter():
+    assert export_query((("in", "AGENT_NAME", ()),)) == export_query(())
+    assert "WHERE" not in export_query((("in", "AGENT_NAME", ()),))
+
+
+def test_unknown_filter_is_rejected():
+    with pytest.raises(ValueError):
+        export_query((("between", "SENTIMENT_SCORE", (0, 1)),))
+
+
+@pytest.mark.parametrize("export_format", list(EXPORT_FORMATS))
+def test_export_writes_only_the_matching_rows_newest_first(exporter, export_format):
+    result = exporter.export((
+        ("in", "SENTIMENT_CATEGORY", ("NEGATIVE",)),
+        ("in", "AGENT_NAME", ()),
+        ("contains", "TRANSCRIPT_TEXT", "refund"),
+    ), export_format)
+
+    assert exported_ids(result, export_format) == ["C4", "C3", "C1"]
+    assert result.rows == 3 and result.format == export_format
+    assert all(f.name.startswith(result.prefix + "/calls_") and f.name.endswith(EXPORT_FORMATS[export_format][2])
+               for f in result.files)
+    assert all(os.path.getsize(f.url[len("file://"):]) == f.bytes for f in result.files)
+
+
+def test_export_pushes_profile_filters_and_quotes(exporter):
+    result = exporter.export((("in", "REGION", ("West",)),), "CSV (gzip)")
+    assert exported_ids(result, "CSV (gzip)") == ["C5", "C3", "C1"]
+
+    quoted = exporter.export((("in", "CUSTOMER_NAME", ("O'Neil",)),), "CSV (gzip)")
+    assert exported_ids(quoted, "CSV (gzip)") == ["C5"]
+
+
+def test_export_with_only_empty_filters_writes_every_row(exporter):
+    result = exporter.export((("in", "SENTIMENT_CATEGORY", ()),), "Parquet (snappy)")
+    assert exported_ids(result, "Parquet (snappy)") == ["C5", "C4", "C3", "C2", "C1"]
+    assert result.rows == CALLS.num_rows
@@ -0,0 +1,106 @@
+"""
+Tests for the callback queue drain (scripts/callback_worker.py) against the
+SQLite stand-in: concurrent claims never hand out a callback twice, expired
+leases are claimed again, and completing a batch releases its claim.
+
+Usage:
+    python -m pytest scripts/test_callback_worker.py
+"""
+
+import threading
+
+from callback_worker import DialError, LocalCallbackQueue, drain
+
+
+def seeded_queue(tmp_path, count):
+    queue = LocalCallbackQueue(str(tmp_path / "queue.sqlite"))
+    queue.seed(count)
+    return queue
+
+
+def leases(queue):
+    rows = queue._db().execute("SELECT CALLBACK_ID, STATUS, LEASE_TOKEN, ATTEMPTS, LAST_ERROR FROM CALLBACK_QUEUE")
+    return {row["CALLBACK_ID"]: dict(row) for row in rows}
+
+
+def outcomes_for(batch, succeeded=True):
+    return [{"callback_id": callback["CALLBACK_ID"], "succeeded": succeeded,
+             "error": None if succeeded else "No answer"} for callback in batch]
+
+
+def test_concurrent_claims_never_share_a_callback(tmp_path):
+    queue = seeded_queue(tmp_path, 300)
+    claimed = []
+    barrier = threading.Barrier(8)
+
+    def claim_until_empty(index):
+        barrier.wait()
+        while batch := queue.claim(f"worker-{index}", 7, 300, 3):
+            claimed.extend(callback["CALLBACK_ID"] for callback in batch)
+
+    workers = [threading.Thread(target=claim_until_empty, args=(i,)) for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(claimed) == sorted(leases(queue))
+    assert queue.status_counts() == {"IN_PROGRESS": 300}
+
+
+def test_drain_dials_every_callback_once(tmp_path):
+    queue = seeded_queue(tmp_path, 200)
+    stats, _ = drain(queue, lambda callback: None, threads=6, batch_size=9, poll_seconds=0.01)
+
+    assert stats.duplicate_dials == 0 and stats.stale_completions == 0
+    assert stats.completed == 200 and len(stats.connected) == 200
+    assert queue.status_counts() == {"COMPLETED": 200} and queue.outstanding() == 0
+
+
+def test_expired_lease_is_claimed_again_and_stale_completion_is_ignored(tmp_path):
+    queue = seeded_queue(tmp_path, 5)
+    abandoned = queue.claim("crashed", 5, -1, 3)               # lease already expired
+    reclaimed = queue.claim("survivor", 5, 300, 3)
+
+    assert [c["CALLBACK_ID"] for c in reclaimed] == [c["CALLBACK_ID"] for c in abandoned]
+    assert {c["ATTEMPTS"] for c in reclaimed} == {2}
+    assert queue.complete(abandoned[0]["LEASE_TOKEN"], outcomes_for(abandoned), 3) == 0
+    assert queue.complete(reclaimed[0]["LEASE_TOKEN"], outcomes_for(reclaimed), 3) == 5
+    assert queue.status_counts() == {"COMPLETED": 5}
+
+
+def test_expired_lease_fails_after_max_attempts(tmp_path):
+    queue = seeded_queue(tmp_path, 3)
+    queue.claim("crashed-1", 3, -1, 2)
+    queue.claim("crashed-2", 3, -1, 2)
+
+    assert queue.claim("worker", 3, 300, 2) == []
+    assert queue.status_counts() == {"FAILED": 3}
+    assert all("crashed-2" in row["LAST_ERROR"] for row in leases(queue).values())
+
+
+def test_complete_releases_the_claim(tmp_path):
+    queue = seeded_queue(tmp_path, 4)
+    batch = queue.claim("worker", 4, 300, 3)
+    answered, unanswered = batch[:2], batch[2:]
+
+    assert queue.complete(batch[0]["LEASE_TOKEN"], outcomes_for(answered) + outcomes_for(unanswered, False), 3) == 4
+    rows = leases(queue)
+    assert all(row["LEASE_TOKEN"] is None for row in rows.values())
+    assert [rows[c["CALLBACK_ID"]]["STATUS"] for c in batch] == ["COMPLETED", "COMPLETED", "PENDING", "PENDING"]
+    assert queue.outstanding() == 2
+
+    retried = queue.claim("worker", 4, 300, 3)
+    assert [c["CALLBACK_ID"] for c in retried] == [c["CALLBACK_ID"] for c in unanswered]
+    assert queue.complete(batch[0]["LEASE_TOKEN"], outcomes_for(retried), 3) == 0     # old token released
+
+
+def test_unanswered_dials_are_retried_until_max_attempts(tmp_path):
+    queue = seeded_queue(tmp_path, 10)
+
+    def never_answers(callback):
+        raise DialError("No answer")
+
+    stats, _ = drain(queue, never_answers, threads=3, batch_size=4, max_attempts=2, poll_seconds=0.01)
+    assert stats.dials == 20 and stats.failed_dials == 20
+    assert queue.status_counts() == {"FAILED": 10}
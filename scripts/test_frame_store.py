@@ -0,0 +1,101 @@
+"""
+Tests for the shared frame store (Streamlit App/frame_adapter.py): filter
+masks are shared and reused across sessions, chained filters stay views over
+the store base, and masks are dropped with their data version or by the LRU.
+
+Usage:
+    python -m pytest scripts/test_frame_store.py
+"""
+
+import pyarrow as pa
+import pytest
+
+from frame_adapter import FrameStore, pl
+
+BACKENDS = ["arrow"] + (["polars"] if pl is not None else [])
+
+CALLS = {
+    "CALL_ID": ["C1", "C2", "C3", "C4", "C5"],
+    "AGENT_NAME": ["Ann", "Bob", "Ann", "Cid", "Ann"],
+    "SENTIMENT_CATEGORY": ["NEGATIVE", "POSITIVE", "POSITIVE", "NEGATIVE", "NEGATIVE"],
+}
+
+
+def calls_table(version="q1", data=CALLS):
+    return pa.table(data).replace_schema_metadata({"query_id": version})
+
+
+def call_ids(frame):
+    data = frame.data
+    return list(data["CALL_ID"]) if frame.backend == "polars" else data["CALL_ID"].to_pylist()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_same_filter_in_two_sessions_reuses_one_mask(backend):
+    store = FrameStore()
+    first = store.frame("calls", calls_table(), backend).where_in("AGENT_NAME", ["Ann"])
+    second = store.frame("calls", calls_table(), backend).where_in("AGENT_NAME", ["Ann"])
+
+    assert len(first) == 3 and call_ids(second) == ["C1", "C3", "C5"]
+    assert first.key == second.key
+    assert store.stats()["masks"] == 1
+    assert store.mask_misses == 1 and store.mask_hits >= 1
+    assert store.conversions == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_chained_filters_combine_masks_over_the_store_base(backend):
+    frame = FrameStore().frame("calls", calls_table(), backend)
+    selection = frame.where_in("AGENT_NAME", ["Ann"]).where_equals("SENTIMENT_CATEGORY", "NEGATIVE")
+
+    assert selection._base is frame
+    assert call_ids(selection) == ["C1", "C5"]
+    assert call_ids(selection.head(1)) == ["C1"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_filters_over_an_empty_dataset_stay_on_the_store_base(backend):
+    empty = {column: pa.array([], pa.string()) for column in CALLS}
+    frame = FrameStore().frame("calls", calls_table(data=empty), backend)
+    selection = frame.where_in("AGENT_NAME", ["Ann"]).where_contains("CALL_ID", "c")
+
+    assert selection._base is frame
+    assert len(selection) == 0 and selection.empty
+    assert call_ids(selection.head(5)) == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_selection_can_be_filtered_further(backend):
+    frame = FrameStore().frame("calls", calls_table(), backend)
+    nobody = frame.where_in("AGENT_NAME", ["Zed"])
+    selection = nobody.where_equals("SENTIMENT_CATEGORY", "NEGATIVE")
+
+    assert selection._base is frame
+    assert len(nobody) == 0 and len(selection) == 0
+
+
+def test_new_data_version_drops_stale_masks():
+    store = FrameStore()
+    len(store.frame("calls", calls_table("q1")).where_in("AGENT_NAME", ["Ann"]))
+    assert store.stats()["masks"] == 1
+
+    fresh = store.frame("calls", calls_table("q2")).where_in("AGENT_NAME", ["Ann"])
+    assert store.stats()["masks"] == 0 and store.stats()["datasets"] == 1
+    assert len(fresh) == 3
+    assert store.stats()["masks"] == 1 and store.conversions == 2
+
+
+def test_mask_lru_evicts_least_recently_used():
+    store = FrameStore(max_masks=2)
+    frame = store.frame("calls", calls_table())
+    by_agent = {agent: frame.where_equals("AGENT_NAME", agent) for agent in ("Ann", "Bob", "Cid")}
+
+    len(by_agent["Ann"])
+    len(by_agent["Bob"])
+    len(by_agent["Ann"])                    # touch Ann: Bob is now the oldest
+    len(by_agent["Cid"])
+    assert store.stats()["masks"] == 2
+
+    misses = store.mask_misses
+    assert len(by_agent["Ann"]) == 3 and store.mask_misses == misses
+    assert len(by_agent["Bob"]) == 1 and store.mask_misses == misses + 1
@@ -0,0 +1,132 @@
+"""
+Tests for the priority feed (Streamlit App/priority_feed.py): top-K selection,
+heap merges of newly scored calls, watermark advance and paging.
+
+Usage:
+    python -m pytest scripts/test_priority_feed.py
+"""
+
+import datetime
+
+import pyarrow as pa
+
+from call_export import sql_literal
+from frame_adapter import data_version
+from priority_feed import FEED_COLUMNS, LiveFeed, PriorityFeed, score_calls, top_k
+
+START = datetime.datetime(2025, 3, 1, 9, 0)
+
+
+def scored(keys, first_id=1, categories=None):
+    """FEED_COLUMNS rows with the given PRIORITY_KEYs, one minute apart"""
+    n = len(keys)
+    columns = {name: pa.nulls(n, pa.string()) for name in FEED_COLUMNS}
+    columns.update({
+        "CALL_ID": pa.array([f"CALL_{first_id + i:03d}" for i in range(n)]),
+        "SENTIMENT_CATEGORY": pa.array(categories or ["NEGATIVE"] * n),
+        "SENTIMENT_SCORE": pa.array([0.0] * n),
+        "LIFETIME_VALUE": pa.array([0.0] * n),
+        "ANALYSIS_TIMESTAMP": pa.array([START + datetime.timedelta(minutes=first_id + i) for i in range(n)],
+                                       pa.timestamp("us")),
+        "PRIORITY_KEY": pa.array(keys, pa.float64()),
+    })
+    return pa.table({name: columns[name] for name in FEED_COLUMNS})
+
+
+def feed_of(keys, k=5):
+    rows = top_k(scored(keys), k)
+    watermark = max(rows["ANALYSIS_TIMESTAMP"].to_pylist())
+    return PriorityFeed(rows, k, watermark)
+
+
+def ids(feed):
+    return feed.rows["CALL_ID"].to_pylist()
+
+
+def test_top_k_matches_a_full_sort():
+    keys = [7.0, 3.0, 9.0, 9.0, 1.0, 5.0, 8.0]
+    rows = top_k(scored(keys), 4)
+    assert rows["PRIORITY_KEY"].to_pylist() == sorted(keys, reverse=True)[:4]
+    assert rows["CALL_ID"].to_pylist()[:2] == ["CALL_003", "CALL_004"]      # ties ranked by CALL_ID
+
+
+def test_extend_keeps_the_k_best_and_advances_watermark():
+    feed = feed_of([10.0, 20.0, 30.0, 40.0, 50.0, 5.0])
+    extended = feed.extend(scored([45.0, 1.0, 60.0], first_id=10))
+    assert extended.rows["PRIORITY_KEY"].to_pylist() == [60.0, 50.0, 45.0, 40.0, 30.0]
+    assert extended.watermark == START + datetime.timedelta(minutes=12)
+    assert extended.key != feed.key
+
+
+def test_rescored_call_replaces_its_old_row():
+    feed = feed_of([10.0, 20.0, 30.0])
+    rescored = scored([99.0], first_id=1)                                  # CALL_001 again
+    extended = feed.extend(rescored)
+    assert ids(extended) == ["CALL_001", "CALL_003", "CALL_002"]
+    assert extended.rows["PRIORITY_KEY"].to_pylist()[0] == 99.0
+
+
+def test_empty_delta_returns_the_same_feed():
+    feed = feed_of([1.0, 2.0])
+    assert feed.extend(scored([])) is feed
+
+
+def test_extended_feed_drops_the_loaded_query_id():
+    rows = top_k(scored([1.0, 2.0, 3.0]), 5).replace_schema_metadata({"query_id": "01loaded"})
+    feed = PriorityFeed(rows, 5, START)
+    extended = feed.extend(scored([4.0], first_id=10))
+    assert data_version(extended.rows) != "01loaded"
+
+
+def test_page_is_none_beyond_the_rows_held():
+    feed = feed_of(list(range(1, 8)), k=5)
+    first = feed.page(0, size=3)
+    assert [row["CALL_ID"] for row in first] == ["CALL_007", "CALL_006", "CALL_005"]
+    assert first[0]["PRIORITY_SCORE"] == round(7.0 - feed.reference_days(), 1)
+    assert feed.page(1, size=3) is None
+
+
+def test_where_in_filters_rows_and_records_server_filters():
+    rows = top_k(scored([1.0, 2.0, 3.0], categories=["NEGATIVE", "POSITIVE", "NEGATIVE"]), 5)
+    feed = PriorityFeed(rows, 5, START).where_in("SENTIMENT_CATEGORY", ["NEGATIVE"])
+    assert ids(feed) == ["CALL_003", "CALL_001"]
+    assert feed.filters == (("SENTIMENT_CATEGORY", ("NEGATIVE",)),)
+
+
+def test_live_feed_queries_only_calls_after_the_last_refresh():
+    live = LiveFeed(feed_of([10.0, 20.0]))
+    landed = {START + datetime.timedelta(minutes=2): scored([30.0], first_id=3)}
+    asked = []
+
+    def load_new_rows(watermark):
+        asked.append(watermark)
+        return landed.pop(watermark, scored([]))
+
+    assert ids(live.refresh(load_new_rows)) == ["CALL_003", "CALL_002", "CALL_001"]
+    assert ids(live.refresh(load_new_rows)) == ["CALL_003", "CALL_002", "CALL_001"]
+    assert asked == [START + datetime.timedelta(minutes=2), START + datetime.timedelta(minutes=3)]
+
+
+def test_score_calls_ranks_escalated_negative_calls_first():
+    calls = pa.table({
+        "CALL_ID": ["A", "B"],
+        "CUSTOMER_NAME": ["C1", "C2"],
+        "AGENT_NAME": ["Ann", "Bob"],
+        "PRIMARY_INTENT": ["billing", "billing"],
+        "SENTIMENT_CATEGORY": ["NEGATIVE", "POSITIVE"],
+        "SENTIMENT_SCORE": [-0.8, 0.8],
+        "URGENCY_LEVEL": ["high", "low"],
+        "ESCALATION_REQUIRED": ["yes", "no"],
+        "CALL_SUMMARY": ["angry", "happy"],
+        "ANALYSIS_TIMESTAMP": ["2025-03-01 09:00:00+00:00", "2025-03-02 09:00:00+00:00"],
+    })
+    profiles = pa.table({"CUSTOMER_NAME": ["C1", "C2"], "LIFETIME_VALUE": [20000.0, 0.0]})
+    rows = top_k(score_calls(calls, profiles), 2)
+    assert rows["CALL_ID"].to_pylist() == ["A", "B"]
+    assert rows.column_names == FEED_COLUMNS
+
+
+def test_sql_literal_escapes_quotes():
+    assert sql_literal("O'Brien") == "'O''Brien'"
+    assert sql_literal("a\\' OR 1=1 --") == "'a\\\\'' OR 1=1 --'"
+    assert sql_literal(datetime.datetime(2025, 3, 1, 9, 0)) == "'2025-03-01 09:00:00'"
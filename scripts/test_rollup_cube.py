@@ -0,0 +1,106 @@
+"""
+Tests for the rollup cube (Streamlit App/rollup_cube.py): cells built from
+calls, merges of new calls, filters and the means / rates of a slice.
+
+Usage:
+    python -m pytest scripts/test_rollup_cube.py
+"""
+
+import math
+
+import pyarrow as pa
+import pytest
+
+from frame_adapter import data_version
+from rollup_cube import RollupCube, build_cells
+
+CALLS = [
+    # (timestamp, agent, intent, category, sentiment, performance, resolved, escalated, satisfaction, customer)
+    ("2025-03-03 09:00:00", "Ann", "billing", "positive", 0.8, 90, "yes", "no", "satisfied", "C1"),
+    ("2025-03-03 10:00:00", "Ann", "billing", "positive", 0.6, 70, "no", "no", "satisfied", "C2"),
+    ("2025-03-04 11:00:00", "Bob", "outage", "negative", -0.5, 40, "no", "yes", "dissatisfied", "C1"),
+    ("2025-03-10 12:00:00", "Bob", "outage", "negative", -0.7, None, "yes", "yes", "neutral", "C3"),
+    ("2025-04-01 08:00:00", "Ann", "upgrade", "neutral", 0.1, 80, "yes", "no", "satisfied", "C2"),
+]
+
+
+def calls_table(rows, first_id=1):
+    columns = list(zip(*rows))
+    return pa.table({
+        "CALL_ID": [f"CALL_{first_id + i:03d}" for i in range(len(rows))],
+        "ANALYSIS_TIMESTAMP": list(columns[0]),
+        "AGENT_NAME": list(columns[1]),
+        "PRIMARY_INTENT": list(columns[2]),
+        "SENTIMENT_CATEGORY": list(columns[3]),
+        "SENTIMENT_SCORE": list(columns[4]),
+        "AGENT_PERFORMANCE_SCORE": pa.array(columns[5], pa.int64()),
+        "ISSUE_RESOLVED": list(columns[6]),
+        "ESCALATION_REQUIRED": list(columns[7]),
+        "CUSTOMER_SATISFACTION": list(columns[8]),
+        "CUSTOMER_NAME": list(columns[9]),
+    })
+
+
+PROFILES = pa.table({"CUSTOMER_NAME": ["C1", "C2", "C3"], "REGION": ["North", "South", "North"]})
+
+
+def cube_of(rows):
+    return RollupCube(build_cells(calls_table(rows), PROFILES))
+
+
+def test_cells_count_every_call_once():
+    cube = cube_of(CALLS)
+    assert len(cube) == 5
+    assert sum(cube.cells["CALLS"].to_pylist()) == len(CALLS)
+    assert cube.values("REGION") == ["North", "South"]
+
+
+def test_merge_matches_a_rebuild():
+    merged = cube_of(CALLS[:3]).merge(build_cells(calls_table(CALLS[3:], first_id=4), PROFILES))
+    rebuilt = cube_of(CALLS)
+    by = ["CALL_DATE", "AGENT_NAME", "REGION"]
+    assert merged.slice(by).equals(rebuilt.slice(by))
+
+
+def test_merged_cube_gets_a_new_version():
+    cells = build_cells(calls_table(CALLS[:3]), PROFILES)
+    cube = RollupCube(cells.replace_schema_metadata({"query_id": "01loaded"}))
+    merged = cube.merge(build_cells(calls_table(CALLS[3:], first_id=4), PROFILES))
+    assert cube.key == ("rollup", "01loaded")
+    assert merged.key != cube.key
+    assert merged.key == ("rollup", data_version(merged.cells))
+
+
+def test_where_in_filters_cells_and_extends_key():
+    cube = cube_of(CALLS)
+    north = cube.where_in("REGION", ["North"])
+    assert sum(north.cells["CALLS"].to_pylist()) == 3
+    assert north.key == cube.key + (("where_in", "REGION", ("North",)),)
+    assert north.key == cube.where_in("REGION", {"North"}).key
+
+
+def test_slice_derives_means_std_and_rates():
+    view = cube_of(CALLS).slice(["AGENT_NAME"]).set_index("AGENT_NAME")
+
+    ann = view.loc["Ann"]
+    assert ann["CALLS"] == 3
+    assert ann["AVG_SENTIMENT"] == pytest.approx(0.5)
+    assert ann["SENTIMENT_STDDEV"] == pytest.approx(math.sqrt(((0.3) ** 2 + (0.1) ** 2 + (0.4) ** 2) / 2))
+    assert ann["RESOLUTION_RATE"] == pytest.approx(200 / 3)
+    assert ann["SATISFACTION_RATE"] == pytest.approx(100)
+
+    bob = view.loc["Bob"]
+    assert bob["AVG_PERFORMANCE"] == pytest.approx(40)      # the null score is not counted
+    assert math.isnan(bob["PERFORMANCE_STDDEV"])            # one value: no sample deviation
+    assert bob["ESCALATION_RATE"] == pytest.approx(100)
+
+
+def test_slice_grains_truncate_call_dates():
+    cube = cube_of(CALLS)
+    weeks = cube.slice(["CALL_DATE"], grain="week")
+    assert [str(d.date()) for d in weeks["CALL_DATE"]] == ["2025-03-03", "2025-03-10", "2025-03-31"]
+    assert weeks["CALLS"].tolist() == [3, 1, 1]
+
+    months = cube.slice(["CALL_DATE"], grain="month")
+    assert [str(d.date()) for d in months["CALL_DATE"]] == ["2025-03-01", "2025-04-01"]
+    assert months["CALLS"].tolist() == [4, 1]
@@ -0,0 +1,100 @@
+"""
+Tests for the mergeable sketches (Streamlit App/sketches.py): HyperLogLog and
+KLL estimates stay within their documented error bounds, merged states match
+states built in one pass, and a delta merge only changes its own days.
+
+Usage:
+    python -m pytest scripts/test_sketches.py
+"""
+
+import numpy as np
+import pyarrow as pa
+
+from sketches import (
+    COUNT_COLUMNS, HLL_RELATIVE_ERROR, KLL_RANK_ERROR, HyperLogLog, KLLSketch,
+    build_sketch_table, hll_estimate_list, kll_estimate_list, merge_sketch_tables,
+)
+
+
+def rank_of(values, estimate):
+    """Fraction of values at or below estimate"""
+    return np.count_nonzero(values <= estimate) / len(values)
+
+
+def calls_table(days, per_day, seed=0):
+    """per_day calls on each of days (ISO dates) with random customers and scores"""
+    rng = np.random.default_rng(seed)
+    n = len(days) * per_day
+    return pa.table({
+        "ANALYSIS_TIMESTAMP": [f"{day} 12:00:00" for day in days for _ in range(per_day)],
+        "CUSTOMER_NAME": [f"Customer {c}" for c in rng.integers(0, 5000, n)],
+        "AGENT_NAME": [f"Agent {a}" for a in rng.integers(0, 40, n)],
+        "SENTIMENT_SCORE": rng.uniform(-1, 1, n),
+        "AGENT_PERFORMANCE_SCORE": rng.integers(0, 101, n),
+        "ISSUE_RESOLVED": rng.choice(["yes", "no"], n).tolist(),
+        "ESCALATION_REQUIRED": rng.choice(["yes", "no"], n).tolist(),
+        "CUSTOMER_SATISFACTION": rng.choice(["satisfied", "neutral"], n).tolist(),
+        "SENTIMENT_CATEGORY": rng.choice(["NEGATIVE", "POSITIVE"], n).tolist(),
+    })
+
+
+def test_hll_estimate_within_three_standard_errors():
+    for n in (100, 10_000, 200_000):
+        estimate = HyperLogLog().add([f"v{i}" for i in range(n)]).estimate()
+        assert abs(estimate - n) <= 3 * HLL_RELATIVE_ERROR * n + 1
+
+
+def test_hll_merge_equals_one_pass_and_ignores_duplicates():
+    left = HyperLogLog().add([f"v{i}" for i in range(0, 6000)])
+    right = HyperLogLog().add([f"v{i}" for i in range(4000, 10_000)])
+    whole = HyperLogLog().add([f"v{i}" for i in range(10_000)])
+    assert np.array_equal(left.merge(right).registers, whole.registers)
+    assert hll_estimate_list([left.to_bytes(), None, right.to_bytes()]) == round(whole.estimate())
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(1).normal(size=100_000)
+    sketch = KLLSketch(seed=1).update(values)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        assert abs(rank_of(values, sketch.quantile(q)) - q) <= KLL_RANK_ERROR
+
+
+def test_kll_merge_of_parts_within_rank_error():
+    values = np.random.default_rng(2).exponential(size=60_000)
+    states = [KLLSketch(seed=i).update(part).to_bytes() for i, part in enumerate(np.array_split(values, 30))]
+    for q in (0.1, 0.5, 0.9):
+        assert abs(rank_of(values, kll_estimate_list(states, q)) - q) <= KLL_RANK_ERROR
+
+
+def test_kll_ignores_nan_and_round_trips():
+    sketch = KLLSketch(seed=3).update([1.0, float("nan"), 2.0, 3.0])
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+    assert restored.n == 3
+    assert restored.quantile(0.5) == sketch.quantile(0.5) == 2.0
+    assert KLLSketch().quantile(0.5) is None and kll_estimate_list([None], 0.5) is None
+
+
+def test_merge_adds_delta_days_and_keeps_the_rest():
+    days = ["2025-03-01", "2025-03-02", "2025-03-03"]
+    history = build_sketch_table(calls_table(days, 400, seed=4))
+    delta_calls = calls_table(["2025-03-03", "2025-03-04"], 300, seed=5)
+    merged = merge_sketch_tables(history, build_sketch_table(delta_calls))
+
+    assert [str(d) for d in merged["CALL_DATE"].to_pylist()] == days + ["2025-03-04"]
+    assert merged.slice(0, 2).equals(history.slice(0, 2))        # days outside the delta untouched
+
+    combined = pa.concat_tables([calls_table(days, 400, seed=4), delta_calls])
+    rebuilt = build_sketch_table(combined)
+    for column in COUNT_COLUMNS:
+        assert np.allclose(merged[column].to_numpy(), rebuilt[column].to_numpy())
+    assert merged["CUSTOMER_HLL"].equals(rebuilt["CUSTOMER_HLL"])
+    assert hll_estimate_list(merged["AGENT_HLL"].to_pylist()) == 40
+
+    sentiment = combined["SENTIMENT_SCORE"].to_numpy()
+    for q in (0.1, 0.5, 0.9):
+        assert abs(rank_of(sentiment, kll_estimate_list(merged["SENTIMENT_DIGEST"].to_pylist(), q)) - q) <= KLL_RANK_ERROR
+
+
+def test_merge_of_empty_delta_is_a_no_op():
+    history = build_sketch_table(calls_table(["2025-03-01"], 10))
+    assert merge_sketch_tables(history, history.slice(0, 0)) is history
@@ -0,0 +1,114 @@
+"""
+Tests for the incremental transcription pipeline (scripts/transcribe_incremental.py)
+with the stub transcriber and the SQLite store: only new or changed files are
+planned, every batch is checkpointed, and an interrupted run resumes without
+transcribing any file twice.
+
+Usage:
+    python -m pytest scripts/test_transcribe_incremental.py
+"""
+
+import pytest
+
+from transcribe_incremental import (
+    LocalAudioSource, LocalTranscriptStore, StubTranscriber, plan_work, run_incremental,
+)
+
+
+class CountingTranscriber(StubTranscriber):
+    """Stub transcriber that remembers every call ID it was asked for and can fail on a given batch"""
+
+    def __init__(self, fail_on_batch=None):
+        super().__init__(transcripts_csv="")
+        self.seen = []
+        self.batches = 0
+        self.fail_on_batch = fail_on_batch
+
+    def __call__(self, files):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError("warehouse suspended")
+        self.seen.extend(audio.call_id for audio in files)
+        return super().__call__(files)
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    folder = tmp_path / "audio"
+    folder.mkdir()
+    for i in range(5):
+        (folder / f"CALL_{i}.mp3").write_bytes(b"id3" * (i + 1))
+    (folder / "notes.txt").write_text("not audio")
+    return folder
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalTranscriptStore(str(tmp_path / "transcripts.sqlite"))
+
+
+def checkpoints(store):
+    return store.db.execute("SELECT BATCH_NUMBER, FILES, LAST_CALL_ID FROM TRANSCRIPTION_CHECKPOINTS "
+                            "ORDER BY COMMITTED_AT, BATCH_NUMBER").fetchall()
+
+
+def test_only_new_and_changed_files_are_planned(audio_dir, store):
+    source = LocalAudioSource(str(audio_dir))
+    run_incremental(source, store, CountingTranscriber())
+    assert plan_work(source.list_files(), store.transcribed()) == []
+
+    (audio_dir / "CALL_1.mp3").write_bytes(b"re-recorded")
+    (audio_dir / "CALL_9.wav").write_bytes(b"riff")
+    planned = plan_work(source.list_files(), store.transcribed())
+    assert [(audio.call_id, reason) for audio, reason in planned] == [("CALL_1", "changed"), ("CALL_9", "new")]
+
+    transcriber = CountingTranscriber()
+    summary = run_incremental(source, store, transcriber)
+    assert transcriber.seen == ["CALL_1", "CALL_9"]
+    assert summary["already_transcribed"] == 4
+
+
+def test_rows_without_fingerprint_compare_size_and_upload_time(audio_dir, store):
+    listing = {audio.call_id: audio for audio in LocalAudioSource(str(audio_dir)).list_files()}
+    notebook_rows = {
+        "CALL_0": {"fingerprint": None, "status": "SUCCESS", "size": listing["CALL_0"].size,
+                   "upload_time": listing["CALL_0"].last_modified},
+        "CALL_1": {"fingerprint": None, "status": "SUCCESS", "size": 1, "upload_time": listing["CALL_1"].last_modified},
+    }
+    planned = {audio.call_id: reason for audio, reason in plan_work(listing.values(), notebook_rows)}
+    assert "CALL_0" not in planned and planned["CALL_1"] == "changed"
+
+
+def test_each_batch_is_checkpointed(audio_dir, store):
+    summary = run_incremental(LocalAudioSource(str(audio_dir)), store, CountingTranscriber(), batch_size=2)
+
+    assert summary["batches"] == 3 and summary["files"] == 5
+    assert checkpoints(store) == [(1, 2, "CALL_1"), (2, 2, "CALL_3"), (3, 1, "CALL_4")]
+    assert {row["status"] for row in store.transcribed().values()} == {"SUCCESS"}
+
+
+def test_failed_transcriptions_are_retried_only_on_request(audio_dir, store):
+    source = LocalAudioSource(str(audio_dir))
+    assert run_incremental(source, store, lambda files: {})["failed"] == 5          # no result for any file
+
+    assert plan_work(source.list_files(), store.transcribed()) == []
+    retries = plan_work(source.list_files(), store.transcribed(), retry_failed=True)
+    assert {reason for _, reason in retries} == {"retry"} and len(retries) == 5
+
+
+def test_interrupted_run_resumes_without_transcribing_twice(audio_dir, store):
+    source = LocalAudioSource(str(audio_dir))
+    interrupted = CountingTranscriber(fail_on_batch=2)
+    with pytest.raises(RuntimeError):
+        run_incremental(source, store, interrupted, batch_size=2)
+    assert interrupted.seen == ["CALL_0", "CALL_1"]
+    assert sorted(store.transcribed()) == ["CALL_0", "CALL_1"]         # batch in flight not written
+
+    paused = CountingTranscriber()
+    assert run_incremental(source, store, paused, batch_size=2, max_batches=1)["files"] == 2
+    resumed = CountingTranscriber()
+    run_incremental(source, store, resumed, batch_size=2)
+
+    transcribed = interrupted.seen + paused.seen + resumed.seen
+    assert sorted(transcribed) == [f"CALL_{i}" for i in range(5)]
+    assert len(checkpoints(store)) == 3
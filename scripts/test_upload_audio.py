@@ -0,0 +1,99 @@
+"""
+Tests for the audio uploader (scripts/upload_audio.py) against a temporary
+LocalStage: unchanged files are skipped by size + mtime or MD5, batches are
+bounded per stage folder, a failed batch stays out of the manifest, and the
+directory table is refreshed exactly once per run.
+
+Usage:
+    python -m pytest scripts/test_upload_audio.py
+"""
+
+import os
+
+import pytest
+
+from upload_audio import LocalStage, UploadManifest, make_batches, scan, upload
+
+
+class FlakyStage(LocalStage):
+    """LocalStage whose PUTs into the given stage folders fail"""
+
+    def __init__(self, directory, failing_folders):
+        super().__init__(directory)
+        self.failing_folders = set(failing_folders)
+
+    def put_batch(self, folder, items):
+        if folder in self.failing_folders:
+            raise RuntimeError(f"PUT failed for {folder}")
+        super().put_batch(folder, items)
+
+
+@pytest.fixture
+def source(tmp_path):
+    folder = tmp_path / "audio"
+    for day in ("2025-03-01", "2025-03-02"):
+        (folder / day).mkdir(parents=True)
+        for i in range(3):
+            (folder / day / f"CALL_{day}_{i}.mp3").write_bytes(f"{day}-{i}".encode() * 100)
+    (folder / "README.txt").write_text("not audio")
+    return folder
+
+
+def manifest_for(tmp_path, stage):
+    return UploadManifest(str(tmp_path / "manifest.json"), stage.name)
+
+
+def test_unchanged_files_are_skipped_by_size_and_mtime_or_md5(tmp_path, source):
+    stage = LocalStage(str(tmp_path / "stage"))
+    assert upload(stage, str(source), manifest_for(tmp_path, stage))["files"] == 6
+
+    manifest = manifest_for(tmp_path, stage)
+    assert scan(str(source), manifest) == ([], 6)
+
+    touched = source / "2025-03-01" / "CALL_2025-03-01_0.mp3"
+    changed = source / "2025-03-01" / "CALL_2025-03-01_1.mp3"
+    os.utime(touched, (1_700_000_000, 1_700_000_000))
+    changed.write_bytes(b"re-recorded" * 100)
+    to_upload, skipped = scan(str(source), manifest)
+
+    assert [item["path"] for item in to_upload] == ["2025-03-01/CALL_2025-03-01_1.mp3"]
+    assert skipped == 5
+    assert manifest.entries["2025-03-01/CALL_2025-03-01_0.mp3"]["mtime"] == 1_700_000_000  # touched, not changed
+
+
+def test_batches_are_bounded_per_stage_folder(tmp_path, source):
+    files, _ = scan(str(source), UploadManifest(str(tmp_path / "manifest.json"), "none"))
+    batches = make_batches(files, batch_bytes=3_000, batch_files=2)           # files are 1,200 bytes
+
+    assert [(folder, len(items)) for folder, items in batches] == [
+        ("2025-03-01", 2), ("2025-03-01", 1), ("2025-03-02", 2), ("2025-03-02", 1),
+    ]
+    assert len(make_batches(files, batch_bytes=2_000, batch_files=10)) == 6
+    assert len(make_batches(files, batch_bytes=1, batch_files=10)) == 6      # an oversized file goes alone
+
+
+def test_failed_batch_is_not_recorded_and_is_retried(tmp_path, source):
+    stage = FlakyStage(str(tmp_path / "stage"), failing_folders={"2025-03-02"})
+    summary = upload(stage, str(source), manifest_for(tmp_path, stage), batch_files=2)
+
+    assert summary["failed_batches"] == 2 and summary["files"] == 3
+    recorded = manifest_for(tmp_path, stage).entries
+    assert sorted(recorded) == [f"2025-03-01/CALL_2025-03-01_{i}.mp3" for i in range(3)]
+
+    stage.failing_folders.clear()
+    retry = upload(stage, str(source), manifest_for(tmp_path, stage), batch_files=2)
+    assert retry["files"] == 3 and retry["skipped"] == 3
+    assert sorted(os.listdir(tmp_path / "stage" / "2025-03-02")) == sorted(os.listdir(source / "2025-03-02"))
+
+
+def test_refresh_runs_once_per_run(tmp_path, source):
+    stage = LocalStage(str(tmp_path / "stage"))
+    upload(stage, str(source), manifest_for(tmp_path, stage), concurrency=4, batch_files=1)
+    assert stage.refreshes == 1
+
+    upload(stage, str(source), manifest_for(tmp_path, stage), concurrency=4, batch_files=1)
+    assert stage.refreshes == 1                                             # nothing uploaded, nothing to refresh
+
+    flaky = FlakyStage(str(tmp_path / "flaky"), failing_folders={"2025-03-01"})
+    upload(flaky, str(source), manifest_for(tmp_path, flaky), concurrency=4, batch_files=1)
+    assert flaky.refreshes == 1
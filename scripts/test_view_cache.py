@@ -0,0 +1,86 @@
+"""
+Tests for the view model cache (Streamlit App/view_cache.py) and the data
+versions its keys are built from (frame_adapter.data_version).
+
+Usage:
+    python -m pytest scripts/test_view_cache.py
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+from frame_adapter import data_version
+from view_cache import ViewModelCache, estimate_size, view_key
+
+
+class Frame:
+    def __init__(self, key):
+        self.key = key
+
+
+def frame_of(size_bytes):
+    """A view model whose estimate_size is about size_bytes"""
+    return pd.DataFrame({"x": range(size_bytes // 8)})
+
+
+def test_hit_returns_cached_view_without_building():
+    cache = ViewModelCache()
+    assert cache.get_or_build("k", lambda: "built") == "built"
+    assert cache.get_or_build("k", lambda: "rebuilt") == "built"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_none_key_bypasses_cache():
+    cache = ViewModelCache()
+    assert cache.get_or_build(None, lambda: 1) == 1
+    assert cache.get_or_build(None, lambda: 2) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_byte_budget_evicts_least_recently_used():
+    size = estimate_size(frame_of(10_000))
+    cache = ViewModelCache(max_bytes=int(size * 2.5))
+    cache.get_or_build("a", lambda: frame_of(10_000))
+    cache.get_or_build("b", lambda: frame_of(10_000))
+    cache.get_or_build("a", lambda: None)              # touch a: b is now the oldest
+    cache.get_or_build("c", lambda: frame_of(10_000))
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.get_or_build("a", lambda: None) is not None
+    assert cache.get_or_build("b", lambda: "rebuilt") == "rebuilt"
+
+
+def test_entry_limit_evicts_oldest():
+    cache = ViewModelCache(max_entries=2)
+    for key in "abc":
+        cache.get_or_build(key, lambda key=key: key)
+    assert cache.stats()["entries"] == 2
+    assert cache.get_or_build("a", lambda: "rebuilt") == "rebuilt"
+
+
+def test_view_larger_than_budget_is_returned_but_not_stored():
+    cache = ViewModelCache(max_bytes=1000)
+    view = frame_of(10_000)
+    assert cache.get_or_build("big", lambda: view) is view
+    assert cache.stats()["entries"] == 0 and cache.total_bytes == 0
+
+
+def test_view_key_is_none_for_unversioned_frames():
+    assert view_key("page", Frame(("calls", "q1")), Frame(None)) is None
+    assert view_key("page", Frame(("calls", "q1")), b=2, a=1) == view_key("page", Frame(("calls", "q1")), a=1, b=2)
+
+
+def test_data_version_uses_query_id():
+    table = pa.table({"x": [1]}).replace_schema_metadata({"query_id": "01abc"})
+    assert data_version(table) == "01abc"
+
+
+def test_data_version_of_local_tables_follows_content():
+    first = pa.table({"x": [1, 2]})
+    assert data_version(first) == data_version(pa.table({"x": [1, 2]}))
+    assert data_version(first) != data_version(pa.table({"x": [1, 3]}))
+    assert data_version(first) != data_version(pa.table({"y": [1, 2]}))
+    # Same row count and (after collection) possibly the same id() - still a new version
+    del first
+    assert data_version(pa.table({"x": [2, 1]})) != data_version(pa.table({"x": [1, 2]}))
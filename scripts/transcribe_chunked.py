@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Chunked Parallel Transcription
+Splits long recordings into bounded segments at MP3 frame boundaries,
+transcribes all segments concurrently and stitches them back into one
+transcript per call with segment timings - so an hour-long call finishes
+about as fast as a short one instead of holding up its whole batch.
+
+Splitting needs no decoder: frames are parsed straight from the MP3 bitstream.
+Each cut is placed at the quietest frame (fewest Layer III main-data bits) in
+the --search-seconds before the segment limit, so words are rarely cut in half.
+Segments start with a couple of lead-in frames for the bit reservoir; their
+offsets account for it.
+
+Usage:
+    python scripts/transcribe_chunked.py --local                             # offline: audio/ + stub
+    python scripts/transcribe_chunked.py --local --max-segment-seconds 20 --stub-realtime-factor 0.05
+    python scripts/transcribe_chunked.py --split-only --out /tmp/segments
+    python scripts/transcribe_chunked.py --connection my_conn --concurrency 16
+
+Prerequisites:
+    --local / --split-only: none
+    Snowflake: pip install snowflake-connector-python, a connection in
+    ~/.snowflake/connections.toml and sql/01_setup_database.sql (creates the stage)
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+AUDIO_DIR = os.path.join(PROJECT_ROOT, "audio")
+CALLS_CSV = os.path.join(PROJECT_ROOT, "data", "final", "FINAL_TABLE_COMPLETE.csv")
+AUDIO_STAGE = "@CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_CENTER_AUDIO_FILES"
+SEGMENT_FOLDER = "segments"
+
+# Frames carried before each segment's first frame: Layer III frames may borrow
+# main data from the previous frames (bit reservoir, up to 511 bytes back)
+RESERVOIR_FRAMES = 2
+
+
+# ============================================
+# MP3 FRAME PARSING
+# ============================================
+
+# offset/length in bytes; bits = Layer III part2_3_length summed over granules
+# and channels (a cheap loudness/complexity proxy), None for Layer I/II
+Frame = namedtuple("Frame", ["offset", "length", "seconds", "bits"])
+
+_BITRATES = {  # kbps by (MPEG-1 or later, layer)
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+_VERSIONS = {3: 1, 2: 2, 0: 25}  # header bits -> MPEG-1, MPEG-2, MPEG-2.5
+_LAYERS = {3: 1, 2: 2, 1: 3}
+
+
+def _parse_header(data, i):
+    """(frame length, samples, header dict) for a frame header at i, or None if invalid"""
+    if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[i + 1], data[i + 2], data[i + 3]
+    version = _VERSIONS.get((b1 >> 3) & 0x3)
+    layer = _LAYERS.get((b1 >> 1) & 0x3)
+    bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 0x3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x1
+    if layer == 1:
+        length, samples = (12 * bitrate // sample_rate + padding) * 4, 384
+    elif layer == 2 or version == 1:
+        length, samples = 144 * bitrate // sample_rate + padding, 1152
+    else:  # Layer III, MPEG-2/2.5
+        length, samples = 72 * bitrate // sample_rate + padding, 576
+    header = {
+        "version": version, "layer": layer, "sample_rate": sample_rate,
+        "crc": not (b1 & 0x1), "channels": 1 if (b3 >> 6) == 3 else 2,
+    }
+    return length, samples, header
+
+
+def _main_data_bits(data, i, header):
+    """Sum of part2_3_length from the Layer III side info"""
+    position = (i + 4 + (2 if header["crc"] else 0)) * 8
+    channels = header["channels"]
+
+    def read(bits):
+        nonlocal position
+        value = 0
+        for _ in range(bits):
+            value = (value << 1) | ((data[position >> 3] >> (7 - (position & 7))) & 1)
+            position += 1
+        return value
+
+    if header["version"] == 1:
+        position += 9 + (5 if channels == 1 else 3) + 4 * channels
+        granules, rest = 2, 59 - 12
+    else:
+        position += 8 + (1 if channels == 1 else 2)
+        granules, rest = 1, 63 - 12
+    total = 0
+    for _ in range(granules * channels):
+        total += read(12)
+        position += rest
+    return total
+
+
+def _id3v2_size(data):
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_frames(data):
+    """Audio frames of an MP3 (ID3 tags and a leading Xing/Info/VBRI frame are skipped)"""
+    frames = []
+    i = _id3v2_size(data)
+    end = len(data) - (128 if data[-128:-125] == b"TAG" else 0)
+    while i + 4 <= end:
+        parsed = _parse_header(data, i)
+        if parsed is None or i + parsed[0] > end:
+            i += 1
+            continue
+        length, samples, header = parsed
+        # Guard against false syncs inside audio data: the next frame must follow
+        following = i + length
+        if following + 4 <= end and _parse_header(data, following) is None:
+            i += 1
+            continue
+        body = data[i:i + length]
+        if not frames and (b"Xing" in body or b"Info" in body or b"VBRI" in body):
+            i += length  # VBR/encoder tag frame with whole-file metadata, no audio
+            continue
+        bits = _main_data_bits(data, i, header) if header["layer"] == 3 and length > 40 else None
+        frames.append(Frame(i, length, samples / header["sample_rate"], bits))
+        i += length
+    return frames
+
+
+# ============================================
+# SPLITTING
+# ============================================
+
+def plan_cuts(frames, max_seconds, search_seconds):
+    """
+    Frame indexes where segments start (always including 0). Every segment
+    is at most max_seconds long; each cut falls on the quietest frame in
+    the search window that ends at the limit.
+    """
+    starts = [0.0]
+    for frame in frames:
+        starts.append(starts[-1] + frame.seconds)
+    cuts = [0]
+    start = 0
+    while starts[-1] - starts[start] > max_seconds:
+        limit = starts[start] + max_seconds
+        last = start + 1
+        while last + 1 < len(frames) and starts[last + 1] <= limit:
+            last += 1
+        first = last
+        while first - 1 > start and starts[first - 1] >= limit - search_seconds:
+            first -= 1
+        candidates = range(first, last + 1)
+        if all(frames[k].bits is not None for k in candidates):
+            # Quietest frame wins; among equals, the latest (longest segment)
+            cut = min(candidates, key=lambda k: (frames[k].bits, -k))
+        else:
+            cut = last
+        cuts.append(cut)
+        start = cut
+    return cuts, starts
+
+
+def split_recording(path, out_dir, max_seconds=60.0, search_seconds=5.0):
+    """
+    Write the segments of one recording to out_dir and return their metadata.
+    A recording at or under max_seconds becomes a single segment.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    frames = parse_frames(data)
+    call_id = os.path.splitext(os.path.basename(path))[0]
+    if not frames:
+        raise ValueError(f"No MPEG audio frames found in {path}")
+
+    cuts, starts = plan_cuts(frames, max_seconds, search_seconds) if max_seconds else ([0], None)
+    if starts is None:
+        starts = [0.0]
+        for frame in frames:
+            starts.append(starts[-1] + frame.seconds)
+    bounds = cuts + [len(frames)]
+
+    segments = []
+    for index, (first, stop) in enumerate(zip(bounds, bounds[1:])):
+        lead = max(first - RESERVOIR_FRAMES, 0)
+        file_name = f"{call_id}__seg{index:03d}.mp3"
+        byte_start = frames[lead].offset
+        byte_end = frames[stop - 1].offset + frames[stop - 1].length
+        with open(os.path.join(out_dir, file_name), "wb") as f:
+            f.write(data[byte_start:byte_end])
+        segments.append({
+            "call_id": call_id,
+            "index": index,
+            "path": os.path.join(out_dir, file_name),
+            "stage_path": f"{SEGMENT_FOLDER}/{file_name}",
+            "start": round(starts[first], 3),            # nominal segment start in the call
+            "end": round(starts[stop], 3),
+            "offset": round(starts[lead], 3),            # call time of the segment file's t=0
+            "call_duration": round(starts[-1], 3),
+        })
+    return segments
+
+
+def split_all(source_dir, out_dir, max_seconds, search_seconds):
+    """Split every MP3 in source_dir into out_dir/segments; writes segments.json"""
+    segment_dir = os.path.join(out_dir, SEGMENT_FOLDER)
+    os.makedirs(segment_dir, exist_ok=True)
+    segments = []
+    for name in sorted(os.listdir(source_dir)):
+        if name.lower().endswith(".mp3"):
+            segments.extend(split_recording(os.path.join(source_dir, name), segment_dir,
+                                            max_seconds, search_seconds))
+    with open(os.path.join(out_dir, "segments.json"), "w", encoding="utf-8") as f:
+        json.dump(segments, f, indent=1)
+    return segments
+
+
+# ============================================
+# STITCHING
+# ============================================
+
+def stitch(call_id, segment_results):
+    """
+    One transcript from (segment, result) pairs: text joined in order, each
+    segment's span, and any word/speaker timestamps shifted to call time.
+    """
+    pairs = sorted(segment_results, key=lambda pair: pair[0]["index"])
+    texts, spans, timestamps = [], [], []
+    for segment, result in pairs:
+        result = result or {}
+        timed = result.get("segments") or []
+        text = result.get("text")
+        if text is None:
+            text = " ".join(item.get("text", "") for item in timed)
+        text = text.strip()
+        if text:
+            texts.append(text)
+        spans.append({"index": segment["index"], "start": segment["start"], "end": segment["end"], "text": text})
+        for item in timed:
+            shifted = dict(item)
+            shifted["start"] = round(item["start"] + segment["offset"], 3)
+            shifted["end"] = round(item["end"] + segment["offset"], 3)
+            timestamps.append(shifted)
+    return {
+        "call_id": call_id,
+        "text": " ".join(texts),
+        "audio_duration": pairs[-1][0]["call_duration"] if pairs else 0.0,
+        "segments": spans,
+        "timestamps": timestamps,
+    }
+
+
+# ============================================
+# TRANSCRIBERS
+# ============================================
+
+class StubSegmentTranscriber:
+    """
+    Offline transcriber: returns the slice of the call's data/final transcript
+    that falls in the segment (words spread evenly over the call), with word
+    timestamps, after sleeping realtime_factor x segment length.
+    """
+
+    def __init__(self, realtime_factor=0.0, transcripts_csv=CALLS_CSV):
+        self.realtime_factor = realtime_factor
+        with open(transcripts_csv, encoding="utf-8") as f:
+            self.transcripts = {row["CALL_ID"]: row["TRANSCRIPT_TEXT"].split() for row in csv.DictReader(f)}
+
+    def __call__(self, segment):
+        time.sleep(self.realtime_factor * (segment["end"] - segment["offset"]))
+        words = self.transcripts.get(segment["call_id"], [])
+        per_word = segment["call_duration"] / max(len(words), 1)
+        first = round(segment["start"] / per_word) if words else 0
+        last = round(segment["end"] / per_word) if words else 0
+        timed = [
+            {"start": round(k * per_word - segment["offset"], 3),
+             "end": round((k + 1) * per_word - segment["offset"], 3),
+             "text": words[k]}
+            for k in range(first, min(last, len(words)))
+        ]
+        return {"audio_duration": segment["end"] - segment["offset"], "segments": timed,
+                "text": " ".join(item["text"] for item in timed)}
+
+
+class CortexSegmentTranscriber:
+    """AI_TRANSCRIBE of one staged segment with word timestamps (one connection per thread)"""
+
+    def __init__(self, connection_name, stage=AUDIO_STAGE):
+        import snowflake.connector
+        self._connector = snowflake.connector
+        self._connection_name = connection_name
+        self._local = threading.local()
+        self.stage = stage
+
+    def __call__(self, segment):
+        if not hasattr(self._local, "connection"):
+            self._local.connection = self._connector.connect(connection_name=self._connection_name)
+        cursor = self._local.connection.cursor()
+        cursor.execute(
+            "SELECT AI_TRANSCRIBE(TO_FILE(%s, %s), {'timestamp_granularity': 'word'})",
+            (self.stage, segment["stage_path"]),
+        )
+        value = cursor.fetchone()[0]
+        return json.loads(value) if isinstance(value, str) else value
+
+
+# ============================================
+# ORCHESTRATION
+# ============================================
+
+def transcribe_segments(segments, transcriber, concurrency):
+    """
+    Transcribe all segments of all calls on one pool (so a long call's
+    segments run side by side) and stitch per call.
+    Returns ({call_id: transcript}, {call_id: seconds until its last segment finished}).
+    """
+    by_call = {}
+    for segment in segments:
+        by_call.setdefault(segment["call_id"], []).append(segment)
+    results = {call_id: [] for call_id in by_call}
+    finished = {}
+    # Longest segments first keeps the pool busy to the end
+    ordered = sorted(segments, key=lambda s: s["end"] - s["offset"], reverse=True)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(transcriber, segment): segment for segment in ordered}
+        for future in as_completed(futures):
+            segment = futures[future]
+            results[segment["call_id"]].append((segment, future.result()))
+            if len(results[segment["call_id"]]) == len(by_call[segment["call_id"]]):
+                finished[segment["call_id"]] = time.perf_counter() - start
+    transcripts = {call_id: stitch(call_id, pairs) for call_id, pairs in results.items()}
+    return transcripts, finished
+
+
+def upload_segments(connection_name, out_dir, concurrency):
+    """Stage out_dir/segments with the parallel uploader (skips unchanged segments)"""
+    import upload_audio
+    stage = upload_audio.SnowflakeStage(connection_name)
+    manifest = upload_audio.UploadManifest(os.path.join(out_dir, upload_audio.MANIFEST_NAME), stage.name)
+    summary = upload_audio.upload(stage, out_dir, manifest, concurrency)
+    if summary["failed_batches"]:
+        raise RuntimeError(f"{summary['failed_batches']} segment batch(es) failed to upload")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split long recordings, transcribe segments in parallel, stitch")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local", action="store_true", help="Offline: stub transcriber over data/final transcripts")
+    target.add_argument("--split-only", action="store_true", help="Only write segments + segments.json")
+    parser.add_argument("--source", default=AUDIO_DIR, help="Folder of MP3 recordings (default: audio/)")
+    parser.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "call_segments"),
+                        help="Output folder for segments/ and transcripts/")
+    parser.add_argument("--max-segment-seconds", type=float, default=60.0,
+                        help="Upper bound on segment length (0 = do not split)")
+    parser.add_argument("--search-seconds", type=float, default=5.0,
+                        help="Look this far back from the limit for the quietest cut point")
+    parser.add_argument("--concurrency", type=int, default=8, help="Segments transcribed at once")
+    parser.add_argument("--stub-realtime-factor", type=float, default=0.0,
+                        help="--local: simulated transcription seconds per second of audio")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("CHUNKED PARALLEL TRANSCRIPTION")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    segments = split_all(args.source, args.out, args.max_segment_seconds, args.search_seconds)
+    calls = {s["call_id"] for s in segments}
+    longest = max(s["end"] - s["start"] for s in segments)
+    print(f"✂️  {len(calls)} recordings -> {len(segments)} segments (longest {longest:.1f}s) "
+          f"in {time.perf_counter() - start:.1f}s: {os.path.join(args.out, SEGMENT_FOLDER)}")
+    if args.split_only:
+        return 0
+
+    if args.local:
+        transcriber = StubSegmentTranscriber(args.stub_realtime_factor)
+    else:
+        upload_segments(args.connection, args.out, args.concurrency)
+        transcriber = CortexSegmentTranscriber(args.connection)
+
+    transcripts, finished = transcribe_segments(segments, transcriber, args.concurrency)
+
+    transcript_dir = os.path.join(args.out, "transcripts")
+    os.makedirs(transcript_dir, exist_ok=True)
+    for call_id, transcript in transcripts.items():
+        with open(os.path.join(transcript_dir, f"{call_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(transcript, f, indent=1)
+
+    latencies = list(finished.values())
+    print(f"🎙️  Transcribed {len(segments)} segments with concurrency {args.concurrency}")
+    print(f"   Per-call latency: p50 {percentile(latencies, 0.5):.2f}s | "
+          f"p95 {percentile(latencies, 0.95):.2f}s | max {max(latencies):.2f}s")
+
+    if args.local:
+        # Offline check: stitched text must reproduce the source transcript
+        stub = transcriber
+        mismatched = [c for c, t in transcripts.items()
+                      if c in stub.transcripts and t["text"].split() != stub.transcripts[c]]
+        if mismatched:
+            print(f"❌ Stitching mismatch for {len(mismatched)} calls: {', '.join(sorted(mismatched)[:5])}")
+            return 1
+        print("✓ Stitched transcripts match the source transcripts word for word")
+
+    print("\n" + "=" * 70)
+    print(f"✅ Transcripts written to {transcript_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Incremental Transcription Pipeline
+Transcribes only the audio files that are new or changed since the last run,
+instead of re-running AI_TRANSCRIBE over the whole CALL_CENTER_AUDIO_FILES
+stage like the CREATE TABLE ... AS SELECT in 01_AI_TRANSCRIBE_DEMO.
+
+1. List the stage directory (path, size, last modified, MD5)
+2. Diff it against AI_TRANSCRIBED_CALLS (call_id + file fingerprint)
+3. Transcribe the difference in bounded batches (--batch-size / --max-batch-mb)
+4. After each batch, upsert its transcripts and a TRANSCRIPTION_CHECKPOINTS row
+   in one transaction - an interrupted run loses at most the batch in flight
+   and simply resumes on the next run
+
+The transcriber is pluggable: CortexTranscriber calls AI_TRANSCRIBE in
+Snowflake, StubTranscriber returns the pre-processed transcripts from
+data/final so the pipeline can be exercised locally against the audio/ folder.
+
+Usage:
+    python scripts/transcribe_incremental.py --local                       # audio/ + SQLite + stub
+    python scripts/transcribe_incremental.py --local --dry-run
+    python scripts/transcribe_incremental.py --connection my_conn --batch-size 20 --max-batches 5
+
+Prerequisites:
+    --local: none
+    Snowflake: pip install snowflake-snowpark-python, a connection in
+    ~/.snowflake/connections.toml, and audio uploaded to @CALL_CENTER_AUDIO_FILES
+    (a stage with DIRECTORY = (ENABLE = TRUE))
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+AUDIO_DIR = os.path.join(PROJECT_ROOT, "audio")
+CALLS_CSV = os.path.join(PROJECT_ROOT, "data", "final", "FINAL_TABLE_COMPLETE.csv")
+
+AUDIO_STAGE = "@CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_CENTER_AUDIO_FILES"
+TRANSCRIPT_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.AI_TRANSCRIBED_CALLS"
+CHECKPOINT_TABLE = "CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.TRANSCRIPTION_CHECKPOINTS"
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+
+# One file in the stage listing. fingerprint is the MD5 when the stage provides one.
+AudioFile = namedtuple("AudioFile", ["call_id", "path", "size", "last_modified", "fingerprint"])
+
+TRANSCRIPT_COLUMNS = [
+    "CALL_ID", "FILE_PATH", "FILE_SIZE_BYTES", "UPLOAD_TIME", "TRANSCRIPTION_RESULT",
+    "TRANSCRIPT_TEXT", "TRANSCRIPTION_TIMESTAMP", "TRANSCRIPT_LENGTH", "WORD_COUNT",
+    "TRANSCRIPTION_STATUS", "FILE_FINGERPRINT",
+]
+
+
+def call_id_for(path):
+    """CALL_20250728_09998.mp3 -> CALL_20250728_09998 (same rule as the notebook)"""
+    return os.path.splitext(path)[0]
+
+
+# ============================================
+# PLANNING
+# ============================================
+
+def plan_work(listing, transcribed, retry_failed=False):
+    """
+    Files that need transcribing, as (AudioFile, reason) with reason 'new',
+    'changed' or 'retry'. Rows written by the notebook have no fingerprint;
+    for those a change is detected from size and upload time.
+    """
+    work = []
+    for audio in sorted(listing, key=lambda a: a.path):
+        existing = transcribed.get(audio.call_id)
+        if existing is None:
+            work.append((audio, "new"))
+        elif existing["fingerprint"]:
+            if existing["fingerprint"] != audio.fingerprint:
+                work.append((audio, "changed"))
+            elif retry_failed and existing["status"] == "FAILED":
+                work.append((audio, "retry"))
+        elif (existing["size"], str(existing["upload_time"])) != (audio.size, str(audio.last_modified)):
+            work.append((audio, "changed"))
+        elif retry_failed and existing["status"] == "FAILED":
+            work.append((audio, "retry"))
+    return work
+
+
+def make_batches(files, batch_size, max_batch_bytes):
+    """Split files into batches of at most batch_size files and max_batch_bytes (one oversized file goes alone)"""
+    batch, batch_bytes = [], 0
+    for audio in files:
+        if batch and (len(batch) >= batch_size or batch_bytes + audio.size > max_batch_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(audio)
+        batch_bytes += audio.size
+    if batch:
+        yield batch
+
+
+def transcript_record(audio, result, transcribed_at):
+    """Row for AI_TRANSCRIBED_CALLS, with the notebook's derived columns"""
+    text = (result or {}).get("text")
+    if text is None:
+        status = "FAILED"
+    elif len(text) < 10:
+        status = "SHORT"
+    else:
+        status = "SUCCESS"
+    return {
+        "CALL_ID": audio.call_id,
+        "FILE_PATH": audio.path,
+        "FILE_SIZE_BYTES": audio.size,
+        "UPLOAD_TIME": str(audio.last_modified),
+        "TRANSCRIPTION_RESULT": json.dumps(result) if result is not None else None,
+        "TRANSCRIPT_TEXT": text,
+        "TRANSCRIPTION_TIMESTAMP": transcribed_at,
+        "TRANSCRIPT_LENGTH": len(text) if text is not None else None,
+        "WORD_COUNT": len(text.split(" ")) if text is not None else None,
+        "TRANSCRIPTION_STATUS": status,
+        "FILE_FINGERPRINT": audio.fingerprint,
+    }
+
+
+# ============================================
+# SNOWFLAKE
+# ============================================
+
+class StageAudioSource:
+    """Audio files in the CALL_CENTER_AUDIO_FILES directory table"""
+
+    def __init__(self, session, stage=AUDIO_STAGE, refresh=True):
+        self.session = session
+        self.stage = stage
+        self.refresh = refresh
+
+    def list_files(self):
+        if self.refresh:
+            # Directory tables only see uploads after a refresh (unless AUTO_REFRESH is on)
+            self.session.sql(f"ALTER STAGE {self.stage.lstrip('@')} REFRESH").collect()
+        filters = " OR ".join(f"RELATIVE_PATH ILIKE '%{ext}'" for ext in AUDIO_EXTENSIONS)
+        rows = self.session.sql(f"""
+            SELECT RELATIVE_PATH, SIZE, LAST_MODIFIED, MD5
+            FROM DIRECTORY('{self.stage}')
+            WHERE {filters}
+        """).collect()
+        return [
+            AudioFile(call_id_for(row["RELATIVE_PATH"]), row["RELATIVE_PATH"], row["SIZE"],
+                      row["LAST_MODIFIED"], row["MD5"] or f"{row['SIZE']}:{row['LAST_MODIFIED']}")
+            for row in rows
+        ]
+
+
+class CortexTranscriber:
+    """AI_TRANSCRIBE over one batch of staged files, in a single query"""
+
+    def __init__(self, session, stage=AUDIO_STAGE):
+        self.session = session
+        self.stage = stage
+
+    def __call__(self, files):
+        placeholders = ", ".join("?" for _ in files)
+        rows = self.session.sql(f"""
+            SELECT RELATIVE_PATH, AI_TRANSCRIBE(TO_FILE('{self.stage}', RELATIVE_PATH)) AS RESULT
+            FROM DIRECTORY('{self.stage}')
+            WHERE RELATIVE_PATH IN ({placeholders})
+        """, params=[audio.path for audio in files]).collect()
+        return {
+            call_id_for(row["RELATIVE_PATH"]): json.loads(row["RESULT"]) if row["RESULT"] else None
+            for row in rows
+        }
+
+
+class SnowflakeTranscriptStore:
+    """AI_TRANSCRIBED_CALLS (created by the notebook or here) plus TRANSCRIPTION_CHECKPOINTS"""
+
+    def __init__(self, session):
+        self.session = session
+        self._sql(f"""
+            CREATE TABLE IF NOT EXISTS {TRANSCRIPT_TABLE} (
+                CALL_ID VARCHAR, FILE_PATH VARCHAR, FILE_SIZE_BYTES NUMBER, UPLOAD_TIME TIMESTAMP_LTZ,
+                TRANSCRIPTION_RESULT VARIANT, TRANSCRIPT_TEXT VARCHAR, TRANSCRIPTION_TIMESTAMP TIMESTAMP_LTZ,
+                TRANSCRIPT_LENGTH NUMBER, WORD_COUNT NUMBER, TRANSCRIPTION_STATUS VARCHAR
+            )
+        """)
+        # Tables built by the notebook predate change detection
+        self._sql(f"ALTER TABLE {TRANSCRIPT_TABLE} ADD COLUMN IF NOT EXISTS FILE_FINGERPRINT VARCHAR")
+        self._sql(f"""
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                RUN_ID VARCHAR, BATCH_NUMBER NUMBER, FILES NUMBER, BYTES NUMBER,
+                FAILED NUMBER, LAST_CALL_ID VARCHAR, COMMITTED_AT TIMESTAMP_LTZ
+            )
+        """)
+
+    def _sql(self, query, params=None):
+        return self.session.sql(query, params=params).collect()
+
+    def transcribed(self):
+        rows = self._sql(f"""
+            SELECT CALL_ID, FILE_FINGERPRINT, TRANSCRIPTION_STATUS, FILE_SIZE_BYTES, UPLOAD_TIME
+            FROM {TRANSCRIPT_TABLE}
+        """)
+        return {
+            row["CALL_ID"]: {"fingerprint": row["FILE_FINGERPRINT"], "status": row["TRANSCRIPTION_STATUS"],
+                             "size": row["FILE_SIZE_BYTES"], "upload_time": row["UPLOAD_TIME"]}
+            for row in rows
+        }
+
+    def write_batch(self, run_id, batch_number, records):
+        """Upsert the batch and record its checkpoint atomically"""
+        import pandas as pd
+        staged = f"TRANSCRIPTION_BATCH_{uuid.uuid4().hex[:8].upper()}"
+        self.session.create_dataframe(pd.DataFrame(records, columns=TRANSCRIPT_COLUMNS)).write.save_as_table(
+            staged, mode="overwrite", table_type="temporary"
+        )
+        updates = ", ".join(f"t.{c} = s.{c}" for c in TRANSCRIPT_COLUMNS if c != "CALL_ID")
+        values = ", ".join(f"s.{c}" for c in TRANSCRIPT_COLUMNS)
+        source = ", ".join(
+            "PARSE_JSON(TRANSCRIPTION_RESULT) AS TRANSCRIPTION_RESULT" if c == "TRANSCRIPTION_RESULT" else c
+            for c in TRANSCRIPT_COLUMNS
+        )
+        failed = sum(1 for r in records if r["TRANSCRIPTION_STATUS"] == "FAILED")
+
+        self._sql("BEGIN")
+        try:
+            self._sql(f"""
+                MERGE INTO {TRANSCRIPT_TABLE} t
+                USING (SELECT {source} FROM {staged}) s
+                ON t.CALL_ID = s.CALL_ID
+                WHEN MATCHED THEN UPDATE SET {updates}
+                WHEN NOT MATCHED THEN INSERT ({', '.join(TRANSCRIPT_COLUMNS)}) VALUES ({values})
+            """)
+            self._sql(f"INSERT INTO {CHECKPOINT_TABLE} VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP())",
+                      [run_id, batch_number, len(records), sum(r["FILE_SIZE_BYTES"] for r in records),
+                       failed, records[-1]["CALL_ID"]])
+            self._sql("COMMIT")
+        except Exception:
+            self._sql("ROLLBACK")
+            raise
+        finally:
+            self._sql(f"DROP TABLE IF EXISTS {staged}")
+
+
+# ============================================
+# LOCAL STAND-INS
+# ============================================
+
+class LocalAudioSource:
+    """Audio files in a local folder (defaults to audio/), fingerprinted by MD5 like the stage"""
+
+    def __init__(self, directory=AUDIO_DIR):
+        self.directory = directory
+
+    def list_files(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                md5 = hashlib.md5()
+                with open(full_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        md5.update(chunk)
+                stat = os.stat(full_path)
+                modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+                files.append(AudioFile(call_id_for(path), path, stat.st_size, modified, md5.hexdigest()))
+        return files
+
+
+class StubTranscriber:
+    """
+    Local transcriber: returns the pre-processed transcript from data/final for
+    known call IDs (a placeholder otherwise) and sleeps seconds_per_mb to stand
+    in for transcription cost.
+    """
+
+    def __init__(self, seconds_per_mb=0.0, transcripts_csv=CALLS_CSV):
+        self.seconds_per_mb = seconds_per_mb
+        self.transcripts = {}
+        if os.path.exists(transcripts_csv):
+            with open(transcripts_csv, encoding="utf-8") as f:
+                self.transcripts = {row["CALL_ID"]: row["TRANSCRIPT_TEXT"] for row in csv.DictReader(f)}
+        self.files = 0
+        self.bytes = 0
+
+    def __call__(self, files):
+        self.files += len(files)
+        self.bytes += sum(audio.size for audio in files)
+        time.sleep(self.seconds_per_mb * sum(audio.size for audio in files) / 1e6)
+        return {
+            audio.call_id: {"text": self.transcripts.get(audio.call_id, f"[stub transcript] {audio.call_id}")}
+            for audio in files
+        }
+
+
+class LocalTranscriptStore:
+    """SQLite stand-in for AI_TRANSCRIBED_CALLS + TRANSCRIPTION_CHECKPOINTS"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS AI_TRANSCRIBED_CALLS (
+                {', '.join(TRANSCRIPT_COLUMNS)},
+                PRIMARY KEY (CALL_ID)
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS TRANSCRIPTION_CHECKPOINTS (
+                RUN_ID, BATCH_NUMBER, FILES, BYTES, FAILED, LAST_CALL_ID, COMMITTED_AT
+            )
+        """)
+
+    def transcribed(self):
+        rows = self.db.execute("""
+            SELECT CALL_ID, FILE_FINGERPRINT, TRANSCRIPTION_STATUS, FILE_SIZE_BYTES, UPLOAD_TIME
+            FROM AI_TRANSCRIBED_CALLS
+        """)
+        return {
+            call_id: {"fingerprint": fingerprint, "status": status, "size": size, "upload_time": upload_time}
+            for call_id, fingerprint, status, size, upload_time in rows
+        }
+
+    def write_batch(self, run_id, batch_number, records):
+        placeholders = ", ".join("?" for _ in TRANSCRIPT_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in TRANSCRIPT_COLUMNS if c != "CALL_ID")
+        failed = sum(1 for r in records if r["TRANSCRIPTION_STATUS"] == "FAILED")
+        self.db.execute("BEGIN")
+        try:
+            self.db.executemany(
+                f"INSERT INTO AI_TRANSCRIBED_CALLS ({', '.join(TRANSCRIPT_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (CALL_ID) DO UPDATE SET {updates}",
+                [[r[c] for c in TRANSCRIPT_COLUMNS] for r in records],
+            )
+            self.db.execute(
+                "INSERT INTO TRANSCRIPTION_CHECKPOINTS VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, batch_number, len(records), sum(r["FILE_SIZE_BYTES"] for r in records),
+                 failed, records[-1]["CALL_ID"], datetime.now(timezone.utc).isoformat()),
+            )
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+
+# ============================================
+# ORCHESTRATOR
+# ============================================
+
+def run_incremental(source, store, transcriber, batch_size=20, max_batch_bytes=200_000_000,
+                    max_batches=None, retry_failed=False, dry_run=False):
+    """Diff, then transcribe and checkpoint batch by batch. Returns a summary dict."""
+    run_id = uuid.uuid4().hex[:12]
+    listing = source.list_files()
+    transcribed = store.transcribed()
+    work = plan_work(listing, transcribed, retry_failed)
+
+    reasons = {}
+    for _, reason in work:
+        reasons[reason] = reasons.get(reason, 0) + 1
+    summary = {
+        "run_id": run_id,
+        "listed": len(listing),
+        "listed_bytes": sum(audio.size for audio in listing),
+        "already_transcribed": len(listing) - len(work),
+        "to_transcribe": reasons,
+        "batches": 0,
+        "files": 0,
+        "bytes": 0,
+        "failed": 0,
+    }
+
+    print(f"📂 {summary['listed']} files listed ({summary['listed_bytes'] / 1e6:,.1f} MB), "
+          f"{summary['already_transcribed']} up to date, {len(work)} to transcribe {reasons or ''}")
+    if dry_run or not work:
+        return summary
+
+    for batch_number, batch in enumerate(make_batches([audio for audio, _ in work], batch_size, max_batch_bytes), 1):
+        if max_batches is not None and batch_number > max_batches:
+            print(f"⏸  Stopping after {max_batches} batches - the rest is picked up next run")
+            break
+        start = time.perf_counter()
+        results = transcriber(batch)
+        transcribed_at = datetime.now(timezone.utc).isoformat()
+        records = [transcript_record(audio, results.get(audio.call_id), transcribed_at) for audio in batch]
+        store.write_batch(run_id, batch_number, records)
+
+        failed = sum(1 for r in records if r["TRANSCRIPTION_STATUS"] == "FAILED")
+        batch_bytes = sum(audio.size for audio in batch)
+        summary["batches"] += 1
+        summary["files"] += len(batch)
+        summary["bytes"] += batch_bytes
+        summary["failed"] += failed
+        print(f"   ✓ Batch {batch_number}: {len(batch)} files ({batch_bytes / 1e6:,.1f} MB) "
+              f"in {time.perf_counter() - start:.1f}s, {failed} failed - checkpointed at {batch[-1].call_id}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe only new or changed audio files")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local", action="store_true", help="audio/ folder + SQLite store + stub transcriber")
+    parser.add_argument("--audio-dir", default=AUDIO_DIR, help="--local: folder of audio files")
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "transcriptions.sqlite"),
+                        help="--local: SQLite file for transcripts and checkpoints")
+    parser.add_argument("--stub-seconds-per-mb", type=float, default=0.0,
+                        help="--local: simulated transcription time per MB of audio")
+    parser.add_argument("--batch-size", type=int, default=20, help="Files per batch")
+    parser.add_argument("--max-batch-mb", type=float, default=200, help="Audio MB per batch")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches (resume next run)")
+    parser.add_argument("--retry-failed", action="store_true", help="Also retry files whose last transcription FAILED")
+    parser.add_argument("--no-refresh", action="store_true", help="Do not refresh the stage directory table first")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would be transcribed")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("INCREMENTAL TRANSCRIPTION PIPELINE")
+    print("=" * 70)
+
+    if args.local:
+        source = LocalAudioSource(args.audio_dir)
+        store = LocalTranscriptStore(args.db)
+        transcriber = StubTranscriber(args.stub_seconds_per_mb)
+        print(f"💻 Local run: {args.audio_dir} -> {args.db} (stub transcriber)")
+    else:
+        from snowflake.snowpark import Session
+        session = Session.builder.config("connection_name", args.connection).create()
+        source = StageAudioSource(session, refresh=not args.no_refresh)
+        store = SnowflakeTranscriptStore(session)
+        transcriber = CortexTranscriber(session)
+        print(f"❄️  Snowflake run: {AUDIO_STAGE} -> {TRANSCRIPT_TABLE}")
+
+    start = time.perf_counter()
+    try:
+        summary = run_incremental(
+            source, store, transcriber,
+            batch_size=args.batch_size,
+            max_batch_bytes=int(args.max_batch_mb * 1e6),
+            max_batches=args.max_batches,
+            retry_failed=args.retry_failed,
+            dry_run=args.dry_run,
+        )
+    except Exception as exc:
+        print(f"\n❌ Run stopped: {exc}")
+        print("   Completed batches are checkpointed - re-run to resume")
+        return 1
+
+    print("\n" + "=" * 70)
+    if args.dry_run:
+        print("ℹ️  Dry run - nothing transcribed")
+        return 0
+    print(f"✅ Run {summary['run_id']}: transcribed {summary['files']} files "
+          f"({summary['bytes'] / 1e6:,.1f} of {summary['listed_bytes'] / 1e6:,.1f} MB) "
+          f"in {summary['batches']} batches, {time.perf_counter() - start:.1f}s")
+    if summary["failed"]:
+        print(f"⚠️  {summary['failed']} files FAILED - re-run with --retry-failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Audio Stage Uploader
+Uploads the audio/ recordings to @CALL_CENTER_AUDIO_FILES in parallel and
+resumably.
+
+- Files are grouped into batches by size (--batch-mb / --batch-files); each
+  batch is one PUT of a temporary folder of hard links, so thousands of small
+  recordings do not cost thousands of round trips
+- --concurrency batches upload at once, each on its own connection
+- A local manifest records every uploaded file with its MD5; unchanged files
+  are skipped (size + mtime match avoids re-hashing), changed files re-uploaded
+- The manifest is saved after every batch, so an interrupted run resumes
+- The stage directory table is refreshed once at the end, not per file
+
+Usage:
+    python scripts/upload_audio.py --connection my_conn
+    python scripts/upload_audio.py --connection my_conn --concurrency 8 --batch-mb 256
+    python scripts/upload_audio.py --local-stage /tmp/stage                # local-directory stand-in
+
+Prerequisites:
+    Snowflake: pip install snowflake-connector-python, a connection in
+    ~/.snowflake/connections.toml and sql/01_setup_database.sql (creates the stage)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "audio")
+AUDIO_STAGE = "@CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.CALL_CENTER_AUDIO_FILES"
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+MANIFEST_NAME = ".upload_manifest.json"
+
+
+# ============================================
+# MANIFEST
+# ============================================
+
+class UploadManifest:
+    """
+    JSON manifest of uploaded files per stage target:
+    {"targets": {target: {relative_path: {"md5", "size", "mtime", "uploaded_at"}}}}
+    Saved atomically (write + rename) so an interrupted save never corrupts it.
+    """
+
+    def __init__(self, path, target):
+        self.path = path
+        self.target = target
+        self._lock = threading.Lock()
+        self._data = {"targets": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._data = json.load(f)
+        self.entries = self._data["targets"].setdefault(target, {})
+
+    def record(self, files):
+        uploaded_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for item in files:
+                self.entries[item["path"]] = {
+                    "md5": item["md5"], "size": item["size"], "mtime": item["mtime"], "uploaded_at": uploaded_at,
+                }
+            self.save()
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def scan(source_dir, manifest):
+    """
+    (to_upload, skipped) for the audio files under source_dir. A file whose
+    size and mtime match its manifest entry is trusted without hashing; other
+    files are hashed and skipped only if the MD5 is unchanged.
+    """
+    to_upload, skipped = [], 0
+    for root, _, names in os.walk(source_dir):
+        for name in sorted(names):
+            if not name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            full_path = os.path.join(root, name)
+            stat = os.stat(full_path)
+            item = {
+                "path": os.path.relpath(full_path, source_dir).replace(os.sep, "/"),
+                "full_path": full_path,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+            entry = manifest.entries.get(item["path"])
+            if entry and (entry["size"], entry["mtime"]) == (item["size"], item["mtime"]):
+                skipped += 1
+                continue
+            item["md5"] = file_md5(full_path)
+            if entry and entry["md5"] == item["md5"]:
+                manifest.entries[item["path"]]["mtime"] = item["mtime"]  # touched, not changed
+                skipped += 1
+                continue
+            to_upload.append(item)
+    return to_upload, skipped
+
+
+def make_batches(files, batch_bytes, batch_files):
+    """Group files by stage folder into batches bounded by total size and count"""
+    by_folder = {}
+    for item in files:
+        by_folder.setdefault(os.path.dirname(item["path"]), []).append(item)
+    batches = []
+    for folder, items in sorted(by_folder.items()):
+        batch, size = [], 0
+        for item in items:
+            if batch and (len(batch) >= batch_files or size + item["size"] > batch_bytes):
+                batches.append((folder, batch))
+                batch, size = [], 0
+            batch.append(item)
+            size += item["size"]
+        if batch:
+            batches.append((folder, batch))
+    return batches
+
+
+# ============================================
+# STAGE TARGETS
+# ============================================
+
+class SnowflakeStage:
+    """PUT into an internal stage; one connection per upload thread"""
+
+    def __init__(self, connection_name, stage=AUDIO_STAGE, put_parallel=4):
+        import snowflake.connector
+        self._connector = snowflake.connector
+        self._connection_name = connection_name
+        self._local = threading.local()
+        self.stage = stage
+        self.put_parallel = put_parallel
+
+    @property
+    def name(self):
+        return self.stage
+
+    def _cursor(self):
+        if not hasattr(self._local, "connection"):
+            self._local.connection = self._connector.connect(connection_name=self._connection_name)
+        return self._local.connection.cursor()
+
+    def put_batch(self, folder, items):
+        # Hard-link the batch into a temp folder so one PUT with a wildcard uploads it
+        with tempfile.TemporaryDirectory(prefix="audio_batch_") as batch_dir:
+            for item in items:
+                link = os.path.join(batch_dir, os.path.basename(item["path"]))
+                try:
+                    os.link(item["full_path"], link)
+                except OSError:  # different filesystem - fall back to a copy
+                    shutil.copy2(item["full_path"], link)
+            target = f"{self.stage}/{folder}" if folder else self.stage
+            pattern = os.path.join(batch_dir, "*").replace("\\", "/")
+            cursor = self._cursor()
+            # Audio must stay uncompressed for AI_TRANSCRIBE; OVERWRITE replaces changed files
+            cursor.execute(f"PUT 'file://{pattern}' {target} "
+                           f"AUTO_COMPRESS = FALSE OVERWRITE = TRUE PARALLEL = {self.put_parallel}")
+            failed = [row[0] for row in cursor.fetchall() if row[6] not in ("UPLOADED", "SKIPPED")]
+        if failed:
+            raise RuntimeError(f"PUT failed for {', '.join(failed)}")
+
+    def refresh(self):
+        self._cursor().execute(f"ALTER STAGE {self.stage.lstrip('@')} REFRESH")
+
+
+class LocalStage:
+    """Local-directory stand-in for the stage (optionally throttled to a bandwidth)"""
+
+    def __init__(self, directory, bandwidth_mbps=None):
+        self.directory = directory
+        self.bandwidth_mbps = bandwidth_mbps
+        self.refreshes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def name(self):
+        return f"local:{os.path.abspath(self.directory)}"
+
+    def put_batch(self, folder, items):
+        target = os.path.join(self.directory, folder)
+        os.makedirs(target, exist_ok=True)
+        for item in items:
+            shutil.copy2(item["full_path"], os.path.join(target, os.path.basename(item["path"])))
+        if self.bandwidth_mbps:
+            time.sleep(sum(item["size"] for item in items) * 8 / (self.bandwidth_mbps * 1e6))
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+# ============================================
+# UPLOAD
+# ============================================
+
+def upload(stage, source_dir, manifest, concurrency=4, batch_bytes=128_000_000, batch_files=200):
+    """Upload new/changed files in parallel batches; returns a summary dict"""
+    start = time.perf_counter()
+    to_upload, skipped = scan(source_dir, manifest)
+    batches = make_batches(to_upload, batch_bytes, batch_files)
+    total_bytes = sum(item["size"] for item in to_upload)
+    print(f"📂 {len(to_upload) + skipped} files: {skipped} unchanged (skipped), "
+          f"{len(to_upload)} to upload ({total_bytes / 1e6:,.1f} MB) in {len(batches)} batches")
+
+    summary = {"files": 0, "bytes": 0, "skipped": skipped, "failed_batches": 0}
+    if not batches:
+        manifest.save()
+        return summary
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(stage.put_batch, folder, items): items for folder, items in batches}
+        for future in as_completed(futures):
+            items = futures[future]
+            try:
+                future.result()
+            except Exception as exc:
+                summary["failed_batches"] += 1
+                print(f"   ❌ Batch of {len(items)} failed ({exc}) - will retry next run")
+                continue
+            manifest.record(items)
+            summary["files"] += len(items)
+            summary["bytes"] += sum(item["size"] for item in items)
+            elapsed = time.perf_counter() - start
+            print(f"   ✓ {summary['files']:,}/{len(to_upload):,} files "
+                  f"({summary['bytes'] / 1e6:,.1f} MB, {summary['bytes'] * 8 / 1e6 / max(elapsed, 1e-9):,.0f} Mbit/s)")
+
+    if summary["files"]:
+        stage.refresh()  # once per run, after all batches
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload audio recordings to the stage in parallel, resumably")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local-stage", help="Upload into this local directory instead of Snowflake")
+    parser.add_argument("--source", default=AUDIO_DIR, help="Folder of recordings (default: audio/)")
+    parser.add_argument("--stage", default=AUDIO_STAGE, help="Target stage")
+    parser.add_argument("--manifest", default=None, help=f"Manifest path (default: <source>/{MANIFEST_NAME})")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batches uploaded at once")
+    parser.add_argument("--batch-mb", type=float, default=128, help="Max MB per batch")
+    parser.add_argument("--batch-files", type=int, default=200, help="Max files per batch")
+    parser.add_argument("--put-parallel", type=int, default=4, help="PUT PARALLEL (threads per PUT)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=None,
+                        help="--local-stage: simulate this many Mbit/s per upload thread")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("AUDIO STAGE UPLOADER")
+    print("=" * 70)
+
+    if args.local_stage:
+        stage = LocalStage(args.local_stage, args.bandwidth_mbps)
+    else:
+        stage = SnowflakeStage(args.connection, args.stage, args.put_parallel)
+    manifest = UploadManifest(args.manifest or os.path.join(args.source, MANIFEST_NAME), stage.name)
+    print(f"📤 {args.source} -> {stage.name} (concurrency {args.concurrency})")
+
+    summary = upload(stage, args.source, manifest, args.concurrency,
+                     int(args.batch_mb * 1e6), args.batch_files)
+
+    print("\n" + "=" * 70)
+    if summary["failed_batches"]:
+        print(f"⚠️  {summary['failed_batches']} batch(es) failed - re-run to upload the rest")
+        return 1
+    if summary["files"]:
+        print(f"✅ Uploaded {summary['files']:,} files ({summary['bytes'] / 1e6:,.1f} MB) "
+              f"in {summary['seconds']:.1f}s; directory table refreshed")
+    else:
+        print("✅ Stage already up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Semantic Model Verifier & Verified-Query Benchmark
+Checks data/final/call_center_semantic_model_ENHANCED.yaml against the table
+DDL in sql/ and times every verified query, so slow agent answers are found
+here rather than by users.
+
+1. Validate  - base tables, dimension/fact/time-dimension columns, primary
+               keys, filter/metric expressions, relationships and the
+               alias.COLUMN references of verified queries must exist in the
+               DDL; declared data types are compared with the DDL types
+2. Compile   - logical table names in verified queries are replaced by their
+               base tables (fully qualified on Snowflake; Snowflake-only
+               syntax translated for the embedded engine)
+3. Benchmark - each query runs --repeat times after a warm-up; the slowest
+               (over --slow-ms, or the --top N) are flagged with a
+               materialization suggestion (dynamic table)
+
+Usage:
+    python scripts/verify_semantic_model.py --local                   # data/final CSVs in DuckDB
+    python scripts/verify_semantic_model.py --local --rows 1M         # synthetic data at scale
+    python scripts/verify_semantic_model.py --connection my_conn --repeat 3
+    python scripts/verify_semantic_model.py --validate-only
+
+Prerequisites:
+    pip install pyyaml duckdb
+    Snowflake: pip install snowflake-connector-python and a connection in
+    ~/.snowflake/connections.toml
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import yaml
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "final", "call_center_semantic_model_ENHANCED.yaml")
+SQL_DIR = os.path.join(PROJECT_ROOT, "sql")
+DATA_DIR = os.path.join(PROJECT_ROOT, "data", "final")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+# Local CSV for each base table
+TABLE_FILES = {
+    "AI_TRANSCRIBED_CALLS_AI_GENERATED": "FINAL_TABLE_COMPLETE.csv",
+    "AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE": "CUSTOMER_PROFILE_COMPLETE.csv",
+}
+
+# Words in expressions that are not column references
+SQL_WORDS = {
+    "AND", "OR", "NOT", "IN", "IS", "NULL", "TRUE", "FALSE", "CASE", "WHEN", "THEN", "ELSE", "END",
+    "AS", "DISTINCT", "LIKE", "ILIKE", "BETWEEN", "INTERVAL", "FLOAT", "NUMBER", "VARCHAR", "DATE",
+    "YEAR", "QUARTER", "MONTH", "WEEK", "DAY", "HOUR", "MINUTE", "SECOND",
+}
+
+TYPE_FAMILIES = {
+    "VARCHAR": "text", "STRING": "text", "TEXT": "text", "CHAR": "text",
+    "NUMBER": "number", "NUMERIC": "number", "DECIMAL": "number", "INT": "number", "INTEGER": "number",
+    "BIGINT": "number", "FLOAT": "number", "DOUBLE": "number", "REAL": "number",
+    "DATE": "date", "TIMESTAMP_NTZ": "timestamp", "TIMESTAMP_LTZ": "timestamp", "TIMESTAMP_TZ": "timestamp",
+    "TIMESTAMP": "timestamp", "BOOLEAN": "boolean",
+    "VARIANT": "semi-structured", "OBJECT": "semi-structured", "ARRAY": "semi-structured",
+}
+
+# Snowflake DDL type -> DuckDB type for the embedded engine
+DUCKDB_TYPES = {
+    "text": "VARCHAR", "date": "DATE", "timestamp": "TIMESTAMP", "boolean": "BOOLEAN",
+    "semi-structured": "VARCHAR",
+}
+
+
+# ============================================
+# DDL PARSING
+# ============================================
+
+def _split_top_level(body):
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def parse_ddl(sql_dir=SQL_DIR):
+    """{TABLE_NAME: {COLUMN: TYPE}} from every CREATE TABLE in sql/*.sql"""
+    tables = {}
+    pattern = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+                         r"([\w.]+)\s*\(", re.IGNORECASE)
+    for path in sorted(glob.glob(os.path.join(sql_dir, "*.sql"))):
+        with open(path, encoding="utf-8") as f:
+            # Drop comments and string literals (COMMENT texts contain commas)
+            text = re.sub(r"'(?:[^']|'')*'", "''", re.sub(r"--[^\n]*", "", f.read()))
+        for match in pattern.finditer(text):
+            # Balanced-paren column list
+            depth, i = 1, match.end()
+            while depth and i < len(text):
+                depth += {"(": 1, ")": -1}.get(text[i], 0)
+                i += 1
+            columns = {}
+            for part in _split_top_level(text[match.end():i - 1]):
+                tokens = part.split()
+                if len(tokens) < 2 or tokens[0].upper() in ("PRIMARY", "CONSTRAINT", "FOREIGN", "UNIQUE"):
+                    continue
+                columns[tokens[0].upper()] = re.sub(r"\(.*", "", tokens[1]).upper()
+            tables[match.group(1).split(".")[-1].upper()] = columns
+    return tables
+
+
+def type_family(data_type):
+    return TYPE_FAMILIES.get(re.sub(r"\(.*", "", (data_type or "").upper()))
+
+
+# ============================================
+# VALIDATION
+# ============================================
+
+def expression_columns(expr):
+    """Column references in a SQL expression: [(qualifier or None, COLUMN)]"""
+    text = re.sub(r"'(?:[^']|'')*'", "''", expr)
+    refs = []
+    for match in re.finditer(r"\b([A-Za-z_]\w*)(?:\.([A-Za-z_]\w*))?\b(\s*\()?", text):
+        first, second, call = match.group(1), match.group(2), match.group(3)
+        if call:
+            continue  # function name
+        if second:
+            refs.append((first, second.upper()))
+        elif first.upper() not in SQL_WORDS and not text[max(match.start() - 2, 0):match.start()].endswith("::"):
+            refs.append((None, first.upper()))
+    return refs
+
+
+def validate(model, ddl):
+    """(errors, warnings) as lists of strings"""
+    errors, warnings = [], []
+    logical = {}  # logical table name -> DDL columns
+
+    for table in model.get("tables", []):
+        name = table["name"]
+        base = table["base_table"]["table"].upper()
+        if base not in ddl:
+            errors.append(f"{name}: base table {base} has no CREATE TABLE in sql/")
+            continue
+        columns = logical[name] = ddl[base]
+
+        for pk in table.get("primary_key", {}).get("columns", []):
+            if pk.upper() not in columns:
+                errors.append(f"{name}: primary key column {pk} not in {base}")
+
+        for kind in ("dimensions", "time_dimensions", "facts"):
+            for field in table.get(kind, []):
+                for _, column in expression_columns(field["expr"]):
+                    if column not in columns:
+                        errors.append(f"{name}.{field['name']}: column {column} not in {base}")
+                declared = field.get("data_type")
+                actual = columns.get(field["expr"].strip().upper())
+                if declared and actual and type_family(declared) != type_family(actual):
+                    warnings.append(f"{name}.{field['name']}: declared {declared}, DDL has {actual}")
+
+        for kind in ("filters", "metrics"):
+            for field in table.get(kind, []):
+                for _, column in expression_columns(field["expr"]):
+                    if column not in columns:
+                        errors.append(f"{name}.{field['name']} ({kind[:-1]}): column {column} not in {base}")
+
+    for rel in model.get("relationships", []):
+        left, right = rel["left_table"], rel["right_table"]
+        for side in (left, right):
+            if side not in logical:
+                errors.append(f"relationship {rel['name']}: unknown table {side}")
+        if left not in logical or right not in logical:
+            continue
+        for pair in rel["relationship_columns"]:
+            left_type = logical[left].get(pair["left_column"].upper())
+            right_type = logical[right].get(pair["right_column"].upper())
+            if left_type is None:
+                errors.append(f"relationship {rel['name']}: {left}.{pair['left_column']} does not exist")
+            if right_type is None:
+                errors.append(f"relationship {rel['name']}: {right}.{pair['right_column']} does not exist")
+            if left_type and right_type and type_family(left_type) != type_family(right_type):
+                warnings.append(f"relationship {rel['name']}: joins {left_type} to {right_type}")
+
+    for metric in model.get("metrics", []):
+        for qualifier, column in expression_columns(metric["expr"]):
+            if qualifier is None:
+                continue
+            if qualifier not in logical:
+                errors.append(f"metric {metric['name']}: unknown table {qualifier}")
+            elif column not in logical[qualifier]:
+                errors.append(f"metric {metric['name']}: {qualifier}.{column} does not exist")
+
+    for query in model.get("verified_queries", []):
+        aliases = query_aliases(query["sql"])
+        for table in set(aliases.values()):
+            if table not in logical:
+                errors.append(f"verified query {query['name']}: unknown table {table}")
+        for qualifier, column in expression_columns(query["sql"]):
+            table = aliases.get(qualifier)
+            if qualifier and table in logical and column not in logical[table]:
+                errors.append(f"verified query {query['name']}: {qualifier}.{column} does not exist")
+
+    return errors, warnings
+
+
+def query_aliases(sql):
+    """{alias or table name: logical table} for the FROM/JOIN items of a query"""
+    aliases = {}
+    for match in re.finditer(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|JOIN|LEFT|RIGHT|INNER|"
+                             r"FULL|CROSS|ON|GROUP|ORDER|LIMIT|HAVING)(\w+))?", sql, re.IGNORECASE):
+        aliases[match.group(1)] = match.group(1)
+        if match.group(2):
+            aliases[match.group(2)] = match.group(1)
+    return aliases
+
+
+# ============================================
+# COMPILATION
+# ============================================
+
+def compile_query(model, sql, qualified=True):
+    """Replace logical table names after FROM/JOIN with their base tables"""
+    bases = {}
+    for table in model.get("tables", []):
+        base = table["base_table"]
+        bases[table["name"].lower()] = (f"{base['database']}.{base['schema']}.{base['table']}"
+                                        if qualified else base["table"])
+
+    def replace(match):
+        return f"{match.group(1)} {bases.get(match.group(2).lower(), match.group(2))}"
+    return re.sub(r"\b(FROM|JOIN)\s+(\w+)", replace, sql, flags=re.IGNORECASE).strip()
+
+
+def to_duckdb(sql):
+    """Translate the Snowflake-only syntax used in the model to DuckDB"""
+    sql = re.sub(r"CURRENT_TIMESTAMP\(\)", "CURRENT_LOCALTIMESTAMP()", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"CURRENT_DATE\(\)", "CURRENT_DATE", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"::FLOAT\b", "::DOUBLE", sql, flags=re.IGNORECASE)
+    # DATEADD(day, -30, x) / DATEDIFF(month, a, b): DuckDB wants the date part quoted
+    sql = re.sub(r"\b(DATEADD|DATEDIFF)\(\s*(\w+)\s*,", r"\1('\2',", sql, flags=re.IGNORECASE)
+    return sql
+
+
+# ============================================
+# ENGINES
+# ============================================
+
+class LocalEngine:
+    """
+    DuckDB loaded with the data/final CSVs (or synthetic rows), columns cast
+    to the DDL types so type mismatches behave as they would in Snowflake
+    """
+
+    name = "duckdb"
+
+    def __init__(self, ddl, rows=None):
+        import duckdb
+        self._db = duckdb.connect()
+        self._db.execute("CREATE MACRO dateadd(part, n, ts) AS "
+                         "ts + CASE lower(part) WHEN 'day' THEN to_days(n) WHEN 'week' THEN to_days(7 * n) "
+                         "WHEN 'month' THEN to_months(n) WHEN 'year' THEN to_years(n) "
+                         "WHEN 'hour' THEN to_hours(n) ELSE to_minutes(n) END")
+        sources = self._synthetic(rows) if rows else {
+            table: f"read_csv('{os.path.join(DATA_DIR, file_name)}', all_varchar = true, header = true)"
+            for table, file_name in TABLE_FILES.items()
+        }
+        for table, source in sources.items():
+            select = ", ".join(
+                f"TRY_CAST({column} AS {DUCKDB_TYPES.get(type_family(data_type), 'DOUBLE')}) AS {column}"
+                for column, data_type in ddl[table].items()
+            )
+            self._db.execute(f"CREATE TABLE {table} AS SELECT {select} FROM {source}")
+
+    def _synthetic(self, rows):
+        import app_harness
+        calls, profiles = app_harness.synthetic_tables(app_harness.parse_size(rows))
+        self._db.register("synthetic_calls", calls)
+        self._db.register("synthetic_profiles", profiles)
+        return {app_harness.CALL_TABLE: "synthetic_calls", app_harness.PROFILE_TABLE: "synthetic_profiles"}
+
+    def compile(self, model, sql):
+        return to_duckdb(compile_query(model, sql, qualified=False))
+
+    def run(self, sql):
+        start = time.perf_counter()
+        rows = self._db.execute(sql).fetchall()
+        return (time.perf_counter() - start) * 1000, len(rows), None
+
+
+class SnowflakeEngine:
+    """Snowflake with the result cache off, so every run executes"""
+
+    name = "snowflake"
+
+    def __init__(self, connection_name):
+        import snowflake.connector
+        self._connection = snowflake.connector.connect(connection_name=connection_name)
+        cursor = self._connection.cursor()
+        cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = FALSE")
+        cursor.execute("ALTER SESSION SET QUERY_TAG = 'verify_semantic_model'")
+
+    def compile(self, model, sql):
+        return compile_query(model, sql, qualified=True)
+
+    def run(self, sql):
+        cursor = self._connection.cursor()
+        start = time.perf_counter()
+        cursor.execute(sql)
+        rows = len(cursor.fetchall())
+        return (time.perf_counter() - start) * 1000, rows, cursor.sfqid
+
+    def server_stats(self, query_ids):
+        """Compile/execute split and bytes scanned per query id from QUERY_HISTORY"""
+        if not query_ids:
+            return {}
+        cursor = self._connection.cursor()
+        placeholders = ", ".join(["%s"] * len(query_ids))
+        cursor.execute(
+            "SELECT QUERY_ID, COMPILATION_TIME, EXECUTION_TIME, BYTES_SCANNED, PARTITIONS_SCANNED, PARTITIONS_TOTAL "
+            "FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 1000)) "
+            f"WHERE QUERY_ID IN ({placeholders})", tuple(query_ids))
+        return {row[0]: {"compile_ms": row[1], "execute_ms": row[2], "bytes_scanned": row[3],
+                         "partitions_scanned": row[4], "partitions_total": row[5]} for row in cursor.fetchall()}
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def benchmark(engine, model, repeat):
+    """Time every verified query; returns a list of result dicts"""
+    results = []
+    for query in model.get("verified_queries", []):
+        sql = engine.compile(model, query["sql"])
+        result = {"name": query["name"], "question": query["question"], "sql": sql,
+                  "snowflake_sql": compile_query(model, query["sql"], qualified=True)}
+        try:
+            engine.run(sql)  # warm-up (compilation / metadata / file cache)
+            timings, query_ids = [], []
+            for _ in range(repeat):
+                elapsed_ms, rows, query_id = engine.run(sql)
+                timings.append(elapsed_ms)
+                if query_id:
+                    query_ids.append(query_id)
+        except Exception as exc:
+            result["error"] = str(exc).splitlines()[0]
+            results.append(result)
+            continue
+        result.update(rows=rows, median_ms=statistics.median(timings), min_ms=min(timings),
+                      max_ms=max(timings), query_ids=query_ids)
+        results.append(result)
+
+    if hasattr(engine, "server_stats"):
+        stats = engine.server_stats([qid for r in results for qid in r.get("query_ids", [])])
+        for result in results:
+            per_run = [stats[qid] for qid in result.get("query_ids", []) if qid in stats]
+            if per_run:
+                result["server"] = {key: statistics.median(run[key] or 0 for run in per_run) for key in per_run[0]}
+    return results
+
+
+def materialization_sql(result):
+    """Dynamic table suggestion for a slow verified query"""
+    name = re.sub(r"\W", "_", result["name"]).upper()
+    # CURRENT_TIMESTAMP()/CURRENT_DATE() filters are only allowed in full-refresh dynamic tables
+    refresh = "FULL" if re.search(r"CURRENT_(TIMESTAMP|DATE)", result["snowflake_sql"], re.IGNORECASE) else "AUTO"
+    body = re.sub(r"\s+", " ", result["snowflake_sql"])
+    return (f"CREATE OR REPLACE DYNAMIC TABLE CALL_CENTER_ANALYTICS.AUDIO_PROCESSING.VQ_{name}\n"
+            f"  TARGET_LAG = '1 hour' WAREHOUSE = WH_AISQL_HOL REFRESH_MODE = {refresh}\n"
+            f"  AS {body};")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the semantic model and benchmark its verified queries")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--connection", help="Snowflake connection name (connections.toml)")
+    target.add_argument("--local", action="store_true", help="Embedded DuckDB over data/final CSVs")
+    target.add_argument("--validate-only", action="store_true", help="Only check the model against the DDL")
+    parser.add_argument("--model", default=MODEL_FILE, help="Semantic model YAML")
+    parser.add_argument("--rows", default=None, help="--local: synthetic call rows instead of the CSVs (e.g. 1M; above 20k the distinct records repeat, see app_harness.synthetic_tables)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (after one warm-up)")
+    parser.add_argument("--slow-ms", type=float, default=1000.0, help="Flag queries slower than this median")
+    parser.add_argument("--top", type=int, default=2, help="Also flag the N slowest queries")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SEMANTIC MODEL VERIFICATION")
+    print("=" * 70)
+
+    with open(args.model, encoding="utf-8") as f:
+        model = yaml.safe_load(f)
+    ddl = parse_ddl()
+    print(f"📂 {os.path.basename(args.model)}: {len(model.get('tables', []))} tables, "
+          f"{len(model.get('relationships', []))} relationships, {len(model.get('verified_queries', []))} verified queries")
+
+    errors, warnings = validate(model, ddl)
+    for message in errors:
+        print(f"   ❌ {message}")
+    for message in warnings:
+        print(f"   ⚠️  {message}")
+    if not errors:
+        print(f"✓ All model references resolve against the DDL ({len(warnings)} type warnings)")
+    if args.validate_only or errors:
+        return 1 if errors else 0
+
+    engine = LocalEngine(ddl, args.rows) if args.local else SnowflakeEngine(args.connection)
+    print(f"\n⏱️  Running {len(model.get('verified_queries', []))} verified queries on {engine.name} "
+          f"({args.repeat} timed runs each)")
+    results = benchmark(engine, model, args.repeat)
+
+    timed = sorted((r for r in results if "error" not in r), key=lambda r: r["median_ms"], reverse=True)
+    flagged = {r["name"] for r in timed[:args.top]} | {r["name"] for r in timed if r["median_ms"] > args.slow_ms}
+    print(f"\n   {'Query':<36} {'Rows':>6} {'Median ms':>10} {'Min ms':>8} {'Max ms':>8}")
+    for result in timed:
+        marker = "🐢" if result["name"] in flagged else "  "
+        print(f"{marker} {result['name']:<36} {result['rows']:>6} {result['median_ms']:>10.1f} "
+              f"{result['min_ms']:>8.1f} {result['max_ms']:>8.1f}")
+        if "server" in result:
+            server = result["server"]
+            print(f"      compile {server['compile_ms']:.0f} ms | execute {server['execute_ms']:.0f} ms | "
+                  f"{server['bytes_scanned'] / 1e6:,.1f} MB | "
+                  f"partitions {server['partitions_scanned']:.0f}/{server['partitions_total']:.0f}")
+    failed = [r for r in results if "error" in r]
+    for result in failed:
+        print(f"❌ {result['name']}: {result['error']}")
+
+    if flagged:
+        print("\n🐢 Materialization candidates (slowest verified queries):")
+        for result in timed:
+            if result["name"] in flagged:
+                print(f"\n-- {result['question']}\n{materialization_sql(result)}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_path = os.path.join(RESULTS_DIR, f"verified_queries_{engine.name}_{stamp}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"engine": engine.name, "rows": args.rows, "repeat": args.repeat,
+                   "warnings": warnings, "results": results}, f, indent=1, default=str)
+
+    print("\n" + "=" * 70)
+    if failed:
+        print(f"⚠️  {len(failed)} verified queries failed - results in {out_path}")
+        return 1
+    print(f"✅ {len(timed)} verified queries ran; {len(flagged)} flagged - results in {out_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
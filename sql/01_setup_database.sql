@@ -67,6 +67,20 @@ CREATE OR REPLACE STAGE call_center_stage
   FILE_FORMAT = csv_format
   COMMENT = 'Internal stage for uploading CSV files';
 
+-- Audio recordings for AI_TRANSCRIBE (server-side encryption + directory table)
+-- Upload with: python scripts/upload_audio.py --connection <name>
+CREATE STAGE IF NOT EXISTS CALL_CENTER_AUDIO_FILES
+  DIRECTORY = (ENABLE = TRUE)
+  ENCRYPTION = (TYPE = 'SNOWFLAKE_SSE')
+  COMMENT = 'Internal stage for call recordings (MP3/WAV)';
+
+-- Bulk exports from the dashboard (COPY INTO .../exports/<timestamp>_<id>/calls_*)
+-- Server-side encryption so GET_PRESIGNED_URL can hand out download links.
+-- Clear old exports with: REMOVE @CALL_EXPORTS/exports/;
+CREATE STAGE IF NOT EXISTS CALL_EXPORTS
+  ENCRYPTION = (TYPE = 'SNOWFLAKE_SSE')
+  COMMENT = 'Internal stage for bulk CSV/Parquet exports of filtered calls';
+
 -- ============================================
 -- 6. VERIFY SETUP
 -- ============================================
@@ -94,6 +108,9 @@ SELECT
 --
 -- 2. Or use Snowsight UI to upload files to the stage
 --
+-- Optional - stage the audio/ recordings (parallel, resumable):
+--    python scripts/upload_audio.py --connection <name>
+--
 -- 3. Then run: 01_create_tables.sql
 
 SELECT '✓ Database setup complete!' as status;
@@ -38,7 +38,11 @@ CREATE OR REPLACE TABLE AI_TRANSCRIBED_CALLS_AI_GENERATED (
     ISSUE_RESOLVED VARCHAR(10) COMMENT 'yes or no',
     ESCALATION_REQUIRED VARCHAR(10) COMMENT 'yes or no',
     CUSTOMER_SATISFACTION VARCHAR(20) COMMENT 'satisfied, neutral, dissatisfied'
-) COMMENT = 'Call center interaction data with AI-powered sentiment analysis and agent performance metrics';
+)
+-- Clustered by call date: time-window filters and ORDER BY ANALYSIS_TIMESTAMP
+-- read only the micro-partitions of the requested days
+CLUSTER BY (TO_DATE(ANALYSIS_TIMESTAMP))
+COMMENT = 'Call center interaction data with AI-powered sentiment analysis and agent performance metrics';
 
 -- ============================================
 -- 2. CREATE AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE (Demographics)
@@ -88,6 +92,27 @@ FILE_FORMAT = csv_format
 ON_ERROR = 'CONTINUE'
 PURGE = FALSE;
 
+-- Option B: Load a date-partitioned layout (larger generated datasets)
+-- python scripts/generate_call_data.py --layout partitioned --output calls_partitioned
+-- writes calls_partitioned/call_date=YYYY-MM-DD/part-NNNNN.csv, each file one day
+-- sorted by ANALYSIS_TIMESTAMP, so loaded micro-partitions are already clustered.
+-- Upload keeping the folders:
+--   snow stage copy calls_partitioned @call_center_stage/calls --recursive
+--
+-- Everything:
+-- COPY INTO AI_TRANSCRIBED_CALLS_AI_GENERATED
+-- FROM @call_center_stage/calls/
+-- PATTERN = '.*call_date=.*[.]csv'
+-- FILE_FORMAT = csv_format
+-- ON_ERROR = 'CONTINUE';
+--
+-- Only a date window (e.g. top up one month); file names prune the load:
+-- COPY INTO AI_TRANSCRIBED_CALLS_AI_GENERATED
+-- FROM @call_center_stage/calls/
+-- PATTERN = '.*call_date=2025-07-.*[.]csv'
+-- FILE_FORMAT = csv_format
+-- ON_ERROR = 'CONTINUE';
+
 -- ============================================
 -- 4. VERIFY DATA LOAD
 -- ============================================
@@ -101,6 +126,9 @@ SELECT 'AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE', COUNT(*) FROM AI_TR
 -- AI_TRANSCRIBED_CALLS_AI_GENERATED: 500 rows (52 original + 448 generated)
 -- AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE: 418 rows (complete coverage)
 
+-- Clustering health on the call date key (average_depth near 1 = days do not overlap)
+SELECT SYSTEM$CLUSTERING_INFORMATION('AI_TRANSCRIBED_CALLS_AI_GENERATED', '(TO_DATE(ANALYSIS_TIMESTAMP))') as clustering_info;
+
 -- Sample data from AI_TRANSCRIBED_CALLS_AI_GENERATED
 SELECT 
     CALL_ID,
@@ -175,6 +203,217 @@ ORDER BY satisfaction_rate DESC;
 -- Test the view
 SELECT * FROM call_metrics_by_region;
 
+-- Dynamic table: daily rollup cube behind the dashboard trend pages
+-- (Streamlit App/rollup_cube.py builds the same cells locally). Only additive
+-- measures - counts, sums and sums of squares - so means and standard
+-- deviations can be derived at any grain and new calls refresh incrementally,
+-- touching only the buckets they fall into.
+CREATE OR REPLACE DYNAMIC TABLE CALL_ROLLUP_DAILY
+  TARGET_LAG = '1 hour'
+  WAREHOUSE = WH_AISQL_HOL  -- Change to your warehouse (same as WAREHOUSE_NAME above)
+  REFRESH_MODE = INCREMENTAL
+  COMMENT = 'Daily call buckets by agent, intent, sentiment category and region (counts, sums, sums of squares)'
+AS
+SELECT
+    TO_DATE(ft.ANALYSIS_TIMESTAMP) AS CALL_DATE,
+    ft.AGENT_NAME,
+    ft.PRIMARY_INTENT,
+    ft.SENTIMENT_CATEGORY,
+    cp.REGION,
+    COUNT(*) AS CALLS,
+    COUNT(ft.SENTIMENT_SCORE) AS SENTIMENT_COUNT,
+    SUM(ft.SENTIMENT_SCORE) AS SENTIMENT_SUM,
+    SUM(ft.SENTIMENT_SCORE * ft.SENTIMENT_SCORE) AS SENTIMENT_SUM_SQ,
+    COUNT(ft.AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_COUNT,
+    SUM(ft.AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_SUM,
+    SUM(ft.AGENT_PERFORMANCE_SCORE * ft.AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_SUM_SQ,
+    COUNT_IF(ft.ISSUE_RESOLVED = 'yes') AS RESOLVED_CALLS,
+    COUNT_IF(ft.ESCALATION_REQUIRED = 'yes') AS ESCALATED_CALLS,
+    COUNT_IF(ft.CUSTOMER_SATISFACTION = 'satisfied') AS SATISFIED_CALLS
+FROM AI_TRANSCRIBED_CALLS_AI_GENERATED ft
+LEFT JOIN AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE cp ON ft.CUSTOMER_NAME = cp.CUSTOMER_NAME
+GROUP BY 1, 2, 3, 4, 5;
+
+-- Per-day mergeable sketches behind the dashboard headline tiles
+-- (Streamlit App/sketches.py is the local equivalent). Any date range is
+-- answered by combining its days: HLL_COMBINE for distinct customers/agents
+-- (about 1.6% standard error) and APPROX_PERCENTILE_COMBINE for percentiles
+-- (t-digest). Maintained incrementally: a stream collects the calls inserted
+-- since the last merge, and a task rolls them up per day and MERGEs their
+-- states into the rows of the days they fall into (sketches.merge_sketch_tables
+-- does the same locally). Other days are never read or rewritten.
+
+-- Earlier versions of this script created CALL_SKETCHES_DAILY as a dynamic table
+EXECUTE IMMEDIATE $$
+BEGIN
+    IF (EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_SCHEMA = 'AUDIO_PROCESSING' AND TABLE_NAME = 'CALL_SKETCHES_DAILY'
+                  AND IS_DYNAMIC = 'YES')) THEN
+        DROP DYNAMIC TABLE CALL_SKETCHES_DAILY;
+    END IF;
+END;
+$$;
+
+-- Stream first, so calls inserted from now on are merged by the task
+-- (after 02b_compact_schema.sql, recreate it with ON VIEW instead of ON TABLE)
+CREATE OR REPLACE STREAM CALL_SKETCHES_NEW_CALLS
+  ON TABLE AI_TRANSCRIBED_CALLS_AI_GENERATED
+  APPEND_ONLY = TRUE
+  COMMENT = 'Calls not yet merged into CALL_SKETCHES_DAILY';
+
+CREATE OR REPLACE TABLE CALL_SKETCHES_DAILY
+  COMMENT = 'Daily counts plus HLL and percentile sketch states for headline metrics (merged incrementally by CALL_SKETCHES_DAILY_MERGE)'
+AS
+SELECT
+    TO_DATE(ANALYSIS_TIMESTAMP) AS CALL_DATE,
+    COUNT(*) AS CALLS,
+    COUNT(SENTIMENT_SCORE) AS SENTIMENT_COUNT,
+    SUM(SENTIMENT_SCORE) AS SENTIMENT_SUM,
+    COUNT(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_COUNT,
+    SUM(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_SUM,
+    COUNT_IF(ISSUE_RESOLVED = 'yes') AS RESOLVED_CALLS,
+    COUNT_IF(ESCALATION_REQUIRED = 'yes') AS ESCALATED_CALLS,
+    COUNT_IF(CUSTOMER_SATISFACTION = 'satisfied') AS SATISFIED_CALLS,
+    COUNT_IF(SENTIMENT_CATEGORY = 'NEGATIVE') AS NEGATIVE_CALLS,
+    HLL_ACCUMULATE(CUSTOMER_NAME) AS CUSTOMER_HLL,
+    HLL_ACCUMULATE(AGENT_NAME) AS AGENT_HLL,
+    APPROX_PERCENTILE_ACCUMULATE(SENTIMENT_SCORE) AS SENTIMENT_DIGEST,
+    APPROX_PERCENTILE_ACCUMULATE(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_DIGEST
+FROM AI_TRANSCRIBED_CALLS_AI_GENERATED
+GROUP BY 1;
+
+CREATE OR REPLACE TASK CALL_SKETCHES_DAILY_MERGE
+  WAREHOUSE = WH_AISQL_HOL  -- Change to your warehouse (same as WAREHOUSE_NAME above)
+  SCHEDULE = '60 MINUTE'
+  COMMENT = 'Merges the sketch states of newly inserted calls into their days of CALL_SKETCHES_DAILY'
+  WHEN SYSTEM$STREAM_HAS_DATA('CALL_SKETCHES_NEW_CALLS')
+AS
+MERGE INTO CALL_SKETCHES_DAILY t
+USING (
+    -- New calls rolled up per day, combined with the current states of those days only
+    SELECT
+        CALL_DATE,
+        SUM(CALLS) AS CALLS,
+        SUM(SENTIMENT_COUNT) AS SENTIMENT_COUNT,
+        SUM(SENTIMENT_SUM) AS SENTIMENT_SUM,
+        SUM(PERFORMANCE_COUNT) AS PERFORMANCE_COUNT,
+        SUM(PERFORMANCE_SUM) AS PERFORMANCE_SUM,
+        SUM(RESOLVED_CALLS) AS RESOLVED_CALLS,
+        SUM(ESCALATED_CALLS) AS ESCALATED_CALLS,
+        SUM(SATISFIED_CALLS) AS SATISFIED_CALLS,
+        SUM(NEGATIVE_CALLS) AS NEGATIVE_CALLS,
+        HLL_COMBINE(CUSTOMER_HLL) AS CUSTOMER_HLL,
+        HLL_COMBINE(AGENT_HLL) AS AGENT_HLL,
+        APPROX_PERCENTILE_COMBINE(SENTIMENT_DIGEST) AS SENTIMENT_DIGEST,
+        APPROX_PERCENTILE_COMBINE(PERFORMANCE_DIGEST) AS PERFORMANCE_DIGEST
+    FROM (
+        SELECT
+            TO_DATE(ANALYSIS_TIMESTAMP) AS CALL_DATE,
+            COUNT(*) AS CALLS,
+            COUNT(SENTIMENT_SCORE) AS SENTIMENT_COUNT,
+            SUM(SENTIMENT_SCORE) AS SENTIMENT_SUM,
+            COUNT(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_COUNT,
+            SUM(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_SUM,
+            COUNT_IF(ISSUE_RESOLVED = 'yes') AS RESOLVED_CALLS,
+            COUNT_IF(ESCALATION_REQUIRED = 'yes') AS ESCALATED_CALLS,
+            COUNT_IF(CUSTOMER_SATISFACTION = 'satisfied') AS SATISFIED_CALLS,
+            COUNT_IF(SENTIMENT_CATEGORY = 'NEGATIVE') AS NEGATIVE_CALLS,
+            HLL_ACCUMULATE(CUSTOMER_NAME) AS CUSTOMER_HLL,
+            HLL_ACCUMULATE(AGENT_NAME) AS AGENT_HLL,
+            APPROX_PERCENTILE_ACCUMULATE(SENTIMENT_SCORE) AS SENTIMENT_DIGEST,
+            APPROX_PERCENTILE_ACCUMULATE(AGENT_PERFORMANCE_SCORE) AS PERFORMANCE_DIGEST
+        FROM CALL_SKETCHES_NEW_CALLS
+        GROUP BY 1
+        UNION ALL
+        SELECT CALL_DATE, CALLS, SENTIMENT_COUNT, SENTIMENT_SUM, PERFORMANCE_COUNT, PERFORMANCE_SUM,
+               RESOLVED_CALLS, ESCALATED_CALLS, SATISFIED_CALLS, NEGATIVE_CALLS,
+               CUSTOMER_HLL, AGENT_HLL, SENTIMENT_DIGEST, PERFORMANCE_DIGEST
+        FROM CALL_SKETCHES_DAILY
+        WHERE CALL_DATE IN (SELECT TO_DATE(ANALYSIS_TIMESTAMP) FROM CALL_SKETCHES_NEW_CALLS)
+    )
+    GROUP BY CALL_DATE
+) s
+ON t.CALL_DATE = s.CALL_DATE
+WHEN MATCHED THEN UPDATE SET
+        CALLS = s.CALLS,
+        SENTIMENT_COUNT = s.SENTIMENT_COUNT,
+        SENTIMENT_SUM = s.SENTIMENT_SUM,
+        PERFORMANCE_COUNT = s.PERFORMANCE_COUNT,
+        PERFORMANCE_SUM = s.PERFORMANCE_SUM,
+        RESOLVED_CALLS = s.RESOLVED_CALLS,
+        ESCALATED_CALLS = s.ESCALATED_CALLS,
+        SATISFIED_CALLS = s.SATISFIED_CALLS,
+        NEGATIVE_CALLS = s.NEGATIVE_CALLS,
+        CUSTOMER_HLL = s.CUSTOMER_HLL,
+        AGENT_HLL = s.AGENT_HLL,
+        SENTIMENT_DIGEST = s.SENTIMENT_DIGEST,
+        PERFORMANCE_DIGEST = s.PERFORMANCE_DIGEST
+WHEN NOT MATCHED THEN INSERT (
+        CALL_DATE, CALLS, SENTIMENT_COUNT, SENTIMENT_SUM, PERFORMANCE_COUNT, PERFORMANCE_SUM,
+        RESOLVED_CALLS, ESCALATED_CALLS, SATISFIED_CALLS, NEGATIVE_CALLS,
+        CUSTOMER_HLL, AGENT_HLL, SENTIMENT_DIGEST, PERFORMANCE_DIGEST)
+    VALUES (
+        s.CALL_DATE, s.CALLS, s.SENTIMENT_COUNT, s.SENTIMENT_SUM, s.PERFORMANCE_COUNT, s.PERFORMANCE_SUM,
+        s.RESOLVED_CALLS, s.ESCALATED_CALLS, s.SATISFIED_CALLS, s.NEGATIVE_CALLS,
+        s.CUSTOMER_HLL, s.AGENT_HLL, s.SENTIMENT_DIGEST, s.PERFORMANCE_DIGEST);
+
+ALTER TASK CALL_SKETCHES_DAILY_MERGE RESUME;
+-- Merge right away instead of waiting for the schedule:
+-- EXECUTE TASK CALL_SKETCHES_DAILY_MERGE;
+
+-- Sketch estimates vs exact values over the last 30 call days
+SELECT
+    HLL_ESTIMATE(HLL_COMBINE(CUSTOMER_HLL)) AS customers_estimate,
+    (SELECT COUNT(DISTINCT CUSTOMER_NAME) FROM AI_TRANSCRIBED_CALLS_AI_GENERATED
+     WHERE TO_DATE(ANALYSIS_TIMESTAMP) > (SELECT MAX(CALL_DATE) FROM CALL_SKETCHES_DAILY) - 30) AS customers_exact,
+    APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(SENTIMENT_DIGEST), 0.9) AS p90_sentiment_estimate
+FROM CALL_SKETCHES_DAILY
+WHERE CALL_DATE > (SELECT MAX(CALL_DATE) FROM CALL_SKETCHES_DAILY) - 30;
+
+-- Dynamic table: priority score per call behind the Calls Requiring Attention
+-- feed (Streamlit App/priority_feed.py scores the same way locally; keep the
+-- weights in sync). Escalation 40, sentiment 15 per unit below +1, urgency
+-- high 20 / medium 10, lifetime value up to 10 (capped at 10000), minus 1 point
+-- per day of age. The age penalty is stored as a bonus for newer calls
+-- (epoch days), so existing keys never change as time passes and only new
+-- calls are scored on refresh. The app reads ORDER BY PRIORITY_KEY DESC LIMIT K.
+CREATE OR REPLACE DYNAMIC TABLE CALL_PRIORITY_SCORES
+  TARGET_LAG = '5 minutes'
+  WAREHOUSE = WH_AISQL_HOL  -- Change to your warehouse (same as WAREHOUSE_NAME above)
+  REFRESH_MODE = INCREMENTAL
+  COMMENT = 'Per-call priority key for the supervisor attention feed (higher is more urgent)'
+AS
+SELECT
+    ft.CALL_ID,
+    ft.CUSTOMER_NAME,
+    ft.AGENT_NAME,
+    ft.PRIMARY_INTENT,
+    ft.SENTIMENT_CATEGORY,
+    ft.SENTIMENT_SCORE,
+    ft.URGENCY_LEVEL,
+    ft.ESCALATION_REQUIRED,
+    cp.LIFETIME_VALUE,
+    LEFT(ft.CALL_SUMMARY, 200) AS CALL_SUMMARY,
+    ft.ANALYSIS_TIMESTAMP,
+    IFF(ft.ESCALATION_REQUIRED = 'yes', 40, 0)
+      + 15 * (1 - COALESCE(ft.SENTIMENT_SCORE, 0))
+      + CASE ft.URGENCY_LEVEL WHEN 'high' THEN 20 WHEN 'medium' THEN 10 ELSE 0 END
+      + 10 * LEAST(COALESCE(cp.LIFETIME_VALUE, 0) / 10000, 1)
+      + DATEDIFF('millisecond', '1970-01-01'::TIMESTAMP_NTZ, ft.ANALYSIS_TIMESTAMP) / 86400000 AS PRIORITY_KEY
+FROM AI_TRANSCRIBED_CALLS_AI_GENERATED ft
+LEFT JOIN AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE cp ON ft.CUSTOMER_NAME = cp.CUSTOMER_NAME;
+
+-- Top of the feed (Snowflake keeps only the best rows while scanning for ORDER BY ... LIMIT)
+SELECT CALL_ID, CUSTOMER_NAME, ESCALATION_REQUIRED, SENTIMENT_SCORE, URGENCY_LEVEL, PRIORITY_KEY
+FROM CALL_PRIORITY_SCORES
+ORDER BY PRIORITY_KEY DESC
+LIMIT 10;
+
+-- Buckets vs calls: trend pages read the first number of rows, not the second
+SELECT
+    (SELECT COUNT(*) FROM CALL_ROLLUP_DAILY) AS rollup_buckets,
+    (SELECT COUNT(*) FROM AI_TRANSCRIBED_CALLS_AI_GENERATED) AS calls;
+
 -- ============================================
 -- 7. GRANT PERMISSIONS (Adjust as needed)
 -- ============================================
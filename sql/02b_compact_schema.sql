@@ -0,0 +1,256 @@
+-- ============================================
+-- Snowflake World Tour 2025 London
+-- Call Center Intelligence Demo
+-- Step 2b (Optional): Compact Call Record Schema
+-- ============================================
+-- Stores calls without the duplicated data of AI_TRANSCRIBED_CALLS_AI_GENERATED:
+--   * enumerations (sentiment, intent, urgency, ...) as small NUMBER codes,
+--     decoded through CALL_CODE_LOOKUP
+--   * agent and customer names once, as columns; CALL_ANALYSIS and
+--     EXTRACTED_FIELDS are rebuilt from the columns and the original JSON is
+--     kept (VARIANT) only for rows where it differs from them
+--   * no pandas index column
+-- AI_TRANSCRIBED_CALLS_AI_GENERATED then becomes a view with the original
+-- columns, so the Streamlit app, the semantic model and the custom tools work
+-- unchanged against either schema.
+--
+-- Run after 02_create_tables_and_load.sql, then rerun
+-- 03_create_cortex_search.sql (search services are bound to the old table).
+-- Also rerun section 6 of script 02 (the CALL_ROLLUP_DAILY and
+-- CALL_PRIORITY_SCORES dynamic tables, and CALL_SKETCHES_DAILY with its stream
+-- and task - create the stream ON VIEW) so they read the view instead of the
+-- renamed table.
+-- Size comparison and CSV conversion: python scripts/compact_schema.py
+-- ============================================
+
+-- ============================================
+-- CONFIGURATION - Update these for your environment
+-- ============================================
+SET WAREHOUSE_NAME = 'WH_AISQL_HOL';  -- Change to your warehouse
+
+USE DATABASE CALL_CENTER_ANALYTICS;
+USE SCHEMA AUDIO_PROCESSING;
+USE WAREHOUSE IDENTIFIER($WAREHOUSE_NAME);
+
+-- ============================================
+-- 1. CODE LOOKUP (keep in sync with CODES in scripts/compact_schema.py)
+-- ============================================
+
+CREATE OR REPLACE TABLE CALL_CODE_LOOKUP (
+    DOMAIN VARCHAR(30) COMMENT 'Column the code belongs to, e.g. PRIMARY_INTENT',
+    CODE NUMBER(3) COMMENT 'Stored code (1-based)',
+    LABEL VARCHAR(50) COMMENT 'Value returned by the compatibility view',
+    PRIMARY KEY (DOMAIN, CODE)
+) COMMENT = 'Labels for the enumeration codes of AI_TRANSCRIBED_CALLS_COMPACT';
+
+INSERT INTO CALL_CODE_LOOKUP (DOMAIN, CODE, LABEL) VALUES
+    ('SENTIMENT_CATEGORY', 1, 'POSITIVE'),
+    ('SENTIMENT_CATEGORY', 2, 'NEUTRAL'),
+    ('SENTIMENT_CATEGORY', 3, 'NEGATIVE'),
+    ('CALL_CLASSIFICATION', 1, 'Billing Issue'),
+    ('CALL_CLASSIFICATION', 2, 'Technical Support'),
+    ('CALL_CLASSIFICATION', 3, 'Inquiry'),
+    ('CALL_CLASSIFICATION', 4, 'Compliment'),
+    ('CALL_CLASSIFICATION', 5, 'Complaint'),
+    ('CALL_TYPE', 1, 'inbound'),
+    ('CALL_TYPE', 2, 'outbound'),
+    ('PRIMARY_INTENT', 1, 'billing'),
+    ('PRIMARY_INTENT', 2, 'technical_support'),
+    ('PRIMARY_INTENT', 3, 'cancellation'),
+    ('PRIMARY_INTENT', 4, 'complaint'),
+    ('PRIMARY_INTENT', 5, 'compliment'),
+    ('PRIMARY_INTENT', 6, 'information'),
+    ('URGENCY_LEVEL', 1, 'low'),
+    ('URGENCY_LEVEL', 2, 'medium'),
+    ('URGENCY_LEVEL', 3, 'high'),
+    ('ISSUE_RESOLVED', 1, 'yes'),
+    ('ISSUE_RESOLVED', 2, 'no'),
+    ('ISSUE_RESOLVED', 3, 'partial'),
+    ('ESCALATION_REQUIRED', 1, 'no'),
+    ('ESCALATION_REQUIRED', 2, 'yes'),
+    ('CUSTOMER_SATISFACTION', 1, 'satisfied'),
+    ('CUSTOMER_SATISFACTION', 2, 'neutral'),
+    ('CUSTOMER_SATISFACTION', 3, 'dissatisfied');
+
+-- ============================================
+-- 2. CREATE AI_TRANSCRIBED_CALLS_COMPACT
+-- ============================================
+-- Column order matches the CSV written by compact_schema.py and
+-- generate_call_data.py --schema compact; short columns first, long text last.
+
+CREATE OR REPLACE TABLE AI_TRANSCRIBED_CALLS_COMPACT (
+    CALL_ID VARCHAR(50) PRIMARY KEY COMMENT 'Unique call identifier',
+    ANALYSIS_TIMESTAMP TIMESTAMP_NTZ COMMENT 'When the call was analyzed',
+    CUSTOMER_NAME VARCHAR(100) COMMENT 'Customer name (stored once)',
+    AGENT_NAME VARCHAR(100) COMMENT 'Agent who handled the call (stored once)',
+    SENTIMENT_CATEGORY_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain SENTIMENT_CATEGORY',
+    CALL_CLASSIFICATION_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain CALL_CLASSIFICATION',
+    CALL_TYPE_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain CALL_TYPE',
+    PRIMARY_INTENT_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain PRIMARY_INTENT',
+    URGENCY_LEVEL_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain URGENCY_LEVEL',
+    ISSUE_RESOLVED_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain ISSUE_RESOLVED',
+    ESCALATION_REQUIRED_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain ESCALATION_REQUIRED',
+    CUSTOMER_SATISFACTION_CODE NUMBER(3) COMMENT 'CALL_CODE_LOOKUP domain CUSTOMER_SATISFACTION',
+    SENTIMENT_SCORE FLOAT COMMENT 'AI sentiment score (-1 to +1)',
+    AGENT_PERFORMANCE_SCORE NUMBER COMMENT 'Agent performance rating (0-10)',
+    WORD_COUNT NUMBER COMMENT 'Number of words in transcript',
+    CALL_SUMMARY VARCHAR(16777216) COMMENT 'AI-generated summary of the call',
+    IMPROVEMENT_OPPORTUNITIES VARCHAR(16777216) COMMENT 'Suggested improvements for agent',
+    TRANSCRIPT_TEXT VARCHAR(16777216) COMMENT 'Full call transcript (unstructured text)',
+    CALL_ANALYSIS_RAW VARIANT COMMENT 'Original CALL_ANALYSIS, only where it differs from the columns',
+    EXTRACTED_FIELDS_RAW VARIANT COMMENT 'Original EXTRACTED_FIELDS, only where it differs from the columns'
+)
+CLUSTER BY (TO_DATE(ANALYSIS_TIMESTAMP))
+COMMENT = 'Call center interactions, compact layout (enumeration codes, no duplicated JSON)';
+
+-- ============================================
+-- 3. LOAD
+-- ============================================
+
+-- Option A: Migrate the rows already loaded by script 02
+INSERT INTO AI_TRANSCRIBED_CALLS_COMPACT
+WITH rebuilt AS (
+    SELECT
+        c.*,
+        OBJECT_CONSTRUCT_KEEP_NULL(
+            'agent_name', c.AGENT_NAME,
+            'call_type', c.CALL_TYPE,
+            'customer_name', c.CUSTOMER_NAME,
+            'customer_satisfaction', c.CUSTOMER_SATISFACTION,
+            'escalation_required', c.ESCALATION_REQUIRED,
+            'issue_resolved', c.ISSUE_RESOLVED,
+            'primary_intent', c.PRIMARY_INTENT,
+            'urgency_level', c.URGENCY_LEVEL
+        ) AS ANALYSIS_FROM_COLUMNS,
+        OBJECT_CONSTRUCT_KEEP_NULL('response', OBJECT_CONSTRUCT_KEEP_NULL(
+            'agent_name', c.AGENT_NAME,
+            'customer_name', c.CUSTOMER_NAME
+        )) AS FIELDS_FROM_COLUMNS
+    FROM AI_TRANSCRIBED_CALLS_AI_GENERATED c
+)
+SELECT
+    r.CALL_ID,
+    r.ANALYSIS_TIMESTAMP,
+    r.CUSTOMER_NAME,
+    r.AGENT_NAME,
+    sc.CODE, cc.CODE, ct.CODE, pi.CODE, ul.CODE, ir.CODE, er.CODE, cs.CODE,
+    r.SENTIMENT_SCORE,
+    r.AGENT_PERFORMANCE_SCORE,
+    r.WORD_COUNT,
+    r.CALL_SUMMARY,
+    r.IMPROVEMENT_OPPORTUNITIES,
+    r.TRANSCRIPT_TEXT,
+    IFF(EQUAL_NULL(r.CALL_ANALYSIS, r.ANALYSIS_FROM_COLUMNS), NULL, r.CALL_ANALYSIS),
+    IFF(EQUAL_NULL(r.EXTRACTED_FIELDS, r.FIELDS_FROM_COLUMNS), NULL, r.EXTRACTED_FIELDS)
+FROM rebuilt r
+LEFT JOIN CALL_CODE_LOOKUP sc ON sc.DOMAIN = 'SENTIMENT_CATEGORY' AND sc.LABEL = r.SENTIMENT_CATEGORY
+LEFT JOIN CALL_CODE_LOOKUP cc ON cc.DOMAIN = 'CALL_CLASSIFICATION' AND cc.LABEL = r.CALL_CLASSIFICATION
+LEFT JOIN CALL_CODE_LOOKUP ct ON ct.DOMAIN = 'CALL_TYPE' AND ct.LABEL = r.CALL_TYPE
+LEFT JOIN CALL_CODE_LOOKUP pi ON pi.DOMAIN = 'PRIMARY_INTENT' AND pi.LABEL = r.PRIMARY_INTENT
+LEFT JOIN CALL_CODE_LOOKUP ul ON ul.DOMAIN = 'URGENCY_LEVEL' AND ul.LABEL = r.URGENCY_LEVEL
+LEFT JOIN CALL_CODE_LOOKUP ir ON ir.DOMAIN = 'ISSUE_RESOLVED' AND ir.LABEL = r.ISSUE_RESOLVED
+LEFT JOIN CALL_CODE_LOOKUP er ON er.DOMAIN = 'ESCALATION_REQUIRED' AND er.LABEL = r.ESCALATION_REQUIRED
+LEFT JOIN CALL_CODE_LOOKUP cs ON cs.DOMAIN = 'CUSTOMER_SATISFACTION' AND cs.LABEL = r.CUSTOMER_SATISFACTION
+ORDER BY r.ANALYSIS_TIMESTAMP;
+
+-- Option B: Load compact CSVs directly (smaller files to upload and parse)
+-- python scripts/compact_schema.py --output FINAL_TABLE_COMPACT.csv
+-- python scripts/generate_call_data.py --schema compact --layout partitioned --output calls_compact
+--
+-- COPY INTO AI_TRANSCRIBED_CALLS_COMPACT
+-- FROM @call_center_stage/FINAL_TABLE_COMPACT.csv
+-- FILE_FORMAT = csv_format
+-- ON_ERROR = 'CONTINUE';
+
+-- Every row must have decoded; unknown labels show up here as NULL codes
+SELECT
+    COUNT(*) AS total_calls,
+    COUNT_IF(SENTIMENT_CATEGORY_CODE IS NULL OR PRIMARY_INTENT_CODE IS NULL
+             OR CALL_CLASSIFICATION_CODE IS NULL OR CALL_TYPE_CODE IS NULL) AS undecoded_rows,
+    COUNT(CALL_ANALYSIS_RAW) AS rows_keeping_call_analysis,
+    COUNT(EXTRACTED_FIELDS_RAW) AS rows_keeping_extracted_fields
+FROM AI_TRANSCRIBED_CALLS_COMPACT;
+
+-- ============================================
+-- 4. SWAP: KEEP THE FULL TABLE, SERVE THE VIEW UNDER ITS NAME
+-- ============================================
+
+ALTER TABLE AI_TRANSCRIBED_CALLS_AI_GENERATED RENAME TO AI_TRANSCRIBED_CALLS_FULL_BACKUP;
+
+CREATE OR REPLACE VIEW AI_TRANSCRIBED_CALLS_AI_GENERATED
+COMMENT = 'Call center interaction data with AI-powered sentiment analysis and agent performance metrics (decoded from AI_TRANSCRIBED_CALLS_COMPACT)'
+AS
+SELECT
+    c.CALL_ID,
+    c.TRANSCRIPT_TEXT,
+    c.WORD_COUNT,
+    c.SENTIMENT_SCORE,
+    sc.LABEL AS SENTIMENT_CATEGORY,
+    c.CALL_SUMMARY,
+    cc.LABEL AS CALL_CLASSIFICATION,
+    COALESCE(c.EXTRACTED_FIELDS_RAW, OBJECT_CONSTRUCT_KEEP_NULL('response', OBJECT_CONSTRUCT_KEEP_NULL(
+        'agent_name', c.AGENT_NAME,
+        'customer_name', c.CUSTOMER_NAME
+    ))) AS EXTRACTED_FIELDS,
+    COALESCE(c.CALL_ANALYSIS_RAW, OBJECT_CONSTRUCT_KEEP_NULL(
+        'agent_name', c.AGENT_NAME,
+        'call_type', ct.LABEL,
+        'customer_name', c.CUSTOMER_NAME,
+        'customer_satisfaction', cs.LABEL,
+        'escalation_required', er.LABEL,
+        'issue_resolved', ir.LABEL,
+        'primary_intent', pi.LABEL,
+        'urgency_level', ul.LABEL
+    )) AS CALL_ANALYSIS,
+    c.AGENT_PERFORMANCE_SCORE,
+    c.IMPROVEMENT_OPPORTUNITIES,
+    c.ANALYSIS_TIMESTAMP,
+    ct.LABEL AS CALL_TYPE,
+    c.CUSTOMER_NAME,
+    c.AGENT_NAME,
+    pi.LABEL AS PRIMARY_INTENT,
+    ul.LABEL AS URGENCY_LEVEL,
+    ir.LABEL AS ISSUE_RESOLVED,
+    er.LABEL AS ESCALATION_REQUIRED,
+    cs.LABEL AS CUSTOMER_SATISFACTION
+FROM AI_TRANSCRIBED_CALLS_COMPACT c
+LEFT JOIN CALL_CODE_LOOKUP sc ON sc.DOMAIN = 'SENTIMENT_CATEGORY' AND sc.CODE = c.SENTIMENT_CATEGORY_CODE
+LEFT JOIN CALL_CODE_LOOKUP cc ON cc.DOMAIN = 'CALL_CLASSIFICATION' AND cc.CODE = c.CALL_CLASSIFICATION_CODE
+LEFT JOIN CALL_CODE_LOOKUP ct ON ct.DOMAIN = 'CALL_TYPE' AND ct.CODE = c.CALL_TYPE_CODE
+LEFT JOIN CALL_CODE_LOOKUP pi ON pi.DOMAIN = 'PRIMARY_INTENT' AND pi.CODE = c.PRIMARY_INTENT_CODE
+LEFT JOIN CALL_CODE_LOOKUP ul ON ul.DOMAIN = 'URGENCY_LEVEL' AND ul.CODE = c.URGENCY_LEVEL_CODE
+LEFT JOIN CALL_CODE_LOOKUP ir ON ir.DOMAIN = 'ISSUE_RESOLVED' AND ir.CODE = c.ISSUE_RESOLVED_CODE
+LEFT JOIN CALL_CODE_LOOKUP er ON er.DOMAIN = 'ESCALATION_REQUIRED' AND er.CODE = c.ESCALATION_REQUIRED_CODE
+LEFT JOIN CALL_CODE_LOOKUP cs ON cs.DOMAIN = 'CUSTOMER_SATISFACTION' AND cs.CODE = c.CUSTOMER_SATISFACTION_CODE;
+
+-- ============================================
+-- 5. VERIFY: THE VIEW RETURNS WHAT THE TABLE HELD
+-- ============================================
+
+SELECT
+    (SELECT COUNT(*) FROM AI_TRANSCRIBED_CALLS_FULL_BACKUP) AS full_rows,
+    (SELECT COUNT(*) FROM AI_TRANSCRIBED_CALLS_AI_GENERATED) AS view_rows,
+    (SELECT COUNT(*) FROM (
+        SELECT CALL_ID, SENTIMENT_CATEGORY, CALL_CLASSIFICATION, CALL_TYPE, PRIMARY_INTENT,
+               URGENCY_LEVEL, ISSUE_RESOLVED, ESCALATION_REQUIRED, CUSTOMER_SATISFACTION,
+               TO_JSON(CALL_ANALYSIS), TO_JSON(EXTRACTED_FIELDS)
+        FROM AI_TRANSCRIBED_CALLS_FULL_BACKUP
+        MINUS
+        SELECT CALL_ID, SENTIMENT_CATEGORY, CALL_CLASSIFICATION, CALL_TYPE, PRIMARY_INTENT,
+               URGENCY_LEVEL, ISSUE_RESOLVED, ESCALATION_REQUIRED, CUSTOMER_SATISFACTION,
+               TO_JSON(CALL_ANALYSIS), TO_JSON(EXTRACTED_FIELDS)
+        FROM AI_TRANSCRIBED_CALLS_AI_GENERATED
+    )) AS rows_that_differ;  -- expect 0
+
+-- Storage of both layouts (BYTES is refreshed a few minutes after DML)
+SELECT TABLE_NAME, ROW_COUNT, BYTES
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = 'AUDIO_PROCESSING'
+  AND TABLE_NAME IN ('AI_TRANSCRIBED_CALLS_FULL_BACKUP', 'AI_TRANSCRIBED_CALLS_COMPACT')
+ORDER BY TABLE_NAME;
+
+-- To go back to the full table:
+-- DROP VIEW AI_TRANSCRIBED_CALLS_AI_GENERATED;
+-- ALTER TABLE AI_TRANSCRIBED_CALLS_FULL_BACKUP RENAME TO AI_TRANSCRIBED_CALLS_AI_GENERATED;
+
+SELECT '✅ Compact schema active - rerun 03_create_cortex_search.sql and the script 02 dynamic tables' AS status;
@@ -128,6 +128,9 @@ DESCRIBE CORTEX SEARCH SERVICE SWT2025_call_transcript_search;
 -- Search Service for Agent/Customer Names (Fuzzy Matching)
 -- ============================================
 -- These services support fuzzy matching in semantic model for names
+-- For Python callers (dashboard, scripts) the same lookup runs in process with
+-- Streamlit App/name_resolver.py (see scripts/resolve_names.py): no warehouse
+-- round trip and no running index needed for these small name lists
 
 CREATE OR REPLACE CORTEX SEARCH SERVICE SWT2025_customer_name_search
   ON CUSTOMER_NAME
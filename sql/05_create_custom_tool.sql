@@ -19,8 +19,15 @@ USE WAREHOUSE IDENTIFIER($WAREHOUSE_NAME);
 -- 1. CREATE CALLBACK QUEUE TABLE
 -- ============================================
 
+-- IDs come from a named sequence so bulk scheduling can draw them up front
+-- and hand them back to the caller (an AUTOINCREMENT value cannot be read back)
+-- NOTE: a CALLBACK_QUEUE created by an earlier version of this script uses
+-- AUTOINCREMENT - drop it (or run 06_cleanup.sql) before re-running
+CREATE SEQUENCE IF NOT EXISTS CALLBACK_ID_SEQ START = 1 INCREMENT = 1
+    COMMENT = 'Callback IDs for CALLBACK_QUEUE';
+
 CREATE TABLE IF NOT EXISTS CALLBACK_QUEUE (
-    CALLBACK_ID NUMBER AUTOINCREMENT PRIMARY KEY,
+    CALLBACK_ID NUMBER DEFAULT CALLBACK_ID_SEQ.NEXTVAL PRIMARY KEY,
     CUSTOMER_NAME VARCHAR(200) NOT NULL,
     CALLBACK_REASON VARCHAR(500),
     PRIORITY VARCHAR(20) DEFAULT 'MEDIUM',
@@ -32,7 +39,14 @@ CREATE TABLE IF NOT EXISTS CALLBACK_QUEUE (
     STATUS VARCHAR(20) DEFAULT 'PENDING',
     CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
     CREATED_BY VARCHAR(100) DEFAULT CURRENT_USER(),
-    NOTES VARCHAR(1000)
+    NOTES VARCHAR(1000),
+    -- Work-queue lease (see section 9): set by claim_callbacks, cleared by complete_callbacks
+    LEASE_OWNER VARCHAR(200),
+    LEASE_TOKEN VARCHAR(64),
+    LEASE_EXPIRES_AT TIMESTAMP_NTZ,
+    ATTEMPTS NUMBER DEFAULT 0,
+    COMPLETED_AT TIMESTAMP_NTZ,
+    LAST_ERROR VARCHAR(1000)
 ) COMMENT = 'Queue for scheduled customer callbacks. Populated by Cortex Agent or call center staff.';
 
 -- ============================================
@@ -256,20 +270,440 @@ $$;
 -- CALL bulk_schedule_callbacks_for_at_risk_customers(30, 'HIGH');
 
 -- ============================================
--- 7. GRANT PERMISSIONS
+-- 7. AGENT ROSTER (for set-based assignment)
+-- ============================================
+
+-- One row per agent with average score and capacity. Bulk scheduling reads
+-- this small table instead of scanning the call table per callback; it counts
+-- the current load from the open rows of CALLBACK_QUEUE, so OPEN_CALLBACKS here
+-- is only the snapshot taken by the last refresh_agent_roster.
+CREATE TABLE IF NOT EXISTS AGENT_ROSTER (
+    AGENT_NAME VARCHAR(200) PRIMARY KEY,
+    AVG_SCORE NUMBER(4,2),
+    CALLS_HANDLED NUMBER,
+    OPEN_CALLBACKS NUMBER DEFAULT 0,
+    MAX_OPEN_CALLBACKS NUMBER DEFAULT 25,
+    REFRESHED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Precomputed agent scores and callback capacity. Rebuilt by refresh_agent_roster; OPEN_CALLBACKS is the open load at that refresh.';
+
+CREATE OR REPLACE PROCEDURE refresh_agent_roster(
+    MAX_OPEN_CALLBACKS_INPUT NUMBER DEFAULT 25
+)
+RETURNS VARCHAR
+LANGUAGE SQL
+COMMENT = 'Recomputes AGENT_ROSTER scores and pending callback counts in one pass over the call table. MAX_OPEN_CALLBACKS_INPUT applies to new agents only.'
+AS
+$$
+DECLARE
+    agents_refreshed NUMBER := 0;
+BEGIN
+    MERGE INTO AGENT_ROSTER ar
+    USING (
+        SELECT
+            cc.AGENT_NAME,
+            AVG(cc.AGENT_PERFORMANCE_SCORE) as AVG_SCORE,
+            COUNT(*) as CALLS_HANDLED,
+            COALESCE(MAX(q.OPEN_CALLBACKS), 0) as OPEN_CALLBACKS
+        FROM AI_TRANSCRIBED_CALLS_AI_GENERATED cc
+        LEFT JOIN (
+            SELECT ASSIGNED_AGENT, COUNT(*) as OPEN_CALLBACKS
+            FROM CALLBACK_QUEUE
+            WHERE STATUS IN ('PENDING', 'IN_PROGRESS')
+            GROUP BY ASSIGNED_AGENT
+        ) q ON q.ASSIGNED_AGENT = cc.AGENT_NAME
+        WHERE cc.AGENT_NAME IS NOT NULL
+        GROUP BY cc.AGENT_NAME
+    ) src
+    ON ar.AGENT_NAME = src.AGENT_NAME
+    WHEN MATCHED THEN UPDATE SET
+        AVG_SCORE = src.AVG_SCORE,
+        CALLS_HANDLED = src.CALLS_HANDLED,
+        OPEN_CALLBACKS = src.OPEN_CALLBACKS,
+        REFRESHED_AT = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN INSERT (AGENT_NAME, AVG_SCORE, CALLS_HANDLED, OPEN_CALLBACKS, MAX_OPEN_CALLBACKS, REFRESHED_AT)
+        VALUES (src.AGENT_NAME, src.AVG_SCORE, src.CALLS_HANDLED, src.OPEN_CALLBACKS, :MAX_OPEN_CALLBACKS_INPUT, CURRENT_TIMESTAMP());
+
+    SET agents_refreshed = SQLROWCOUNT;
+
+    RETURN 'Agent roster refreshed: ' || :agents_refreshed || ' agents';
+END;
+$$;
+
+CALL refresh_agent_roster();
+
+-- Optional: keep the roster fresh as new calls land
+-- CREATE OR REPLACE TASK refresh_agent_roster_task
+--     WAREHOUSE = WH_AISQL_HOL
+--     SCHEDULE = '60 MINUTE'
+-- AS CALL refresh_agent_roster();
+-- ALTER TASK refresh_agent_roster_task RESUME;
+
+-- ============================================
+-- 8. BULK CALLBACK SCHEDULING (set-based)
+-- ============================================
+
+-- Schedules many callbacks in one statement and returns the new rows.
+-- CALLBACK_REQUESTS is an array of objects:
+--   {"customer_name": "...", "reason": "...", "scheduled_date": "YYYY-MM-DD", "priority": "HIGH|MEDIUM|LOW"}
+-- scheduled_date defaults to tomorrow, priority to MEDIUM. Customers without a
+-- profile are skipped, as in schedule_customer_callback.
+--
+-- Agent assignment is capacity-aware round-robin over AGENT_ROSTER: each agent
+-- contributes one slot per free place below MAX_OPEN_CALLBACKS, counting the
+-- PENDING and IN_PROGRESS callbacks already assigned to them in CALLBACK_QUEUE
+-- (so completions and single-row scheduling are reflected at once). Slots are
+-- handed out level by level (every agent's next free place before anyone's
+-- second), so the least-loaded agents fill first. HIGH priority draws from the
+-- senior agents - the top 20% by average score - and falls back to the general
+-- slots when no senior slot is free; other requests draw from agents averaging
+-- >= 7 (less senior agents first). Requests beyond the remaining capacity are
+-- inserted unassigned (TBD).
+CREATE OR REPLACE PROCEDURE schedule_customer_callbacks_bulk(
+    CALLBACK_REQUESTS ARRAY
+)
+RETURNS TABLE (
+    CALLBACK_ID NUMBER,
+    CUSTOMER_NAME VARCHAR,
+    PRIORITY VARCHAR,
+    SCHEDULED_DATE DATE,
+    SCHEDULED_TIME TIME,
+    ASSIGNED_AGENT VARCHAR
+)
+LANGUAGE SQL
+COMMENT = 'Schedules a batch of customer callbacks in one set-based insert with capacity-aware round-robin agent assignment from AGENT_ROSTER. Returns the inserted callbacks with their IDs.'
+AS
+$$
+DECLARE
+    results RESULTSET;
+BEGIN
+    -- Resolve requests, draw IDs and assign agents in one statement
+    CREATE OR REPLACE TEMPORARY TABLE CALLBACK_BATCH AS
+    WITH requests AS (
+        SELECT
+            r.INDEX as REQUEST_INDEX,
+            r.VALUE:customer_name::VARCHAR as CUSTOMER_NAME,
+            r.VALUE:reason::VARCHAR as CALLBACK_REASON,
+            UPPER(COALESCE(r.VALUE:priority::VARCHAR, 'MEDIUM')) as PRIORITY,
+            COALESCE(TO_DATE(r.VALUE:scheduled_date::VARCHAR), DATEADD(day, 1, CURRENT_DATE())) as SCHEDULED_DATE
+        FROM TABLE(FLATTEN(INPUT => :CALLBACK_REQUESTS)) r
+    ),
+    profiled AS (
+        SELECT
+            req.*,
+            cp.CUSTOMER_SEGMENT,
+            cp.MONTHLY_PLAN_VALUE,
+            IFF(req.PRIORITY = 'HIGH', 'SENIOR', 'GENERAL') as TIER
+        FROM requests req
+        JOIN AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE cp
+            ON cp.CUSTOMER_NAME = req.CUSTOMER_NAME
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY req.REQUEST_INDEX ORDER BY cp.CUSTOMER_ID) = 1
+    ),
+    ranked AS (
+        SELECT p.*, ROW_NUMBER() OVER (PARTITION BY p.TIER ORDER BY p.REQUEST_INDEX) as TIER_RANK
+        FROM profiled p
+    ),
+    open_load AS (
+        -- Current load from the queue itself, not a counter that can drift
+        SELECT ASSIGNED_AGENT, COUNT(*) as OPEN_CALLBACKS
+        FROM CALLBACK_QUEUE
+        WHERE STATUS IN ('PENDING', 'IN_PROGRESS')
+            AND ASSIGNED_AGENT IS NOT NULL
+        GROUP BY ASSIGNED_AGENT
+    ),
+    agents AS (
+        SELECT
+            ar.AGENT_NAME,
+            ar.AVG_SCORE,
+            ar.MAX_OPEN_CALLBACKS,
+            COALESCE(ol.OPEN_CALLBACKS, 0) as OPEN_CALLBACKS,
+            PERCENT_RANK() OVER (ORDER BY ar.AVG_SCORE DESC) <= 0.2 as IS_SENIOR
+        FROM AGENT_ROSTER ar
+        LEFT JOIN open_load ol ON ol.ASSIGNED_AGENT = ar.AGENT_NAME
+    ),
+    slots AS (
+        -- One row per free place: SLOT runs from the current load of the agent up to capacity
+        SELECT a.AGENT_NAME, a.AVG_SCORE, a.IS_SENIOR, s.VALUE::NUMBER as SLOT
+        FROM agents a,
+             LATERAL FLATTEN(INPUT => ARRAY_GENERATE_RANGE(a.OPEN_CALLBACKS, a.MAX_OPEN_CALLBACKS)) s
+        WHERE a.AVG_SCORE >= 7 OR a.IS_SENIOR
+    ),
+    senior_slots AS (
+        SELECT AGENT_NAME, SLOT,
+               ROW_NUMBER() OVER (ORDER BY SLOT, AVG_SCORE DESC, AGENT_NAME) as SLOT_RANK
+        FROM slots
+        WHERE IS_SENIOR
+    ),
+    senior_assigned AS (
+        -- HIGH requests that got a senior slot
+        SELECT r.REQUEST_INDEX, ss.AGENT_NAME, ss.SLOT
+        FROM ranked r
+        JOIN senior_slots ss ON ss.SLOT_RANK = r.TIER_RANK
+        WHERE r.TIER = 'SENIOR'
+    ),
+    general_requests AS (
+        -- Everything else, HIGH requests left without a senior slot first
+        SELECT r.REQUEST_INDEX,
+               ROW_NUMBER() OVER (ORDER BY IFF(r.TIER = 'SENIOR', 0, 1), r.REQUEST_INDEX) as GENERAL_RANK
+        FROM ranked r
+        LEFT JOIN senior_assigned sa ON sa.REQUEST_INDEX = r.REQUEST_INDEX
+        WHERE sa.REQUEST_INDEX IS NULL
+    ),
+    general_slots AS (
+        -- Every free place not taken by a senior assignment in this batch
+        SELECT s.AGENT_NAME,
+               ROW_NUMBER() OVER (ORDER BY s.SLOT, s.AVG_SCORE, s.AGENT_NAME) as SLOT_RANK
+        FROM slots s
+        LEFT JOIN senior_assigned sa
+            ON sa.AGENT_NAME = s.AGENT_NAME
+           AND sa.SLOT = s.SLOT
+        WHERE sa.AGENT_NAME IS NULL
+    )
+    SELECT
+        CALLBACK_ID_SEQ.NEXTVAL as CALLBACK_ID,
+        r.CUSTOMER_NAME,
+        r.CALLBACK_REASON,
+        r.PRIORITY,
+        r.SCHEDULED_DATE,
+        CASE r.PRIORITY
+            WHEN 'HIGH' THEN '10:00:00'::TIME
+            WHEN 'LOW' THEN '16:00:00'::TIME
+            ELSE '14:00:00'::TIME
+        END as SCHEDULED_TIME,
+        COALESCE(sa.AGENT_NAME, gs.AGENT_NAME) as ASSIGNED_AGENT,
+        r.CUSTOMER_SEGMENT,
+        r.MONTHLY_PLAN_VALUE
+    FROM ranked r
+    LEFT JOIN senior_assigned sa ON sa.REQUEST_INDEX = r.REQUEST_INDEX
+    LEFT JOIN general_requests gr ON gr.REQUEST_INDEX = r.REQUEST_INDEX
+    LEFT JOIN general_slots gs ON gs.SLOT_RANK = gr.GENERAL_RANK;
+
+    INSERT INTO CALLBACK_QUEUE (
+        CALLBACK_ID,
+        CUSTOMER_NAME,
+        CALLBACK_REASON,
+        PRIORITY,
+        SCHEDULED_DATE,
+        SCHEDULED_TIME,
+        ASSIGNED_AGENT,
+        CUSTOMER_SEGMENT,
+        MONTHLY_PLAN_VALUE,
+        STATUS,
+        NOTES
+    )
+    SELECT
+        CALLBACK_ID,
+        CUSTOMER_NAME,
+        CALLBACK_REASON,
+        PRIORITY,
+        SCHEDULED_DATE,
+        SCHEDULED_TIME,
+        ASSIGNED_AGENT,
+        CUSTOMER_SEGMENT,
+        MONTHLY_PLAN_VALUE,
+        'PENDING',
+        'Bulk scheduled by Cortex Agent'
+    FROM CALLBACK_BATCH;
+
+    -- No roster update: the next batch counts these rows in CALLBACK_QUEUE
+    -- Return exactly the rows of this batch (no lookup by customer name)
+    results := (
+        SELECT CALLBACK_ID, CUSTOMER_NAME, PRIORITY, SCHEDULED_DATE, SCHEDULED_TIME,
+               COALESCE(ASSIGNED_AGENT, 'TBD') as ASSIGNED_AGENT
+        FROM CALLBACK_BATCH
+        ORDER BY CALLBACK_ID
+    );
+    RETURN TABLE(results);
+END;
+$$;
+
+-- Test bulk scheduling (e.g. after an outage)
+-- CALL schedule_customer_callbacks_bulk(ARRAY_CONSTRUCT(
+--     OBJECT_CONSTRUCT('customer_name', 'David Thompson', 'reason', 'Outage follow-up', 'priority', 'HIGH'),
+--     OBJECT_CONSTRUCT('customer_name', 'Ashley Brown', 'reason', 'Outage follow-up'),
+--     OBJECT_CONSTRUCT('customer_name', 'Emily Davis', 'reason', 'Outage follow-up', 'scheduled_date', '2025-10-09', 'priority', 'LOW')
+-- ));
+
+-- From a table of requests:
+-- CALL schedule_customer_callbacks_bulk((
+--     SELECT ARRAY_AGG(OBJECT_CONSTRUCT('customer_name', CUSTOMER_NAME, 'reason', 'Network outage follow-up', 'priority', 'HIGH'))
+--     FROM AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE
+--     WHERE REGION = 'West'
+-- ));
+
+-- ============================================
+-- 9. WORK QUEUE: CLAIM / LEASE / COMPLETE
+-- ============================================
+
+-- Consumers (scripts/callback_worker.py) drain CALLBACK_QUEUE with leases:
+--   PENDING --claim--> IN_PROGRESS --complete(ok)--> COMPLETED
+--                          |  complete(failed) or lease expired: back to the
+--                          |  queue until MAX_ATTEMPTS, then FAILED
+-- A claim takes the N highest-priority due rows and stamps them with a lease
+-- token; only the holder of that token can complete them. A worker that dies
+-- mid-batch simply lets its lease expire and the rows are claimed again.
+
+-- Single-row lock table: claims and completions update it first, inside their
+-- transaction, so they run one at a time and never see a stale queue.
+CREATE TABLE IF NOT EXISTS CALLBACK_CLAIM_LOCK (
+    LOCK_ID NUMBER,
+    LOCKED_BY VARCHAR(200),
+    LOCKED_AT TIMESTAMP_NTZ
+) COMMENT = 'Serializes claim_callbacks / complete_callbacks. Holds exactly one row.';
+
+INSERT INTO CALLBACK_CLAIM_LOCK (LOCK_ID)
+SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM CALLBACK_CLAIM_LOCK);
+
+CREATE OR REPLACE PROCEDURE claim_callbacks(
+    WORKER_ID VARCHAR,
+    BATCH_SIZE NUMBER DEFAULT 25,
+    LEASE_SECONDS NUMBER DEFAULT 300,
+    MAX_ATTEMPTS NUMBER DEFAULT 3
+)
+RETURNS TABLE (
+    CALLBACK_ID NUMBER,
+    LEASE_TOKEN VARCHAR,
+    CUSTOMER_NAME VARCHAR,
+    CALLBACK_REASON VARCHAR,
+    PRIORITY VARCHAR,
+    SCHEDULED_DATE DATE,
+    SCHEDULED_TIME TIME,
+    ASSIGNED_AGENT VARCHAR,
+    ATTEMPTS NUMBER
+)
+LANGUAGE SQL
+COMMENT = 'Atomically leases up to BATCH_SIZE due callbacks (HIGH first, then earliest) to WORKER_ID for LEASE_SECONDS. Expired leases are retried until MAX_ATTEMPTS. Returns the claimed rows and their lease token.'
+AS
+$$
+DECLARE
+    claim_token VARCHAR DEFAULT UUID_STRING();
+    results RESULTSET;
+BEGIN
+    BEGIN TRANSACTION;
+
+    UPDATE CALLBACK_CLAIM_LOCK SET LOCKED_BY = :WORKER_ID, LOCKED_AT = CURRENT_TIMESTAMP();
+
+    -- Leases that expired on their last attempt are not retried again
+    UPDATE CALLBACK_QUEUE
+    SET STATUS = 'FAILED',
+        LAST_ERROR = 'Lease expired (' || LEASE_OWNER || ') after ' || ATTEMPTS || ' attempts',
+        LEASE_OWNER = NULL,
+        LEASE_TOKEN = NULL,
+        LEASE_EXPIRES_AT = NULL
+    WHERE STATUS = 'IN_PROGRESS'
+        AND LEASE_EXPIRES_AT < CURRENT_TIMESTAMP()
+        AND ATTEMPTS >= :MAX_ATTEMPTS;
+
+    UPDATE CALLBACK_QUEUE q
+    SET STATUS = 'IN_PROGRESS',
+        LEASE_OWNER = :WORKER_ID,
+        LEASE_TOKEN = :claim_token,
+        LEASE_EXPIRES_AT = DATEADD(second, :LEASE_SECONDS, CURRENT_TIMESTAMP()),
+        ATTEMPTS = COALESCE(q.ATTEMPTS, 0) + 1
+    FROM (
+        SELECT CALLBACK_ID
+        FROM CALLBACK_QUEUE
+        WHERE (STATUS = 'PENDING' OR (STATUS = 'IN_PROGRESS' AND LEASE_EXPIRES_AT < CURRENT_TIMESTAMP()))
+            AND TIMESTAMP_NTZ_FROM_PARTS(SCHEDULED_DATE, COALESCE(SCHEDULED_TIME, '00:00:00'::TIME)) <= CURRENT_TIMESTAMP()
+        ORDER BY
+            CASE PRIORITY
+                WHEN 'HIGH' THEN 1
+                WHEN 'MEDIUM' THEN 2
+                ELSE 3
+            END,
+            SCHEDULED_DATE,
+            SCHEDULED_TIME,
+            CALLBACK_ID
+        LIMIT :BATCH_SIZE
+    ) due
+    WHERE q.CALLBACK_ID = due.CALLBACK_ID;
+
+    COMMIT;
+
+    results := (
+        SELECT CALLBACK_ID, LEASE_TOKEN, CUSTOMER_NAME, CALLBACK_REASON, PRIORITY,
+               SCHEDULED_DATE, SCHEDULED_TIME, ASSIGNED_AGENT, ATTEMPTS
+        FROM CALLBACK_QUEUE
+        WHERE LEASE_TOKEN = :claim_token
+        ORDER BY CALLBACK_ID
+    );
+    RETURN TABLE(results);
+END;
+$$;
+
+-- OUTCOMES is an array of {"callback_id": 123, "succeeded": true, "error": "..."}
+CREATE OR REPLACE PROCEDURE complete_callbacks(
+    LEASE_TOKEN_INPUT VARCHAR,
+    OUTCOMES ARRAY,
+    MAX_ATTEMPTS NUMBER DEFAULT 3
+)
+RETURNS NUMBER
+LANGUAGE SQL
+COMMENT = 'Completes callbacks claimed under LEASE_TOKEN_INPUT. Succeeded rows become COMPLETED; failed rows return to PENDING for retry, or FAILED after MAX_ATTEMPTS. Rows whose lease was taken over by another worker are left alone. Returns the number of rows updated.'
+AS
+$$
+DECLARE
+    rows_completed NUMBER := 0;
+BEGIN
+    BEGIN TRANSACTION;
+
+    UPDATE CALLBACK_CLAIM_LOCK SET LOCKED_BY = :LEASE_TOKEN_INPUT, LOCKED_AT = CURRENT_TIMESTAMP();
+
+    UPDATE CALLBACK_QUEUE q
+    SET STATUS = CASE
+            WHEN o.SUCCEEDED THEN 'COMPLETED'
+            WHEN q.ATTEMPTS >= :MAX_ATTEMPTS THEN 'FAILED'
+            ELSE 'PENDING'
+        END,
+        COMPLETED_AT = IFF(o.SUCCEEDED, CURRENT_TIMESTAMP(), NULL),
+        LAST_ERROR = o.ERROR_MESSAGE,
+        LEASE_OWNER = NULL,
+        LEASE_TOKEN = NULL,
+        LEASE_EXPIRES_AT = NULL
+    FROM (
+        SELECT
+            f.VALUE:callback_id::NUMBER as CALLBACK_ID,
+            COALESCE(f.VALUE:succeeded::BOOLEAN, FALSE) as SUCCEEDED,
+            f.VALUE:error::VARCHAR as ERROR_MESSAGE
+        FROM TABLE(FLATTEN(INPUT => :OUTCOMES)) f
+    ) o
+    WHERE q.CALLBACK_ID = o.CALLBACK_ID
+        AND q.LEASE_TOKEN = :LEASE_TOKEN_INPUT
+        AND q.STATUS = 'IN_PROGRESS';
+
+    SET rows_completed = SQLROWCOUNT;
+
+    COMMIT;
+
+    RETURN :rows_completed;
+END;
+$$;
+
+-- Test the lease cycle
+-- CALL claim_callbacks('manual-test', 5, 60);
+-- CALL complete_callbacks('<LEASE_TOKEN from the claim>', PARSE_JSON('[{"callback_id": 1, "succeeded": true}]')::ARRAY);
+
+-- Queue health
+-- SELECT STATUS, COUNT(*), MIN(LEASE_EXPIRES_AT), MAX(ATTEMPTS) FROM CALLBACK_QUEUE GROUP BY STATUS;
+
+-- ============================================
+-- 10. GRANT PERMISSIONS
 -- ============================================
 
 -- Grant execute permission to agent role (replace with your actual role)
 -- GRANT USAGE ON PROCEDURE schedule_customer_callback(VARCHAR, VARCHAR, VARCHAR, VARCHAR) TO ROLE AGENT_ROLE;
 -- GRANT USAGE ON PROCEDURE bulk_schedule_callbacks_for_at_risk_customers(NUMBER, VARCHAR) TO ROLE AGENT_ROLE;
+-- GRANT USAGE ON PROCEDURE schedule_customer_callbacks_bulk(ARRAY) TO ROLE AGENT_ROLE;
+-- GRANT USAGE ON PROCEDURE claim_callbacks(VARCHAR, NUMBER, NUMBER, NUMBER) TO ROLE WORKER_ROLE;
+-- GRANT USAGE ON PROCEDURE complete_callbacks(VARCHAR, ARRAY, NUMBER) TO ROLE WORKER_ROLE;
 
 -- ============================================
--- 8. VERIFICATION
+-- 11. VERIFICATION
 -- ============================================
 
 -- Show created objects
 SHOW TABLES LIKE 'CALLBACK_QUEUE';
-SHOW PROCEDURES LIKE 'schedule_customer_callback';
+SHOW TABLES LIKE 'AGENT_ROSTER';
+SHOW PROCEDURES LIKE 'schedule_customer_callback%';
 
 -- Check callback queue
 SELECT 
@@ -282,6 +716,7 @@ SELECT '✓ Custom tool created successfully!' as status,
        '  → Table: CALLBACK_QUEUE' as detail1,
        '  → Procedure: schedule_customer_callback' as detail2,
        '  → Bulk procedure: bulk_schedule_callbacks_for_at_risk_customers' as detail3,
+       '  → Set-based bulk: schedule_customer_callbacks_bulk (AGENT_ROSTER)' as detail4,
        '  → Ready to add to Cortex Agent!' as next_step;
 
 -- ============================================
@@ -295,6 +730,7 @@ SELECT '✓ Custom tool created successfully!' as status,
 -- Bulk callbacks:
 -- "Schedule callbacks for all customers with multiple negative calls in the last 30 days"
 -- "Create callback tasks for Premium customers who had escalations this week"
+-- "Schedule high-priority callbacks for every West region customer affected by the outage"
 
 -- Query callbacks:
 -- "Show me all pending high-priority callbacks"
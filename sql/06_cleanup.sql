@@ -31,9 +31,27 @@ DROP CORTEX SEARCH SERVICE IF EXISTS SWT2025_agent_name_search;
 
 SELECT '🗑️ Dropping Tables...' AS status;
 
+-- After 02b_compact_schema.sql the call data name is a view over the compact table
+EXECUTE IMMEDIATE $$
+BEGIN
+    IF (EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.VIEWS
+                WHERE TABLE_SCHEMA = 'AUDIO_PROCESSING' AND TABLE_NAME = 'AI_TRANSCRIBED_CALLS_AI_GENERATED')) THEN
+        DROP VIEW AI_TRANSCRIBED_CALLS_AI_GENERATED;
+    END IF;
+END;
+$$;
+
 DROP TABLE IF EXISTS AI_TRANSCRIBED_CALLS_AI_GENERATED;
+DROP TABLE IF EXISTS AI_TRANSCRIBED_CALLS_COMPACT;       -- created by 02b_compact_schema
+DROP TABLE IF EXISTS AI_TRANSCRIBED_CALLS_FULL_BACKUP;   -- created by 02b_compact_schema
+DROP TABLE IF EXISTS CALL_CODE_LOOKUP;                   -- created by 02b_compact_schema
 DROP TABLE IF EXISTS AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE;
 DROP TABLE IF EXISTS CALLBACK_QUEUE;
+DROP TABLE IF EXISTS AGENT_ROSTER;
+DROP TABLE IF EXISTS CALLBACK_CLAIM_LOCK;
+DROP TABLE IF EXISTS AI_ENRICHMENT_CACHE;  -- created by 01_AI_TRANSCRIBE_DEMO
+DROP TABLE IF EXISTS AI_ENRICHMENT_PROMPTS;  -- created by 01_AI_TRANSCRIBE_DEMO
+DROP SEQUENCE IF EXISTS CALLBACK_ID_SEQ;
 
 -- ============================================
 -- 3. DROP VIEWS
@@ -42,6 +60,21 @@ DROP TABLE IF EXISTS CALLBACK_QUEUE;
 SELECT '🗑️ Dropping Views...' AS status;
 
 DROP VIEW IF EXISTS call_metrics_by_region;
+DROP DYNAMIC TABLE IF EXISTS CALL_ROLLUP_DAILY;
+DROP TASK IF EXISTS CALL_SKETCHES_DAILY_MERGE;
+DROP STREAM IF EXISTS CALL_SKETCHES_NEW_CALLS;
+-- CALL_SKETCHES_DAILY is a table (stream + task), a dynamic table in earlier versions
+EXECUTE IMMEDIATE $$
+BEGIN
+    IF (EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_SCHEMA = 'AUDIO_PROCESSING' AND TABLE_NAME = 'CALL_SKETCHES_DAILY'
+                  AND IS_DYNAMIC = 'YES')) THEN
+        DROP DYNAMIC TABLE CALL_SKETCHES_DAILY;
+    END IF;
+END;
+$$;
+DROP TABLE IF EXISTS CALL_SKETCHES_DAILY;
+DROP DYNAMIC TABLE IF EXISTS CALL_PRIORITY_SCORES;
 
 -- ============================================
 -- 4. DROP PROCEDURES
@@ -51,6 +84,11 @@ SELECT '🗑️ Dropping Procedures...' AS status;
 
 DROP PROCEDURE IF EXISTS schedule_customer_callback(VARCHAR, VARCHAR, VARCHAR, VARCHAR);
 DROP PROCEDURE IF EXISTS bulk_schedule_callbacks_for_at_risk_customers(NUMBER, VARCHAR);
+DROP PROCEDURE IF EXISTS refresh_agent_roster(NUMBER);
+DROP PROCEDURE IF EXISTS schedule_customer_callbacks_bulk(ARRAY);
+DROP PROCEDURE IF EXISTS claim_callbacks(VARCHAR, NUMBER, NUMBER, NUMBER);
+DROP PROCEDURE IF EXISTS complete_callbacks(VARCHAR, ARRAY, NUMBER);
+DROP FUNCTION IF EXISTS ai_enrichment_key(VARCHAR, VARCHAR, VARCHAR, VARCHAR);
 
 -- ============================================
 -- 5. DROP STAGE AND FILE FORMAT
@@ -59,6 +97,8 @@ DROP PROCEDURE IF EXISTS bulk_schedule_callbacks_for_at_risk_customers(NUMBER, V
 SELECT '🗑️ Dropping Stage and File Format...' AS status;
 
 DROP STAGE IF EXISTS call_center_stage;
+DROP STAGE IF EXISTS CALL_CENTER_AUDIO_FILES;
+DROP STAGE IF EXISTS CALL_EXPORTS;
 DROP FILE FORMAT IF EXISTS csv_format;
 
 -- ============================================
@@ -95,7 +135,11 @@ WHERE TABLE_SCHEMA = 'AUDIO_PROCESSING'
   AND TABLE_NAME IN (
     'AI_TRANSCRIBED_CALLS_AI_GENERATED',
     'AI_TRANSCRIBED_CALLS_AI_GENERATED_CUSTOMER_PROFILE',
-    'CALLBACK_QUEUE'
+    'CALLBACK_QUEUE',
+    'AGENT_ROSTER',
+    'CALLBACK_CLAIM_LOCK',
+    'AI_ENRICHMENT_CACHE',
+    'AI_ENRICHMENT_PROMPTS'
   );
 
 -- Check remaining views